@@ -13,23 +13,140 @@
 # limitations under the License.
 """Library of compiler functions for usage in the native execution context."""
 
-from typing import Optional
+import functools
+import sys
+import time
+from typing import Callable, List, Optional, Tuple
 
 from absl import logging
+import attr
 import tensorflow as tf
 
 from tensorflow_federated.python.common_libs import tracing
 from tensorflow_federated.python.core.impl.compiler import building_blocks
 from tensorflow_federated.python.core.impl.compiler import transformations
+from tensorflow_federated.python.core.impl.compiler import tree_analysis
 from tensorflow_federated.python.core.impl.compiler import tree_transformations
 from tensorflow_federated.python.core.impl.computation import computation_impl
 from tensorflow_federated.python.core.impl.wrappers import computation_wrapper_instances
 
+try:
+  import resource  # pylint: disable=g-import-not-at-top
+except ImportError:
+  # Not available on Windows, where peak memory is not reported.
+  resource = None
+
+
+@attr.s(auto_attribs=True, eq=False, order=False, frozen=True)
+class PassReport(object):
+  """Profile of a single compiler pass of `transform_to_native_form`.
+
+  Attributes:
+    `name`: The name of the pass, matching the name of its tracing span.
+    `wall_time_seconds`: The wall time spent in the pass, in seconds.
+    `num_nodes_before`: The number of building blocks in the input of the pass.
+    `num_nodes_after`: The number of building blocks in the output of the pass.
+    `num_tf_ops_before`: The number of TensorFlow ops in the input of the pass.
+    `num_tf_ops_after`: The number of TensorFlow ops in the output of the pass.
+    `peak_memory_bytes`: The peak resident memory of the process at the end of
+      the pass, in bytes, or `None` if not available on this platform.
+  """
+  name: str
+  wall_time_seconds: float
+  num_nodes_before: int
+  num_nodes_after: int
+  num_tf_ops_before: int
+  num_tf_ops_after: int
+  peak_memory_bytes: Optional[int]
+
+
+@attr.s(auto_attribs=True, eq=False, order=False, frozen=True)
+class CompileReport(object):
+  """Profile of a single invocation of `transform_to_native_form`.
+
+  Attributes:
+    `type_signature`: The type signature of the compiled computation.
+    `passes`: A list of `PassReport`s, in the order the passes were run.
+    `wall_time_seconds`: The total wall time of the compilation, in seconds.
+    `peak_memory_bytes`: The peak resident memory of the process at the end of
+      the compilation, in bytes, or `None` if not available on this platform.
+    `succeeded`: Whether compilation succeeded. If `False`, the computation was
+      returned uncompiled, and `passes` ends with the pass that failed.
+  """
+  type_signature: str
+  passes: List[PassReport]
+  wall_time_seconds: float
+  peak_memory_bytes: Optional[int]
+  succeeded: bool
+
+
+_TransformFn = Callable[[building_blocks.ComputationBuildingBlock],
+                        Tuple[building_blocks.ComputationBuildingBlock, bool]]
+
+
+def _peak_memory_bytes() -> Optional[int]:
+  """Returns the peak resident memory of this process, if available."""
+  if resource is None:
+    return None
+  max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  # Reported in bytes on macOS, and in kilobytes elsewhere.
+  return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def _run_pass(name: str,
+              transform_fn: _TransformFn,
+              comp: building_blocks.ComputationBuildingBlock,
+              pass_reports: Optional[List[PassReport]]):
+  """Runs `transform_fn` on `comp`, appending its profile to `pass_reports`.
+
+  Args:
+    name: The name of the pass.
+    transform_fn: A transformation returning a transformed copy of its argument
+      and whether it was modified, as is conventional for TFF transformations.
+    comp: The `building_blocks.ComputationBuildingBlock` to transform.
+    pass_reports: An optional list of `PassReport`s to append to.
+
+  Returns:
+    The transformed computation.
+  """
+  with tracing.span('transform_to_native_form', name, span=True):
+    if pass_reports is None:
+      return transform_fn(comp)[0]
+    # Counting traverses the whole tree, so only done if a report is requested.
+    num_nodes_before = tree_analysis.count(comp)
+    num_tf_ops_before = tree_analysis.count_tensorflow_ops_under(comp)
+    start_time = time.perf_counter()
+    try:
+      result, _ = transform_fn(comp)
+    except ValueError:
+      pass_reports.append(
+          PassReport(
+              name=name,
+              wall_time_seconds=time.perf_counter() - start_time,
+              num_nodes_before=num_nodes_before,
+              num_nodes_after=num_nodes_before,
+              num_tf_ops_before=num_tf_ops_before,
+              num_tf_ops_after=num_tf_ops_before,
+              peak_memory_bytes=_peak_memory_bytes()))
+      raise
+    wall_time_seconds = time.perf_counter() - start_time
+    pass_reports.append(
+        PassReport(
+            name=name,
+            wall_time_seconds=wall_time_seconds,
+            num_nodes_before=num_nodes_before,
+            num_nodes_after=tree_analysis.count(result),
+            num_tf_ops_before=num_tf_ops_before,
+            num_tf_ops_after=tree_analysis.count_tensorflow_ops_under(result),
+            peak_memory_bytes=_peak_memory_bytes()))
+    return result
+
 
 def transform_to_native_form(
     comp: computation_impl.ConcreteComputation,
     transform_math_to_tf: bool = False,
-    grappler_config: Optional[tf.compat.v1.ConfigProto] = None
+    grappler_config: Optional[tf.compat.v1.ConfigProto] = None,
+    compile_report_fn: Optional[Callable[[CompileReport], None]] = None
 ) -> computation_impl.ConcreteComputation:
   """Compiles a computation for execution in the TFF native runtime.
 
@@ -45,6 +162,10 @@ def transform_to_native_form(
     grappler_config: Configuration for Grappler optimizations to perform on the
       TensorFlow computations. If `None`, Grappler will not be run and no
       optimizations wil be applied.
+    compile_report_fn: An optional Python function called with a
+      `CompileReport` profiling this compilation. Profiling counts the nodes of
+      the computation before and after each pass, which adds to the time spent
+      compiling, so is only done if this function is given.
 
   Returns:
     A new `computation_impl.ConcreteComputation` representing the compiled
@@ -53,43 +174,54 @@ def transform_to_native_form(
   proto = computation_impl.ConcreteComputation.get_proto(comp)
   computation_building_block = building_blocks.ComputationBuildingBlock.from_proto(
       proto)
+  pass_reports = [] if compile_report_fn is not None else None
+  start_time = time.perf_counter()
+
+  def _report(succeeded):
+    if compile_report_fn is not None:
+      compile_report_fn(
+          CompileReport(
+              type_signature=str(computation_building_block.type_signature),
+              passes=pass_reports,
+              wall_time_seconds=time.perf_counter() - start_time,
+              peak_memory_bytes=_peak_memory_bytes(),
+              succeeded=succeeded))
+
   try:
     logging.debug('Compiling TFF computation to CDF.')
-    with tracing.span(
-        'transform_to_native_form', 'transform_to_call_dominant', span=True):
-      call_dominant_form, _ = transformations.transform_to_call_dominant(
-          computation_building_block)
+    call_dominant_form = _run_pass('transform_to_call_dominant',
+                                   transformations.transform_to_call_dominant,
+                                   computation_building_block, pass_reports)
     logging.debug('Computation compiled to:')
     logging.debug(call_dominant_form.formatted_representation())
     if transform_math_to_tf:
       logging.debug('Compiling local computations to TensorFlow.')
-      with tracing.span(
-          'transform_to_native_form',
+      call_dominant_form = _run_pass(
           'compile_local_computations_to_tensorflow',
-          span=True):
-        call_dominant_form, _ = transformations.compile_local_computations_to_tensorflow(
-            call_dominant_form)
+          transformations.compile_local_computations_to_tensorflow,
+          call_dominant_form, pass_reports)
       logging.debug('Computation compiled to:')
       logging.debug(call_dominant_form.formatted_representation())
     if grappler_config is not None:
-      with tracing.span(
-          'transform_to_native_form', 'optimize_tf_graphs', span=True):
-        call_dominant_form, _ = transformations.optimize_tensorflow_graphs(
-            call_dominant_form, grappler_config)
-    with tracing.span(
-        'transform_to_native_form',
+      call_dominant_form = _run_pass(
+          'optimize_tf_graphs',
+          functools.partial(
+              transformations.optimize_tensorflow_graphs,
+              grappler_config_proto=grappler_config), call_dominant_form,
+          pass_reports)
+    disabled_grapler_form = _run_pass(
         'transform_tf_call_ops_disable_grappler',
-        span=True):
-      disabled_grapler_form, _ = tree_transformations.transform_tf_call_ops_to_disable_grappler(
-          call_dominant_form)
-    with tracing.span(
-        'transform_to_native_form', 'transform_tf_add_ids', span=True):
-      form_with_ids, _ = tree_transformations.transform_tf_add_ids(
-          disabled_grapler_form)
+        tree_transformations.transform_tf_call_ops_to_disable_grappler,
+        call_dominant_form, pass_reports)
+    form_with_ids = _run_pass('transform_tf_add_ids',
+                              tree_transformations.transform_tf_add_ids,
+                              disabled_grapler_form, pass_reports)
+    _report(succeeded=True)
     return computation_wrapper_instances.building_block_to_computation(
         form_with_ids)
   except ValueError as e:
     logging.debug('Compilation for native runtime failed with error %s', e)
     logging.debug('computation: %s',
                   computation_building_block.compact_representation())
+    _report(succeeded=False)
     return comp
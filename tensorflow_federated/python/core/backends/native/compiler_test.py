@@ -0,0 +1,93 @@
+# Copyright 2021, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import tensorflow as tf
+
+from tensorflow_federated.python.core.api import computations
+from tensorflow_federated.python.core.api import test_case
+from tensorflow_federated.python.core.backends.native import compiler
+from tensorflow_federated.python.core.backends.native import execution_contexts
+from tensorflow_federated.python.core.impl.federated_context import intrinsics
+from tensorflow_federated.python.core.impl.types import computation_types
+
+
+@computations.tf_computation(tf.int32)
+def _add_one(x):
+  return x + 1
+
+
+@computations.federated_computation(computation_types.at_clients(tf.int32))
+def _sum_of_incremented(client_values):
+  return intrinsics.federated_sum(
+      intrinsics.federated_map(_add_one, client_values))
+
+
+class TransformToNativeFormCompileReportTest(test_case.TestCase):
+
+  def test_reports_each_pass(self):
+    reports = []
+
+    compiler.transform_to_native_form(
+        _sum_of_incremented,
+        transform_math_to_tf=True,
+        compile_report_fn=reports.append)
+
+    self.assertLen(reports, 1)
+    report = reports[0]
+    self.assertTrue(report.succeeded)
+    self.assertEqual(report.type_signature,
+                     str(_sum_of_incremented.type_signature))
+    self.assertEqual([p.name for p in report.passes], [
+        'transform_to_call_dominant',
+        'compile_local_computations_to_tensorflow',
+        'transform_tf_call_ops_disable_grappler',
+        'transform_tf_add_ids',
+    ])
+    for pass_report in report.passes:
+      self.assertGreaterEqual(pass_report.wall_time_seconds, 0.0)
+      self.assertGreater(pass_report.num_nodes_before, 0)
+      self.assertGreater(pass_report.num_nodes_after, 0)
+      self.assertGreater(pass_report.num_tf_ops_after, 0)
+    for before, after in zip(report.passes, report.passes[1:]):
+      self.assertEqual(before.num_nodes_after, after.num_nodes_before)
+      self.assertEqual(before.num_tf_ops_after, after.num_tf_ops_before)
+    self.assertGreaterEqual(report.wall_time_seconds,
+                            sum(p.wall_time_seconds for p in report.passes))
+    self.assertGreater(report.peak_memory_bytes, 0)
+
+  def test_reports_grappler_pass(self):
+    reports = []
+
+    compiler.transform_to_native_form(
+        _sum_of_incremented,
+        grappler_config=tf.compat.v1.ConfigProto(),
+        compile_report_fn=reports.append)
+
+    self.assertIn('optimize_tf_graphs', [p.name for p in reports[0].passes])
+
+  def test_compiles_same_computation_with_and_without_report(self):
+    with_report = compiler.transform_to_native_form(
+        _sum_of_incremented,
+        transform_math_to_tf=True,
+        compile_report_fn=lambda _: None)
+    without_report = compiler.transform_to_native_form(
+        _sum_of_incremented, transform_math_to_tf=True)
+
+    self.assertEqual(with_report.type_signature, without_report.type_signature)
+    self.assertEqual(with_report(range(3)), without_report(range(3)))
+
+
+if __name__ == '__main__':
+  execution_contexts.set_local_python_execution_context()
+  test_case.main()
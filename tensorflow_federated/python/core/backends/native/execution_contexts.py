@@ -13,24 +13,43 @@
 # limitations under the License.
 """Execution contexts for the native backend."""
 
-from typing import Sequence
+import collections
+from typing import List, Sequence
+import weakref
 
 from tensorflow_federated.python.core.backends.native import compiler
 from tensorflow_federated.python.core.backends.native import mergeable_comp_compiler
+from tensorflow_federated.python.core.impl.context_stack import context_base
 from tensorflow_federated.python.core.impl.context_stack import context_stack_impl
 from tensorflow_federated.python.core.impl.execution_contexts import mergeable_comp_execution_context
 from tensorflow_federated.python.core.impl.execution_contexts import sync_execution_context
 from tensorflow_federated.python.core.impl.executors import executor_factory
 from tensorflow_federated.python.core.impl.executors import executor_stacks
 
+# The most recent compile reports of each context recording them, keyed by the
+# context.
+_compile_reports = weakref.WeakKeyDictionary()
+
 
 def create_local_python_execution_context(default_num_clients: int = 0,
                                           max_fanout=100,
                                           clients_per_thread=1,
                                           server_tf_device=None,
                                           client_tf_devices=tuple(),
-                                          reference_resolving_clients=False):
-  """Creates an execution context that executes computations locally."""
+                                          reference_resolving_clients=False,
+                                          compiler_cache_dir=None,
+                                          max_compile_reports=0):
+  """Creates an execution context that executes computations locally.
+
+  If `compiler_cache_dir` is given, compiled computations are persisted in
+  that directory, and reused by later processes compiling the same
+  computations.
+
+  If `max_compile_reports` is positive, the context profiles each compilation,
+  and the reports of the most recent `max_compile_reports` compilations can be
+  retrieved with `get_compile_reports`. Computations loaded from
+  `compiler_cache_dir` are not compiled, so are not reported.
+  """
   factory = executor_stacks.local_executor_factory(
       default_num_clients=default_num_clients,
       max_fanout=max_fanout,
@@ -39,13 +58,29 @@ def create_local_python_execution_context(default_num_clients: int = 0,
       client_tf_devices=client_tf_devices,
       reference_resolving_clients=reference_resolving_clients)
 
+  if max_compile_reports > 0:
+    compile_reports = collections.deque(maxlen=max_compile_reports)
+    compile_report_fn = compile_reports.append
+  else:
+    compile_reports = None
+    compile_report_fn = None
+
   def _compiler(comp):
     native_form = compiler.transform_to_native_form(
-        comp, transform_math_to_tf=not reference_resolving_clients)
+        comp,
+        transform_math_to_tf=not reference_resolving_clients,
+        compile_report_fn=compile_report_fn)
     return native_form
 
-  return sync_execution_context.ExecutionContext(
-      executor_fn=factory, compiler_fn=_compiler)
+  context = sync_execution_context.ExecutionContext(
+      executor_fn=factory,
+      compiler_fn=_compiler,
+      compiler_cache_dir=compiler_cache_dir,
+      compiler_config='transform_to_native_form(transform_math_to_tf={})'
+      .format(not reference_resolving_clients))
+  if compile_reports is not None:
+    _compile_reports[context] = compile_reports
+  return context
 
 
 def set_local_python_execution_context(default_num_clients: int = 0,
@@ -53,7 +88,9 @@ def set_local_python_execution_context(default_num_clients: int = 0,
                                        clients_per_thread=1,
                                        server_tf_device=None,
                                        client_tf_devices=tuple(),
-                                       reference_resolving_clients=False):
+                                       reference_resolving_clients=False,
+                                       compiler_cache_dir=None,
+                                       max_compile_reports=0):
   """Sets an execution context that executes computations locally."""
   context = create_local_python_execution_context(
       default_num_clients=default_num_clients,
@@ -61,10 +98,31 @@ def set_local_python_execution_context(default_num_clients: int = 0,
       clients_per_thread=clients_per_thread,
       server_tf_device=server_tf_device,
       client_tf_devices=client_tf_devices,
-      reference_resolving_clients=reference_resolving_clients)
+      reference_resolving_clients=reference_resolving_clients,
+      compiler_cache_dir=compiler_cache_dir,
+      max_compile_reports=max_compile_reports)
   context_stack_impl.context_stack.set_default_context(context)
 
 
+def get_compile_reports(
+    context: context_base.Context) -> List[compiler.CompileReport]:
+  """Returns the most recent compile reports of `context`, oldest first.
+
+  Args:
+    context: An execution context created by
+      `create_local_python_execution_context` with a positive
+      `max_compile_reports`.
+
+  Raises:
+    ValueError: If `context` does not record compile reports.
+  """
+  compile_reports = _compile_reports.get(context)
+  if compile_reports is None:
+    raise ValueError('The context does not record compile reports; create it '
+                     'with a positive `max_compile_reports`.')
+  return list(compile_reports)
+
+
 def create_sizing_execution_context(default_num_clients: int = 0,
                                     max_fanout: int = 100,
                                     clients_per_thread: int = 1):
@@ -105,7 +163,8 @@ def create_remote_python_execution_context(channels,
                                            thread_pool_executor=None,
                                            dispose_batch_size=20,
                                            max_fanout: int = 100,
-                                           default_num_clients: int = 0):
+                                           default_num_clients: int = 0,
+                                           max_concurrent_requests: int = 100):
   """Creates context to execute computations with workers on `channels`."""
   factory = executor_stacks.remote_executor_factory(
       channels=channels,
@@ -113,6 +172,7 @@ def create_remote_python_execution_context(channels,
       dispose_batch_size=dispose_batch_size,
       max_fanout=max_fanout,
       default_num_clients=default_num_clients,
+      max_concurrent_requests=max_concurrent_requests,
   )
 
   return sync_execution_context.ExecutionContext(
@@ -123,14 +183,16 @@ def set_remote_python_execution_context(channels,
                                         thread_pool_executor=None,
                                         dispose_batch_size=20,
                                         max_fanout: int = 100,
-                                        default_num_clients: int = 0):
+                                        default_num_clients: int = 0,
+                                        max_concurrent_requests: int = 100):
   """Installs context to execute computations with workers on `channels`."""
   context = create_remote_python_execution_context(
       channels=channels,
       thread_pool_executor=thread_pool_executor,
       dispose_batch_size=dispose_batch_size,
       max_fanout=max_fanout,
-      default_num_clients=default_num_clients)
+      default_num_clients=default_num_clients,
+      max_concurrent_requests=max_concurrent_requests)
   context_stack_impl.context_stack.set_default_context(context)
 
 
@@ -137,6 +137,33 @@ class DatasetsTest(parameterized.TestCase):
         list(expected_result.as_numpy_iterator()))
 
 
+class CompileReportsTest(absltest.TestCase):
+
+  def test_records_most_recent_compile_reports(self):
+    context = execution_contexts.create_local_python_execution_context(
+        max_compile_reports=2)
+
+    for value in [1, 2, 3]:
+
+      @computations.tf_computation
+      def foo(value=value):
+        return tf.constant(value)
+
+      context.invoke(foo, None)
+
+    reports = execution_contexts.get_compile_reports(context)
+    self.assertLen(reports, 2)
+    for report in reports:
+      self.assertTrue(report.succeeded)
+      self.assertNotEmpty(report.passes)
+
+  def test_get_compile_reports_raises_if_not_recorded(self):
+    context = execution_contexts.create_local_python_execution_context()
+
+    with self.assertRaises(ValueError):
+      execution_contexts.get_compile_reports(context)
+
+
 if __name__ == '__main__':
   execution_contexts.set_local_python_execution_context()
   absltest.main()
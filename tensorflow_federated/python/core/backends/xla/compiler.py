@@ -13,9 +13,12 @@
 # limitations under the License.
 """A library of helper functions for constructing XLA computations."""
 
+from typing import Optional
+
 from jax.lib import xla_client
 import numpy as np
 
+from tensorflow_federated.proto.v0 import computation_pb2 as pb
 from tensorflow_federated.python.common_libs import py_typecheck
 from tensorflow_federated.python.common_libs import structure
 from tensorflow_federated.python.core.impl.compiler import local_computation_factory_base
@@ -174,3 +177,24 @@ class XlaComputationFactory(
     comp_pb = xla_serialization.create_xla_tff_computation(
         xla_computation, list(range(num_operand_tensors + 1)), comp_type)
     return (comp_pb, comp_type)
+
+  def create_stacked_sum_operator(
+      self, operand_type: computation_types.Type, count: int
+  ) -> Optional[local_computation_factory_base.ComputationProtoAndType]:
+    # Sums are computed pairwise with `create_plus_operator`.
+    del operand_type, count  # Unused.
+    return None
+
+  def create_stacked_mean_operator(
+      self, operand_type: computation_types.Type, count: int
+  ) -> Optional[local_computation_factory_base.ComputationProtoAndType]:
+    # Means are computed pairwise with `create_plus_operator`.
+    del operand_type, count  # Unused.
+    return None
+
+  def create_batched_select_operator(
+      self, select_fn: pb.Computation, select_fn_type: computation_types.Type
+  ) -> Optional[local_computation_factory_base.ComputationProtoAndType]:
+    # Keys are selected one at a time with `select_fn`.
+    del select_fn, select_fn_type  # Unused.
+    return None
@@ -25,6 +25,9 @@ from tensorflow_federated.python.core.impl.context_stack.get_context_stack impor
 from tensorflow_federated.python.core.impl.context_stack.set_default_context import set_default_context
 from tensorflow_federated.python.core.impl.execution_contexts.sync_execution_context import ExecutionContext
 from tensorflow_federated.python.core.impl.executors.cardinality_carrying_base import CardinalityCarrying
+from tensorflow_federated.python.core.impl.executors.client_placement import CapacityClientPlacement
+from tensorflow_federated.python.core.impl.executors.client_placement import ClientPlacementPolicy
+from tensorflow_federated.python.core.impl.executors.client_placement import ThroughputClientPlacement
 from tensorflow_federated.python.core.impl.executors.data_backend_base import DataBackend
 from tensorflow_federated.python.core.impl.executors.data_executor import DataExecutor
 from tensorflow_federated.python.core.impl.executors.eager_tf_executor import EagerTFExecutor
@@ -40,12 +43,16 @@ from tensorflow_federated.python.core.impl.executors.executor_stacks import Size
 from tensorflow_federated.python.core.impl.executors.executor_stacks import sizing_executor_factory
 from tensorflow_federated.python.core.impl.executors.executor_stacks import SizingExecutorFactory
 from tensorflow_federated.python.core.impl.executors.executor_stacks import thread_debugging_executor_factory
+from tensorflow_federated.python.core.impl.executors.executor_stacks import WorkerPoolChange
 from tensorflow_federated.python.core.impl.executors.executor_value_base import ExecutorValue
 from tensorflow_federated.python.core.impl.executors.federated_composing_strategy import FederatedComposingStrategy
+from tensorflow_federated.python.core.impl.executors.federated_composing_strategy import StragglerPolicy
 from tensorflow_federated.python.core.impl.executors.federated_resolving_strategy import FederatedResolvingStrategy
 from tensorflow_federated.python.core.impl.executors.federating_executor import FederatingExecutor
 from tensorflow_federated.python.core.impl.executors.federating_executor import FederatingStrategy
 from tensorflow_federated.python.core.impl.executors.ingestable_base import Ingestable
+from tensorflow_federated.python.core.impl.executors.memoizing_executor import MemoizationCache
+from tensorflow_federated.python.core.impl.executors.memoizing_executor import MemoizingExecutor
 from tensorflow_federated.python.core.impl.executors.reference_resolving_executor import ReferenceResolvingExecutor
 from tensorflow_federated.python.core.impl.executors.remote_executor import RemoteExecutor
 from tensorflow_federated.python.core.impl.executors.thread_delegating_executor import ThreadDelegatingExecutor
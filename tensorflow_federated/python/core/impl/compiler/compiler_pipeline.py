@@ -19,11 +19,20 @@
 """A pipeline that reduces computations into an executable form."""
 
 import functools
+import hashlib
+import os
+import os.path
+import tempfile
+from typing import Any, Callable, Optional
 
-from typing import Callable, Any
+from absl import logging
 
+from tensorflow_federated.proto.v0 import computation_pb2 as pb
 from tensorflow_federated.python.common_libs import py_typecheck
 from tensorflow_federated.python.core.api import computation_base
+from tensorflow_federated.python.core.impl.computation import computation_impl
+from tensorflow_federated.python.core.impl.context_stack import context_stack_impl
+from tensorflow_federated.version import __version__ as tff_version
 
 
 class CompilerPipeline(object):
@@ -40,16 +49,96 @@ class CompilerPipeline(object):
   backend takes the form of an instance of `tff.framework.Context`, which would
   be initialized with a `CompilerPipeline` whose `compilation_fn` accepts
   `tff.Computations` and returns MapReduceForms.
+
+  Artifacts are always cached in memory. If a `cache_dir` is given, compiling
+  a `ConcreteComputation` into a `ConcreteComputation` is additionally cached
+  on disk, keyed by the contents of the computation, the `compiler_config` and
+  the version of TFF, so that the compiled computation can be reused across
+  processes.
   """
 
-  def __init__(self, compilation_fn: Callable[[computation_base.Computation],
-                                              Any]):
+  def __init__(self,
+               compilation_fn: Callable[[computation_base.Computation], Any],
+               cache_dir: Optional[str] = None,
+               compiler_config: str = ''):
+    """Creates the pipeline.
+
+    Args:
+      compilation_fn: The function compiling computations.
+      cache_dir: An optional directory in which to persist compiled
+        computations.
+      compiler_config: A string identifying the configuration of
+        `compilation_fn`, which must differ between pipelines sharing a
+        `cache_dir` whose `compilation_fn`s produce different artifacts.
+    """
     py_typecheck.check_callable(compilation_fn)
+    if cache_dir is not None:
+      py_typecheck.check_type(cache_dir, str)
+    py_typecheck.check_type(compiler_config, str)
     self._compilation_fn = compilation_fn
+    self._cache_dir = cache_dir
+    self._compiler_config = compiler_config
+
+  def _cache_path(self, proto: pb.Computation) -> str:
+    key = hashlib.sha256()
+    for part in [
+        tff_version.encode(), self._compiler_config.encode(),
+        proto.SerializeToString(deterministic=True)
+    ]:
+      # Length-prefixing the parts makes the key unambiguous.
+      key.update(len(part).to_bytes(8, 'little'))
+      key.update(part)
+    # Entries of each version live in their own directory, so that entries of
+    # older versions can be pruned as a whole.
+    return os.path.join(self._cache_dir, tff_version, f'{key.hexdigest()}.pb')
+
+  def _read_cache(self, path: str) -> Optional[pb.Computation]:
+    try:
+      with open(path, 'rb') as f:
+        return pb.Computation.FromString(f.read())
+    except FileNotFoundError:
+      return None
+    except Exception as e:  # pylint: disable=broad-except
+      logging.warning('Ignoring unreadable compilation cache entry %s: %s',
+                      path, e)
+      return None
+
+  def _write_cache(self, path: str, proto: pb.Computation):
+    directory = os.path.dirname(path)
+    try:
+      os.makedirs(directory, exist_ok=True)
+      # Writing to a temporary file first ensures concurrent readers never
+      # observe a partially written entry.
+      fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+      with os.fdopen(fd, 'wb') as f:
+        f.write(proto.SerializeToString())
+      os.replace(tmp_path, path)
+    except OSError as e:
+      logging.warning('Failed to write compilation cache entry %s: %s', path,
+                      e)
+
+  def _compile_with_disk_cache(
+      self, computation_to_compile: computation_impl.ConcreteComputation):
+    """Compiles `computation_to_compile`, reusing compilations on disk."""
+    path = self._cache_path(
+        computation_impl.ConcreteComputation.get_proto(computation_to_compile))
+    cached_proto = self._read_cache(path)
+    if cached_proto is not None:
+      logging.debug('Loaded compiled computation from %s.', path)
+      return computation_impl.ConcreteComputation(
+          cached_proto, context_stack_impl.context_stack)
+    compiled = self._compilation_fn(computation_to_compile)
+    if isinstance(compiled, computation_impl.ConcreteComputation):
+      compiled_proto = computation_impl.ConcreteComputation.get_proto(compiled)
+      self._write_cache(path, compiled_proto)
+    return compiled
 
   @functools.lru_cache()
   def compile(self, computation_to_compile: computation_base.Computation):
     """Generates executable for `computation_to_compile`."""
     py_typecheck.check_type(computation_to_compile,
                             computation_base.Computation)
+    if self._cache_dir is not None and isinstance(
+        computation_to_compile, computation_impl.ConcreteComputation):
+      return self._compile_with_disk_cache(computation_to_compile)
     return self._compilation_fn(computation_to_compile)
@@ -12,9 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+
+import tensorflow as tf
+
 from tensorflow_federated.python.core.api import computation_base
+from tensorflow_federated.python.core.api import computations
 from tensorflow_federated.python.core.api import test_case
 from tensorflow_federated.python.core.impl.compiler import compiler_pipeline
+from tensorflow_federated.python.core.impl.computation import computation_impl
 
 
 class CompilerPipelineTest(test_case.TestCase):
@@ -41,6 +47,74 @@ class CompilerPipelineTest(test_case.TestCase):
 
     # TODO(b/113123410): Expand the test with more structural invariants.
 
+  def _create_counting_compilation_fn(self):
+    calls = []
+
+    def compilation_fn(comp):
+      calls.append(comp)
+      return comp
+
+    return compilation_fn, calls
+
+  def test_compile_reuses_compilation_from_disk_across_pipelines(self):
+
+    @computations.tf_computation
+    def comp():
+      return tf.constant(10)
+
+    cache_dir = self.create_tempdir().full_path
+    compilation_fn, calls = self._create_counting_compilation_fn()
+    first_pipeline = compiler_pipeline.CompilerPipeline(
+        compilation_fn, cache_dir=cache_dir)
+    second_pipeline = compiler_pipeline.CompilerPipeline(
+        compilation_fn, cache_dir=cache_dir)
+
+    first_compiled = first_pipeline.compile(comp)
+    second_compiled = second_pipeline.compile(comp)
+
+    self.assertLen(calls, 1)
+    self.assertEqual(
+        computation_impl.ConcreteComputation.get_proto(second_compiled),
+        computation_impl.ConcreteComputation.get_proto(first_compiled))
+
+  def test_compile_does_not_share_compilations_across_configs(self):
+
+    @computations.tf_computation
+    def comp():
+      return tf.constant(10)
+
+    cache_dir = self.create_tempdir().full_path
+    compilation_fn, calls = self._create_counting_compilation_fn()
+    first_pipeline = compiler_pipeline.CompilerPipeline(
+        compilation_fn, cache_dir=cache_dir, compiler_config='a')
+    second_pipeline = compiler_pipeline.CompilerPipeline(
+        compilation_fn, cache_dir=cache_dir, compiler_config='b')
+
+    first_pipeline.compile(comp)
+    second_pipeline.compile(comp)
+
+    self.assertLen(calls, 2)
+
+  def test_compile_recovers_from_corrupt_cache_entry(self):
+
+    @computations.tf_computation
+    def comp():
+      return tf.constant(10)
+
+    cache_dir = self.create_tempdir().full_path
+    compilation_fn, calls = self._create_counting_compilation_fn()
+    compiler_pipeline.CompilerPipeline(
+        compilation_fn, cache_dir=cache_dir).compile(comp)
+    for root, _, files in os.walk(cache_dir):
+      for name in files:
+        with open(os.path.join(root, name), 'wb') as f:
+          f.write(b'not a computation')
+
+    compiler_pipeline.CompilerPipeline(
+        compilation_fn, cache_dir=cache_dir).compile(comp)
+
+    self.assertLen(calls, 2)
+
 
 if __name__ == '__main__':
   test_case.main()
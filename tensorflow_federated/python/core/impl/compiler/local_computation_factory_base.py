@@ -19,7 +19,7 @@
 """Defines the interface for factories of framework-specific computations."""
 
 import abc
-from typing import Tuple
+from typing import Optional, Tuple
 
 from tensorflow_federated.proto.v0 import computation_pb2 as pb
 from tensorflow_federated.python.core.impl.types import computation_types
@@ -134,3 +134,78 @@ class LocalComputationFactory(metaclass=abc.ABCMeta):
       element representing the formal type of that computation.
     """
     raise NotImplementedError
+
+  @abc.abstractmethod
+  def create_stacked_sum_operator(
+      self, operand_type: computation_types.Type,
+      count: int) -> Optional[ComputationProtoAndType]:
+    """Creates a TFF computation summing `count` values in a single call.
+
+    The returned computation has the type signature `(<T,...,T> -> T)`, where
+    `T` is `operand_type` and the parameter has `count` elements. Each tensor in
+    `T` is summed across all of the elements of the parameter at once.
+
+    Args:
+      operand_type: A `computation_types.Type` of the values to sum; must
+        contain only named tuples and tensor types.
+      count: The number of values to sum; must be positive.
+
+    Returns:
+      A tuple `(pb.Computation, computation_types.Type)` with the first element
+      being a TFF computation with semantics as described above, and the second
+      element representing the formal type of that computation, or `None` if
+      this factory does not construct stacked operators, in which case callers
+      sum with `create_plus_operator` instead.
+    """
+    raise NotImplementedError
+
+  @abc.abstractmethod
+  def create_stacked_mean_operator(
+      self, operand_type: computation_types.Type,
+      count: int) -> Optional[ComputationProtoAndType]:
+    """Creates a TFF computation averaging `count` values in a single call.
+
+    The returned computation has the type signature `(<T,...,T> -> T)`, where
+    `T` is `operand_type` and the parameter has `count` elements. Each tensor in
+    `T` is averaged across all of the elements of the parameter at once.
+
+    Args:
+      operand_type: A `computation_types.Type` of the values to average; must
+        contain only named tuples and floating point tensor types.
+      count: The number of values to average; must be positive.
+
+    Returns:
+      A tuple `(pb.Computation, computation_types.Type)` with the first element
+      being a TFF computation with semantics as described above, and the second
+      element representing the formal type of that computation, or `None` if
+      this factory does not construct stacked operators, in which case callers
+      average with `create_plus_operator` and
+      `create_multiply_operator` instead.
+    """
+    raise NotImplementedError
+
+  @abc.abstractmethod
+  def create_batched_select_operator(
+      self, select_fn: pb.Computation, select_fn_type: computation_types.Type
+  ) -> Optional[ComputationProtoAndType]:
+    """Creates a TFF computation applying `select_fn` to many keys at once.
+
+    The returned computation has the type signature `(<S,int32[?]> -> U)`,
+    where `select_fn` is of type `(<S,int32> -> T)`, and `U` is `T` with a
+    leading dimension added to each of its tensors. Slice `i` of the result is
+    the result of `select_fn` applied to the `i`-th key. Since the number of
+    keys is not part of the type, the computation can be reused for any number
+    of keys.
+
+    Args:
+      select_fn: The `pb.Computation` selecting a single key from a value.
+      select_fn_type: The `computation_types.FunctionType` of `select_fn`.
+
+    Returns:
+      A tuple `(pb.Computation, computation_types.Type)` with the first element
+      being a TFF computation with semantics as described above, and the second
+      element representing the formal type of that computation, or `None` if
+      this factory cannot batch `select_fn`, in which case callers apply
+      `select_fn` to each key separately.
+    """
+    raise NotImplementedError
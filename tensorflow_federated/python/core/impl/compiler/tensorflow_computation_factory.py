@@ -87,6 +87,23 @@ class TensorFlowComputationFactory(
   ) -> ComputationProtoAndType:
     return create_indexing_operator(operand_type, index_type)
 
+  def create_stacked_sum_operator(
+      self, operand_type: computation_types.Type,
+      count: int) -> ComputationProtoAndType:
+    return create_stacked_reduce_operator(tf.reduce_sum, operand_type, count)
+
+  def create_stacked_mean_operator(
+      self, operand_type: computation_types.Type,
+      count: int) -> ComputationProtoAndType:
+    return create_stacked_reduce_operator(tf.reduce_mean, operand_type, count)
+
+  def create_batched_select_operator(
+      self, select_fn: pb.Computation, select_fn_type: computation_types.Type
+  ) -> Optional[ComputationProtoAndType]:
+    if not is_batchable_select_fn(select_fn, select_fn_type):
+      return None
+    return create_batched_select_operator(select_fn, select_fn_type)
+
 
 def _tensorflow_comp(
     tensorflow_proto: pb.TensorFlow,
@@ -424,6 +441,134 @@ def create_indexing_operator(
   return _tensorflow_comp(tensorflow, type_signature)
 
 
+def create_stacked_reduce_operator(
+    reduction, operand_type: computation_types.Type,
+    count: int) -> ComputationProtoAndType:
+  """Returns a tensorflow computation reducing `count` values at once.
+
+  The returned computation has the type signature `(<T,...,T> -> T)`, where `T`
+  is `operand_type` and the parameter has `count` elements. The corresponding
+  tensors of all elements are stacked along a new leading axis, which is then
+  reduced away with `reduction`. This computes the reduction of all `count`
+  values in a single call, rather than through `count - 1` calls of a binary
+  operator.
+
+  Args:
+    reduction: A callable taking a tensor and an `axis` keyword argument, such
+      as `tf.reduce_sum` or `tf.reduce_mean`.
+    operand_type: A `computation_types.Type` of the values to reduce; must
+      contain only named tuples and tensor types.
+    count: The number of values to reduce; must be positive.
+
+  Raises:
+    TypeError: If the constraints of `operand_type` are violated or `reduction`
+      is not callable.
+    ValueError: If `count` is not positive.
+  """
+  if (operand_type is None or
+      not type_analysis.is_generic_op_compatible_type(operand_type)):
+    raise TypeError(
+        '`operand_type` contains a type other than '
+        '`computation_types.TensorType` and `computation_types.StructType`; '
+        f'this is disallowed in the generic operators. Got: {operand_type} ')
+  py_typecheck.check_callable(reduction)
+  py_typecheck.check_type(count, int)
+  if count < 1:
+    raise ValueError(f'Expected a positive `count`, found {count}.')
+  parameter_type = computation_types.StructType([(None, operand_type)] * count)
+
+  def _reduce_stacked(*tensors):
+    return reduction(tf.stack(tensors), axis=0)
+
+  def _reduce(operands):
+    return structure.map_structure(_reduce_stacked, *operands)
+
+  return create_computation_for_py_fn(_reduce, parameter_type)
+
+
+def is_batchable_select_fn(select_fn: pb.Computation,
+                           select_fn_type: computation_types.Type) -> bool:
+  """Returns whether `create_batched_select_operator` supports `select_fn`.
+
+  A `select_fn` can be batched if it is a TensorFlow computation without an
+  initialization op, whose value parameter is a structure of tensors and whose
+  result is a structure of tensors of fully defined shapes, so that the results
+  for all keys can be stacked.
+
+  Args:
+    select_fn: A `pb.Computation` selecting a single key.
+    select_fn_type: The `computation_types.FunctionType` of `select_fn`.
+  """
+  if (select_fn.WhichOneof('computation') != 'tensorflow' or
+      select_fn.tensorflow.initialize_op):
+    return False
+  if (not select_fn_type.parameter.is_struct() or
+      len(select_fn_type.parameter) != 2):
+    return False
+  if not type_analysis.is_structure_of_tensors(select_fn_type.parameter[0]):
+    return False
+  result_type = select_fn_type.result
+  return type_analysis.is_structure_of_tensors(result_type) and all(
+      t.shape.is_fully_defined() for t in structure.flatten(result_type))
+
+
+def create_batched_select_operator(
+    select_fn: pb.Computation,
+    select_fn_type: computation_types.Type) -> ComputationProtoAndType:
+  """Returns a tensorflow computation applying `select_fn` to a batch of keys.
+
+  The returned computation has the type signature `(<S,int32[?]> -> U)`, where
+  `select_fn` is of type `(<S,int32> -> T)`, and `U` is `T` with a leading
+  dimension added to each of its tensors. The body of `select_fn` is stamped
+  into the graph once and mapped over the keys with `tf.map_fn`, so the
+  computation does not depend on the number of keys.
+
+  Args:
+    select_fn: A TensorFlow `pb.Computation` selecting a single key.
+    select_fn_type: The `computation_types.FunctionType` of `select_fn`.
+
+  Raises:
+    TypeError: If the constraints of `select_fn_type` are violated, i.e. if
+      `is_batchable_select_fn` returns `False`.
+  """
+  py_typecheck.check_type(select_fn, pb.Computation)
+  py_typecheck.check_type(select_fn_type, computation_types.FunctionType)
+  if not is_batchable_select_fn(select_fn, select_fn_type):
+    raise TypeError(
+        'Expected a TensorFlow `select_fn` taking a value and a key, and '
+        'returning tensors of fully defined shapes; found a `select_fn` of '
+        f'type {select_fn_type}.')
+  value_type = select_fn_type.parameter[0]
+  result_type = select_fn_type.result
+  flat_result_specs = [
+      tf.TensorSpec(t.shape, t.dtype) for t in structure.flatten(result_type)
+  ]
+  parameter_type = computation_types.StructType([
+      (None, value_type),
+      (None, computation_types.TensorType(tf.int32, [None])),
+  ])
+
+  def _select(arg):
+    value, keys = arg
+    flat_value = structure.flatten(value)
+
+    def _select_single_key(key):
+      graph = tf.compat.v1.get_default_graph()
+      # The value is captured into the graph of the loop body.
+      select_value = structure.pack_sequence_as(
+          value_type, [tf.identity(t) for t in flat_value])
+      select_arg = structure.Struct([(None, select_value), (None, key)])
+      _, result = tensorflow_utils.deserialize_and_call_tf_computation(
+          select_fn, select_arg, graph)
+      return structure.flatten(result)
+
+    flat_selected = tf.map_fn(
+        _select_single_key, keys, fn_output_signature=flat_result_specs)
+    return structure.pack_sequence_as(result_type, flat_selected)
+
+  return create_computation_for_py_fn(_select, parameter_type)
+
+
 def create_empty_tuple() -> ComputationProtoAndType:
   """Returns a tensorflow computation returning an empty tuple.
 
@@ -442,6 +442,124 @@ class CreateReplicateInputTest(parameterized.TestCase):
           type_signature, count)
 
 
+class CreateStackedReduceOperatorTest(parameterized.TestCase, tf.test.TestCase):
+
+  @parameterized.named_parameters(
+      ('sum_int', tf.reduce_sum, _TensorType(tf.int32), [1, 2, 3], 6),
+      ('sum_float', tf.reduce_sum, _TensorType(tf.float32), [1.0, 2.0, 3.0],
+       6.0),
+      ('sum_single', tf.reduce_sum, _TensorType(tf.float32), [1.0], 1.0),
+      ('mean_float', tf.reduce_mean, _TensorType(tf.float32), [1.0, 2.0, 6.0],
+       3.0),
+      ('sum_named_tuple', tf.reduce_sum,
+       _StructType([('a', tf.int32), ('b', tf.float32)]),
+       [structure.Struct([('a', 1), ('b', 2.0)]),
+        structure.Struct([('a', 3), ('b', 4.0)])],
+       structure.Struct([('a', 4), ('b', 6.0)])),
+  )
+  def test_returns_computation(self, reduction, operand_type, operands,
+                               expected_result):
+    proto, _ = tensorflow_computation_factory.create_stacked_reduce_operator(
+        reduction, operand_type, len(operands))
+
+    self.assertIsInstance(proto, pb.Computation)
+    actual_type = type_serialization.deserialize_type(proto.type)
+    expected_type = computation_types.FunctionType(
+        [operand_type] * len(operands), operand_type)
+    expected_type.check_assignable_from(actual_type)
+    arg = structure.Struct([(None, operand) for operand in operands])
+    actual_result = test_utils.run_tensorflow(proto, arg)
+    self.assertEqual(actual_result, expected_result)
+
+  def test_returns_computation_with_shaped_tensors(self):
+    operand_type = _TensorType(tf.float32, [2])
+    proto, _ = tensorflow_computation_factory.create_stacked_reduce_operator(
+        tf.reduce_sum, operand_type, 2)
+
+    arg = structure.Struct([(None, np.array([1.0, 2.0], np.float32)),
+                            (None, np.array([3.0, 4.0], np.float32))])
+    actual_result = test_utils.run_tensorflow(proto, arg)
+    self.assertAllEqual(actual_result, [4.0, 6.0])
+
+  @parameterized.named_parameters(
+      ('none_type', None, 3, TypeError),
+      ('federated_type', computation_types.at_server(tf.int32), 3, TypeError),
+      ('sequence_type', computation_types.SequenceType(tf.int32), 3, TypeError),
+      ('zero_count', _TensorType(tf.int32), 0, ValueError),
+  )
+  def test_raises(self, operand_type, count, error_type):
+    with self.assertRaises(error_type):
+      tensorflow_computation_factory.create_stacked_reduce_operator(
+          tf.reduce_sum, operand_type, count)
+
+
+class CreateBatchedSelectOperatorTest(parameterized.TestCase):
+
+  def _create_select_fn(self):
+    value_type = _TensorType(tf.int32, [5])
+    select_fn_type = computation_types.FunctionType(
+        [value_type, tf.int32], tf.int32)
+    select_fn, _ = tensorflow_computation_factory.create_computation_for_py_fn(
+        lambda arg: tf.gather(arg[0], arg[1]), select_fn_type.parameter)
+    return select_fn, select_fn_type
+
+  @parameterized.named_parameters(
+      ('no_keys', []),
+      ('one_key', [3]),
+      ('many_keys', [4, 0, 4, 2]),
+  )
+  def test_returns_computation(self, keys):
+    select_fn, select_fn_type = self._create_select_fn()
+
+    proto, _ = tensorflow_computation_factory.create_batched_select_operator(
+        select_fn, select_fn_type)
+
+    self.assertIsInstance(proto, pb.Computation)
+    actual_type = type_serialization.deserialize_type(proto.type)
+    expected_type = computation_types.FunctionType(
+        [select_fn_type.parameter[0],
+         _TensorType(tf.int32, [None])], _TensorType(tf.int32, [None]))
+    expected_type.check_assignable_from(actual_type)
+    value = np.array([10, 11, 12, 13, 14], np.int32)
+    arg = structure.Struct([(None, value), (None, np.array(keys, np.int32))])
+    actual_result = test_utils.run_tensorflow(proto, arg)
+    self.assertEqual(list(actual_result), [10 + key for key in keys])
+
+  def test_reuses_computation_for_any_number_of_keys(self):
+    select_fn, select_fn_type = self._create_select_fn()
+    proto, _ = tensorflow_computation_factory.create_batched_select_operator(
+        select_fn, select_fn_type)
+
+    value = np.array([10, 11, 12, 13, 14], np.int32)
+    for keys in [[1], [4, 0, 4, 2, 3, 1]]:
+      arg = structure.Struct([(None, value), (None, np.array(keys, np.int32))])
+      actual_result = test_utils.run_tensorflow(proto, arg)
+      self.assertEqual(list(actual_result), [10 + key for key in keys])
+
+  def test_raises_with_non_struct_parameter(self):
+    select_fn, _ = tensorflow_computation_factory.create_identity(
+        _TensorType(tf.int32))
+    select_fn_type = computation_types.FunctionType(tf.int32, tf.int32)
+
+    self.assertFalse(
+        tensorflow_computation_factory.is_batchable_select_fn(
+            select_fn, select_fn_type))
+    with self.assertRaises(TypeError):
+      tensorflow_computation_factory.create_batched_select_operator(
+          select_fn, select_fn_type)
+
+  def test_factory_returns_none_with_result_of_undefined_shape(self):
+    value_type = _TensorType(tf.int32, [5])
+    select_fn_type = computation_types.FunctionType(
+        [value_type, tf.int32], _TensorType(tf.int32, [None]))
+    select_fn, _ = tensorflow_computation_factory.create_computation_for_py_fn(
+        lambda arg: arg[0][:arg[1]], select_fn_type.parameter)
+    factory = tensorflow_computation_factory.TensorFlowComputationFactory()
+
+    self.assertIsNone(
+        factory.create_batched_select_operator(select_fn, select_fn_type))
+
+
 class CreateComputationForPyFnTest(parameterized.TestCase):
 
   # pyformat: disable
@@ -241,19 +241,29 @@ class AsyncExecutionContext(SingleCardinalityAsyncContext):
   def __init__(self,
                executor_fn: executor_factory.ExecutorFactory,
                compiler_fn: Optional[Callable[[computation_base.Computation],
-                                              Any]] = None):
+                                              Any]] = None,
+               compiler_cache_dir: Optional[str] = None,
+               compiler_config: str = ''):
     """Initializes an execution context.
 
     Args:
       executor_fn: Instance of `executor_factory.ExecutorFactory`.
       compiler_fn: A Python function that will be used to compile a computation.
+      compiler_cache_dir: An optional directory in which compiled computations
+        are persisted across processes. See `compiler_pipeline.CompilerPipeline`
+        for details.
+      compiler_config: A string identifying the configuration of `compiler_fn`
+        in `compiler_cache_dir`.
     """
     super().__init__()
     py_typecheck.check_type(executor_fn, executor_factory.ExecutorFactory)
     self._executor_factory = executor_fn
     if compiler_fn is not None:
       py_typecheck.check_callable(compiler_fn)
-      self._compiler_pipeline = compiler_pipeline.CompilerPipeline(compiler_fn)
+      self._compiler_pipeline = compiler_pipeline.CompilerPipeline(
+          compiler_fn,
+          cache_dir=compiler_cache_dir,
+          compiler_config=compiler_config)
     else:
       self._compiler_pipeline = None
 
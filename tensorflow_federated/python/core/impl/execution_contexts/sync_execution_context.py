@@ -37,17 +37,27 @@ class ExecutionContext(context_base.Context):
   def __init__(self,
                executor_fn: executor_factory.ExecutorFactory,
                compiler_fn: Optional[Callable[[computation_base.Computation],
-                                              Any]] = None):
+                                              Any]] = None,
+               compiler_cache_dir: Optional[str] = None,
+               compiler_config: str = ''):
     """Initializes a synchronous execution context which retries invocations.
 
     Args:
       executor_fn: Instance of `executor_factory.ExecutorFactory`.
       compiler_fn: A Python function that will be used to compile a computation.
+      compiler_cache_dir: An optional directory in which compiled computations
+        are persisted across processes. See `compiler_pipeline.CompilerPipeline`
+        for details.
+      compiler_config: A string identifying the configuration of `compiler_fn`
+        in `compiler_cache_dir`.
     """
     py_typecheck.check_type(executor_fn, executor_factory.ExecutorFactory)
     self._executor_factory = executor_fn
     self._async_context = async_execution_context.AsyncExecutionContext(
-        executor_fn=executor_fn, compiler_fn=compiler_fn)
+        executor_fn=executor_fn,
+        compiler_fn=compiler_fn,
+        compiler_cache_dir=compiler_cache_dir,
+        compiler_config=compiler_config)
 
     self._event_loop = asyncio.new_event_loop()
     self._event_loop.set_task_factory(
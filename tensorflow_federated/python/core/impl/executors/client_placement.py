@@ -0,0 +1,265 @@
+# Copyright 2021, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Policies deciding how many clients each remote worker hosts."""
+
+import abc
+import math
+import threading
+from typing import Dict, List, Mapping, Sequence
+
+from tensorflow_federated.python.common_libs import py_typecheck
+
+
+def place_clients(num_clients: int, weights: Sequence[float]) -> List[int]:
+  """Splits `num_clients` across workers in proportion to `weights`.
+
+  Each worker is assigned the integer part of its proportional share, and the
+  clients left over go to the workers with the largest fractional parts. Ties
+  are broken in favor of later workers, so that equal weights reproduce an even
+  split in which the last workers host the remainder.
+
+  Args:
+    num_clients: The non-negative number of clients to place.
+    weights: The non-negative relative capacity of each worker, with a positive
+      sum.
+
+  Returns:
+    A list with the number of clients placed on each worker, in the order of
+    `weights`, which sums to `num_clients`.
+
+  Raises:
+    ValueError: If `num_clients` or any of `weights` is negative, or if the
+      weights sum to zero.
+  """
+  py_typecheck.check_type(num_clients, int)
+  if num_clients < 0:
+    raise ValueError(
+        f'Expected a non-negative `num_clients`, found {num_clients}.')
+  if any(w < 0 for w in weights):
+    raise ValueError(f'Expected non-negative weights, found {weights}.')
+  total_weight = sum(weights)
+  if total_weight <= 0:
+    raise ValueError(f'Expected weights with a positive sum, found {weights}.')
+  shares = [num_clients * w / total_weight for w in weights]
+  placement = [int(math.floor(s)) for s in shares]
+  remaining_clients = num_clients - sum(placement)
+  by_remainder = sorted(
+      range(len(weights)),
+      key=lambda i: (shares[i] - placement[i], i),
+      reverse=True)
+  for index in by_remainder[:remaining_clients]:
+    placement[index] += 1
+  return placement
+
+
+def reassign_clients(num_clients: int, weights: Mapping[int, float],
+                     previous_placement: Mapping[int, int]) -> Dict[int, int]:
+  """Places `num_clients` anew, moving as few clients as possible.
+
+  Used when workers join or leave the pool: each worker keeps the clients it
+  hosted in `previous_placement` as long as this is within one client of its
+  proportional share, so only the workers whose share changed, such as those
+  joining and those absorbing the clients of departed workers, have to be
+  reconfigured.
+
+  Args:
+    num_clients: The non-negative number of clients to place.
+    weights: A mapping from the index of each ready worker to its non-negative
+      relative capacity, with a positive sum.
+    previous_placement: A mapping from worker indices to the number of clients
+      they hosted so far. Workers missing from `weights` have left the pool,
+      and workers missing from `previous_placement` have joined it.
+
+  Returns:
+    A mapping from each of the workers in `weights` to the number of clients it
+    hosts, which sums to `num_clients`.
+
+  Raises:
+    ValueError: If `num_clients` or any of `weights` is negative, or if the
+      weights sum to zero.
+  """
+  py_typecheck.check_type(num_clients, int)
+  if num_clients < 0:
+    raise ValueError(
+        f'Expected a non-negative `num_clients`, found {num_clients}.')
+  if any(w < 0 for w in weights.values()):
+    raise ValueError(f'Expected non-negative weights, found {weights}.')
+  total_weight = sum(weights.values())
+  if total_weight <= 0:
+    raise ValueError(f'Expected weights with a positive sum, found {weights}.')
+  shares = {w: num_clients * weight / total_weight
+            for w, weight in weights.items()}
+  placement = {}
+  for w, share in shares.items():
+    lower, upper = int(math.floor(share)), int(math.ceil(share))
+    placement[w] = min(max(previous_placement.get(w, 0), lower), upper)
+
+  def _moved(w):
+    return placement[w] != previous_placement.get(w)
+
+  # Workers which are reconfigured anyway are adjusted first. Then clients go
+  # to the workers with the largest fractional shares, and are taken from
+  # those with the smallest, breaking ties in favor of later workers.
+  remaining_clients = num_clients - sum(placement.values())
+  if remaining_clients > 0:
+    candidates = sorted((w for w in placement if placement[w] < shares[w]),
+                        key=lambda w: (_moved(w), shares[w] % 1, w),
+                        reverse=True)
+    for w in candidates[:remaining_clients]:
+      placement[w] += 1
+  elif remaining_clients < 0:
+    candidates = sorted((w for w in placement if placement[w] > shares[w]),
+                        key=lambda w: (_moved(w), -(shares[w] % 1), w),
+                        reverse=True)
+    for w in candidates[:-remaining_clients]:
+      placement[w] -= 1
+  return placement
+
+
+class ClientPlacementPolicy(metaclass=abc.ABCMeta):
+  """Decides how many clients each remote worker hosts.
+
+  Workers are identified by their index in the list of channels passed to
+  `remote_executor_factory`. Each time the executor stack is configured, the
+  policy weighs the workers which are ready, and the clients are split across
+  them in proportion to these weights by `place_clients`.
+
+  Between rounds, the factory reports how long each worker took to compute its
+  share of the previous round through `record_round`, and asks the policy
+  whether the clients should be rebalanced through `should_rebalance`.
+  Rebalancing reconfigures all workers, which clears their state, so policies
+  should only request it when the expected gain is significant.
+  """
+
+  @abc.abstractmethod
+  def worker_weights(self, workers: Sequence[int]) -> List[float]:
+    """Returns the relative capacity of each of `workers`.
+
+    Args:
+      workers: The indices of the workers which are ready.
+
+    Returns:
+      A list of non-negative weights, one for each of `workers`, with a
+      positive sum.
+    """
+    raise NotImplementedError()
+
+  def record_round(self, worker: int, num_clients: int, busy_seconds: float):
+    """Records that `worker` took `busy_seconds` to compute `num_clients`."""
+    del worker, num_clients, busy_seconds  # Unused by default.
+
+  def should_rebalance(self, placement: Mapping[int, int]) -> bool:
+    """Whether clients should be placed anew, given the current `placement`.
+
+    Args:
+      placement: A mapping from the index of each ready worker to the number of
+        clients it currently hosts.
+
+    Returns:
+      A boolean.
+    """
+    del placement  # Unused by default.
+    return False
+
+
+class CapacityClientPlacement(ClientPlacementPolicy):
+  """Places clients in proportion to the declared capacity of each worker."""
+
+  def __init__(self, capacities: Sequence[float]):
+    """Creates a policy for workers with the given `capacities`.
+
+    Args:
+      capacities: The relative capacity of each worker, such as its number of
+        cores, in the order of the channels of the workers.
+
+    Raises:
+      ValueError: If any of `capacities` is not positive.
+    """
+    if any(c <= 0 for c in capacities):
+      raise ValueError(f'Expected positive capacities, found {capacities}.')
+    self._capacities = list(capacities)
+
+  def worker_weights(self, workers: Sequence[int]) -> List[float]:
+    return [self._capacities[w] for w in workers]
+
+
+class ThroughputClientPlacement(ClientPlacementPolicy):
+  """Places clients in proportion to the measured throughput of each worker.
+
+  The throughput of a worker is the number of clients it computes per second,
+  estimated as an exponential moving average over the rounds it took part in.
+  Workers which have not been measured yet are assumed to match the average
+  measured worker, so the first round is split evenly.
+
+  Since rebalancing clears the state of all workers, clients are only placed
+  anew once the placement implied by the current estimates moves more than
+  `rebalance_tolerance` of the clients from one worker to another.
+  """
+
+  def __init__(self, smoothing: float = 0.5, rebalance_tolerance: float = 0.1):
+    """Creates a policy without measurements.
+
+    Args:
+      smoothing: The weight of the latest round in the moving average of the
+        throughput of each worker, in `(0, 1]`.
+      rebalance_tolerance: The fraction of the clients, in `[0, 1]`, which must
+        move before a rebalance is requested.
+
+    Raises:
+      ValueError: If `smoothing` or `rebalance_tolerance` is out of range.
+    """
+    if not 0 < smoothing <= 1:
+      raise ValueError(f'Expected `smoothing` in (0, 1], found {smoothing}.')
+    if not 0 <= rebalance_tolerance <= 1:
+      raise ValueError('Expected `rebalance_tolerance` in [0, 1], found '
+                       f'{rebalance_tolerance}.')
+    self._smoothing = smoothing
+    self._rebalance_tolerance = rebalance_tolerance
+    self._lock = threading.Lock()
+    self._throughputs = {}
+
+  @property
+  def throughputs(self) -> Dict[int, float]:
+    """The estimated clients per second of each measured worker."""
+    with self._lock:
+      return dict(self._throughputs)
+
+  def worker_weights(self, workers: Sequence[int]) -> List[float]:
+    with self._lock:
+      measured = [
+          self._throughputs[w] for w in workers if w in self._throughputs
+      ]
+      default = sum(measured) / len(measured) if measured else 1.0
+      return [self._throughputs.get(w, default) for w in workers]
+
+  def record_round(self, worker: int, num_clients: int, busy_seconds: float):
+    if num_clients <= 0 or busy_seconds <= 0:
+      return
+    throughput = num_clients / busy_seconds
+    with self._lock:
+      previous = self._throughputs.get(worker)
+      if previous is not None:
+        throughput = (
+            self._smoothing * throughput + (1 - self._smoothing) * previous)
+      self._throughputs[worker] = throughput
+
+  def should_rebalance(self, placement: Mapping[int, int]) -> bool:
+    num_clients = sum(placement.values())
+    if num_clients == 0:
+      return False
+    workers = list(placement)
+    proposed = place_clients(num_clients, self.worker_weights(workers))
+    moved_clients = sum(
+        max(0, n - placement[w]) for w, n in zip(workers, proposed))
+    return moved_clients > self._rebalance_tolerance * num_clients
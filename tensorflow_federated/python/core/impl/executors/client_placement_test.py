@@ -0,0 +1,129 @@
+# Copyright 2021, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from absl.testing import absltest
+from absl.testing import parameterized
+
+from tensorflow_federated.python.core.impl.executors import client_placement
+
+
+class PlaceClientsTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('even', 7, [1.0, 1.0, 1.0], [2, 2, 3]),
+      ('fewer_clients_than_workers', 1, [1.0, 1.0], [0, 1]),
+      ('proportional', 10, [1.0, 4.0], [2, 8]),
+      ('largest_remainder', 10, [1.0, 1.0, 2.0], [2, 3, 5]),
+      ('zero_weight', 5, [0.0, 1.0], [0, 5]),
+      ('no_clients', 0, [1.0, 2.0], [0, 0]),
+  )
+  def test_places_clients(self, num_clients, weights, expected_placement):
+    self.assertEqual(
+        client_placement.place_clients(num_clients, weights),
+        expected_placement)
+
+  def test_raises_value_error_with_negative_num_clients(self):
+    with self.assertRaises(ValueError):
+      client_placement.place_clients(-1, [1.0])
+
+  def test_raises_value_error_with_negative_weight(self):
+    with self.assertRaises(ValueError):
+      client_placement.place_clients(1, [1.0, -1.0])
+
+  def test_raises_value_error_with_zero_weights(self):
+    with self.assertRaises(ValueError):
+      client_placement.place_clients(1, [0.0, 0.0])
+
+
+class ReassignClientsTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('worker_joins', 12, {0: 1.0, 1: 1.0, 2: 1.0, 3: 1.0},
+       {0: 4, 1: 4, 2: 4}, {0: 3, 1: 3, 2: 3, 3: 3}),
+      ('worker_leaves', 10, {1: 1.0, 2: 1.0},
+       {0: 3, 1: 3, 2: 4}, {1: 5, 2: 5}),
+      ('worker_replaced', 10, {0: 1.0, 1: 1.0, 3: 1.0},
+       {0: 3, 1: 3, 2: 4}, {0: 3, 1: 3, 3: 4}),
+      ('within_one_of_share_kept', 9, {0: 1.0, 1: 1.0},
+       {0: 5, 1: 4}, {0: 5, 1: 4}),
+  )
+  def test_reassigns_clients(self, num_clients, weights, previous_placement,
+                             expected_placement):
+    self.assertEqual(
+        client_placement.reassign_clients(num_clients, weights,
+                                          previous_placement),
+        expected_placement)
+
+  def test_raises_value_error_with_zero_weights(self):
+    with self.assertRaises(ValueError):
+      client_placement.reassign_clients(5, {0: 0.0}, {0: 5})
+
+
+class CapacityClientPlacementTest(absltest.TestCase):
+
+  def test_weighs_workers_by_capacity(self):
+    policy = client_placement.CapacityClientPlacement([1.0, 2.0, 4.0])
+    self.assertEqual(policy.worker_weights([0, 2]), [1.0, 4.0])
+    self.assertFalse(policy.should_rebalance({0: 1, 2: 4}))
+
+  def test_raises_value_error_with_nonpositive_capacity(self):
+    with self.assertRaises(ValueError):
+      client_placement.CapacityClientPlacement([1.0, 0.0])
+
+
+class ThroughputClientPlacementTest(absltest.TestCase):
+
+  def test_weighs_unmeasured_workers_evenly(self):
+    policy = client_placement.ThroughputClientPlacement()
+    self.assertEqual(policy.worker_weights([0, 1]), [1.0, 1.0])
+
+  def test_weighs_workers_by_measured_throughput(self):
+    policy = client_placement.ThroughputClientPlacement()
+    policy.record_round(0, num_clients=10, busy_seconds=10.0)
+    policy.record_round(1, num_clients=10, busy_seconds=2.5)
+    self.assertEqual(policy.worker_weights([0, 1, 2]), [1.0, 4.0, 2.5])
+
+  def test_smooths_throughput_across_rounds(self):
+    policy = client_placement.ThroughputClientPlacement(smoothing=0.5)
+    policy.record_round(0, num_clients=10, busy_seconds=10.0)
+    policy.record_round(0, num_clients=10, busy_seconds=5.0)
+    self.assertEqual(policy.throughputs, {0: 1.5})
+
+  def test_ignores_rounds_without_work(self):
+    policy = client_placement.ThroughputClientPlacement()
+    policy.record_round(0, num_clients=0, busy_seconds=1.0)
+    policy.record_round(1, num_clients=1, busy_seconds=0.0)
+    self.assertEqual(policy.throughputs, {})
+
+  def test_rebalances_only_beyond_tolerance(self):
+    policy = client_placement.ThroughputClientPlacement(
+        smoothing=1.0, rebalance_tolerance=0.1)
+    policy.record_round(0, num_clients=10, busy_seconds=10.0)
+    policy.record_round(1, num_clients=10, busy_seconds=9.0)
+    self.assertFalse(policy.should_rebalance({0: 10, 1: 10}))
+    policy.record_round(1, num_clients=10, busy_seconds=2.5)
+    self.assertTrue(policy.should_rebalance({0: 10, 1: 10}))
+    self.assertFalse(policy.should_rebalance({0: 4, 1: 16}))
+
+  def test_raises_value_error_with_invalid_smoothing(self):
+    with self.assertRaises(ValueError):
+      client_placement.ThroughputClientPlacement(smoothing=0.0)
+
+  def test_raises_value_error_with_invalid_rebalance_tolerance(self):
+    with self.assertRaises(ValueError):
+      client_placement.ThroughputClientPlacement(rebalance_tolerance=2.0)
+
+
+if __name__ == '__main__':
+  absltest.main()
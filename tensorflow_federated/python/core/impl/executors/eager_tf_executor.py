@@ -18,11 +18,13 @@
 # information.
 """A simple executor that operates synchronously in eager TensorFlow mode."""
 
+import collections
+import hashlib
 import itertools
-from typing import Any, Iterable, MutableMapping, Optional
+import threading
+from typing import Any, Hashable, Iterable, MutableMapping, Optional
 
 from absl import logging
-import cachetools
 import tensorflow as tf
 
 from tensorflow_federated.proto.v0 import computation_pb2 as pb
@@ -43,8 +45,141 @@ from tensorflow_federated.python.core.impl.types import typed_object
 from tensorflow_federated.python.core.impl.utils import tensorflow_utils
 from tensorflow_federated.python.tensorflow_libs import graph_merge
 
-# Cache size here is simply heuristic, no formal analysis.
-_TF_FUNCTION_CACHE_SIZE = 100
+# Cache sizes here are simply heuristic, no formal analysis. The cache is shared
+# by all executors in the process, and the byte limit bounds the total size of
+# the serialized computations whose functions are cached, as a proxy for the
+# memory held by the imported graphs.
+_TF_FUNCTION_CACHE_SIZE = 1000
+_TF_FUNCTION_CACHE_MAX_BYTES = 1 << 30
+
+
+class TFFunctionCache(object):
+  """A thread-safe LRU cache of TensorFlow functions embedded by executors.
+
+  Importing the graph of a TensorFlow computation dominates the cost of
+  embedding it, so functions are cached across all of the executors that embed
+  the same computation, such as the leaf executors of all clients. Entries are
+  evicted in least-recently-used order once the cache holds more than
+  `max_size` entries, or once the computations of the cached entries together
+  exceed `max_bytes` serialized bytes.
+  """
+
+  def __init__(self, max_size: int, max_bytes: Optional[int] = None):
+    """Creates an empty cache.
+
+    Args:
+      max_size: The maximum number of cached functions; must be positive.
+      max_bytes: An optional maximum total size of the cached computations, in
+        serialized bytes; must be positive.
+
+    Raises:
+      ValueError: If `max_size` or `max_bytes` is not positive.
+    """
+    self._lock = threading.Lock()
+    self._entries = collections.OrderedDict()
+    self._size_bytes = 0
+    self._hits = 0
+    self._misses = 0
+    self._evictions = 0
+    self.resize(max_size, max_bytes)
+
+  @property
+  def max_size(self) -> int:
+    return self._max_size
+
+  @property
+  def max_bytes(self) -> Optional[int]:
+    return self._max_bytes
+
+  @property
+  def size_bytes(self) -> int:
+    """The total serialized size of the cached computations, in bytes."""
+    return self._size_bytes
+
+  @property
+  def hits(self) -> int:
+    return self._hits
+
+  @property
+  def misses(self) -> int:
+    return self._misses
+
+  @property
+  def evictions(self) -> int:
+    return self._evictions
+
+  def __len__(self) -> int:
+    return len(self._entries)
+
+  def resize(self, max_size: int, max_bytes: Optional[int] = None):
+    """Changes the limits of the cache, evicting entries as needed."""
+    py_typecheck.check_type(max_size, int)
+    if max_size < 1:
+      raise ValueError(f'Expected a positive `max_size`, found {max_size}.')
+    if max_bytes is not None:
+      py_typecheck.check_type(max_bytes, int)
+      if max_bytes < 1:
+        raise ValueError(
+            f'Expected a positive `max_bytes`, found {max_bytes}.')
+    with self._lock:
+      self._max_size = max_size
+      self._max_bytes = max_bytes
+      self._evict()
+
+  def get(self, key: Hashable, default: Any = None) -> Any:
+    """Returns the function cached under `key`, or `default` on a miss."""
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is None:
+        self._misses += 1
+        return default
+      self._hits += 1
+      self._entries.move_to_end(key)
+      return entry[0]
+
+  def put(self, key: Hashable, value: Any, size_bytes: int = 0):
+    """Caches `value` under `key`, weighed as `size_bytes` serialized bytes."""
+    with self._lock:
+      previous_entry = self._entries.pop(key, None)
+      if previous_entry is not None:
+        self._size_bytes -= previous_entry[1]
+      self._entries[key] = (value, size_bytes)
+      self._size_bytes += size_bytes
+      self._evict()
+
+  def __setitem__(self, key: Hashable, value: Any):
+    self.put(key, value)
+
+  def clear(self):
+    """Removes all entries, and resets the counters."""
+    with self._lock:
+      self._entries.clear()
+      self._size_bytes = 0
+      self._hits = 0
+      self._misses = 0
+      self._evictions = 0
+
+  def _evict(self):
+    # The most recently used entry is never evicted, even if it alone exceeds
+    # `max_bytes`, so that it is not imported repeatedly.
+    while len(self._entries) > 1 and (
+        len(self._entries) > self._max_size or
+        (self._max_bytes is not None and self._size_bytes > self._max_bytes)):
+      _, (_, size_bytes) = self._entries.popitem(last=False)
+      self._size_bytes -= size_bytes
+      self._evictions += 1
+
+
+_shared_tf_function_cache = TFFunctionCache(_TF_FUNCTION_CACHE_SIZE,
+                                            _TF_FUNCTION_CACHE_MAX_BYTES)
+
+
+def get_shared_tf_function_cache() -> TFFunctionCache:
+  """Returns the `TFFunctionCache` used by default by all `EagerTFExecutor`s.
+
+  The limits of the cache can be changed with `TFFunctionCache.resize`.
+  """
+  return _shared_tf_function_cache
 
 
 def _all_graph_def_nodes(
@@ -383,14 +518,19 @@ def _to_computation_internal_rep(*, value: pb.Computation,
                deterministic=True), device.name if device else None)
   else:
     logging.debug('Using hash of graph_def for cache key')
-    key = (value.SerializeToString(deterministic=True),
+    # Keyed by a digest, rather than the computation itself, so that long-lived
+    # caches do not hold on to a copy of every graph seen.
+    key = (hashlib.sha256(value.SerializeToString(deterministic=True)).digest(),
            type_serialization.serialize_type(type_spec).SerializeToString(
                deterministic=True), device.name if device else None)
   cached_fn = tf_function_cache.get(key)
   if cached_fn is not None:
     return cached_fn
   embedded_fn = embed_tensorflow_computation(value, type_spec, device)
-  tf_function_cache[key] = embedded_fn
+  if isinstance(tf_function_cache, TFFunctionCache):
+    tf_function_cache.put(key, embedded_fn, size_bytes=value.ByteSize())
+  else:
+    tf_function_cache[key] = embedded_fn
   return embedded_fn
 
 
@@ -610,7 +750,9 @@ class EagerTFExecutor(executor_base.Executor):
   other methods this executor exposes.
   """
 
-  def __init__(self, device=None):
+  def __init__(self,
+               device=None,
+               tf_function_cache: Optional[TFFunctionCache] = None):
     """Creates a new instance of an eager executor.
 
     Args:
@@ -618,6 +760,9 @@ class EagerTFExecutor(executor_base.Executor):
         schedule all of its operations to run on. For example, the list of
         logical devices can be obtained using
         `tf.config.list_logical_devices()`.
+      tf_function_cache: An optional `TFFunctionCache` of the TensorFlow
+        functions embedded by this executor. Defaults to the cache shared by all
+        executors in the process, see `get_shared_tf_function_cache`.
 
     Raises:
       RuntimeError: If not executing eagerly.
@@ -631,7 +776,11 @@ class EagerTFExecutor(executor_base.Executor):
       self._device = device
     else:
       self._device = None
-    self._tf_function_cache = cachetools.LRUCache(_TF_FUNCTION_CACHE_SIZE)
+    if tf_function_cache is None:
+      tf_function_cache = get_shared_tf_function_cache()
+    else:
+      py_typecheck.check_type(tf_function_cache, TFFunctionCache)
+    self._tf_function_cache = tf_function_cache
 
   @tracing.trace(span=True)
   async def create_value(self, value, type_spec=None):
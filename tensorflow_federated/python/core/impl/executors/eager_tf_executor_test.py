@@ -779,5 +779,106 @@ class EagerTFExecutorTest(test_case.TestCase, parameterized.TestCase):
                           [2, 5, 10])
 
 
+class TFFunctionCacheTest(test_case.TestCase):
+
+  def test_raises_with_nonpositive_max_size(self):
+    with self.assertRaises(ValueError):
+      eager_tf_executor.TFFunctionCache(0)
+
+  def test_raises_with_nonpositive_max_bytes(self):
+    with self.assertRaises(ValueError):
+      eager_tf_executor.TFFunctionCache(10, max_bytes=0)
+
+  def test_counts_hits_and_misses(self):
+    cache = eager_tf_executor.TFFunctionCache(10)
+
+    self.assertIsNone(cache.get('a'))
+    cache.put('a', 1)
+    self.assertEqual(cache.get('a'), 1)
+
+    self.assertEqual(cache.hits, 1)
+    self.assertEqual(cache.misses, 1)
+
+  def test_evicts_least_recently_used_beyond_max_size(self):
+    cache = eager_tf_executor.TFFunctionCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+
+    cache.put('c', 3)
+
+    self.assertLen(cache, 2)
+    self.assertIsNone(cache.get('b'))
+    self.assertEqual(cache.get('a'), 1)
+    self.assertEqual(cache.get('c'), 3)
+    self.assertEqual(cache.evictions, 1)
+
+  def test_evicts_least_recently_used_beyond_max_bytes(self):
+    cache = eager_tf_executor.TFFunctionCache(10, max_bytes=100)
+    cache.put('a', 1, size_bytes=60)
+    cache.put('b', 2, size_bytes=30)
+
+    cache.put('c', 3, size_bytes=30)
+
+    self.assertIsNone(cache.get('a'))
+    self.assertEqual(cache.size_bytes, 60)
+
+  def test_keeps_most_recent_entry_exceeding_max_bytes(self):
+    cache = eager_tf_executor.TFFunctionCache(10, max_bytes=100)
+
+    cache.put('a', 1, size_bytes=200)
+
+    self.assertEqual(cache.get('a'), 1)
+
+  def test_resize_evicts_entries(self):
+    cache = eager_tf_executor.TFFunctionCache(10)
+    for key in 'abcd':
+      cache.put(key, key)
+
+    cache.resize(2)
+
+    self.assertLen(cache, 2)
+    self.assertEqual(cache.get('d'), 'd')
+
+  def test_executors_share_embedded_functions(self):
+
+    @computations.tf_computation(tf.int32)
+    def comp(x):
+      return x + 1
+
+    cache = eager_tf_executor.TFFunctionCache(10)
+    executors = [
+        eager_tf_executor.EagerTFExecutor(tf_function_cache=cache)
+        for _ in range(3)
+    ]
+    loop = asyncio.get_event_loop()
+    for ex in executors:
+      fn = loop.run_until_complete(ex.create_value(comp))
+      arg = loop.run_until_complete(ex.create_value(1, tf.int32))
+      result = loop.run_until_complete(ex.create_call(fn, arg))
+      self.assertEqual(result.internal_representation, 2)
+
+    self.assertLen(cache, 1)
+    self.assertEqual(cache.misses, 1)
+    self.assertEqual(cache.hits, 2)
+    self.assertGreater(cache.size_bytes, 0)
+
+  def test_executors_default_to_shared_cache(self):
+
+    @computations.tf_computation(tf.int32)
+    def comp(x):
+      return x + 1
+
+    cache = eager_tf_executor.get_shared_tf_function_cache()
+    cache.clear()
+    loop = asyncio.get_event_loop()
+    for _ in range(2):
+      ex = eager_tf_executor.EagerTFExecutor()
+      loop.run_until_complete(ex.create_value(comp))
+
+    self.assertEqual(cache.misses, 1)
+    self.assertEqual(cache.hits, 1)
+
+
 if __name__ == '__main__':
   test_case.main()
@@ -0,0 +1,246 @@
+# Copyright 2021, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# pytype: skip-file
+# This modules disables the Pytype analyzer, see
+# https://github.com/tensorflow/federated/blob/main/docs/pytype.md for more
+# information.
+"""A pool of local worker processes hosting leaf executors."""
+
+import collections
+from concurrent import futures
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from typing import Callable, List, Optional
+import weakref
+
+from absl import logging
+import grpc
+
+from tensorflow_federated.proto.v0 import computation_pb2 as pb
+from tensorflow_federated.proto.v0 import executor_pb2
+from tensorflow_federated.proto.v0 import executor_pb2_grpc
+from tensorflow_federated.python.common_libs import py_typecheck
+from tensorflow_federated.python.core.impl.executors import executor_base
+from tensorflow_federated.python.core.impl.executors import executor_factory
+from tensorflow_federated.python.core.impl.executors import executor_serialization
+from tensorflow_federated.python.core.impl.executors import executor_service
+from tensorflow_federated.python.core.impl.executors import remote_executor
+
+# The number of gRPC threads serving requests in each worker process. The actual
+# work of the leaf executor runs on a single event loop thread of the service.
+_NUM_SERVER_THREADS = 4
+
+# How long to wait for a worker process to start serving, in seconds.
+_WORKER_STARTUP_TIMEOUT_SECONDS = 60
+
+# The maximum number of distinct computations cached in each worker process.
+_MAX_CACHED_COMPUTATIONS = 1000
+
+
+class _LeafExecutorFactory(executor_factory.ExecutorFactory):
+  """Constructs the leaf executor hosted by a worker process."""
+
+  def __init__(self, leaf_executor_fn: Callable[[], executor_base.Executor]):
+    self._leaf_executor_fn = leaf_executor_fn
+
+  def create_executor(self, cardinalities):
+    del cardinalities  # Unused, leaf executors do not understand placement.
+    return self._leaf_executor_fn()
+
+  def clean_up_executors(self):
+    # Does not hold any executors internally, so nothing to clean up.
+    pass
+
+
+def _serve_executor(address: str,
+                    leaf_executor_fn: Callable[[], executor_base.Executor],
+                    ready_event):
+  """Hosts an `ExecutorService` at `address` until the process is terminated."""
+  service = executor_service.ExecutorService(
+      _LeafExecutorFactory(leaf_executor_fn), use_shared_memory=True)
+  server = grpc.server(
+      futures.ThreadPoolExecutor(max_workers=_NUM_SERVER_THREADS))
+  executor_pb2_grpc.add_ExecutorServicer_to_server(service, server)
+  server.add_insecure_port(address)
+  server.start()
+  ready_event.set()
+  server.wait_for_termination()
+
+
+class _ComputationCache(object):
+  """A thread-safe LRU cache of computations embedded in a worker process."""
+
+  def __init__(self, max_size: int):
+    self._max_size = max_size
+    self._lock = threading.Lock()
+    self._values = collections.OrderedDict()
+
+  def get(self, key: bytes) -> Optional[remote_executor.RemoteValue]:
+    with self._lock:
+      value = self._values.get(key)
+      if value is not None:
+        self._values.move_to_end(key)
+      return value
+
+  def put(self, key: bytes,
+          value: remote_executor.RemoteValue) -> remote_executor.RemoteValue:
+    """Caches `value` unless `key` is cached, and returns the cached value."""
+    with self._lock:
+      value = self._values.setdefault(key, value)
+      self._values.move_to_end(key)
+      while len(self._values) > self._max_size:
+        # The evicted value is disposed on the worker once no longer in use.
+        self._values.popitem(last=False)
+      return value
+
+
+class _PooledRemoteExecutor(remote_executor.RemoteExecutor):
+  """A `RemoteExecutor` sharing a worker process with other executors.
+
+  The executor hosted by the worker process is shared by all of the executors
+  of the pool which run on that process, and lives as long as the pool, so
+  closing a single one of them does not clear the worker. Computations are
+  embedded in the worker only once, and the resulting values are shared by
+  all of these executors.
+  """
+
+  def __init__(self, channel: grpc.Channel,
+               computation_cache: _ComputationCache):
+    super().__init__(channel, use_shared_memory=True)
+    self._computation_cache = computation_cache
+
+  def close(self):
+    # The worker executor is owned by the pool, not by this executor.
+    pass
+
+  async def create_value(self, value, type_spec=None):
+    if not isinstance(value, pb.Computation):
+      return await super().create_value(value, type_spec)
+    key = value.SerializeToString(deterministic=True)
+    cached_value = self._computation_cache.get(key)
+    if cached_value is None:
+      cached_value = self._computation_cache.put(
+          key, await super().create_value(value, type_spec))
+    return cached_value
+
+
+class _Worker(object):
+  """A worker process, and the state needed to talk to it."""
+
+  def __init__(self, process, channel: grpc.Channel):
+    self.process = process
+    self.channel = channel
+    self.computation_cache = _ComputationCache(_MAX_CACHED_COMPUTATIONS)
+
+
+def _stop_workers(workers: List[_Worker], socket_dir: str):
+  logging.debug('Finalizing, terminating worker processes.')
+  for worker in workers:
+    worker.channel.close()
+    worker.process.terminate()
+  for worker in workers:
+    worker.process.join()
+    # Terminated workers do not run their exit handlers, so the shared memory
+    # files they wrote which were never read are removed on their behalf.
+    executor_serialization.remove_shared_memory_files(worker.process.pid)
+  shutil.rmtree(socket_dir, ignore_errors=True)
+  logging.debug('Worker processes terminated.')
+
+
+class ExecutorProcessPool(object):
+  """A pool of local worker processes, each hosting a leaf executor.
+
+  Each worker process hosts an `executor_service.ExecutorService` wrapping an
+  executor constructed by `leaf_executor_fn`, and is reached over a Unix domain
+  socket through the same protocol as a remote worker. Work delegated to the
+  pool therefore runs outside of the calling process, and is not constrained by
+  its global interpreter lock. Since the workers run on the same host, large
+  tensors are passed to and from them through shared memory.
+
+  Executors are handed out by `create_executor` in round-robin order across the
+  worker processes, which are started lazily, the first time an executor is
+  requested, and terminated once the pool is garbage collected.
+  """
+
+  def __init__(self,
+               num_processes: int,
+               leaf_executor_fn: Callable[[], executor_base.Executor]):
+    """Creates a pool of `num_processes` worker processes.
+
+    Args:
+      num_processes: The number of worker processes; must be positive.
+      leaf_executor_fn: A picklable function without arguments constructing the
+        executor hosted by each worker process, such as the class of the
+        executor.
+
+    Raises:
+      ValueError: If `num_processes` is not positive.
+    """
+    py_typecheck.check_type(num_processes, int)
+    py_typecheck.check_callable(leaf_executor_fn)
+    if num_processes < 1:
+      raise ValueError(
+          f'Expected a positive `num_processes`, found {num_processes}.')
+    self._num_processes = num_processes
+    self._leaf_executor_fn = leaf_executor_fn
+    self._lock = threading.Lock()
+    self._workers = []
+    self._next_index = 0
+    self._socket_dir = tempfile.mkdtemp(prefix='tff_executor_process_pool_')
+    weakref.finalize(self, _stop_workers, self._workers, self._socket_dir)
+
+  @property
+  def num_processes(self) -> int:
+    return self._num_processes
+
+  def _start_workers(self):
+    # TensorFlow is not fork-safe, so the worker processes are spawned.
+    context = multiprocessing.get_context('spawn')
+    pending = []
+    for index in range(self._num_processes):
+      address = 'unix:' + os.path.join(self._socket_dir, f'worker_{index}.sock')
+      ready_event = context.Event()
+      process = context.Process(
+          target=_serve_executor,
+          args=(address, self._leaf_executor_fn, ready_event),
+          daemon=True)
+      process.start()
+      pending.append((address, process, ready_event))
+    for address, process, ready_event in pending:
+      if not ready_event.wait(_WORKER_STARTUP_TIMEOUT_SECONDS):
+        raise RuntimeError(
+            f'Worker process serving {address} failed to start in time.')
+      channel = grpc.insecure_channel(address)
+      grpc.channel_ready_future(channel).result(
+          timeout=_WORKER_STARTUP_TIMEOUT_SECONDS)
+      # The worker executor is configured once, and shared by all executors
+      # subsequently handed out for this worker.
+      executor_pb2_grpc.ExecutorStub(channel).SetCardinalities(
+          executor_pb2.SetCardinalitiesRequest(
+              cardinalities=executor_serialization.serialize_cardinalities(
+                  {})))
+      self._workers.append(_Worker(process, channel))
+
+  def create_executor(self) -> executor_base.Executor:
+    """Returns an executor delegating to the next worker process of the pool."""
+    with self._lock:
+      if not self._workers:
+        self._start_workers()
+      worker = self._workers[self._next_index]
+      self._next_index = (self._next_index + 1) % self._num_processes
+    return _PooledRemoteExecutor(worker.channel, worker.computation_cache)
@@ -0,0 +1,83 @@
+# Copyright 2021, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+from absl.testing import absltest
+import tensorflow as tf
+
+from tensorflow_federated.python.core.api import computations
+from tensorflow_federated.python.core.impl.computation import computation_impl
+from tensorflow_federated.python.core.impl.executors import eager_tf_executor
+from tensorflow_federated.python.core.impl.executors import executor_process_pool
+
+
+@computations.tf_computation(tf.int32)
+def _add_one(x):
+  return tf.add(x, 1)
+
+
+def _invoke(ex, comp, arg):
+  loop = asyncio.get_event_loop()
+  comp_proto = computation_impl.ConcreteComputation.get_proto(comp)
+  v1 = loop.run_until_complete(ex.create_value(comp_proto, comp.type_signature))
+  v2 = loop.run_until_complete(ex.create_value(arg, tf.int32))
+  v3 = loop.run_until_complete(ex.create_call(v1, v2))
+  return loop.run_until_complete(v3.compute())
+
+
+class ExecutorProcessPoolTest(absltest.TestCase):
+
+  def test_raises_with_nonpositive_num_processes(self):
+    with self.assertRaises(ValueError):
+      executor_process_pool.ExecutorProcessPool(
+          0, eager_tf_executor.EagerTFExecutor)
+
+  def test_executors_compute_in_worker_processes(self):
+    pool = executor_process_pool.ExecutorProcessPool(
+        2, eager_tf_executor.EagerTFExecutor)
+    executors = [pool.create_executor() for _ in range(3)]
+
+    results = [_invoke(ex, _add_one, i) for i, ex in enumerate(executors)]
+
+    self.assertEqual(results, [1, 2, 3])
+
+  def test_computation_is_embedded_once_per_process(self):
+    pool = executor_process_pool.ExecutorProcessPool(
+        1, eager_tf_executor.EagerTFExecutor)
+    first_ex = pool.create_executor()
+    second_ex = pool.create_executor()
+    comp_proto = computation_impl.ConcreteComputation.get_proto(_add_one)
+    loop = asyncio.get_event_loop()
+
+    first_value = loop.run_until_complete(
+        first_ex.create_value(comp_proto, _add_one.type_signature))
+    second_value = loop.run_until_complete(
+        second_ex.create_value(comp_proto, _add_one.type_signature))
+
+    self.assertIs(first_value, second_value)
+
+  def test_close_does_not_clear_worker(self):
+    pool = executor_process_pool.ExecutorProcessPool(
+        1, eager_tf_executor.EagerTFExecutor)
+    first_ex = pool.create_executor()
+    second_ex = pool.create_executor()
+
+    first_ex.close()
+
+    self.assertEqual(_invoke(second_ex, _add_one, 10), 11)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -18,13 +18,16 @@
 # information.
 """A set of utility methods for `executor_service.py` and its clients."""
 
+import atexit
 import collections
+import glob
 import os
 import os.path
 import tempfile
-from typing import Any, Collection, List, Mapping, Optional, Tuple, Union
+from typing import Any, Collection, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
 import warnings
 import zipfile
+import zlib
 
 import numpy as np
 import tensorflow as tf
@@ -54,6 +57,27 @@ _DeserializeReturnType = Tuple[Any, computation_types.Type]
 # variables from the graph.
 _DEFAULT_MAX_SERIALIZED_SEQUENCE_SIZE_BYTES = 20 * (1024**2)  # 20 MB
 
+# Tensors smaller than this are always serialized inline, since for those the
+# cost of creating and mapping a file exceeds the cost of copying the content.
+_MIN_SHARED_MEMORY_TENSOR_SIZE_BYTES = 1024**2  # 1 MB
+
+# The default maximum size of the raw content of a tensor in a single chunk of a
+# streamed value; kept well below the default 4 MB limit of gRPC messages.
+_DEFAULT_MAX_CHUNK_SIZE_BYTES = 1024**2  # 1 MB
+
+# The zlib level of compressed tensor encodings, which favors throughput over
+# ratio since encoding is on the critical path of every transfer.
+_ZLIB_COMPRESSION_LEVEL = 1
+
+# The directory holding the files backing shared memory tensors. On Linux,
+# `/dev/shm` is memory-backed, so these files never touch the disk.
+_SHARED_MEMORY_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# The prefix of the files backing shared memory tensors; it is followed by the
+# id of the process which created the file, so that the files left behind by a
+# process can be found after it exits.
+_SHARED_MEMORY_FILE_PREFIX = 'tff_tensor_'
+
 
 class DatasetSerializationError(Exception):
   """Error raised during Dataset serialization or deserialization."""
@@ -70,15 +94,174 @@ def _serialize_computation(
   return executor_pb2.Value(computation=comp), type_spec
 
 
+def _is_raw_tensor(value: Any, type_spec: computation_types.TensorType) -> bool:
+  """Whether `value` can be transferred as its raw, C-ordered content."""
+  return (isinstance(value, np.ndarray) and value.dtype.kind in 'biufc' and
+          value.dtype == type_spec.dtype.as_numpy_dtype and
+          type_spec.shape.is_compatible_with(value.shape))
+
+
+def _can_share_tensor_through_memory(
+    value: Any, type_spec: computation_types.TensorType) -> bool:
+  return (_is_raw_tensor(value, type_spec) and
+          value.nbytes >= _MIN_SHARED_MEMORY_TENSOR_SIZE_BYTES)
+
+
+def _shared_memory_file_prefix(pid: int) -> str:
+  return os.path.join(_SHARED_MEMORY_DIR or tempfile.gettempdir(),
+                      f'{_SHARED_MEMORY_FILE_PREFIX}{pid}_')
+
+
+def _remove_shared_memory_file(path: str):
+  try:
+    os.remove(path)
+  except FileNotFoundError:
+    # The file was already consumed by the receiver.
+    pass
+
+
+def release_shared_memory_tensors(value_proto: executor_pb2.Value):
+  """Removes the files backing the shared memory tensors in `value_proto`.
+
+  The file backing a shared memory tensor is normally removed by the receiver
+  when it deserializes the value. Senders must call this when the value is not
+  going to be deserialized, e.g. because the RPC carrying it failed, so that the
+  file does not outlive it. Files which were already removed are ignored.
+
+  Args:
+    value_proto: An instance of `executor_pb2.Value`.
+  """
+  py_typecheck.check_type(value_proto, executor_pb2.Value)
+  which_value = value_proto.WhichOneof('value')
+  if which_value == 'shared_memory_tensor':
+    _remove_shared_memory_file(value_proto.shared_memory_tensor.path)
+  elif which_value == 'struct':
+    for element in value_proto.struct.element:
+      release_shared_memory_tensors(element.value)
+  elif which_value == 'federated':
+    for member in value_proto.federated.value:
+      release_shared_memory_tensors(member)
+
+
+def remove_shared_memory_files(pid: Optional[int] = None):
+  """Removes the remaining files backing shared memory tensors of a process.
+
+  These are the files of values which the process serialized but which were
+  never deserialized, e.g. because the response carrying them was never
+  received. They are removed for the current process when it exits normally;
+  owners of processes which may be terminated, such as a pool of worker
+  processes, should call this with the id of each terminated process.
+
+  Args:
+    pid: The id of the process which created the files. Defaults to the current
+      process.
+  """
+  if pid is None:
+    pid = os.getpid()
+  for path in glob.glob(glob.escape(_shared_memory_file_prefix(pid)) + '*'):
+    _remove_shared_memory_file(path)
+
+
+atexit.register(remove_shared_memory_files)
+
+
+def _serialize_shared_memory_tensor_value(
+    value: np.ndarray) -> executor_pb2.Value:
+  """Writes `value` to a shared memory file, and returns a reference to it."""
+  directory, prefix = os.path.split(_shared_memory_file_prefix(os.getpid()))
+  fd, path = tempfile.mkstemp(prefix=prefix, dir=directory)
+  with os.fdopen(fd, 'wb') as f:
+    np.ascontiguousarray(value).tofile(f)
+  return executor_pb2.Value(
+      shared_memory_tensor=executor_pb2.Value.SharedMemoryTensor(
+          path=path, dtype=value.dtype.str, shape=value.shape))
+
+
+def _can_encode_tensor(value: Any, type_spec: computation_types.TensorType,
+                       tensor_encoding: executor_pb2.TensorEncoding) -> bool:
+  """Whether `value` is a floating-point tensor worth encoding."""
+  if (tensor_encoding.precision == executor_pb2.TensorEncoding.FULL_PRECISION
+      and tensor_encoding.compression
+      == executor_pb2.TensorEncoding.NO_COMPRESSION and
+      tensor_encoding.max_sparse_density <= 0):
+    return False
+  return (_is_raw_tensor(value, type_spec) and value.dtype.kind == 'f' and
+          value.nbytes >= tensor_encoding.min_size_bytes)
+
+
+def _float_to_bfloat16_bits(value: np.ndarray) -> np.ndarray:
+  """Rounds `value` to the nearest bfloat16 values, and returns their bits."""
+  value = value.astype('<f4')
+  bits = value.view('<u4')
+  # Adding just under half of the dropped range, plus the lowest retained bit,
+  # rounds to nearest with ties to even.
+  rounded = (bits + (((bits >> 16) & 1) + 0x7FFF)) >> 16
+  # Rounding could turn NaNs into infinities, so NaNs are kept quiet instead.
+  rounded = np.where(np.isnan(value), (bits >> 16) | 0x40, rounded)
+  return rounded.astype('<u2')
+
+
+def _bfloat16_bits_to_float(bits: np.ndarray) -> np.ndarray:
+  return (bits.astype('<u4') << 16).view('<f4')
+
+
+def _serialize_encoded_tensor_value(
+    value: np.ndarray,
+    tensor_encoding: executor_pb2.TensorEncoding) -> executor_pb2.Value:
+  """Serializes a floating-point tensor in `tensor_encoding`."""
+  elements = np.ascontiguousarray(value).reshape(-1)
+  sparse = False
+  indices = b''
+  if tensor_encoding.max_sparse_density > 0 and elements.size:
+    nonzero = np.flatnonzero(elements)
+    if nonzero.size <= tensor_encoding.max_sparse_density * elements.size:
+      sparse = True
+      elements = elements[nonzero]
+      indices = nonzero.astype('<i8').tobytes()
+  if tensor_encoding.precision == executor_pb2.TensorEncoding.FULL_PRECISION:
+    values = elements.astype(elements.dtype.newbyteorder('<')).tobytes()
+  elif tensor_encoding.precision == executor_pb2.TensorEncoding.FLOAT16:
+    values = elements.astype('<f2').tobytes()
+  elif tensor_encoding.precision == executor_pb2.TensorEncoding.BFLOAT16:
+    values = _float_to_bfloat16_bits(elements).tobytes()
+  else:
+    raise ValueError(
+        f'Unknown tensor encoding precision {tensor_encoding.precision}.')
+  if tensor_encoding.compression == executor_pb2.TensorEncoding.ZLIB:
+    values = zlib.compress(values, _ZLIB_COMPRESSION_LEVEL)
+    if sparse:
+      indices = zlib.compress(indices, _ZLIB_COMPRESSION_LEVEL)
+  elif (tensor_encoding.compression !=
+        executor_pb2.TensorEncoding.NO_COMPRESSION):
+    raise ValueError(
+        f'Unknown tensor encoding compression {tensor_encoding.compression}.')
+  return executor_pb2.Value(
+      encoded_tensor=executor_pb2.Value.EncodedTensor(
+          dtype=value.dtype.str,
+          shape=value.shape,
+          precision=tensor_encoding.precision,
+          compression=tensor_encoding.compression,
+          sparse=sparse,
+          values=values,
+          indices=indices))
+
+
 @tracing.trace
 def _serialize_tensor_value(
     value: Any,
-    type_spec: computation_types.TensorType) -> _SerializeReturnType:
+    type_spec: computation_types.TensorType,
+    use_shared_memory: bool = False,
+    tensor_encoding: Optional[executor_pb2.TensorEncoding] = None
+) -> _SerializeReturnType:
   """Serializes a tensor value into `executor_pb2.Value`.
 
   Args:
     value: A Numpy array or other object understood by `tf.make_tensor_proto`.
     type_spec: A `tff.TensorType`.
+    use_shared_memory: Whether large Numpy arrays may be serialized as a
+      reference to shared memory, which only peers on the same host can read.
+    tensor_encoding: An optional `executor_pb2.TensorEncoding` in which
+      floating-point Numpy arrays are serialized.
 
   Returns:
     A tuple `(value_proto, ret_type_spec)` in which `value_proto` is an instance
@@ -93,6 +276,11 @@ def _serialize_tensor_value(
   """
   if isinstance(value, tf.Tensor):
     value = value.numpy()
+  if use_shared_memory and _can_share_tensor_through_memory(value, type_spec):
+    return _serialize_shared_memory_tensor_value(value), type_spec
+  if tensor_encoding is not None and _can_encode_tensor(
+      value, type_spec, tensor_encoding):
+    return _serialize_encoded_tensor_value(value, tensor_encoding), type_spec
   if isinstance(value, np.ndarray):
     tensor_proto = tf.make_tensor_proto(
         value, dtype=type_spec.dtype, verify_shape=False)
@@ -187,14 +375,21 @@ def _serialize_sequence_value(
 @tracing.trace
 def _serialize_struct_type(
     struct_typed_value: Any,
-    type_spec: computation_types.StructType) -> _SerializeReturnType:
+    type_spec: computation_types.StructType,
+    use_shared_memory: bool = False,
+    tensor_encoding: Optional[executor_pb2.TensorEncoding] = None
+) -> _SerializeReturnType:
   """Serializes a value of tuple type."""
   type_elem_iter = structure.iter_elements(type_spec)
   val_elem_iter = structure.iter_elements(
       structure.from_container(struct_typed_value))
   tup_elems = []
   for (e_name, e_type), (_, e_val) in zip(type_elem_iter, val_elem_iter):
-    e_proto, _ = serialize_value(e_val, e_type)
+    e_proto, _ = serialize_value(
+        e_val,
+        e_type,
+        use_shared_memory=use_shared_memory,
+        tensor_encoding=tensor_encoding)
     tup_elems.append(
         executor_pb2.Value.Struct.Element(
             name=e_name if e_name else None, value=e_proto))
@@ -206,7 +401,10 @@ def _serialize_struct_type(
 @tracing.trace
 def _serialize_federated_value(
     federated_value: Any,
-    type_spec: computation_types.FederatedType) -> _SerializeReturnType:
+    type_spec: computation_types.FederatedType,
+    use_shared_memory: bool = False,
+    tensor_encoding: Optional[executor_pb2.TensorEncoding] = None
+) -> _SerializeReturnType:
   """Serializes a value of federated type."""
   if type_spec.all_equal:
     value = [federated_value]
@@ -215,7 +413,11 @@ def _serialize_federated_value(
   py_typecheck.check_type(value, list)
   items = []
   for v in value:
-    it, it_type = serialize_value(v, type_spec.member)
+    it, it_type = serialize_value(
+        v,
+        type_spec.member,
+        use_shared_memory=use_shared_memory,
+        tensor_encoding=tensor_encoding)
     type_spec.member.check_assignable_from(it_type)
     items.append(it)
   result_proto = executor_pb2.Value(
@@ -228,7 +430,10 @@ def _serialize_federated_value(
 @tracing.trace
 def serialize_value(
     value: Any,
-    type_spec: Optional[computation_types.Type] = None) -> _SerializeReturnType:
+    type_spec: Optional[computation_types.Type] = None,
+    use_shared_memory: bool = False,
+    tensor_encoding: Optional[executor_pb2.TensorEncoding] = None
+) -> _SerializeReturnType:
   """Serializes a value into `executor_pb2.Value`.
 
   We use a switch/function pattern in the body here (and in `deserialize_value`
@@ -237,6 +442,14 @@ def serialize_value(
   Args:
     value: A value to be serialized.
     type_spec: Optional type spec, a `tff.Type` or something convertible to it.
+    use_shared_memory: Whether large tensors may be serialized as references to
+      memory-mapped files rather than inline. Such values can only be
+      deserialized on the same host, and only once, since deserialization
+      removes the backing file.
+    tensor_encoding: An optional `executor_pb2.TensorEncoding` in which the
+      floating-point tensors of `value` are serialized. Encoded tensors are
+      decoded by `deserialize_value` transparently, and restored to their
+      original dtype.
 
   Returns:
     A tuple `(value_proto, ret_type_spec)` where `value_proto` is an instance
@@ -261,13 +474,25 @@ def serialize_value(
                     ' of type {t} with None type spec.'.format(
                         v=value, t=type(value)))
   elif type_spec.is_tensor():
-    return _serialize_tensor_value(value, type_spec)
+    return _serialize_tensor_value(
+        value,
+        type_spec,
+        use_shared_memory=use_shared_memory,
+        tensor_encoding=tensor_encoding)
   elif type_spec.is_sequence():
     return _serialize_sequence_value(value, type_spec)
   elif type_spec.is_struct():
-    return _serialize_struct_type(value, type_spec)
+    return _serialize_struct_type(
+        value,
+        type_spec,
+        use_shared_memory=use_shared_memory,
+        tensor_encoding=tensor_encoding)
   elif type_spec.is_federated():
-    return _serialize_federated_value(value, type_spec)
+    return _serialize_federated_value(
+        value,
+        type_spec,
+        use_shared_memory=use_shared_memory,
+        tensor_encoding=tensor_encoding)
   else:
     raise ValueError(
         'Unable to serialize value with Python type {} and {} TFF type.'.format(
@@ -319,6 +544,94 @@ def _deserialize_tensor_value(
   return tensor_value, value_type
 
 
+@tracing.trace
+def _deserialize_shared_memory_tensor_value(
+    value_proto: executor_pb2.Value) -> _DeserializeReturnType:
+  """Deserializes a tensor shared through memory from `executor_pb2.Value`.
+
+  The returned Numpy array maps the memory of the shared file directly rather
+  than copying it. The file itself is removed, which leaves the mapping intact
+  until the array is garbage collected.
+
+  Args:
+    value_proto: An instance of `executor_pb2.Value`.
+
+  Returns:
+    A tuple `(value, type_spec)`, where `value` is a Numpy array that represents
+    the deserialized value, and `type_spec` is an instance of `tff.TensorType`
+    that represents its type.
+
+  Raises:
+    ValueError: If the value is malformed, or the shared file is missing.
+  """
+  shared_tensor = value_proto.shared_memory_tensor
+  dtype = np.dtype(shared_tensor.dtype)
+  shape = tuple(shared_tensor.shape)
+  if not os.path.exists(shared_tensor.path):
+    raise ValueError(f'The file {shared_tensor.path} backing a shared memory '
+                     'tensor does not exist; shared memory tensors can only be '
+                     'deserialized once, and on the host which created them.')
+  try:
+    # Pages are copied on write, so writes never reach the shared file.
+    value = np.memmap(shared_tensor.path, dtype=dtype, mode='c', shape=shape)
+  finally:
+    os.remove(shared_tensor.path)
+  value_type = computation_types.TensorType(
+      dtype=tf.dtypes.as_dtype(dtype), shape=shape)
+  return value, value_type
+
+
+@tracing.trace
+def _deserialize_encoded_tensor_value(
+    value_proto: executor_pb2.Value) -> _DeserializeReturnType:
+  """Deserializes a tensor in a `TensorEncoding` from `executor_pb2.Value`.
+
+  Args:
+    value_proto: An instance of `executor_pb2.Value`.
+
+  Returns:
+    A tuple `(value, type_spec)`, where `value` is a Numpy array of the original
+    dtype of the encoded tensor, and `type_spec` is an instance of
+    `tff.TensorType` that represents its type.
+
+  Raises:
+    ValueError: If the value is malformed.
+  """
+  encoded_tensor = value_proto.encoded_tensor
+  dtype = np.dtype(encoded_tensor.dtype)
+  shape = tuple(encoded_tensor.shape)
+  values = encoded_tensor.values
+  indices = encoded_tensor.indices
+  if encoded_tensor.compression == executor_pb2.TensorEncoding.ZLIB:
+    values = zlib.decompress(values)
+    if encoded_tensor.sparse:
+      indices = zlib.decompress(indices)
+  elif (encoded_tensor.compression !=
+        executor_pb2.TensorEncoding.NO_COMPRESSION):
+    raise ValueError(
+        f'Unknown tensor encoding compression {encoded_tensor.compression}.')
+  if encoded_tensor.precision == executor_pb2.TensorEncoding.FULL_PRECISION:
+    elements = np.frombuffer(values, dtype=dtype.newbyteorder('<'))
+  elif encoded_tensor.precision == executor_pb2.TensorEncoding.FLOAT16:
+    elements = np.frombuffer(values, dtype='<f2')
+  elif encoded_tensor.precision == executor_pb2.TensorEncoding.BFLOAT16:
+    elements = _bfloat16_bits_to_float(np.frombuffer(values, dtype='<u2'))
+  else:
+    raise ValueError(
+        f'Unknown tensor encoding precision {encoded_tensor.precision}.')
+  # Copies out of the message, so the result is writable.
+  elements = elements.astype(dtype)
+  if encoded_tensor.sparse:
+    value = np.zeros(int(np.prod(shape)), dtype=dtype)
+    value[np.frombuffer(indices, dtype='<i8')] = elements
+    value = value.reshape(shape)
+  else:
+    value = elements.reshape(shape)
+  value_type = computation_types.TensorType(
+      dtype=tf.dtypes.as_dtype(dtype), shape=shape)
+  return value, value_type
+
+
 def _deserialize_dataset_from_zipped_saved_model(serialized_bytes):
   """Deserializes a zipped SavedModel `bytes` object to a `tf.data.Dataset`.
 
@@ -508,22 +821,22 @@ def _ensure_deserialized_types_compatible(
                         next_type, previous_type))
 
 
-@tracing.trace
-def _deserialize_federated_value(
-    value_proto: executor_pb2.Value) -> _DeserializeReturnType:
-  """Deserializes a value of federated type."""
-  all_equal = value_proto.federated.type.all_equal
-  placement_uri = value_proto.federated.type.placement.value.uri
-  if not value_proto.federated.value:
-    raise ValueError('Attempting to deserialize federated value with no data.')
+def _assemble_federated_value(
+    federated_type_proto: computation_pb2.FederatedType,
+    members: Iterable[Tuple[Any, computation_types.Type]]
+) -> _DeserializeReturnType:
+  """Assembles a federated value from its deserialized member constituents."""
+  all_equal = federated_type_proto.all_equal
+  placement_uri = federated_type_proto.placement.value.uri
   value = []
   # item_type will represent a supertype of all deserialized member types in the
   # federated value.
   item_type = None
-  for item in value_proto.federated.value:
-    item_value, next_item_type = deserialize_value(item)
+  for item_value, next_item_type in members:
     item_type = _ensure_deserialized_types_compatible(item_type, next_item_type)
     value.append(item_value)
+  if not value:
+    raise ValueError('Attempting to deserialize federated value with no data.')
   if all_equal:
     if len(value) == 1:
       value = value[0]
@@ -538,6 +851,17 @@ def _deserialize_federated_value(
   return value, type_spec
 
 
+@tracing.trace
+def _deserialize_federated_value(
+    value_proto: executor_pb2.Value) -> _DeserializeReturnType:
+  """Deserializes a value of federated type."""
+  if not value_proto.federated.value:
+    raise ValueError('Attempting to deserialize federated value with no data.')
+  return _assemble_federated_value(
+      value_proto.federated.type,
+      (deserialize_value(item) for item in value_proto.federated.value))
+
+
 @tracing.trace
 def deserialize_value(
     value_proto: executor_pb2.Value) -> _DeserializeReturnType:
@@ -562,6 +886,10 @@ def deserialize_value(
   which_value = value_proto.WhichOneof('value')
   if which_value == 'tensor':
     return _deserialize_tensor_value(value_proto)
+  elif which_value == 'shared_memory_tensor':
+    return _deserialize_shared_memory_tensor_value(value_proto)
+  elif which_value == 'encoded_tensor':
+    return _deserialize_encoded_tensor_value(value_proto)
   elif which_value == 'computation':
     return _deserialize_computation(value_proto)
   elif which_value == 'sequence':
@@ -575,6 +903,192 @@ def deserialize_value(
         'Unable to deserialize a value of type {}.'.format(which_value))
 
 
+def _iter_value_chunks(
+    value: Any, type_spec: computation_types.Type,
+    max_chunk_size_bytes: int) -> Iterator[executor_pb2.ValueChunk]:
+  """Yields the chunks of `value`, serialized lazily, one at a time."""
+  if (isinstance(value, (computation_pb2.Computation,
+                         computation_impl.ConcreteComputation)) or
+      type_spec.is_sequence()):
+    value_proto, _ = serialize_value(value, type_spec)
+    yield executor_pb2.ValueChunk(value=value_proto)
+  elif type_spec.is_tensor():
+    if isinstance(value, tf.Tensor):
+      value = value.numpy()
+    if (_is_raw_tensor(value, type_spec) and
+        value.nbytes > max_chunk_size_bytes):
+      yield executor_pb2.ValueChunk(
+          tensor_header=executor_pb2.ValueChunk.TensorHeader(
+              dtype=value.dtype.str, shape=value.shape))
+      content = np.ascontiguousarray(value).reshape(-1).view(np.uint8)
+      for start in range(0, content.size, max_chunk_size_bytes):
+        yield executor_pb2.ValueChunk(
+            tensor_content=content[start:start +
+                                   max_chunk_size_bytes].tobytes())
+    else:
+      value_proto, _ = serialize_value(value, type_spec)
+      yield executor_pb2.ValueChunk(value=value_proto)
+  elif type_spec.is_struct():
+    type_elements = structure.to_elements(type_spec)
+    value_elements = structure.to_elements(structure.from_container(value))
+    yield executor_pb2.ValueChunk(
+        struct_header=executor_pb2.ValueChunk.StructHeader(
+            name=[name if name else '' for name, _ in type_elements]))
+    for (_, element_type), (_, element_value) in zip(type_elements,
+                                                     value_elements):
+      yield from _iter_value_chunks(element_value, element_type,
+                                    max_chunk_size_bytes)
+  elif type_spec.is_federated():
+    members = [value] if type_spec.all_equal else value
+    py_typecheck.check_type(members, list)
+    yield executor_pb2.ValueChunk(
+        federated_header=executor_pb2.ValueChunk.FederatedHeader(
+            type=type_serialization.serialize_type(type_spec).federated,
+            num_values=len(members)))
+    for member in members:
+      yield from _iter_value_chunks(member, type_spec.member,
+                                    max_chunk_size_bytes)
+  else:
+    # Raises the same error as the unchunked serialization.
+    value_proto, _ = serialize_value(value, type_spec)
+    yield executor_pb2.ValueChunk(value=value_proto)
+
+
+def serialize_value_chunks(
+    value: Any,
+    type_spec: Optional[computation_types.Type] = None,
+    max_chunk_size_bytes: int = _DEFAULT_MAX_CHUNK_SIZE_BYTES
+) -> Tuple[Iterator[executor_pb2.ValueChunk], computation_types.Type]:
+  """Serializes a value into a stream of `executor_pb2.ValueChunk`s.
+
+  The chunks are serialized lazily, as the returned iterator is consumed, so
+  only a bounded part of the serialized value is held in memory at any time.
+  Numeric tensors larger than `max_chunk_size_bytes` are split across chunks;
+  other leaves of the value, such as computations and sequences, are always
+  serialized whole, in a single chunk.
+
+  Args:
+    value: A value to be serialized.
+    type_spec: Optional type spec, a `tff.Type` or something convertible to it.
+    max_chunk_size_bytes: The maximum size of the tensor content in a chunk.
+
+  Returns:
+    A tuple `(chunks, ret_type_spec)` where `chunks` is an iterator of
+    `executor_pb2.ValueChunk`s, and `ret_type_spec` is the TFF type of the
+    serialized value, as in `serialize_value`.
+
+  Raises:
+    TypeError: If the arguments are of the wrong types.
+    ValueError: If `max_chunk_size_bytes` is not positive.
+  """
+  py_typecheck.check_type(max_chunk_size_bytes, int)
+  if max_chunk_size_bytes < 1:
+    raise ValueError('Expected a positive `max_chunk_size_bytes`, found '
+                     f'{max_chunk_size_bytes}.')
+  type_spec = computation_types.to_type(type_spec)
+  if isinstance(value, computation_pb2.Computation):
+    type_spec = type_serialization.deserialize_type(value.type)
+  elif isinstance(value, computation_impl.ConcreteComputation):
+    type_spec = executor_utils.reconcile_value_with_type_spec(value, type_spec)
+  elif type_spec is None:
+    raise TypeError('A type hint is required when serializing a value which '
+                    'is not a TFF computation. Asked to serialized value {v} '
+                    ' of type {t} with None type spec.'.format(
+                        v=value, t=type(value)))
+  return _iter_value_chunks(value, type_spec, max_chunk_size_bytes), type_spec
+
+
+def _next_value_chunk(
+    chunks: Iterator[executor_pb2.ValueChunk]) -> executor_pb2.ValueChunk:
+  chunk = next(chunks, None)
+  if chunk is None:
+    raise ValueError('The stream of chunks ended before the value was '
+                     'complete.')
+  return chunk
+
+
+def _deserialize_chunked_tensor_value(
+    header: executor_pb2.ValueChunk.TensorHeader,
+    chunks: Iterator[executor_pb2.ValueChunk]) -> _DeserializeReturnType:
+  """Reassembles a tensor split across chunks, in place."""
+  dtype = np.dtype(header.dtype)
+  shape = tuple(header.shape)
+  value = np.empty(shape, dtype=dtype)
+  content = value.reshape(-1).view(np.uint8)
+  offset = 0
+  while offset < content.size:
+    chunk = _next_value_chunk(chunks)
+    if chunk.WhichOneof('chunk') != 'tensor_content':
+      raise ValueError('Expected the content of a tensor, found a chunk of '
+                       f'{chunk.WhichOneof("chunk")}.')
+    size = len(chunk.tensor_content)
+    if offset + size > content.size:
+      raise ValueError('Received more content than fits a tensor of shape '
+                       f'{shape} and dtype {dtype}.')
+    content[offset:offset + size] = np.frombuffer(
+        chunk.tensor_content, dtype=np.uint8)
+    offset += size
+  value_type = computation_types.TensorType(
+      dtype=tf.dtypes.as_dtype(dtype), shape=shape)
+  return value, value_type
+
+
+def _deserialize_next_chunked_value(
+    chunks: Iterator[executor_pb2.ValueChunk]) -> _DeserializeReturnType:
+  """Deserializes the next complete value from `chunks`."""
+  chunk = _next_value_chunk(chunks)
+  which_chunk = chunk.WhichOneof('chunk')
+  if which_chunk == 'value':
+    return deserialize_value(chunk.value)
+  elif which_chunk == 'tensor_header':
+    return _deserialize_chunked_tensor_value(chunk.tensor_header, chunks)
+  elif which_chunk == 'struct_header':
+    val_elems = []
+    type_elems = []
+    for name in chunk.struct_header.name:
+      name = name if name else None
+      e_val, e_type = _deserialize_next_chunked_value(chunks)
+      val_elems.append((name, e_val))
+      type_elems.append((name, e_type) if name else e_type)
+    return (structure.Struct(val_elems),
+            computation_types.StructType(type_elems))
+  elif which_chunk == 'federated_header':
+    header = chunk.federated_header
+    return _assemble_federated_value(
+        header.type, (_deserialize_next_chunked_value(chunks)
+                      for _ in range(header.num_values)))
+  else:
+    raise ValueError(
+        'Unexpected chunk of {} at the start of a value.'.format(which_chunk))
+
+
+@tracing.trace
+def deserialize_value_chunks(
+    chunks: Iterable[executor_pb2.ValueChunk]) -> _DeserializeReturnType:
+  """Deserializes a value from a stream of `executor_pb2.ValueChunk`s.
+
+  The value is reassembled incrementally, as `chunks` is consumed, so chunks
+  are deserialized while later ones are still being received, and tensors split
+  across chunks are written in place into their final buffer.
+
+  Args:
+    chunks: An iterable of `executor_pb2.ValueChunk`s, as produced by
+      `serialize_value_chunks`.
+
+  Returns:
+    A tuple `(value, type_spec)`, as returned by `deserialize_value`.
+
+  Raises:
+    TypeError: If the arguments are of the wrong types.
+    ValueError: If the chunks are malformed, or do not form a single value.
+  """
+  chunks = iter(chunks)
+  value, type_spec = _deserialize_next_chunked_value(chunks)
+  if next(chunks, None) is not None:
+    raise ValueError('Received chunks beyond the end of the value.')
+  return value, type_spec
+
+
 CardinalitiesType = Mapping[placements.PlacementLiteral, int]
 
 
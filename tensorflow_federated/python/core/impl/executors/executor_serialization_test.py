@@ -13,8 +13,10 @@
 # limitations under the License.
 
 import collections
+import os
 
 from absl.testing import parameterized
+import numpy as np
 import tensorflow as tf
 
 from tensorflow_federated.proto.v0 import computation_pb2
@@ -67,6 +69,263 @@ class ExecutorServiceUtilsTest(test_case.TestCase, parameterized.TestCase):
                                 computation_types.TensorType(tf.int32, [3]))
     self.assertAllEqual(x, y)
 
+  def test_serialize_deserialize_tensor_value_with_shared_memory(self):
+    x = np.arange(1024 * 1024, dtype=np.float32).reshape([1024, 1024])
+    type_spec = computation_types.TensorType(tf.float32, [1024, 1024])
+    value_proto, value_type = executor_serialization.serialize_value(
+        x, type_spec, use_shared_memory=True)
+    self.assertEqual(value_proto.WhichOneof('value'), 'shared_memory_tensor')
+    self.assert_types_identical(value_type, type_spec)
+    path = value_proto.shared_memory_tensor.path
+    self.assertTrue(os.path.exists(path))
+    y, type_spec = executor_serialization.deserialize_value(value_proto)
+    self.assert_types_identical(type_spec, value_type)
+    self.assertAllEqual(x, y)
+    self.assertFalse(os.path.exists(path))
+    with self.assertRaises(ValueError):
+      executor_serialization.deserialize_value(value_proto)
+
+  def test_serialize_small_tensor_value_inline_with_shared_memory(self):
+    x = np.arange(10, dtype=np.int32)
+    value_proto, _ = executor_serialization.serialize_value(
+        x, computation_types.TensorType(tf.int32, [10]), use_shared_memory=True)
+    self.assertEqual(value_proto.WhichOneof('value'), 'tensor')
+
+  def test_serialize_deserialize_struct_value_with_shared_memory(self):
+    x = np.ones([1024, 1024], dtype=np.float32)
+    type_spec = computation_types.StructType([
+        ('a', computation_types.TensorType(tf.float32, [1024, 1024])),
+        ('b', tf.int32),
+    ])
+    value_proto, _ = executor_serialization.serialize_value(
+        collections.OrderedDict(a=x, b=10), type_spec, use_shared_memory=True)
+    self.assertEqual(
+        value_proto.struct.element[0].value.WhichOneof('value'),
+        'shared_memory_tensor')
+    self.assertEqual(value_proto.struct.element[1].value.WhichOneof('value'),
+                     'tensor')
+    y, _ = executor_serialization.deserialize_value(value_proto)
+    self.assertAllEqual(y.a, x)
+    self.assertEqual(y.b, 10)
+
+  def test_release_shared_memory_tensors_removes_files(self):
+    x = np.ones([1024, 1024], dtype=np.float32)
+    type_spec = computation_types.StructType([
+        ('a', computation_types.TensorType(tf.float32, [1024, 1024])),
+        ('b', tf.int32),
+    ])
+    value_proto, _ = executor_serialization.serialize_value(
+        collections.OrderedDict(a=x, b=10), type_spec, use_shared_memory=True)
+    path = value_proto.struct.element[0].value.shared_memory_tensor.path
+    self.assertTrue(os.path.exists(path))
+    executor_serialization.release_shared_memory_tensors(value_proto)
+    self.assertFalse(os.path.exists(path))
+    # Releasing a value whose files were already removed is a no-op.
+    executor_serialization.release_shared_memory_tensors(value_proto)
+
+  def test_remove_shared_memory_files_removes_files_of_process(self):
+    x = np.ones([1024, 1024], dtype=np.float32)
+    type_spec = computation_types.TensorType(tf.float32, [1024, 1024])
+    paths = []
+    for _ in range(2):
+      value_proto, _ = executor_serialization.serialize_value(
+          x, type_spec, use_shared_memory=True)
+      paths.append(value_proto.shared_memory_tensor.path)
+    self.assertTrue(all(os.path.exists(path) for path in paths))
+    executor_serialization.remove_shared_memory_files(os.getpid())
+    self.assertFalse(any(os.path.exists(path) for path in paths))
+
+  @parameterized.named_parameters(
+      ('float32', np.float32),
+      ('float64', np.float64),
+  )
+  def test_serialize_deserialize_tensor_value_with_zlib_encoding(self, dtype):
+    x = np.arange(1000, dtype=dtype).reshape([10, 100])
+    type_spec = computation_types.TensorType(dtype, [10, 100])
+    tensor_encoding = executor_pb2.TensorEncoding(
+        compression=executor_pb2.TensorEncoding.ZLIB)
+    value_proto, value_type = executor_serialization.serialize_value(
+        x, type_spec, tensor_encoding=tensor_encoding)
+    self.assertEqual(value_proto.WhichOneof('value'), 'encoded_tensor')
+    self.assert_types_identical(value_type, type_spec)
+    self.assertLess(len(value_proto.encoded_tensor.values), x.nbytes)
+    y, type_spec = executor_serialization.deserialize_value(value_proto)
+    self.assert_types_identical(type_spec, value_type)
+    self.assertEqual(y.dtype, dtype)
+    self.assertAllEqual(x, y)
+
+  @parameterized.named_parameters(
+      ('float16', executor_pb2.TensorEncoding.FLOAT16, 1e-3),
+      ('bfloat16', executor_pb2.TensorEncoding.BFLOAT16, 1e-2),
+  )
+  def test_serialize_deserialize_tensor_value_with_reduced_precision(
+      self, precision, rtol):
+    x = np.linspace(-100.0, 100.0, 1000, dtype=np.float32)
+    type_spec = computation_types.TensorType(tf.float32, [1000])
+    value_proto, _ = executor_serialization.serialize_value(
+        x,
+        type_spec,
+        tensor_encoding=executor_pb2.TensorEncoding(precision=precision))
+    self.assertEqual(value_proto.WhichOneof('value'), 'encoded_tensor')
+    self.assertLen(value_proto.encoded_tensor.values, x.size * 2)
+    y, type_spec = executor_serialization.deserialize_value(value_proto)
+    self.assert_types_identical(
+        type_spec, computation_types.TensorType(tf.float32, [1000]))
+    self.assertEqual(y.dtype, np.float32)
+    self.assertAllClose(x, y, rtol=rtol)
+
+  def test_serialize_deserialize_special_values_with_bfloat16_encoding(self):
+    x = np.array([0.0, -1.5, np.inf, -np.inf, np.nan], dtype=np.float32)
+    value_proto, _ = executor_serialization.serialize_value(
+        x,
+        computation_types.TensorType(tf.float32, [5]),
+        tensor_encoding=executor_pb2.TensorEncoding(
+            precision=executor_pb2.TensorEncoding.BFLOAT16))
+    y, _ = executor_serialization.deserialize_value(value_proto)
+    self.assertAllEqual(x[:4], y[:4])
+    self.assertTrue(np.isnan(y[4]))
+
+  def test_serialize_deserialize_tensor_value_with_sparse_encoding(self):
+    x = np.zeros([100, 100], dtype=np.float32)
+    x[3, 7] = 1.5
+    x[42, 0] = -2.0
+    type_spec = computation_types.TensorType(tf.float32, [100, 100])
+    value_proto, _ = executor_serialization.serialize_value(
+        x,
+        type_spec,
+        tensor_encoding=executor_pb2.TensorEncoding(max_sparse_density=0.1))
+    encoded_tensor = value_proto.encoded_tensor
+    self.assertTrue(encoded_tensor.sparse)
+    self.assertLen(encoded_tensor.values, 2 * 4)
+    self.assertLen(encoded_tensor.indices, 2 * 8)
+    y, type_spec = executor_serialization.deserialize_value(value_proto)
+    self.assert_types_identical(type_spec,
+                                computation_types.TensorType(
+                                    tf.float32, [100, 100]))
+    self.assertAllEqual(x, y)
+
+  def test_serialize_dense_tensor_value_with_sparse_encoding(self):
+    x = np.ones([100], dtype=np.float32)
+    value_proto, _ = executor_serialization.serialize_value(
+        x,
+        computation_types.TensorType(tf.float32, [100]),
+        tensor_encoding=executor_pb2.TensorEncoding(
+            max_sparse_density=0.1,
+            compression=executor_pb2.TensorEncoding.ZLIB))
+    self.assertFalse(value_proto.encoded_tensor.sparse)
+    y, _ = executor_serialization.deserialize_value(value_proto)
+    self.assertAllEqual(x, y)
+
+  def test_serialize_struct_value_encodes_only_large_float_tensors(self):
+    type_spec = computation_types.StructType([
+        ('a', computation_types.TensorType(tf.float32, [1000])),
+        ('b', computation_types.TensorType(tf.float32, [10])),
+        ('c', computation_types.TensorType(tf.int32, [1000])),
+    ])
+    value = collections.OrderedDict(
+        a=np.ones([1000], dtype=np.float32),
+        b=np.ones([10], dtype=np.float32),
+        c=np.ones([1000], dtype=np.int32))
+    value_proto, _ = executor_serialization.serialize_value(
+        value,
+        type_spec,
+        tensor_encoding=executor_pb2.TensorEncoding(
+            compression=executor_pb2.TensorEncoding.ZLIB, min_size_bytes=1024))
+    self.assertEqual(
+        [e.value.WhichOneof('value') for e in value_proto.struct.element],
+        ['encoded_tensor', 'tensor', 'tensor'])
+    y, _ = executor_serialization.deserialize_value(value_proto)
+    self.assertAllEqual(y.a, value['a'])
+    self.assertAllEqual(y.b, value['b'])
+    self.assertAllEqual(y.c, value['c'])
+
+  def test_serialize_deserialize_tensor_value_in_chunks(self):
+    x = np.arange(1000, dtype=np.float32).reshape([10, 100])
+    type_spec = computation_types.TensorType(tf.float32, [10, 100])
+    chunks, value_type = executor_serialization.serialize_value_chunks(
+        x, type_spec, max_chunk_size_bytes=1024)
+    chunks = list(chunks)
+    self.assert_types_identical(value_type, type_spec)
+    self.assertEqual(chunks[0].WhichOneof('chunk'), 'tensor_header')
+    # The 4000 bytes of content are split into chunks of at most 1024 bytes.
+    self.assertLen(chunks, 5)
+    for chunk in chunks[1:]:
+      self.assertEqual(chunk.WhichOneof('chunk'), 'tensor_content')
+      self.assertLessEqual(len(chunk.tensor_content), 1024)
+    y, type_spec = executor_serialization.deserialize_value_chunks(chunks)
+    self.assert_types_identical(type_spec, value_type)
+    self.assertAllEqual(x, y)
+
+  def test_serialize_small_tensor_value_in_single_chunk(self):
+    x = np.arange(10, dtype=np.int32)
+    chunks, _ = executor_serialization.serialize_value_chunks(
+        x, computation_types.TensorType(tf.int32, [10]))
+    chunks = list(chunks)
+    self.assertLen(chunks, 1)
+    self.assertEqual(chunks[0].value.WhichOneof('value'), 'tensor')
+
+  def test_serialize_deserialize_struct_value_in_chunks(self):
+    x = np.ones([100], dtype=np.float32)
+    type_spec = computation_types.StructType([
+        ('a', computation_types.TensorType(tf.float32, [100])),
+        ('b', tf.int32),
+        (None, tf.string),
+    ])
+    chunks, _ = executor_serialization.serialize_value_chunks(
+        structure.Struct([('a', x), ('b', 10), (None, 'abc')]),
+        type_spec,
+        max_chunk_size_bytes=128)
+    y, value_type = executor_serialization.deserialize_value_chunks(chunks)
+    self.assert_types_identical(value_type, type_spec)
+    self.assertAllEqual(y.a, x)
+    self.assertEqual(y.b, 10)
+    self.assertEqual(y[2], b'abc')
+
+  def test_serialize_deserialize_federated_value_in_chunks(self):
+    type_spec = computation_types.FederatedType(
+        computation_types.TensorType(tf.int32, [100]), placements.CLIENTS)
+    x = [np.full([100], i, dtype=np.int32) for i in range(3)]
+    chunks, _ = executor_serialization.serialize_value_chunks(
+        x, type_spec, max_chunk_size_bytes=100)
+    y, value_type = executor_serialization.deserialize_value_chunks(chunks)
+    self.assert_types_identical(value_type, type_spec)
+    self.assertLen(y, 3)
+    for expected, actual in zip(x, y):
+      self.assertAllEqual(expected, actual)
+
+  def test_serialize_deserialize_computation_in_single_chunk(self):
+
+    @computations.tf_computation(tf.int32)
+    def add_one(x):
+      return x + 1
+
+    chunks, value_type = executor_serialization.serialize_value_chunks(add_one)
+    chunks = list(chunks)
+    self.assertLen(chunks, 1)
+    y, type_spec = executor_serialization.deserialize_value_chunks(chunks)
+    self.assertIsInstance(y, computation_pb2.Computation)
+    self.assert_types_identical(type_spec, value_type)
+
+  def test_deserialize_value_chunks_raises_on_truncated_stream(self):
+    x = np.arange(1000, dtype=np.float32)
+    chunks, _ = executor_serialization.serialize_value_chunks(
+        x,
+        computation_types.TensorType(tf.float32, [1000]),
+        max_chunk_size_bytes=1024)
+    with self.assertRaisesRegex(ValueError, 'ended before'):
+      executor_serialization.deserialize_value_chunks(list(chunks)[:-1])
+
+  def test_deserialize_value_chunks_raises_on_trailing_chunks(self):
+    chunks, _ = executor_serialization.serialize_value_chunks(10, tf.int32)
+    chunks = list(chunks)
+    with self.assertRaisesRegex(ValueError, 'beyond the end'):
+      executor_serialization.deserialize_value_chunks(chunks + chunks)
+
+  def test_serialize_value_chunks_raises_with_nonpositive_chunk_size(self):
+    with self.assertRaises(ValueError):
+      executor_serialization.serialize_value_chunks(
+          10, tf.int32, max_chunk_size_bytes=0)
+
   def test_serialize_sequence_bad_element_type(self):
     x = tf.data.Dataset.range(5).map(lambda x: x * 2)
     with self.assertRaisesRegex(
@@ -19,9 +19,16 @@
 """A service wrapper around an executor that makes it accessible over gRPC."""
 
 import asyncio
+import collections
+from concurrent import futures
 import functools
+import inspect
+import resource
+import sys
 import threading
+import time
 import traceback
+from typing import Iterable, Iterator, List, Optional
 import uuid
 import weakref
 
@@ -35,6 +42,101 @@ from tensorflow_federated.python.common_libs import structure
 from tensorflow_federated.python.common_libs import tracing
 from tensorflow_federated.python.core.impl.executors import executor_factory
 from tensorflow_federated.python.core.impl.executors import executor_serialization
+from tensorflow_federated.python.core.impl.executors import executor_service_stats
+
+
+# The number of values created from requests carrying a content digest that the
+# service holds on to, for reuse by later requests with the same digest.
+_MAX_CONTENT_DIGEST_VALUES = 4
+
+# How often the lag of the event loop of the service is probed, in seconds.
+_EVENT_LOOP_PROBE_INTERVAL_SECONDS = 1.0
+
+
+def _peak_memory_bytes() -> int:
+  """Returns the peak resident memory of this process, in bytes."""
+  max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  # Reported in bytes on macOS, and in kilobytes elsewhere.
+  return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def _schedule_event_loop_probe(loop: asyncio.AbstractEventLoop,
+                               service_ref: weakref.ref):
+  """Schedules a probe measuring how late `loop` runs a callback."""
+  expected_time = loop.time() + _EVENT_LOOP_PROBE_INTERVAL_SECONDS
+
+  def _probe():
+    service = service_ref()
+    if service is None:
+      return
+    service._record_event_loop_lag(loop.time() - expected_time)  # pylint: disable=protected-access
+    del service
+    _schedule_event_loop_probe(loop, service_ref)
+
+  loop.call_at(expected_time, _probe)
+
+
+class _StatusRecordingContext(object):
+  """Wraps a `grpc.ServicerContext`, recording the status code set on it."""
+
+  def __init__(self, context: grpc.ServicerContext):
+    self._context = context
+    self.code = None
+
+  def set_code(self, code: grpc.StatusCode):
+    self.code = code
+    self._context.set_code(code)
+
+  def __getattr__(self, name):
+    return getattr(self._context, name)
+
+
+def _record_rpc(method):
+  """Decorates an RPC method of `ExecutorService`, recording its metrics.
+
+  A call fails if it raises an exception, or sets an error status code. The
+  latency of streaming methods includes the time taken to stream the responses.
+
+  Args:
+    method: The RPC method, a function of the service, the request (or request
+      iterator), and the context.
+
+  Returns:
+    The decorated method.
+  """
+  method_name = method.__name__
+
+  def _is_ok(context):
+    return context.code in (None, grpc.StatusCode.OK)
+
+  if inspect.isgeneratorfunction(method):
+
+    @functools.wraps(method)
+    def _generator_wrapper(self, request, context):
+      context = _StatusRecordingContext(context)
+      start_time = time.monotonic()
+      ok = False
+      try:
+        yield from method(self, request, context)
+        ok = _is_ok(context)
+      finally:
+        self._rpc_stats.record(method_name, time.monotonic() - start_time, ok)  # pylint: disable=protected-access
+
+    return _generator_wrapper
+
+  @functools.wraps(method)
+  def _wrapper(self, request, context):
+    context = _StatusRecordingContext(context)
+    start_time = time.monotonic()
+    ok = False
+    try:
+      response = method(self, request, context)
+      ok = _is_ok(context)
+      return response
+    finally:
+      self._rpc_stats.record(method_name, time.monotonic() - start_time, ok)  # pylint: disable=protected-access
+
+  return _wrapper
 
 
 def _set_invalid_arg_err(context: grpc.ServicerContext, err):
@@ -50,13 +152,49 @@ def _set_unknown_err(context: grpc.ServicerContext, err):
 
 
 class ExecutorService(executor_pb2_grpc.ExecutorServicer):
-  """A wrapper around a target executor that makes it into a gRPC service."""
-
-  def __init__(self, ex_factory: executor_factory.ExecutorFactory, *args,
+  """A wrapper around a target executor that makes it into a gRPC service.
+
+  Values are only dropped when the client disposes of them, or when the service
+  is reconfigured or cleared. Intermediate values consumed by `CreateCall`,
+  `CreateStruct` or `CreateSelection` are not released automatically, since the
+  client still holds references to them which it may use again. A value the
+  client disposes of while pending operations still consume it is dropped once
+  those operations have consumed it.
+  """
+
+  def __init__(self,
+               ex_factory: executor_factory.ExecutorFactory,
+               *args,
+               use_shared_memory: bool = False,
+               max_chunk_size_bytes: Optional[int] = None,
                **kwargs):
+    """Creates the service.
+
+    Args:
+      ex_factory: The `executor_factory.ExecutorFactory` constructing the
+        executor hosted by this service.
+      *args: Positional arguments of `executor_pb2_grpc.ExecutorServicer`.
+      use_shared_memory: Whether large tensors may be returned to clients
+        through shared memory rather than inline in the responses. Only valid
+        if all clients run on the same host as this service.
+      max_chunk_size_bytes: The optional maximum size of the tensor content in
+        each chunk of a result returned by `ComputeStream`. Defaults to that of
+        `executor_serialization.serialize_value_chunks`.
+      **kwargs: Keyword arguments of `executor_pb2_grpc.ExecutorServicer`.
+    """
     py_typecheck.check_type(ex_factory, executor_factory.ExecutorFactory)
+    py_typecheck.check_type(use_shared_memory, bool)
+    if max_chunk_size_bytes is not None:
+      py_typecheck.check_type(max_chunk_size_bytes, int)
+      if max_chunk_size_bytes < 1:
+        raise ValueError('Expected a positive `max_chunk_size_bytes`, found '
+                         f'{max_chunk_size_bytes}.')
     super().__init__(*args, **kwargs)
     self._ex_factory = ex_factory
+    self._use_shared_memory = use_shared_memory
+    self._chunking_kwargs = {}
+    if max_chunk_size_bytes is not None:
+      self._chunking_kwargs['max_chunk_size_bytes'] = max_chunk_size_bytes
     self._executor = None
     self._lock = threading.Lock()
 
@@ -65,6 +203,26 @@ class ExecutorService(executor_pb2_grpc.ExecutorServicer):
     # instances (this may, and probably will change as we flesh out the rest
     # of this implementation).
     self._values = {}
+    # Values are reference counted: a value stays in `self._values` as long as
+    # the client holds its id, or operations which consume it are pending. The
+    # number of pending consumers of each value, and the ids the client has
+    # disposed of while consumers were still pending.
+    self._num_consumers = collections.Counter()
+    self._disposed_ids = set()
+    # The largest number of values held at once, since the service started.
+    self._max_num_values = 0
+    # The serialized size of each value created from a request carrying it.
+    self._value_bytes = {}
+
+    self._rpc_stats = executor_service_stats.RpcStatsRecorder()
+    # The number of operations scheduled on the event loop, not yet completed.
+    self._num_pending_operations = 0
+    self._event_loop_lag_seconds = 0.0
+    self._max_event_loop_lag_seconds = 0.0
+
+    # The most recent values created from requests carrying a content digest,
+    # keyed by the digest, in least-recently-used order.
+    self._content_values = collections.OrderedDict()
 
     def run_loop(loop):
       loop.run_forever()
@@ -82,13 +240,60 @@ class ExecutorService(executor_pb2_grpc.ExecutorServicer):
       thread.join()
 
     weakref.finalize(self, finalize, self._event_loop, self._thread)
+    self._event_loop.call_soon_threadsafe(_schedule_event_loop_probe,
+                                          self._event_loop, weakref.ref(self))
 
   def _run_coro_threadsafe_with_tracing(self, coro):
     """Runs `coro` on `self._event_loop` inside the current trace spans."""
+    with self._lock:
+      self._num_pending_operations += 1
     with tracing.with_trace_context_from_rpc():
-      return asyncio.run_coroutine_threadsafe(
+      future = asyncio.run_coroutine_threadsafe(
           tracing.wrap_coroutine_in_current_trace_context(coro),
           self._event_loop)
+    future.add_done_callback(self._complete_operation)
+    return future
+
+  def _complete_operation(self, future: futures.Future):
+    del future  # Unused.
+    with self._lock:
+      self._num_pending_operations -= 1
+
+  def _record_event_loop_lag(self, lag_seconds: float):
+    with self._lock:
+      self._event_loop_lag_seconds = lag_seconds
+      self._max_event_loop_lag_seconds = max(self._max_event_loop_lag_seconds,
+                                             lag_seconds)
+
+  def get_stats(self) -> executor_pb2.GetStatsResponse:
+    """Returns the operational metrics of the service."""
+    with self._lock:
+      return executor_pb2.GetStatsResponse(
+          rpc_stats=self._rpc_stats.to_protos(),
+          num_values=len(self._values),
+          value_bytes=sum(self._value_bytes.values()),
+          max_num_values=self._max_num_values,
+          peak_memory_bytes=_peak_memory_bytes(),
+          event_loop_lag_seconds=self._event_loop_lag_seconds,
+          max_event_loop_lag_seconds=self._max_event_loop_lag_seconds,
+          queue_depth=self._num_pending_operations)
+
+  @property
+  def num_values(self) -> int:
+    """The number of values currently held by the service."""
+    with self._lock:
+      return len(self._values)
+
+  @property
+  def max_num_values(self) -> int:
+    """The largest number of values held at once by the service."""
+    with self._lock:
+      return self._max_num_values
+
+  @property
+  def peak_memory_bytes(self) -> int:
+    """The high-water mark of the memory of the process hosting the service."""
+    return _peak_memory_bytes()
 
   @property
   def executor(self):
@@ -98,6 +303,7 @@ class ExecutorService(executor_pb2_grpc.ExecutorServicer):
                          'concrete requests.')
     return self._executor
 
+  @_record_rpc
   def SetCardinalities(
       self,
       request: executor_pb2.SetCardinalitiesRequest,
@@ -108,12 +314,14 @@ class ExecutorService(executor_pb2_grpc.ExecutorServicer):
     try:
       cardinalities_dict = executor_serialization.deserialize_cardinalities(
           request.cardinalities)
+      self._clear_values()
       self._executor = self._ex_factory.create_executor(cardinalities_dict)
       return executor_pb2.SetCardinalitiesResponse()
     except (ValueError, TypeError) as err:
       _set_invalid_arg_err(context, err)
       return executor_pb2.SetCardinalitiesResponse()
 
+  @_record_rpc
   def ClearExecutor(
       self,
       request: executor_pb2.ClearExecutorRequest,
@@ -121,32 +329,237 @@ class ExecutorService(executor_pb2_grpc.ExecutorServicer):
   ) -> executor_pb2.ClearExecutorResponse:
     """Clears the service Executor-related state."""
     py_typecheck.check_type(request, executor_pb2.ClearExecutorRequest)
+    self._clear_values()
     self._executor = None
     self._ex_factory.clean_up_executors()
     return executor_pb2.ClearExecutorResponse()
 
+  def _register_value(self,
+                      value_id: str,
+                      future_val: futures.Future,
+                      num_bytes: int = 0):
+    """Stores `future_val` under `value_id`, which must not be in use.
+
+    Args:
+      value_id: The id of the value.
+      future_val: The future of the executor value.
+      num_bytes: The serialized size of the value, if created from a request
+        carrying it.
+
+    Raises:
+      ValueError: If `value_id` is already in use.
+    """
+    with self._lock:
+      if value_id in self._values:
+        raise ValueError(f'A value with id {value_id} already exists.')
+      self._values[value_id] = future_val
+      if num_bytes:
+        self._value_bytes[value_id] = num_bytes
+      self._max_num_values = max(self._max_num_values, len(self._values))
+
+  def _acquire_values(self, value_ids: Iterable[str]) -> List[futures.Future]:
+    """Returns the values with `value_ids`, held until `_release_values`.
+
+    Args:
+      value_ids: The ids of the values consumed by a pending operation.
+
+    Returns:
+      A list with the future of each value.
+
+    Raises:
+      KeyError: If any of `value_ids` is not held by the service, or has been
+        disposed of.
+    """
+    value_ids = list(value_ids)
+    with self._lock:
+      for value_id in value_ids:
+        if value_id in self._disposed_ids:
+          raise KeyError(f'Value {value_id} has been disposed of.')
+      future_vals = [self._values[value_id] for value_id in value_ids]
+      self._num_consumers.update(value_ids)
+      return future_vals
+
+  def _release_values(self, value_ids: Iterable[str]):
+    """Releases values acquired by an operation, once it has consumed them."""
+    with self._lock:
+      for value_id in value_ids:
+        self._num_consumers[value_id] -= 1
+        if self._num_consumers[value_id] > 0:
+          continue
+        del self._num_consumers[value_id]
+        if value_id in self._disposed_ids:
+          self._disposed_ids.discard(value_id)
+          self._values.pop(value_id, None)
+          self._value_bytes.pop(value_id, None)
+
+  def _clear_values(self):
+    """Drops all values, which belong to the executor about to be replaced."""
+    with self._lock:
+      if self._values:
+        logging.info(
+            'Dropping %s values; at most %s values were held at once, and '
+            'the peak memory of the worker is %s bytes.', len(self._values),
+            self._max_num_values, _peak_memory_bytes())
+      self._values.clear()
+      self._value_bytes.clear()
+      self._num_consumers.clear()
+      self._disposed_ids.clear()
+      self._content_values.clear()
+
+  def _get_content_value(self, digest: bytes) -> Optional[futures.Future]:
+    """Returns the value created with content `digest`, if still held."""
+    with self._lock:
+      future_val = self._content_values.get(digest)
+      if future_val is not None:
+        self._content_values.move_to_end(digest)
+      return future_val
+
+  def _put_content_value(self, digest: bytes, future_val: futures.Future):
+    with self._lock:
+      self._content_values[digest] = future_val
+      self._content_values.move_to_end(digest)
+      while len(self._content_values) > _MAX_CONTENT_DIGEST_VALUES:
+        self._content_values.popitem(last=False)
+
+  def _create_value(
+      self, request: executor_pb2.CreateValueRequest) -> futures.Future:
+    """Schedules the creation of the value in `request` on the executor."""
+    with tracing.span('ExecutorService.CreateValue', 'deserialize_value'):
+      value, value_type = (
+          executor_serialization.deserialize_value(request.value))
+    return self._embed_value(value, value_type)
+
+  def _embed_value(self, value, value_type) -> futures.Future:
+    """Schedules the creation of a deserialized value on the executor."""
+    coro = self.executor.create_value(value, value_type)
+    return self._run_coro_threadsafe_with_tracing(coro)
+
+  def _create_call(
+      self, request: executor_pb2.CreateCallRequest) -> futures.Future:
+    """Schedules the creation of the call in `request` on the executor."""
+    value_ids = [str(request.function_ref.id)]
+    if request.argument_ref.id:
+      value_ids.append(str(request.argument_ref.id))
+    future_vals = self._acquire_values(value_ids)
+
+    async def _process_create_call():
+      try:
+        function, *argument = await asyncio.gather(
+            *[asyncio.wrap_future(v) for v in future_vals])
+        argument = argument[0] if argument else None
+        return await self.executor.create_call(function, argument)
+      finally:
+        self._release_values(value_ids)
+
+    return self._run_coro_threadsafe_with_tracing(_process_create_call())
+
+  def _create_struct(
+      self, request: executor_pb2.CreateStructRequest) -> futures.Future:
+    """Schedules the creation of the struct in `request` on the executor."""
+    value_ids = [str(e.value_ref.id) for e in request.element]
+    elem_futures = self._acquire_values(value_ids)
+    elem_names = [
+        str(elem.name) if elem.name else None for elem in request.element
+    ]
+
+    async def _process_create_struct():
+      try:
+        elem_values = await asyncio.gather(
+            *[asyncio.wrap_future(v) for v in elem_futures])
+        elements = list(zip(elem_names, elem_values))
+        struct = structure.Struct(elements)
+        return await self.executor.create_struct(struct)
+      finally:
+        self._release_values(value_ids)
+
+    return self._run_coro_threadsafe_with_tracing(_process_create_struct())
+
+  def _create_selection(
+      self, request: executor_pb2.CreateSelectionRequest) -> futures.Future:
+    """Schedules the creation of the selection in `request` on the executor."""
+    value_ids = [str(request.source_ref.id)]
+    source_fut, = self._acquire_values(value_ids)
+
+    async def _process_create_selection():
+      try:
+        source = await asyncio.wrap_future(source_fut)
+        return await self.executor.create_selection(source, request.index)
+      finally:
+        self._release_values(value_ids)
+
+    return self._run_coro_threadsafe_with_tracing(_process_create_selection())
+
+  @_record_rpc
   def CreateValue(
       self,
       request: executor_pb2.CreateValueRequest,
       context: grpc.ServicerContext,
   ) -> executor_pb2.CreateValueResponse:
-    """Creates a value embedded in the executor."""
+    """Creates a value embedded in the executor.
+
+    If `request` carries a content digest but no value, the value previously
+    created with the same digest is reused; values embedded in the executor are
+    immutable, so the new reference may safely share it.
+
+    Args:
+      request: An instance of `executor_pb2.CreateValueRequest`.
+      context: An instance of `grpc.ServicerContext`.
+
+    Returns:
+      An instance of `executor_pb2.CreateValueResponse`.
+    """
     py_typecheck.check_type(request, executor_pb2.CreateValueRequest)
     try:
-      with tracing.span('ExecutorService.CreateValue', 'deserialize_value'):
-        value, value_type = (
-            executor_serialization.deserialize_value(request.value))
+      digest = request.content_digest
+      if digest and not request.HasField('value'):
+        future_val = self._get_content_value(digest)
+        if future_val is None:
+          context.set_code(grpc.StatusCode.NOT_FOUND)
+          context.set_details('No value with the requested content digest; '
+                              'resend the request with the value.')
+          return executor_pb2.CreateValueResponse()
+      else:
+        future_val = self._create_value(request)
+        if digest:
+          self._put_content_value(digest, future_val)
+      value_id = str(uuid.uuid4())
+      self._register_value(value_id, future_val, request.value.ByteSize())
+      return executor_pb2.CreateValueResponse(
+          value_ref=executor_pb2.ValueRef(id=value_id))
+    except (ValueError, TypeError) as err:
+      _set_invalid_arg_err(context, err)
+      return executor_pb2.CreateValueResponse()
+
+  @_record_rpc
+  def CreateValueStream(
+      self,
+      request_iterator: Iterator[executor_pb2.CreateValueStreamRequest],
+      context: grpc.ServicerContext,
+  ) -> executor_pb2.CreateValueResponse:
+    """Creates a value streamed in chunks, reassembling it as they arrive."""
+    num_bytes = 0
+
+    def _chunks():
+      nonlocal num_bytes
+      for request in request_iterator:
+        num_bytes += request.chunk.ByteSize()
+        yield request.chunk
+
+    try:
+      with tracing.span('ExecutorService.CreateValueStream',
+                        'deserialize_value_chunks'):
+        value, value_type = executor_serialization.deserialize_value_chunks(
+            _chunks())
+      future_val = self._embed_value(value, value_type)
       value_id = str(uuid.uuid4())
-      coro = self.executor.create_value(value, value_type)
-      future_val = self._run_coro_threadsafe_with_tracing(coro)
-      with self._lock:
-        self._values[value_id] = future_val
+      self._register_value(value_id, future_val, num_bytes)
       return executor_pb2.CreateValueResponse(
           value_ref=executor_pb2.ValueRef(id=value_id))
     except (ValueError, TypeError) as err:
       _set_invalid_arg_err(context, err)
       return executor_pb2.CreateValueResponse()
 
+  @_record_rpc
   def CreateCall(
       self,
       request: executor_pb2.CreateCallRequest,
@@ -155,29 +568,16 @@ class ExecutorService(executor_pb2_grpc.ExecutorServicer):
     """Creates a call embedded in the executor."""
     py_typecheck.check_type(request, executor_pb2.CreateCallRequest)
     try:
-      function_id = str(request.function_ref.id)
-      argument_id = str(request.argument_ref.id)
-      with self._lock:
-        function_val = self._values[function_id]
-        argument_val = self._values[argument_id] if argument_id else None
-
-      async def _process_create_call():
-        function = await asyncio.wrap_future(function_val)
-        argument = await asyncio.wrap_future(
-            argument_val) if argument_val is not None else None
-        return await self.executor.create_call(function, argument)
-
-      coro = _process_create_call()
-      result_fut = self._run_coro_threadsafe_with_tracing(coro)
+      result_fut = self._create_call(request)
       result_id = str(uuid.uuid4())
-      with self._lock:
-        self._values[result_id] = result_fut
+      self._register_value(result_id, result_fut)
       return executor_pb2.CreateCallResponse(
           value_ref=executor_pb2.ValueRef(id=result_id))
     except (ValueError, TypeError) as err:
       _set_invalid_arg_err(context, err)
       return executor_pb2.CreateCallResponse()
 
+  @_record_rpc
   def CreateStruct(
       self,
       request: executor_pb2.CreateStructRequest,
@@ -186,30 +586,16 @@ class ExecutorService(executor_pb2_grpc.ExecutorServicer):
     """Creates a struct embedded in the executor."""
     py_typecheck.check_type(request, executor_pb2.CreateStructRequest)
     try:
-      with self._lock:
-        elem_futures = [self._values[e.value_ref.id] for e in request.element]
-      elem_names = [
-          str(elem.name) if elem.name else None for elem in request.element
-      ]
-
-      async def _process_create_struct():
-        elem_values = await asyncio.gather(
-            *[asyncio.wrap_future(v) for v in elem_futures])
-        elements = list(zip(elem_names, elem_values))
-        struct = structure.Struct(elements)
-        return await self.executor.create_struct(struct)
-
-      result_fut = self._run_coro_threadsafe_with_tracing(
-          _process_create_struct())
+      result_fut = self._create_struct(request)
       result_id = str(uuid.uuid4())
-      with self._lock:
-        self._values[result_id] = result_fut
+      self._register_value(result_id, result_fut)
       return executor_pb2.CreateStructResponse(
           value_ref=executor_pb2.ValueRef(id=result_id))
     except (ValueError, TypeError) as err:
       _set_invalid_arg_err(context, err)
       return executor_pb2.CreateStructResponse()
 
+  @_record_rpc
   def CreateSelection(
       self,
       request: executor_pb2.CreateSelectionRequest,
@@ -218,24 +604,16 @@ class ExecutorService(executor_pb2_grpc.ExecutorServicer):
     """Creates a selection embedded in the executor."""
     py_typecheck.check_type(request, executor_pb2.CreateSelectionRequest)
     try:
-      with self._lock:
-        source_fut = self._values[request.source_ref.id]
-
-      async def _process_create_selection():
-        source = await asyncio.wrap_future(source_fut)
-        return await self.executor.create_selection(source, request.index)
-
-      result_fut = self._run_coro_threadsafe_with_tracing(
-          _process_create_selection())
+      result_fut = self._create_selection(request)
       result_id = str(uuid.uuid4())
-      with self._lock:
-        self._values[result_id] = result_fut
+      self._register_value(result_id, result_fut)
       return executor_pb2.CreateSelectionResponse(
           value_ref=executor_pb2.ValueRef(id=result_id))
     except (ValueError, TypeError) as err:
       _set_invalid_arg_err(context, err)
       return executor_pb2.CreateSelectionResponse()
 
+  @_record_rpc
   def Compute(
       self,
       request: executor_pb2.ComputeRequest,
@@ -245,6 +623,53 @@ class ExecutorService(executor_pb2_grpc.ExecutorServicer):
     return self._run_coro_threadsafe_with_tracing(
         self._Compute(request, context)).result()
 
+  async def _compute_result(self, value_id: str, future_val: futures.Future):
+    """Computes the executor value in `future_val`, with its type.
+
+    Args:
+      value_id: The id of the value, acquired by the caller and released once
+        computed.
+      future_val: The future of the executor value to compute.
+
+    Returns:
+      A tuple of the computed value and its type.
+    """
+    try:
+      val = await asyncio.wrap_future(future_val)
+      result_val = await val.compute()
+      return result_val, val.type_signature
+    finally:
+      self._release_values([value_id])
+
+  async def _compute_value(
+      self, value_id: str, future_val: futures.Future,
+      request: executor_pb2.ComputeRequest) -> executor_pb2.Value:
+    """Computes the executor value in `future_val` and serializes the result.
+
+    The floating-point tensors of the result are serialized in the encoding the
+    client asked for in `request`, if any.
+
+    Args:
+      value_id: The id of the value, acquired by the caller and released once
+        computed.
+      future_val: The future of the executor value to compute.
+      request: The `executor_pb2.ComputeRequest` asking for the value.
+
+    Returns:
+      An instance of `executor_pb2.Value`.
+    """
+    result_val, val_type = await self._compute_result(value_id, future_val)
+    if request.HasField('tensor_encoding'):
+      tensor_encoding = request.tensor_encoding
+    else:
+      tensor_encoding = None
+    value_proto, _ = executor_serialization.serialize_value(
+        result_val,
+        val_type,
+        use_shared_memory=self._use_shared_memory,
+        tensor_encoding=tensor_encoding)
+    return value_proto
+
   async def _Compute(
       self,
       request: executor_pb2.ComputeRequest,
@@ -254,29 +679,152 @@ class ExecutorService(executor_pb2_grpc.ExecutorServicer):
     py_typecheck.check_type(request, executor_pb2.ComputeRequest)
     try:
       value_id = str(request.value_ref.id)
-      with self._lock:
-        future_val = asyncio.wrap_future(self._values[value_id])
-      val = await future_val
-      result_val = await val.compute()
-      val_type = val.type_signature
-      value_proto, _ = executor_serialization.serialize_value(
-          result_val, val_type)
+      future_val, = self._acquire_values([value_id])
+      value_proto = await self._compute_value(value_id, future_val, request)
       return executor_pb2.ComputeResponse(value=value_proto)
     except (ValueError, TypeError) as err:
       _set_invalid_arg_err(context, err)
       return executor_pb2.ComputeResponse()
 
+  @_record_rpc
+  def ComputeStream(
+      self,
+      request: executor_pb2.ComputeRequest,
+      context: grpc.ServicerContext,
+  ) -> Iterator[executor_pb2.ComputeStreamResponse]:
+    """Computes a value embedded in the executor, streaming it back in chunks.
+
+    The chunks are serialized one at a time, as gRPC consumes them, so only a
+    bounded part of the serialized result is held in memory at any time.
+
+    Args:
+      request: An instance of `executor_pb2.ComputeRequest`.
+      context: An instance of `grpc.ServicerContext`.
+
+    Yields:
+      Instances of `executor_pb2.ComputeStreamResponse`.
+    """
+    py_typecheck.check_type(request, executor_pb2.ComputeRequest)
+    try:
+      value_id = str(request.value_ref.id)
+      future_val, = self._acquire_values([value_id])
+      result_val, val_type = self._run_coro_threadsafe_with_tracing(
+          self._compute_result(value_id, future_val)).result()
+      chunks, _ = executor_serialization.serialize_value_chunks(
+          result_val, val_type, **self._chunking_kwargs)
+      for chunk in chunks:
+        yield executor_pb2.ComputeStreamResponse(chunk=chunk)
+    except (ValueError, TypeError) as err:
+      _set_invalid_arg_err(context, err)
+
+  @_record_rpc
+  def Execute(
+      self,
+      request: executor_pb2.ExecuteRequest,
+      context: grpc.ServicerContext,
+  ) -> Iterator[executor_pb2.ExecuteResponse]:
+    """Executes a batch of operations, streaming back the computed results.
+
+    All operations are registered with the executor before anything is sent
+    back, in the order in which they appear in `request`; their execution is
+    scheduled on the service event loop and proceeds concurrently. The first
+    response confirms the registration, after which the results of the
+    `compute` operations are streamed back as soon as each one is available.
+
+    Args:
+      request: An instance of `executor_pb2.ExecuteRequest`.
+      context: An instance of `grpc.ServicerContext`.
+
+    Yields:
+      Instances of `executor_pb2.ExecuteResponse`.
+    """
+    py_typecheck.check_type(request, executor_pb2.ExecuteRequest)
+    compute_futures = {}
+    try:
+      for operation in request.operation:
+        kind = operation.WhichOneof('operation')
+        if kind == 'compute':
+          value_ref = operation.compute.value_ref
+          value_id = str(value_ref.id)
+          future_val, = self._acquire_values([value_id])
+          compute_future = self._run_coro_threadsafe_with_tracing(
+              self._compute_value(value_id, future_val, operation.compute))
+          compute_futures[compute_future] = value_ref
+        elif kind == 'dispose':
+          self._dispose_values(operation.dispose)
+        else:
+          result_id = str(operation.result_ref.id)
+          if not result_id:
+            raise ValueError(
+                f'Operation {kind} requires a `result_ref` to be specified.')
+          num_bytes = 0
+          if kind == 'create_value':
+            result_fut = self._create_value(operation.create_value)
+            num_bytes = operation.create_value.value.ByteSize()
+          elif kind == 'create_call':
+            result_fut = self._create_call(operation.create_call)
+          elif kind == 'create_struct':
+            result_fut = self._create_struct(operation.create_struct)
+          elif kind == 'create_selection':
+            result_fut = self._create_selection(operation.create_selection)
+          else:
+            raise ValueError(f'Unknown operation: {kind}.')
+          self._register_value(result_id, result_fut, num_bytes)
+    except (ValueError, TypeError, KeyError) as err:
+      _set_invalid_arg_err(context, err)
+      return
+    yield executor_pb2.ExecuteResponse(
+        operations_registered=executor_pb2.ExecuteResponse
+        .OperationsRegistered())
+    try:
+      for compute_future in futures.as_completed(compute_futures):
+        yield executor_pb2.ExecuteResponse(
+            compute_result=executor_pb2.ExecuteResponse.ComputeResult(
+                value_ref=compute_futures[compute_future],
+                value=compute_future.result()))
+    except (ValueError, TypeError) as err:
+      _set_invalid_arg_err(context, err)
+
+  def _dispose_values(self, request: executor_pb2.DisposeRequest):
+    """Releases the client references to the values in `request`.
+
+    Values still consumed by pending operations are only dropped once these
+    operations have consumed them. Values the service no longer holds, such as
+    those of a cleared executor, are ignored.
+
+    Args:
+      request: An instance of `executor_pb2.DisposeRequest`.
+    """
+    with self._lock:
+      for value_ref in request.value_ref:
+        value_id = str(value_ref.id)
+        if value_id not in self._values:
+          logging.debug('Ignoring disposal of unknown value %s.', value_id)
+        elif self._num_consumers[value_id] > 0:
+          self._disposed_ids.add(value_id)
+        else:
+          del self._num_consumers[value_id]
+          del self._values[value_id]
+          self._value_bytes.pop(value_id, None)
+
+  @_record_rpc
   def Dispose(
       self,
       request: executor_pb2.DisposeRequest,
       context: grpc.ServicerContext,
   ) -> executor_pb2.DisposeResponse:
     """Disposes of a value, making it no longer available for future calls."""
+    del context  # Unused, unknown values are ignored.
     py_typecheck.check_type(request, executor_pb2.DisposeRequest)
-    try:
-      with self._lock:
-        for value_ref in request.value_ref:
-          del self._values[value_ref.id]
-    except KeyError as err:
-      _set_invalid_arg_err(context, err)
+    self._dispose_values(request)
     return executor_pb2.DisposeResponse()
+
+  def GetStats(
+      self,
+      request: executor_pb2.GetStatsRequest,
+      context: grpc.ServicerContext,
+  ) -> executor_pb2.GetStatsResponse:
+    """Returns the operational metrics of the service."""
+    del context  # Unused.
+    py_typecheck.check_type(request, executor_pb2.GetStatsRequest)
+    return self.get_stats()
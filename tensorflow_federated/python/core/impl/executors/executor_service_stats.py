@@ -0,0 +1,136 @@
+# Copyright 2021, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Operational metrics of an `executor_service.ExecutorService`."""
+
+import bisect
+import threading
+from typing import List
+
+from tensorflow_federated.proto.v0 import executor_pb2
+
+# The upper bounds of the buckets of the latency histograms, in seconds.
+_LATENCY_BUCKET_BOUNDS_SECONDS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0,
+                                  10.0, 60.0)
+
+# The prefix of the names of the metrics in the Prometheus text format.
+_PROMETHEUS_PREFIX = 'tff_executor_service'
+
+
+class _RpcStats(object):
+  """The metrics of a single RPC method."""
+
+  def __init__(self):
+    self.count = 0
+    self.error_count = 0
+    self.latency_bucket_counts = [0] * (len(_LATENCY_BUCKET_BOUNDS_SECONDS) + 1)
+    self.latency_sum_seconds = 0.0
+
+
+class RpcStatsRecorder(object):
+  """Records the number, failures and latency of the RPCs of a service."""
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self._stats = {}
+
+  def record(self, method: str, latency_seconds: float, ok: bool):
+    """Records a call to `method` which took `latency_seconds`.
+
+    Args:
+      method: The name of the RPC method.
+      latency_seconds: The time taken to serve the call.
+      ok: Whether the call succeeded.
+    """
+    bucket = bisect.bisect_left(_LATENCY_BUCKET_BOUNDS_SECONDS, latency_seconds)
+    with self._lock:
+      stats = self._stats.get(method)
+      if stats is None:
+        stats = self._stats[method] = _RpcStats()
+      stats.count += 1
+      if not ok:
+        stats.error_count += 1
+      stats.latency_bucket_counts[bucket] += 1
+      stats.latency_sum_seconds += latency_seconds
+
+  def to_protos(self) -> List[executor_pb2.GetStatsResponse.RpcStats]:
+    """Returns the metrics of each method called so far, sorted by name."""
+    with self._lock:
+      return [
+          executor_pb2.GetStatsResponse.RpcStats(
+              method=method,
+              count=stats.count,
+              error_count=stats.error_count,
+              latency_bucket_bounds_seconds=_LATENCY_BUCKET_BOUNDS_SECONDS,
+              latency_bucket_counts=stats.latency_bucket_counts,
+              latency_sum_seconds=stats.latency_sum_seconds)
+          for method, stats in sorted(self._stats.items())
+      ]
+
+
+def format_prometheus_text(stats: executor_pb2.GetStatsResponse) -> str:
+  """Formats `stats` in the text exposition format of Prometheus.
+
+  Args:
+    stats: An instance of `executor_pb2.GetStatsResponse`.
+
+  Returns:
+    A string, with the latencies of the RPCs as histograms, their counts as
+    counters, and the remaining metrics as gauges.
+  """
+  lines = []
+
+  def _add_metric(name, metric_type, help_text, samples):
+    name = f'{_PROMETHEUS_PREFIX}_{name}'
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} {metric_type}')
+    for suffix, labels, value in samples:
+      label_text = ','.join(f'{k}="{v}"' for k, v in labels)
+      if label_text:
+        label_text = '{' + label_text + '}'
+      lines.append(f'{name}{suffix}{label_text} {value}')
+
+  _add_metric('rpc_count', 'counter', 'The number of RPCs served.',
+              [('', [('method', s.method)], s.count) for s in stats.rpc_stats])
+  _add_metric('rpc_error_count', 'counter', 'The number of RPCs which failed.',
+              [('', [('method', s.method)], s.error_count)
+               for s in stats.rpc_stats])
+  latency_samples = []
+  for rpc_stats in stats.rpc_stats:
+    cumulative_count = 0
+    bounds = [repr(b) for b in rpc_stats.latency_bucket_bounds_seconds]
+    for bound, count in zip(bounds + ['+Inf'],
+                            rpc_stats.latency_bucket_counts):
+      cumulative_count += count
+      latency_samples.append(('_bucket', [('method', rpc_stats.method),
+                                          ('le', bound)], cumulative_count))
+    latency_samples.append(('_sum', [('method', rpc_stats.method)],
+                            rpc_stats.latency_sum_seconds))
+    latency_samples.append(('_count', [('method', rpc_stats.method)],
+                            rpc_stats.count))
+  _add_metric('rpc_latency_seconds', 'histogram', 'The latency of the RPCs.',
+              latency_samples)
+  for name, help_text in [
+      ('num_values', 'The number of values held.'),
+      ('value_bytes', 'The serialized size of the values created from '
+       'requests.'),
+      ('max_num_values', 'The largest number of values held at once.'),
+      ('peak_memory_bytes', 'The peak memory of the process.'),
+      ('event_loop_lag_seconds', 'How late the latest probe of the event loop '
+       'ran.'),
+      ('max_event_loop_lag_seconds', 'How late the latest ever probe of the '
+       'event loop ran.'),
+      ('queue_depth', 'The number of operations pending on the event loop.'),
+  ]:
+    _add_metric(name, 'gauge', help_text, [('', [], getattr(stats, name))])
+  return '\n'.join(lines) + '\n'
@@ -0,0 +1,73 @@
+# Copyright 2021, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from absl.testing import absltest
+
+from tensorflow_federated.proto.v0 import executor_pb2
+from tensorflow_federated.python.core.impl.executors import executor_service_stats
+
+
+class RpcStatsRecorderTest(absltest.TestCase):
+
+  def test_records_counts_and_latencies(self):
+    recorder = executor_service_stats.RpcStatsRecorder()
+    recorder.record('Compute', 0.02, ok=True)
+    recorder.record('Compute', 100.0, ok=False)
+    recorder.record('CreateValue', 0.0005, ok=True)
+
+    compute_stats, create_value_stats = recorder.to_protos()
+
+    self.assertEqual(compute_stats.method, 'Compute')
+    self.assertEqual(compute_stats.count, 2)
+    self.assertEqual(compute_stats.error_count, 1)
+    self.assertAlmostEqual(compute_stats.latency_sum_seconds, 100.02)
+    bounds = list(compute_stats.latency_bucket_bounds_seconds)
+    counts = list(compute_stats.latency_bucket_counts)
+    self.assertLen(counts, len(bounds) + 1)
+    self.assertEqual(counts[bounds.index(0.05)], 1)
+    self.assertEqual(counts[-1], 1)
+    self.assertEqual(create_value_stats.method, 'CreateValue')
+    self.assertEqual(create_value_stats.latency_bucket_counts[0], 1)
+
+
+class FormatPrometheusTextTest(absltest.TestCase):
+
+  def test_formats_histograms_and_gauges(self):
+    recorder = executor_service_stats.RpcStatsRecorder()
+    recorder.record('Compute', 0.02, ok=True)
+    stats = executor_pb2.GetStatsResponse(
+        rpc_stats=recorder.to_protos(), num_values=3, queue_depth=2)
+
+    text = executor_service_stats.format_prometheus_text(stats)
+
+    lines = text.splitlines()
+    self.assertIn('# TYPE tff_executor_service_rpc_latency_seconds histogram',
+                  lines)
+    self.assertIn(
+        'tff_executor_service_rpc_count{method="Compute"} 1', lines)
+    self.assertIn(
+        'tff_executor_service_rpc_latency_seconds_bucket'
+        '{method="Compute",le="0.01"} 0', lines)
+    self.assertIn(
+        'tff_executor_service_rpc_latency_seconds_bucket'
+        '{method="Compute",le="0.05"} 1', lines)
+    self.assertIn(
+        'tff_executor_service_rpc_latency_seconds_bucket'
+        '{method="Compute",le="+Inf"} 1', lines)
+    self.assertIn('tff_executor_service_num_values 3', lines)
+    self.assertIn('tff_executor_service_queue_depth 2', lines)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -18,6 +18,7 @@ from unittest import mock
 from absl.testing import absltest
 import grpc
 from grpc.framework.foundation import logging_pool
+import numpy as np
 import portpicker
 import tensorflow as tf
 
@@ -32,6 +33,7 @@ from tensorflow_federated.python.core.impl.executors import executor_serializati
 from tensorflow_federated.python.core.impl.executors import executor_service
 from tensorflow_federated.python.core.impl.executors import executor_stacks
 from tensorflow_federated.python.core.impl.executors import executor_value_base
+from tensorflow_federated.python.core.impl.types import computation_types
 from tensorflow_federated.python.core.impl.types import placements
 
 
@@ -66,6 +68,10 @@ class TestEnv(object):
   def stub(self):
     return self._stub
 
+  @property
+  def service(self):
+    return self._service
+
   def get_value(self, value_id: str):
     """Retrieves a value using the `Compute` endpoint."""
     response = self._stub.Compute(
@@ -155,6 +161,54 @@ class ExecutorServiceTest(absltest.TestCase):
     self.assertEqual(value, 10.0)
     del env
 
+  def test_executor_service_reuses_value_with_content_digest(self):
+    ex_factory = executor_stacks.ResourceManagingExecutorFactory(
+        lambda _: eager_tf_executor.EagerTFExecutor())
+    env = TestEnv(ex_factory)
+    value_proto, _ = executor_serialization.serialize_value(
+        tf.constant(10.0).numpy(), tf.float32)
+    first_response = env.stub.CreateValue(
+        executor_pb2.CreateValueRequest(
+            value=value_proto, content_digest=b'digest'))
+    second_response = env.stub.CreateValue(
+        executor_pb2.CreateValueRequest(content_digest=b'digest'))
+    self.assertNotEqual(first_response.value_ref.id,
+                        second_response.value_ref.id)
+    self.assertIs(
+        env.get_value_future_directly(first_response.value_ref.id),
+        env.get_value_future_directly(second_response.value_ref.id))
+    self.assertEqual(env.get_value(second_response.value_ref.id), 10.0)
+    del env
+
+  def test_executor_service_raises_not_found_with_unknown_content_digest(self):
+    ex_factory = executor_stacks.ResourceManagingExecutorFactory(
+        lambda _: eager_tf_executor.EagerTFExecutor())
+    env = TestEnv(ex_factory)
+    with self.assertRaises(grpc.RpcError) as context:
+      env.stub.CreateValue(
+          executor_pb2.CreateValueRequest(content_digest=b'digest'))
+    self.assertEqual(context.exception.code(), grpc.StatusCode.NOT_FOUND)
+    del env
+
+  def test_executor_service_stream_large_tensor_value(self):
+    ex_factory = executor_stacks.ResourceManagingExecutorFactory(
+        lambda _: eager_tf_executor.EagerTFExecutor())
+    env = TestEnv(ex_factory)
+    # Larger than the default 4 MB limit on the size of a single gRPC message.
+    x = np.ones([2048, 1024], dtype=np.float32)
+    chunks, _ = executor_serialization.serialize_value_chunks(
+        x, computation_types.TensorType(tf.float32, [2048, 1024]))
+    response = env.stub.CreateValueStream(
+        executor_pb2.CreateValueStreamRequest(chunk=chunk) for chunk in chunks)
+    self.assertIsInstance(response, executor_pb2.CreateValueResponse)
+    responses = env.stub.ComputeStream(
+        executor_pb2.ComputeRequest(value_ref=response.value_ref))
+    value, _ = executor_serialization.deserialize_value_chunks(
+        r.chunk for r in responses)
+    self.assertEqual(value.shape, (2048, 1024))
+    self.assertTrue((value == 1.0).all())
+    del env
+
   def test_executor_service_create_no_arg_computation_value_and_call(self):
     ex_factory = executor_stacks.ResourceManagingExecutorFactory(
         lambda _: eager_tf_executor.EagerTFExecutor())
@@ -200,6 +254,76 @@ class ExecutorServiceTest(absltest.TestCase):
     with self.assertRaises(KeyError):
       env.get_value_future_directly(value_id)
 
+  def test_executor_service_disposes_value_once_consumed(self):
+    ex_factory = executor_stacks.ResourceManagingExecutorFactory(
+        lambda _: eager_tf_executor.EagerTFExecutor())
+    env = TestEnv(ex_factory)
+    value_proto, _ = executor_serialization.serialize_value(10, tf.int32)
+    response = env.stub.CreateValue(
+        executor_pb2.CreateValueRequest(value=value_proto))
+    value_id = str(response.value_ref.id)
+    # Simulates an operation consuming the value, still pending.
+    env.service._acquire_values([value_id])
+
+    env.stub.Dispose(
+        executor_pb2.DisposeRequest(value_ref=[response.value_ref]))
+
+    env.get_value_future_directly(value_id)
+    env.service._release_values([value_id])
+    with self.assertRaises(KeyError):
+      env.get_value_future_directly(value_id)
+
+  def test_executor_service_ignores_dispose_of_unknown_value(self):
+    ex_factory = executor_stacks.ResourceManagingExecutorFactory(
+        lambda _: eager_tf_executor.EagerTFExecutor())
+    env = TestEnv(ex_factory)
+    response = env.stub.Dispose(
+        executor_pb2.DisposeRequest(
+            value_ref=[executor_pb2.ValueRef(id='unknown')]))
+    self.assertIsInstance(response, executor_pb2.DisposeResponse)
+
+  def test_executor_service_get_stats(self):
+    ex_factory = executor_stacks.ResourceManagingExecutorFactory(
+        lambda _: eager_tf_executor.EagerTFExecutor())
+    env = TestEnv(ex_factory)
+    value_proto, _ = executor_serialization.serialize_value(10, tf.int32)
+    response = env.stub.CreateValue(
+        executor_pb2.CreateValueRequest(value=value_proto))
+    env.get_value(response.value_ref.id)
+    with self.assertRaises(grpc.RpcError):
+      env.stub.CreateCall(
+          executor_pb2.CreateCallRequest(
+              function_ref=executor_pb2.ValueRef(id='unknown')))
+
+    stats = env.stub.GetStats(executor_pb2.GetStatsRequest())
+
+    rpc_stats = {s.method: s for s in stats.rpc_stats}
+    self.assertEqual(rpc_stats['CreateValue'].count, 1)
+    self.assertEqual(rpc_stats['CreateValue'].error_count, 0)
+    self.assertEqual(rpc_stats['Compute'].count, 1)
+    self.assertEqual(sum(rpc_stats['Compute'].latency_bucket_counts), 1)
+    self.assertEqual(rpc_stats['CreateCall'].error_count, 1)
+    self.assertEqual(stats.num_values, 1)
+    self.assertEqual(stats.value_bytes, value_proto.ByteSize())
+
+  def test_executor_service_drops_values_on_set_cardinalities(self):
+    ex_factory = executor_stacks.ResourceManagingExecutorFactory(
+        lambda _: eager_tf_executor.EagerTFExecutor())
+    env = TestEnv(ex_factory)
+    value_proto, _ = executor_serialization.serialize_value(10, tf.int32)
+    for _ in range(3):
+      env.stub.CreateValue(executor_pb2.CreateValueRequest(value=value_proto))
+    self.assertEqual(env.service.num_values, 3)
+
+    serialized_cards = executor_serialization.serialize_cardinalities(
+        {placements.CLIENTS: 1})
+    env.stub.SetCardinalities(
+        executor_pb2.SetCardinalitiesRequest(cardinalities=serialized_cards))
+
+    self.assertEqual(env.service.num_values, 0)
+    self.assertEqual(env.service.max_num_values, 3)
+    self.assertGreater(env.service.peak_memory_bytes, 0)
+
   def test_dispose_does_not_trigger_cleanup(self):
 
     class MockFactory(executor_factory.ExecutorFactory, mock.MagicMock):
@@ -303,6 +427,90 @@ class ExecutorServiceTest(absltest.TestCase):
 
     del env
 
+  def test_executor_service_execute_batch_of_operations(self):
+    ex_factory = executor_stacks.ResourceManagingExecutorFactory(
+        lambda _: eager_tf_executor.EagerTFExecutor())
+    env = TestEnv(ex_factory)
+
+    @computations.tf_computation(tf.int32, tf.int32)
+    def comp(x, y):
+      return tf.add(x, y)
+
+    comp_proto, _ = executor_serialization.serialize_value(comp)
+    ten_proto, _ = executor_serialization.serialize_value(10, tf.int32)
+    twenty_proto, _ = executor_serialization.serialize_value(20, tf.int32)
+    comp_ref = executor_pb2.ValueRef(id='comp')
+    ten_ref = executor_pb2.ValueRef(id='ten')
+    twenty_ref = executor_pb2.ValueRef(id='twenty')
+    arg_ref = executor_pb2.ValueRef(id='arg')
+    result_ref = executor_pb2.ValueRef(id='result')
+    selection_ref = executor_pb2.ValueRef(id='selection')
+    operation = executor_pb2.ExecuteRequest.Operation
+    request = executor_pb2.ExecuteRequest(operation=[
+        operation(
+            result_ref=comp_ref,
+            create_value=executor_pb2.CreateValueRequest(value=comp_proto)),
+        operation(
+            result_ref=ten_ref,
+            create_value=executor_pb2.CreateValueRequest(value=ten_proto)),
+        operation(
+            result_ref=twenty_ref,
+            create_value=executor_pb2.CreateValueRequest(value=twenty_proto)),
+        operation(
+            result_ref=arg_ref,
+            create_struct=executor_pb2.CreateStructRequest(element=[
+                executor_pb2.CreateStructRequest.Element(value_ref=ten_ref),
+                executor_pb2.CreateStructRequest.Element(value_ref=twenty_ref),
+            ])),
+        operation(
+            result_ref=result_ref,
+            create_call=executor_pb2.CreateCallRequest(
+                function_ref=comp_ref, argument_ref=arg_ref)),
+        operation(
+            result_ref=selection_ref,
+            create_selection=executor_pb2.CreateSelectionRequest(
+                source_ref=arg_ref, index=1)),
+        operation(compute=executor_pb2.ComputeRequest(value_ref=result_ref)),
+        operation(
+            compute=executor_pb2.ComputeRequest(value_ref=selection_ref)),
+        operation(
+            dispose=executor_pb2.DisposeRequest(value_ref=[ten_ref])),
+    ])
+
+    responses = list(env.stub.Execute(request))
+
+    self.assertLen(responses, 3)
+    self.assertEqual(responses[0].WhichOneof('response'),
+                     'operations_registered')
+    results = {}
+    for response in responses[1:]:
+      value, _ = executor_serialization.deserialize_value(
+          response.compute_result.value)
+      results[response.compute_result.value_ref.id] = value
+    self.assertEqual(results, {'result': 30, 'selection': 20})
+    # Values created in the batch remain available to later requests.
+    self.assertEqual(env.get_value('result'), 30)
+    with self.assertRaises(KeyError):
+      env.get_value_future_directly('ten')
+    del env
+
+  def test_executor_service_execute_fails_without_result_ref(self):
+    ex_factory = executor_stacks.ResourceManagingExecutorFactory(
+        lambda _: eager_tf_executor.EagerTFExecutor())
+    env = TestEnv(ex_factory)
+    value_proto, _ = executor_serialization.serialize_value(10, tf.int32)
+    request = executor_pb2.ExecuteRequest(operation=[
+        executor_pb2.ExecuteRequest.Operation(
+            create_value=executor_pb2.CreateValueRequest(value=value_proto))
+    ])
+
+    with self.assertRaises(grpc.RpcError) as context:
+      list(env.stub.Execute(request))
+
+    self.assertEqual(context.exception.code(),
+                     grpc.StatusCode.INVALID_ARGUMENT)
+    del env
+
   @mock.patch(
       'tensorflow_federated.python.core.impl.executors.executor_stacks.ResourceManagingExecutorFactory.clean_up_executors'
   )
@@ -19,8 +19,9 @@
 """A collection of constructors for basic types of executor stacks."""
 
 from concurrent import futures
+import functools
 import math
-from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
 import warnings
 
 from absl import logging
@@ -29,16 +30,20 @@ import cachetools
 import grpc
 import tensorflow as tf
 
+from tensorflow_federated.proto.v0 import executor_pb2
 from tensorflow_federated.python.common_libs import py_typecheck
 from tensorflow_federated.python.core.impl.compiler import local_computation_factory_base
 from tensorflow_federated.python.core.impl.compiler import tensorflow_computation_factory
+from tensorflow_federated.python.core.impl.executors import client_placement
 from tensorflow_federated.python.core.impl.executors import eager_tf_executor
 from tensorflow_federated.python.core.impl.executors import executor_base
 from tensorflow_federated.python.core.impl.executors import executor_factory
+from tensorflow_federated.python.core.impl.executors import executor_process_pool
 from tensorflow_federated.python.core.impl.executors import executors_errors
 from tensorflow_federated.python.core.impl.executors import federated_composing_strategy
 from tensorflow_federated.python.core.impl.executors import federated_resolving_strategy
 from tensorflow_federated.python.core.impl.executors import federating_executor
+from tensorflow_federated.python.core.impl.executors import memoizing_executor
 from tensorflow_federated.python.core.impl.executors import reference_resolving_executor
 from tensorflow_federated.python.core.impl.executors import remote_executor
 from tensorflow_federated.python.core.impl.executors import sequence_executor
@@ -256,10 +261,14 @@ class SizingExecutorFactory(ResourceManagingExecutorFactory):
 
 
 # pylint:disable=missing-function-docstring
-def _wrap_executor_in_threading_stack(ex: executor_base.Executor,
-                                      support_sequence_ops: bool = False,
-                                      can_resolve_references=True):
-  threaded_ex = thread_delegating_executor.ThreadDelegatingExecutor(ex)
+def _wrap_executor_in_threading_stack(
+    ex: executor_base.Executor,
+    support_sequence_ops: bool = False,
+    can_resolve_references=True,
+    event_loop_pool: Optional[
+        thread_delegating_executor.EventLoopThreadPool] = None):
+  threaded_ex = thread_delegating_executor.ThreadDelegatingExecutor(
+      ex, event_loop_pool=event_loop_pool)
   if support_sequence_ops:
     if not can_resolve_references:
       raise ValueError(
@@ -278,6 +287,17 @@ class UnplacedExecutorFactory(executor_factory.ExecutorFactory):
   This factory constructs executors which represent "local execution": work
   that happens at the clients, at the server, or without placements. As such,
   this executor manages the placement of work on local executors.
+
+  If an `event_loop_pool` is given, all of the constructed executors share its
+  threads; otherwise each constructed executor runs on a thread of its own.
+
+  If a `client_process_pool` is given, the leaf executors of the clients are
+  hosted by its worker processes rather than constructed in this process.
+
+  If a `memoization_cache` is given, each leaf executor is wrapped in a
+  `memoizing_executor.MemoizingExecutor` storing the results of deterministic
+  computations in it, so that calls repeated with the same arguments, within or
+  across rounds, are not computed again.
   """
 
   def __init__(self,
@@ -286,13 +306,34 @@ class UnplacedExecutorFactory(executor_factory.ExecutorFactory):
                can_resolve_references: bool = True,
                server_device: Optional[tf.config.LogicalDevice] = None,
                client_devices: Optional[Sequence[tf.config.LogicalDevice]] = (),
-               leaf_executor_fn=eager_tf_executor.EagerTFExecutor):
+               leaf_executor_fn=eager_tf_executor.EagerTFExecutor,
+               event_loop_pool: Optional[
+                   thread_delegating_executor.EventLoopThreadPool] = None,
+               client_process_pool: Optional[
+                   executor_process_pool.ExecutorProcessPool] = None,
+               memoization_cache: Optional[
+                   memoizing_executor.MemoizationCache] = None):
+    if event_loop_pool is not None:
+      py_typecheck.check_type(event_loop_pool,
+                              thread_delegating_executor.EventLoopThreadPool)
+    if client_process_pool is not None:
+      py_typecheck.check_type(client_process_pool,
+                              executor_process_pool.ExecutorProcessPool)
+      if client_devices:
+        raise ValueError('Client devices cannot be used with a client process '
+                         'pool.')
+    if memoization_cache is not None:
+      py_typecheck.check_type(memoization_cache,
+                              memoizing_executor.MemoizationCache)
+    self._client_process_pool = client_process_pool
+    self._event_loop_pool = event_loop_pool
     self._support_sequence_ops = support_sequence_ops
     self._can_resolve_references = can_resolve_references
     self._server_device = server_device
     self._client_devices = client_devices
     self._client_device_index = 0
     self._leaf_executor_fn = leaf_executor_fn
+    self._memoization_cache = memoization_cache
 
   def _get_next_client_device(self) -> Optional[tf.config.LogicalDevice]:
     if not self._client_devices:
@@ -318,11 +359,19 @@ class UnplacedExecutorFactory(executor_factory.ExecutorFactory):
       device = self._server_device
     else:
       device = None
-    leaf_ex = self._leaf_executor_fn(device=device)
+    if (placement == placements.CLIENTS and
+        self._client_process_pool is not None):
+      leaf_ex = self._client_process_pool.create_executor()
+    else:
+      leaf_ex = self._leaf_executor_fn(device=device)
+    if self._memoization_cache is not None:
+      leaf_ex = memoizing_executor.MemoizingExecutor(leaf_ex,
+                                                     self._memoization_cache)
     return _wrap_executor_in_threading_stack(
         leaf_ex,
         support_sequence_ops=self._support_sequence_ops,
-        can_resolve_references=self._can_resolve_references)
+        can_resolve_references=self._can_resolve_references,
+        event_loop_pool=self._event_loop_pool)
 
   def clean_up_executors(self):
     # Does not hold any executors internally, so nothing to clean up.
@@ -507,13 +556,16 @@ class ComposingExecutorFactory(executor_factory.ExecutorFactory):
                                        Sequence[executor_base.Executor]],
                local_computation_factory: local_computation_factory_base
                .LocalComputationFactory = tensorflow_computation_factory
-               .TensorFlowComputationFactory()):
+               .TensorFlowComputationFactory(),
+               straggler_policy: Optional[
+                   federated_composing_strategy.StragglerPolicy] = None):
     if max_fanout < 2:
       raise ValueError('Max fanout must be greater than 1.')
     self._flat_stack_fn = flat_stack_fn
     self._max_fanout = max_fanout
     self._unplaced_ex_factory = unplaced_ex_factory
     self._local_computation_factory = local_computation_factory
+    self._straggler_policy = straggler_policy
 
   def create_executor(
       self, cardinalities: executor_factory.CardinalitiesType
@@ -546,7 +598,8 @@ class ComposingExecutorFactory(executor_factory.ExecutorFactory):
     composing_strategy_factory = federated_composing_strategy.FederatedComposingStrategy.factory(
         server_executor,
         target_executors,
-        local_computation_factory=self._local_computation_factory)
+        local_computation_factory=self._local_computation_factory,
+        straggler_policy=self._straggler_policy)
     unplaced_executor = self._unplaced_ex_factory.create_executor()
     composing_executor = federating_executor.FederatingExecutor(
         composing_strategy_factory, unplaced_executor)
@@ -616,6 +669,10 @@ def local_executor_factory(
     leaf_executor_fn=eager_tf_executor.EagerTFExecutor,
     local_computation_factory=tensorflow_computation_factory
     .TensorFlowComputationFactory(),
+    tree_reduction=False,
+    num_worker_threads: Optional[int] = None,
+    client_process_pool_size: Optional[int] = None,
+    memoization_cache: Optional[memoizing_executor.MemoizationCache] = None,
 ) -> executor_factory.ExecutorFactory:
   """Constructs an executor factory to execute computations locally.
 
@@ -651,6 +708,27 @@ def local_executor_factory(
       use to construct local computations used as parameters in certain
       federated operators (such as `tff.federated_sum`, etc.). Defaults to
       a TensorFlow computation factory that generates TensorFlow code.
+    tree_reduction: Boolean indicating whether client values should be combined
+      at the server pairwise, in a tree of logarithmic depth, for aggregations
+      which are associative (`tff.federated_sum` and the merge stage of
+      `tff.federated_aggregate`), rather than folded in one at a time.
+    num_worker_threads: An optional positive integer bounding the number of
+      threads used to run client, server and unplaced executors, which then
+      share a pool of `num_worker_threads` threads. If `None` (the default),
+      each such executor runs on a thread of its own, so the number of threads
+      grows with the number of clients.
+    client_process_pool_size: An optional positive integer. If specified, the
+      leaf executors of the clients, constructed by `leaf_executor_fn`, run in
+      `client_process_pool_size` worker processes rather than in this process,
+      so that client work is not bound by the global interpreter lock of this
+      process. The worker processes are started when the first executor is
+      constructed. Cannot be combined with `client_tf_devices`, and
+      `leaf_executor_fn` must be picklable.
+    memoization_cache: An optional `tff.framework.MemoizationCache`. If
+      specified, the results of deterministic TensorFlow computations are
+      stored in it, and calls repeated with the same arguments, such as the
+      evaluation of unchanged models on unchanged client data across rounds,
+      are served from it rather than computed again.
 
   Returns:
     An instance of `executor_factory.ExecutorFactory` encapsulating the
@@ -664,20 +742,37 @@ def local_executor_factory(
   py_typecheck.check_type(client_tf_devices, (tuple, list))
   py_typecheck.check_type(max_fanout, int)
   py_typecheck.check_type(clients_per_thread, int)
+  py_typecheck.check_type(tree_reduction, bool)
   if max_fanout < 2:
     raise ValueError('Max fanout must be greater than 1.')
+  if num_worker_threads is not None:
+    event_loop_pool = thread_delegating_executor.EventLoopThreadPool(
+        num_worker_threads)
+  else:
+    event_loop_pool = None
+  if client_process_pool_size is not None:
+    client_process_pool = executor_process_pool.ExecutorProcessPool(
+        client_process_pool_size, leaf_executor_fn=leaf_executor_fn)
+  else:
+    client_process_pool = None
   unplaced_ex_factory = UnplacedExecutorFactory(
       support_sequence_ops=support_sequence_ops,
       can_resolve_references=reference_resolving_clients,
       server_device=server_tf_device,
       client_devices=client_tf_devices,
-      leaf_executor_fn=leaf_executor_fn)
+      leaf_executor_fn=leaf_executor_fn,
+      event_loop_pool=event_loop_pool,
+      client_process_pool=client_process_pool,
+      memoization_cache=memoization_cache)
   federating_executor_factory = FederatingExecutorFactory(
       clients_per_thread=clients_per_thread,
       unplaced_ex_factory=unplaced_ex_factory,
       default_num_clients=default_num_clients,
       use_sizing=False,
-      local_computation_factory=local_computation_factory)
+      local_computation_factory=local_computation_factory,
+      federated_strategy_factory=functools.partial(
+          federated_resolving_strategy.FederatedResolvingStrategy.factory,
+          tree_reduction=tree_reduction))
   flat_stack_fn = create_minimal_length_flat_stack_fn(
       max_fanout, federating_executor_factory)
   full_stack_factory = ComposingExecutorFactory(
@@ -832,11 +927,15 @@ class ReconstructOnChangeExecutorFactory(executor_factory.ExecutorFactory):
   When the initialization parameter `change_query` returns `True`,
   ReconstructOnChangeExecutorFactory` constructs a new executor, bypassing
   any previously constructed executors.
+
+  The optional initialization parameter `ensure_closed` is a sequence of
+  objects with a `close()` method, such as executors, which are closed when
+  the executors are cleaned up.
   """
 
   def __init__(self,
                underlying_stack: executor_factory.ExecutorFactory,
-               ensure_closed: Optional[Sequence[executor_base.Executor]] = None,
+               ensure_closed: Optional[Sequence[Any]] = None,
                change_query: Callable[[executor_factory.CardinalitiesType],
                                       bool] = lambda _: True):
     self._change_query = change_query
@@ -906,27 +1005,139 @@ class _CardinalitiesOrReadyListChanged():
     return cardinalities_changed or ready_list_changed
 
 
-def _configure_remote_workers(default_num_clients, remote_executors):
-  """"Configures `default_num_clients` across `remote_executors`."""
-  available_executors = [ex for ex in remote_executors if ex.is_ready]
-  logging.info('%s TFF workers available out of a total of %s.',
-               len(available_executors), len(remote_executors))
-  if not available_executors:
-    raise executors_errors.RetryableError(
-        'No workers are ready; try again to reconnect.')
-  remaining_clients = default_num_clients
-  live_workers = []
-  for ex_idx, ex in enumerate(available_executors):
-    remaining_executors = len(available_executors) - ex_idx
-    default_num_clients_to_host = remaining_clients // remaining_executors
-    remaining_clients -= default_num_clients_to_host
-    if default_num_clients_to_host > 0:
-      ex.set_cardinalities({placements.CLIENTS: default_num_clients_to_host})
-      live_workers.append(ex)
-  return [
-      _wrap_executor_in_threading_stack(e, can_resolve_references=False)
-      for e in live_workers
-  ]
+@attr.s(auto_attribs=True, eq=False, order=False, frozen=True)
+class WorkerPoolChange(object):
+  """A change of the remote workers ready to host clients, between rounds.
+
+  Attributes:
+    joined_workers: The indices of the workers which became ready.
+    left_workers: The indices of the workers which are no longer ready.
+    reconfigured_workers: The indices of the ready workers whose number of
+      clients changed, including workers which joined.
+    moved_clients: The number of clients placed on a different worker.
+    num_ready_workers: The number of workers ready after the change.
+  """
+  joined_workers: List[int]
+  left_workers: List[int]
+  reconfigured_workers: List[int]
+  moved_clients: int
+  num_ready_workers: int
+
+
+class _RemoteClientPlacement(object):
+  """Places clients on remote workers as decided by a `ClientPlacementPolicy`.
+
+  Also measures how long each worker took to compute its share of the previous
+  round, and reports it to the policy before the next round.
+
+  When workers join or leave the pool while the number of clients is unchanged,
+  the clients are reassigned incrementally: the workers whose share does not
+  change are not reconfigured, so they keep their state, and only the workers
+  which joined or absorb the clients of departed workers are reconfigured.
+
+  Closing the placement closes the remote executors, which drops their state,
+  so all of them are reconfigured the next time clients are placed.
+  """
+
+  def __init__(self,
+               remote_executors: Sequence[remote_executor.RemoteExecutor],
+               policy: client_placement.ClientPlacementPolicy,
+               on_worker_pool_change: Optional[Callable[[WorkerPoolChange],
+                                                        None]] = None):
+    self._remote_executors = remote_executors
+    self._policy = policy
+    self._on_worker_pool_change = on_worker_pool_change
+    # The number of clients placed on each ready worker, by worker index.
+    self._placement = {}
+    self._num_clients = None
+    self._rebalance_requested = False
+    # The busy time of each worker at the end of the last measured round.
+    self._busy_seconds = {}
+
+  def configure(self, num_clients: int) -> List[executor_base.Executor]:
+    """Configures `num_clients` across the ready remote workers."""
+    ready_workers = [
+        index for index, ex in enumerate(self._remote_executors) if ex.is_ready
+    ]
+    logging.info('%s TFF workers available out of a total of %s.',
+                 len(ready_workers), len(self._remote_executors))
+    if not ready_workers:
+      raise executors_errors.RetryableError(
+          'No workers are ready; try again to reconnect.')
+    weights = self._policy.worker_weights(ready_workers)
+    previous_placement = self._placement
+    # Clients are only reassigned incrementally when the workers changed;
+    # otherwise, the stack is rebuilt for another reason, and all the workers
+    # are reconfigured.
+    if (self._rebalance_requested or num_clients != self._num_clients or
+        not previous_placement or
+        set(ready_workers) == set(previous_placement)):
+      placement = client_placement.place_clients(num_clients, weights)
+      self._placement = dict(zip(ready_workers, placement))
+      reconfigured_workers = set(ready_workers)
+    else:
+      self._placement = client_placement.reassign_clients(
+          num_clients, dict(zip(ready_workers, weights)), previous_placement)
+      reconfigured_workers = set(
+          index for index, num_clients_to_host in self._placement.items()
+          if num_clients_to_host != previous_placement.get(index))
+      self._record_worker_pool_change(previous_placement, reconfigured_workers)
+    self._num_clients = num_clients
+    self._rebalance_requested = False
+    live_workers = []
+    for index, num_clients_to_host in self._placement.items():
+      ex = self._remote_executors[index]
+      self._busy_seconds[index] = ex.busy_seconds
+      if num_clients_to_host > 0:
+        if index in reconfigured_workers:
+          ex.set_cardinalities({placements.CLIENTS: num_clients_to_host})
+        live_workers.append(ex)
+    return [
+        _wrap_executor_in_threading_stack(e, can_resolve_references=False)
+        for e in live_workers
+    ]
+
+  def close(self):
+    """Closes the remote executors, and forgets the placement of clients."""
+    for ex in self._remote_executors:
+      ex.close()
+    self._placement = {}
+    self._num_clients = None
+
+  def _record_worker_pool_change(self, previous_placement: Dict[int, int],
+                                 reconfigured_workers: Set[int]):
+    joined_workers = sorted(set(self._placement) - set(previous_placement))
+    left_workers = sorted(set(previous_placement) - set(self._placement))
+    if not joined_workers and not left_workers:
+      return
+    moved_clients = sum(
+        max(0, n - previous_placement.get(index, 0))
+        for index, n in self._placement.items())
+    change = WorkerPoolChange(
+        joined_workers=joined_workers,
+        left_workers=left_workers,
+        reconfigured_workers=sorted(reconfigured_workers),
+        moved_clients=moved_clients,
+        num_ready_workers=len(self._placement))
+    logging.info(
+        'TFF worker pool changed: workers %s joined, workers %s left; moved %s '
+        'clients, reconfiguring workers %s.', change.joined_workers,
+        change.left_workers, change.moved_clients, change.reconfigured_workers)
+    if self._on_worker_pool_change is not None:
+      self._on_worker_pool_change(change)
+
+  def should_rebalance(self) -> bool:
+    """Records the last round with the policy, and asks it to rebalance."""
+    for index, num_clients in self._placement.items():
+      busy_seconds = self._remote_executors[index].busy_seconds
+      round_seconds = busy_seconds - self._busy_seconds.get(index, busy_seconds)
+      self._busy_seconds[index] = busy_seconds
+      if num_clients > 0 and round_seconds > 0:
+        self._policy.record_round(index, num_clients, round_seconds)
+    self._rebalance_requested = bool(
+        self._placement) and self._policy.should_rebalance(
+            dict(self._placement))
+    return self._rebalance_requested
 
 
 def remote_executor_factory(
@@ -935,9 +1146,27 @@ def remote_executor_factory(
     dispose_batch_size: int = 20,
     max_fanout: int = 100,
     default_num_clients: int = 0,
+    max_concurrent_requests: int = 100,
+    batch_requests: bool = False,
+    stream_values: bool = False,
+    deduplicate_broadcasts: bool = False,
+    tensor_encoding: Optional[Union[
+        executor_pb2.TensorEncoding,
+        Sequence[Optional[executor_pb2.TensorEncoding]]]] = None,
+    client_placement_policy: Optional[
+        client_placement.ClientPlacementPolicy] = None,
+    straggler_policy: Optional[
+        federated_composing_strategy.StragglerPolicy] = None,
+    on_worker_pool_change: Optional[Callable[[WorkerPoolChange], None]] = None,
 ) -> executor_factory.ExecutorFactory:
   """Create an executor backed by remote workers.
 
+  Workers may join or leave the pool between rounds, e.g. when preemptible
+  workers are replaced: the channels are polled before each round, a worker
+  which becomes ready is assigned a share of the clients, and the clients of a
+  worker which is no longer ready are reassigned to the others. Workers whose
+  share is unchanged keep their state.
+
   Args:
     channels: A list of `grpc.Channels` hosting services which can execute TFF
       work.
@@ -958,6 +1187,36 @@ def remote_executor_factory(
       client-placed values. However, when this inference isn't possible (such as
       in the case of a no-argument or non-federated computation) this default
       will be used instead.
+    max_concurrent_requests: The maximum number of RPCs kept in flight on each
+      channel at any point in time. Requests to a single remote worker are
+      issued asynchronously, so a round is bounded by the slowest worker
+      rather than by the sum of the per-request latencies.
+    batch_requests: Whether to submit work to the remote workers in batches of
+      operations, each sent in a single round-trip when a value is computed,
+      rather than through one RPC per operation.
+    stream_values: Whether to transfer values to and from the remote workers
+      in bounded chunks, so that values larger than the maximum gRPC message
+      size can be transferred. Cannot be combined with `batch_requests`.
+    deduplicate_broadcasts: Whether broadcast values are serialized only once
+      for all remote workers, and only sent to workers which do not already
+      hold the same content. Cannot be combined with `batch_requests` or
+      `stream_values`.
+    tensor_encoding: An optional `executor_pb2.TensorEncoding` in which
+      floating-point tensors are exchanged with all remote workers, or a
+      sequence of optional encodings, one for each of `channels`, for instance
+      to compress only the traffic of workers behind slow links. Cannot be
+      combined with `stream_values`.
+    client_placement_policy: An optional `ClientPlacementPolicy` deciding how
+      many clients each worker hosts, such as `CapacityClientPlacement` for
+      workers of known relative capacity, or `ThroughputClientPlacement` to
+      follow the throughput measured in previous rounds and rebalance between
+      rounds. Defaults to splitting the clients evenly.
+    straggler_policy: An optional `StragglerPolicy` allowing aggregations to
+      complete without the slowest workers, e.g. after over-selecting clients
+      across `max_dropped_children` extra workers.
+    on_worker_pool_change: An optional callable invoked with a
+      `WorkerPoolChange` each time workers join or leave the pool, e.g. to
+      export the churn of the pool as a metric. Changes are logged regardless.
 
   Returns:
     An instance of `executor_factory.ExecutorFactory` encapsulating the
@@ -971,28 +1230,69 @@ def remote_executor_factory(
   py_typecheck.check_type(dispose_batch_size, int)
   py_typecheck.check_type(max_fanout, int)
   py_typecheck.check_type(default_num_clients, int)
-
+  py_typecheck.check_type(max_concurrent_requests, int)
+  py_typecheck.check_type(batch_requests, bool)
+  py_typecheck.check_type(stream_values, bool)
+  py_typecheck.check_type(deduplicate_broadcasts, bool)
+  if tensor_encoding is None or isinstance(tensor_encoding,
+                                           executor_pb2.TensorEncoding):
+    tensor_encodings = [tensor_encoding] * len(channels)
+  else:
+    tensor_encodings = list(tensor_encoding)
+    if len(tensor_encodings) != len(channels):
+      raise ValueError(
+          f'Expected a tensor encoding for each of the {len(channels)} '
+          f'channels, found {len(tensor_encodings)}.')
+  if client_placement_policy is None:
+    client_placement_policy = client_placement.CapacityClientPlacement(
+        [1.0] * len(channels))
+  py_typecheck.check_type(client_placement_policy,
+                          client_placement.ClientPlacementPolicy)
+
+  if deduplicate_broadcasts:
+    broadcast_cache = remote_executor.BroadcastCache()
+  else:
+    broadcast_cache = None
   remote_executors = []
-  for channel in channels:
+  for channel, channel_tensor_encoding in zip(channels, tensor_encodings):
     remote_executors.append(
         remote_executor.RemoteExecutor(
             channel=channel,
             thread_pool_executor=thread_pool_executor,
-            dispose_batch_size=dispose_batch_size))
+            dispose_batch_size=dispose_batch_size,
+            max_concurrent_requests=max_concurrent_requests,
+            batch_requests=batch_requests,
+            stream_values=stream_values,
+            broadcast_cache=broadcast_cache,
+            tensor_encoding=channel_tensor_encoding))
+
+  if on_worker_pool_change is not None:
+    py_typecheck.check_callable(on_worker_pool_change)
+  remote_client_placement = _RemoteClientPlacement(remote_executors,
+                                                   client_placement_policy,
+                                                   on_worker_pool_change)
 
   def _flat_stack_fn(cardinalities):
     num_clients = cardinalities.get(placements.CLIENTS, default_num_clients)
-    return _configure_remote_workers(num_clients, remote_executors)
+    return remote_client_placement.configure(num_clients)
 
   unplaced_ex_factory = UnplacedExecutorFactory()
   composing_executor_factory = ComposingExecutorFactory(
       max_fanout=max_fanout,
       unplaced_ex_factory=unplaced_ex_factory,
       flat_stack_fn=_flat_stack_fn,
+      straggler_policy=straggler_policy,
   )
 
+  cardinalities_or_ready_list_changed = _CardinalitiesOrReadyListChanged(
+      maybe_ready_list=remote_executors)
+
+  def _change_query(cardinalities):
+    # Both are always queried, since they track state across calls.
+    changed = cardinalities_or_ready_list_changed(cardinalities)
+    return remote_client_placement.should_rebalance() or changed
+
   return ReconstructOnChangeExecutorFactory(
       underlying_stack=composing_executor_factory,
-      ensure_closed=remote_executors,
-      change_query=_CardinalitiesOrReadyListChanged(
-          maybe_ready_list=remote_executors))
+      ensure_closed=[remote_client_placement],
+      change_query=_change_query)
@@ -21,13 +21,16 @@ import grpc
 import numpy as np
 import tensorflow as tf
 
+from tensorflow_federated.proto.v0 import executor_pb2
 from tensorflow_federated.python.common_libs import test_utils
 from tensorflow_federated.python.core.api import computations
+from tensorflow_federated.python.core.impl.executors import client_placement
 from tensorflow_federated.python.core.impl.executors import eager_tf_executor
 from tensorflow_federated.python.core.impl.executors import executor_base
 from tensorflow_federated.python.core.impl.executors import executor_factory
 from tensorflow_federated.python.core.impl.executors import executor_stacks
 from tensorflow_federated.python.core.impl.executors import executor_test_utils
+from tensorflow_federated.python.core.impl.executors import memoizing_executor
 from tensorflow_federated.python.core.impl.federated_context import intrinsics
 from tensorflow_federated.python.core.impl.types import computation_types
 from tensorflow_federated.python.core.impl.types import placements
@@ -307,6 +310,63 @@ class ExecutorStacksTest(parameterized.TestCase):
 
     self.assertAlmostEqual(result, 8.333, places=3)
 
+  def test_execution_with_shared_worker_threads(self):
+
+    @computations.federated_computation(computation_types.at_clients(tf.int32))
+    def foo(x):
+      return intrinsics.federated_sum(x)
+
+    executor = executor_stacks.local_executor_factory(num_worker_threads=2)
+    with executor_test_utils.install_executor(executor):
+      result = foo([1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
+
+    self.assertEqual(result, 55)
+
+  def test_execution_with_client_process_pool(self):
+
+    @computations.federated_computation(computation_types.at_clients(tf.int32))
+    def foo(x):
+      return intrinsics.federated_sum(x)
+
+    executor = executor_stacks.local_executor_factory(
+        client_process_pool_size=2)
+    with executor_test_utils.install_executor(executor):
+      result = foo([1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
+
+    self.assertEqual(result, 55)
+
+  def test_execution_with_memoization_cache(self):
+
+    @computations.tf_computation(tf.int32)
+    def add_one(x):
+      return x + 1
+
+    @computations.federated_computation(computation_types.at_clients(tf.int32))
+    def foo(x):
+      return intrinsics.federated_sum(intrinsics.federated_map(add_one, x))
+
+    cache = memoizing_executor.MemoizationCache(2**20)
+    executor = executor_stacks.local_executor_factory(memoization_cache=cache)
+    with executor_test_utils.install_executor(executor):
+      first_result = foo([1, 2, 3])
+      num_hits = cache.hits
+      second_result = foo([1, 2, 3])
+
+    self.assertEqual(first_result, 9)
+    self.assertEqual(second_result, 9)
+    # Each of the three clients reuses the result of `add_one`.
+    self.assertGreaterEqual(cache.hits - num_hits, 3)
+
+  def test_construction_raises_with_client_process_pool_and_devices(self):
+    with self.assertRaises(ValueError):
+      executor_stacks.local_executor_factory(
+          client_tf_devices=tf.config.list_logical_devices('CPU'),
+          client_process_pool_size=2)
+
+  def test_construction_raises_with_zero_worker_threads(self):
+    with self.assertRaises(ValueError):
+      executor_stacks.local_executor_factory(num_worker_threads=0)
+
   @parameterized.named_parameters(
       ('local_executor', executor_stacks.local_executor_factory),
       ('sizing_executor', executor_stacks.sizing_executor_factory),
@@ -607,6 +667,21 @@ class ComposingExecutorFactoryTest(absltest.TestCase):
     self.assertLen(args_list, 6)
 
 
+class _AlwaysRebalancingPlacement(client_placement.ClientPlacementPolicy):
+
+  def __init__(self):
+    self.rounds = []
+
+  def worker_weights(self, workers):
+    return [1.0] * len(workers)
+
+  def record_round(self, worker, num_clients, busy_seconds):
+    self.rounds.append((worker, num_clients, busy_seconds))
+
+  def should_rebalance(self, placement):
+    return True
+
+
 class RemoteExecutorFactoryTest(absltest.TestCase):
 
   def _make_set_cardinalities_patch(self, mock_obj):
@@ -671,6 +746,143 @@ class RemoteExecutorFactoryTest(absltest.TestCase):
     remote_ex_factory.create_executor({placements.CLIENTS: 10})
     mock_obj.assert_called_once()
 
+  def test_raises_value_error_with_tensor_encoding_per_channel_mismatch(self):
+    channels = [
+        grpc.insecure_channel('localhost:1'),
+        grpc.insecure_channel('localhost:2')
+    ]
+    with self.assertRaises(ValueError):
+      executor_stacks.remote_executor_factory(
+          channels,
+          tensor_encoding=[
+              executor_pb2.TensorEncoding(
+                  compression=executor_pb2.TensorEncoding.ZLIB)
+          ])
+
+  def test_places_clients_by_capacity(self):
+    channels = [
+        grpc.insecure_channel('localhost:1'),
+        grpc.insecure_channel('localhost:2')
+    ]
+    remote_ex_factory = executor_stacks.remote_executor_factory(
+        channels,
+        client_placement_policy=client_placement.CapacityClientPlacement(
+            [1.0, 3.0]))
+    remote_ex_factory.create_executor({placements.CLIENTS: 8})
+    self.assertEqual(self.coro_mock.call_args_list, [
+        mock.call({placements.CLIENTS: 2}),
+        mock.call({placements.CLIENTS: 6}),
+    ])
+
+  def test_rebalances_between_rounds_with_measured_busy_time(self):
+    channels = [
+        grpc.insecure_channel('localhost:1'),
+        grpc.insecure_channel('localhost:2')
+    ]
+    policy = _AlwaysRebalancingPlacement()
+    remote_ex_factory = executor_stacks.remote_executor_factory(
+        channels, client_placement_policy=policy)
+    with mock.patch(
+        'tensorflow_federated.python.core.impl.executors.remote_executor.RemoteExecutor.busy_seconds',
+        new_callable=mock.PropertyMock,
+        side_effect=[0.0, 0.0, 2.0, 4.0, 2.0, 4.0]):
+      remote_ex_factory.create_executor({placements.CLIENTS: 4})
+      remote_ex_factory.create_executor({placements.CLIENTS: 4})
+    self.assertEqual(policy.rounds, [(0, 2, 2.0), (1, 2, 4.0)])
+    # The unchanged cardinalities are configured anew on every round.
+    self.assertLen(self.coro_mock.call_args_list, 4)
+
+  def _patch_ready_workers(self, channels, ready_workers):
+    # pylint: disable=protected-access
+    return mock.patch(
+        'tensorflow_federated.python.core.impl.executors.remote_executor.RemoteExecutor.is_ready',
+        new=property(lambda ex: channels.index(ex._channel) in ready_workers))
+    # pylint: enable=protected-access
+
+  def test_reassigns_clients_of_departed_worker(self):
+    channels = [grpc.insecure_channel(f'localhost:{i}') for i in range(3)]
+    ready_workers = {0, 1, 2}
+    changes = []
+    remote_ex_factory = executor_stacks.remote_executor_factory(
+        channels, on_worker_pool_change=changes.append)
+    with self._patch_ready_workers(channels, ready_workers):
+      remote_ex_factory.create_executor({placements.CLIENTS: 9})
+      ready_workers.remove(0)
+      remote_ex_factory.create_executor({placements.CLIENTS: 9})
+
+    self.assertEqual(self.coro_mock.call_args_list, [
+        mock.call({placements.CLIENTS: 3}),
+        mock.call({placements.CLIENTS: 3}),
+        mock.call({placements.CLIENTS: 3}),
+        mock.call({placements.CLIENTS: 4}),
+        mock.call({placements.CLIENTS: 5}),
+    ])
+    self.assertLen(changes, 1)
+    self.assertEqual(changes[0].left_workers, [0])
+    self.assertEqual(changes[0].joined_workers, [])
+    self.assertEqual(changes[0].moved_clients, 3)
+    self.assertEqual(changes[0].num_ready_workers, 2)
+
+  def test_configures_only_joining_worker_when_worker_is_replaced(self):
+    channels = [grpc.insecure_channel(f'localhost:{i}') for i in range(4)]
+    ready_workers = {0, 1, 2}
+    changes = []
+    remote_ex_factory = executor_stacks.remote_executor_factory(
+        channels, on_worker_pool_change=changes.append)
+    with self._patch_ready_workers(channels, ready_workers):
+      remote_ex_factory.create_executor({placements.CLIENTS: 9})
+      ready_workers.remove(2)
+      ready_workers.add(3)
+      remote_ex_factory.create_executor({placements.CLIENTS: 9})
+
+    # Workers 0 and 1 keep their clients, and their state.
+    self.assertLen(self.coro_mock.call_args_list, 4)
+    self.assertEqual(self.coro_mock.call_args_list[-1],
+                     mock.call({placements.CLIENTS: 3}))
+    self.assertLen(changes, 1)
+    self.assertEqual(changes[0].joined_workers, [3])
+    self.assertEqual(changes[0].left_workers, [2])
+    self.assertEqual(changes[0].reconfigured_workers, [3])
+
+  @mock.patch(
+      'tensorflow_federated.python.core.impl.executors.remote_executor.RemoteExecutor.close'
+  )
+  def test_reconfigures_all_workers_when_retrying_after_failure(
+      self, mock_close):
+    channels = [
+        grpc.insecure_channel('localhost:1'),
+        grpc.insecure_channel('localhost:2')
+    ]
+    remote_ex_factory = executor_stacks.remote_executor_factory(channels)
+    remote_ex_factory.create_executor({placements.CLIENTS: 4})
+    # A failed invocation cleans up the executors, which clears the state of
+    # the workers, before it is retried.
+    remote_ex_factory.clean_up_executors()
+    remote_ex_factory.create_executor({placements.CLIENTS: 4})
+
+    mock_close.assert_called()
+    self.assertEqual(self.coro_mock.call_args_list,
+                     [mock.call({placements.CLIENTS: 2})] * 4)
+
+  @mock.patch(
+      'tensorflow_federated.python.core.impl.executors.remote_executor.RemoteExecutor.close'
+  )
+  def test_reconfigures_all_workers_when_retrying_after_worker_left(
+      self, mock_close):
+    del mock_close  # Unused
+    channels = [grpc.insecure_channel(f'localhost:{i}') for i in range(3)]
+    ready_workers = {0, 1, 2}
+    remote_ex_factory = executor_stacks.remote_executor_factory(channels)
+    with self._patch_ready_workers(channels, ready_workers):
+      remote_ex_factory.create_executor({placements.CLIENTS: 6})
+      ready_workers.remove(0)
+      remote_ex_factory.clean_up_executors()
+      remote_ex_factory.create_executor({placements.CLIENTS: 6})
+
+    self.assertEqual(self.coro_mock.call_args_list,
+                     [mock.call({placements.CLIENTS: 2})] * 3 +
+                     [mock.call({placements.CLIENTS: 3})] * 2)
+
   def test_configuration_succeeds_while_event_loop_is_running(self):
     loop = asyncio.get_event_loop()
     channels = [
@@ -49,8 +49,11 @@
 """
 
 import asyncio
-from typing import Any, List
+import math
+from typing import Any, List, Optional, Sequence, Tuple
 
+from absl import logging
+import attr
 import tensorflow as tf
 
 from tensorflow_federated.proto.v0 import computation_pb2 as pb
@@ -71,6 +74,64 @@ from tensorflow_federated.python.core.impl.types import type_analysis
 from tensorflow_federated.python.core.impl.types import type_transformations
 
 
+@attr.s(frozen=True)
+class StragglerPolicy(object):
+  """Configures how aggregations tolerate slow child executors.
+
+  By default, an aggregation across the child executors of a
+  `FederatedComposingStrategy` waits for every child, so a single slow or
+  wedged child sets the latency of the whole aggregation. Under a
+  `StragglerPolicy`, the contributions of up to `max_dropped_children` children
+  may be dropped: with over-selection, where clients are spread across
+  `max_dropped_children` more children than needed, the aggregation completes as
+  soon as all but `max_dropped_children` children have reported.
+
+  If `deadline_percentile` is set, the slowest children are only dropped once
+  they exceed a deadline of `deadline_factor` times the latency of the child at
+  that percentile, so that children which are only slightly slower than the
+  others still contribute.
+
+  The computations of dropped children are cancelled, and their values on the
+  children released, which for remote children disposes of them on the worker.
+  Federated means are normalized by the clients of the children which
+  contributed.
+
+  Attributes:
+    max_dropped_children: The maximum number of children whose contributions to
+      a single aggregation may be dropped. At least one child always
+      contributes.
+    deadline_percentile: An optional percentile of the children, in `(0, 1]`,
+      whose latency determines the deadline for the remaining children.
+    deadline_factor: The multiple, at least 1, of the latency at
+      `deadline_percentile` after which the remaining children are dropped.
+  """
+  max_dropped_children = attr.ib(type=int)
+  deadline_percentile = attr.ib(type=Optional[float], default=None)
+  deadline_factor = attr.ib(type=float, default=2.0)
+
+  @max_dropped_children.validator
+  def _check_max_dropped_children(self, attribute, value):
+    del attribute  # Unused.
+    py_typecheck.check_type(value, int)
+    if value < 0:
+      raise ValueError(
+          f'Expected a non-negative `max_dropped_children`, found {value}.')
+
+  @deadline_percentile.validator
+  def _check_deadline_percentile(self, attribute, value):
+    del attribute  # Unused.
+    if value is not None and not 0 < value <= 1:
+      raise ValueError(
+          f'Expected a `deadline_percentile` in (0, 1], found {value}.')
+
+  @deadline_factor.validator
+  def _check_deadline_factor(self, attribute, value):
+    del attribute  # Unused.
+    if value < 1:
+      raise ValueError(f'Expected a `deadline_factor` of at least 1, found '
+                       f'{value}.')
+
+
 class FederatedComposingStrategyValue(executor_value_base.ExecutorValue):
   """A value embedded in a `FederatedExecutor`."""
 
@@ -148,6 +209,9 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
 
   * `tff.SERVER`
   * `tff.CLIENTS`
+
+  Given a `StragglerPolicy`, aggregations may complete without the
+  contributions of the slowest target executors.
   """
 
   @classmethod
@@ -156,13 +220,15 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
               target_executors: List[executor_base.Executor],
               local_computation_factory: local_computation_factory_base
               .LocalComputationFactory = tensorflow_computation_factory
-              .TensorFlowComputationFactory()):
+              .TensorFlowComputationFactory(),
+              straggler_policy: Optional[StragglerPolicy] = None):
     # pylint:disable=g-long-lambda
     return lambda executor: cls(
         executor,
         server_executor,
         target_executors,
-        local_computation_factory=local_computation_factory)
+        local_computation_factory=local_computation_factory,
+        straggler_policy=straggler_policy)
     # pylint:enable=g-long-lambda
 
   def __init__(self,
@@ -171,7 +237,8 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
                target_executors: List[executor_base.Executor],
                local_computation_factory: local_computation_factory_base
                .LocalComputationFactory = tensorflow_computation_factory
-               .TensorFlowComputationFactory()):
+               .TensorFlowComputationFactory(),
+               straggler_policy: Optional[StragglerPolicy] = None):
     """Creates a `FederatedComposingStrategy`.
 
     Args:
@@ -186,6 +253,8 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
         to construct local computations used as parameters in certain federated
         operators (such as `tff.federated_sum`, etc.). Defaults to a TensorFlow
         computation factory that generates TensorFlow code.
+      straggler_policy: An optional `StragglerPolicy` allowing aggregations to
+        drop the contributions of the slowest target executors.
 
     Raises:
       TypeError: If `server_executor` is not an `executor_base.Executor` or if
@@ -202,6 +271,9 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
       py_typecheck.check_type(e, executor_base.Executor)
     self._server_executor = server_executor
     self._target_executors = target_executors
+    if straggler_policy is not None:
+      py_typecheck.check_type(straggler_policy, StragglerPolicy)
+    self._straggler_policy = straggler_policy
 
   def close(self):
     self._server_executor.close()
@@ -213,13 +285,19 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
   ) -> executor_value_base.ExecutorValue:
     return FederatedComposingStrategyValue(value, type_signature)
 
-  async def _get_cardinalities(self):
+  async def _get_cardinalities(self,
+                               children: Optional[Sequence[int]] = None):
     """Returns information about the number of clients in the child executors.
 
+    Args:
+      children: The optional indices of the child executors to query, all of
+        them by default.
+
     Returns:
-      A `list` with one element for each element in `self._target_executors`;
-      each of these elements is an integer representing the total number of
-      clients located in the corresponding child executor.
+      A `list` with one element for each element in `self._target_executors`,
+      or for each of `children` if given; each of these elements is an integer
+      representing the total number of clients located in the corresponding
+      child executor.
     """
 
     async def _num_clients(executor):
@@ -260,8 +338,61 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
       else:
         return result
 
+    if children is None:
+      children = range(len(self._target_executors))
     return await asyncio.gather(
-        *[_num_clients(c) for c in self._target_executors])
+        *[_num_clients(self._target_executors[i]) for i in children])
+
+  async def _gather_child_results(self, coros) -> List[Tuple[int, Any]]:
+    """Awaits the result of each child in `coros`, as the straggler policy allows.
+
+    Args:
+      coros: The coroutines computing the result of each target executor, in
+        the order of `self._target_executors`.
+
+    Returns:
+      A list of `(index, result)` pairs for the children which contributed, in
+      the order in which they completed.
+    """
+    tasks = [asyncio.ensure_future(c) for c in coros]
+    indices = {task: index for index, task in enumerate(tasks)}
+    policy = self._straggler_policy
+    if policy is None:
+      num_required = len(tasks)
+    else:
+      num_required = max(1, len(tasks) - policy.max_dropped_children)
+    loop = asyncio.get_event_loop()
+    start_time = loop.time()
+    deadline = None
+    completed = []
+    pending = set(tasks)
+    try:
+      while pending:
+        timeout = None
+        if len(completed) >= num_required:
+          if policy is None or policy.deadline_percentile is None:
+            break
+          if deadline is not None:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+              break
+        done, pending = await asyncio.wait(
+            pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+          completed.append((indices[task], task.result()))
+        if (deadline is None and policy is not None and
+            policy.deadline_percentile is not None and len(completed) >=
+            math.ceil(policy.deadline_percentile * len(tasks))):
+          deadline = start_time + policy.deadline_factor * (
+              loop.time() - start_time)
+    finally:
+      # Dropped children are cancelled, releasing their pending values.
+      for task in pending:
+        task.cancel()
+    if pending:
+      logging.info('Dropped the contributions of %s straggling children.',
+                   len(pending))
+    return completed
 
   async def compute_federated_value(
       self, value: Any, type_signature: computation_types.Type
@@ -303,6 +434,21 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
   async def compute_federated_aggregate(
       self,
       arg: FederatedComposingStrategyValue) -> FederatedComposingStrategyValue:
+    result, _ = await self._aggregate(arg)
+    return result
+
+  async def _aggregate(
+      self, arg: FederatedComposingStrategyValue
+  ) -> Tuple[FederatedComposingStrategyValue, List[int]]:
+    """Computes a federated aggregate across the target executors.
+
+    Args:
+      arg: The argument of the `federated_aggregate` intrinsic.
+
+    Returns:
+      A tuple of the result, and the indices of the target executors which
+      contributed to it.
+    """
     value_type, zero_type, accumulate_type, merge_type, report_type = (
         executor_utils.parse_federated_aggregate_argument_types(
             arg.type_signature))
@@ -347,22 +493,24 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
         self._server_executor.create_value(report, report_type))
 
     if self._target_executors:
-      val_futures = asyncio.as_completed(
+      child_results = await self._gather_child_results(
           [_child_fn(c, v) for c, v in zip(self._target_executors, val)])
-      merge_result = await next(val_futures)
-      for next_val_future in val_futures:
-        next_val = await next_val_future
+      children = [index for index, _ in child_results]
+      merge_result = child_results[0][1]
+      for _, next_val in child_results[1:]:
         merge_arg = await self._server_executor.create_struct(
             [merge_result, next_val])
         merge_result = await self._server_executor.create_call(
             parent_merge, merge_arg)
     else:
+      children = []
       merge_result = await self._server_executor.create_value(zero, zero_type)
 
     report_result = await self._server_executor.create_call(
         parent_report, merge_result)
     return FederatedComposingStrategyValue(
-        report_result, computation_types.at_server(report_type.result))
+        report_result,
+        computation_types.at_server(report_type.result)), children
 
   @tracing.trace
   async def compute_federated_apply(
@@ -495,22 +643,25 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
         arg.type_signature, placement=placements.CLIENTS)
     member_type = arg.type_signature.member
 
-    async def _create_total():
-      total = await self.compute_federated_sum(arg)
+    async def _create_total_and_count():
+      if self._straggler_policy is None:
+        total, cardinalities = await asyncio.gather(
+            self.compute_federated_sum(arg), self._get_cardinalities())
+      else:
+        # Only the clients of the children which contributed are counted.
+        total, children = await self._sum(arg)
+        cardinalities = await self._get_cardinalities(children)
       total = await total.compute()
-      return await self._server_executor.create_value(total, member_type)
+      return (await self._server_executor.create_value(total, member_type),
+              sum(cardinalities))
 
-    async def _create_factor():
-      cardinalities = await self._get_cardinalities()
-      count = sum(cardinalities)
-      return await executor_utils.embed_constant(
+    async def _create_multiply_arg():
+      total, count = await _create_total_and_count()
+      factor = await executor_utils.embed_constant(
           self._server_executor,
           member_type,
           float(1.0 / count),
           local_computation_factory=self._local_computation_factory)
-
-    async def _create_multiply_arg():
-      total, factor = await asyncio.gather(_create_total(), _create_factor())
       return await self._server_executor.create_struct([total, factor])
 
     multiply_fn, multiply_arg = await asyncio.gather(
@@ -527,6 +678,13 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
   async def compute_federated_sum(
       self,
       arg: FederatedComposingStrategyValue) -> FederatedComposingStrategyValue:
+    result, _ = await self._sum(arg)
+    return result
+
+  async def _sum(
+      self, arg: FederatedComposingStrategyValue
+  ) -> Tuple[FederatedComposingStrategyValue, List[int]]:
+    """Like `_aggregate`, for the argument of the `federated_sum` intrinsic."""
     type_analysis.check_federated_type(
         arg.type_signature, placement=placements.CLIENTS)
     id_comp, id_type = tensorflow_computation_factory.create_identity(
@@ -544,7 +702,7 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
         self._executor.create_value(id_comp, id_type))
     aggregate_args = await self._executor.create_struct(
         [arg, zero, plus, plus, identity])
-    return await self.compute_federated_aggregate(aggregate_args)
+    return await self._aggregate(aggregate_args)
 
   @tracing.trace
   async def compute_federated_secure_sum_bitwidth(
@@ -621,10 +779,61 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
   async def compute_federated_weighted_mean(
       self,
       arg: FederatedComposingStrategyValue) -> FederatedComposingStrategyValue:
-    return await executor_utils.compute_intrinsic_federated_weighted_mean(
-        self._executor,
-        arg,
-        local_computation_factory=self._local_computation_factory)
+    if self._straggler_policy is None:
+      return await executor_utils.compute_intrinsic_federated_weighted_mean(
+          self._executor,
+          arg,
+          local_computation_factory=self._local_computation_factory)
+    # The weighted values and the weights are summed in a single aggregation,
+    # so that both cover the same children when stragglers are dropped.
+    type_analysis.check_valid_federated_weighted_mean_argument_tuple_type(
+        arg.type_signature)
+    value_type = arg.type_signature[0].member
+    weight_type = arg.type_signature[1].member
+    multiply_comp, multiply_type = (
+        self._local_computation_factory.create_scalar_multiply_operator(
+            value_type, weight_type))
+    product_type = multiply_type.result
+
+    async def _zip(value, member_types):
+      zip_type = computation_types.FunctionType(
+          computation_types.StructType(
+              [computation_types.at_clients(t) for t in member_types]),
+          computation_types.at_clients(
+              computation_types.StructType(member_types)))
+      zip_fn = await self._executor.create_value(
+          executor_utils.create_intrinsic_comp(
+              intrinsic_defs.FEDERATED_ZIP_AT_CLIENTS, zip_type), zip_type)
+      return await self._executor.create_call(zip_fn, value)
+
+    map_type = computation_types.FunctionType(
+        computation_types.StructType([
+            multiply_type,
+            computation_types.at_clients(
+                computation_types.StructType([value_type, weight_type]))
+        ]), computation_types.at_clients(product_type))
+    map_fn, multiply_fn, values_and_weights, weights = await asyncio.gather(
+        self._executor.create_value(
+            executor_utils.create_intrinsic_comp(intrinsic_defs.FEDERATED_MAP,
+                                                 map_type), map_type),
+        self._executor.create_value(multiply_comp, multiply_type),
+        _zip(arg, [value_type, weight_type]),
+        self._executor.create_selection(arg, 1))
+    products = await self._executor.create_call(
+        map_fn, await self._executor.create_struct(
+            [multiply_fn, values_and_weights]))
+    products_and_weights = await _zip(
+        await self._executor.create_struct([products, weights]),
+        [product_type, weight_type])
+    totals, _ = await self._sum(products_and_weights)
+    divide = building_block_factory.create_tensorflow_binary_operator_with_upcast(
+        tf.divide, computation_types.StructType([product_type, weight_type]))
+    result = await self._server_executor.create_call(
+        await self._server_executor.create_value(divide.proto,
+                                                 divide.type_signature),
+        totals.internal_representation)
+    return FederatedComposingStrategyValue(
+        result, computation_types.at_server(divide.type_signature.result))
 
   async def _zip_struct_into_child(self, child, child_index, value, value_type):
     """Embeds elements of `value` at `child_index` into `child`."""
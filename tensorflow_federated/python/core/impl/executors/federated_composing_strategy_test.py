@@ -24,6 +24,8 @@ from tensorflow_federated.python.common_libs import structure
 from tensorflow_federated.python.core.api import computations
 from tensorflow_federated.python.core.impl.compiler import intrinsic_defs
 from tensorflow_federated.python.core.impl.executors import eager_tf_executor
+from tensorflow_federated.python.core.impl.executors import executor_base
+from tensorflow_federated.python.core.impl.executors import executor_value_base
 from tensorflow_federated.python.core.impl.executors import federated_composing_strategy
 from tensorflow_federated.python.core.impl.executors import federated_resolving_strategy
 from tensorflow_federated.python.core.impl.executors import federating_executor
@@ -47,19 +49,22 @@ def _create_worker_stack():
   return federating_executor.FederatingExecutor(factory, _create_bottom_stack())
 
 
-def _create_middle_stack(children):
+def _create_middle_stack(children, straggler_policy=None):
   factory = federated_composing_strategy.FederatedComposingStrategy.factory(
-      _create_bottom_stack(), children)
+      _create_bottom_stack(), children, straggler_policy=straggler_policy)
   executor = federating_executor.FederatingExecutor(factory,
                                                     _create_bottom_stack())
   return reference_resolving_executor.ReferenceResolvingExecutor(executor)
 
 
-def _create_test_executor():
-  executor = _create_middle_stack([
-      _create_middle_stack([_create_worker_stack() for _ in range(3)]),
-      _create_middle_stack([_create_worker_stack() for _ in range(3)]),
-  ])
+def _create_test_executor(straggler_policy=None):
+  middle_stacks = [
+      _create_middle_stack([_create_worker_stack() for _ in range(3)],
+                           straggler_policy=straggler_policy)
+      for _ in range(2)
+  ]
+  executor = _create_middle_stack(
+      middle_stacks, straggler_policy=straggler_policy)
   # 2 clients per worker stack * 3 worker stacks * 2 middle stacks
   num_clients = 12
   return executor, num_clients
@@ -77,6 +82,86 @@ def _invoke(ex, comp, arg=None):
   return loop.run_until_complete(v3.compute())
 
 
+class _StragglingValue(executor_value_base.ExecutorValue):
+
+  def __init__(self, value, delay):
+    self.value = value
+    self._delay = delay
+
+  @property
+  def type_signature(self):
+    return self.value.type_signature
+
+  async def compute(self):
+    if self._delay is None:
+      await asyncio.Event().wait()
+    else:
+      await asyncio.sleep(self._delay)
+    return await self.value.compute()
+
+
+def _unwrap(value):
+  if isinstance(value, _StragglingValue):
+    return value.value
+  return value
+
+
+class _StragglingExecutor(executor_base.Executor):
+  """Delays computations once `straggling`, forever if `delay` is `None`."""
+
+  def __init__(self, target, delay=None):
+    self._target = target
+    self._delay = delay
+    self.straggling = False
+
+  def _wrap(self, value):
+    if self.straggling:
+      return _StragglingValue(value, self._delay)
+    return value
+
+  async def create_value(self, value, type_spec=None):
+    return self._wrap(await self._target.create_value(value, type_spec))
+
+  async def create_call(self, comp, arg=None):
+    return self._wrap(await self._target.create_call(
+        _unwrap(comp), _unwrap(arg) if arg is not None else None))
+
+  async def create_struct(self, elements):
+    elements = structure.from_container(elements)
+    return self._wrap(await self._target.create_struct(
+        structure.Struct([(name, _unwrap(value))
+                          for name, value in structure.iter_elements(elements)
+                         ])))
+
+  async def create_selection(self, source, index):
+    return self._wrap(await self._target.create_selection(
+        _unwrap(source), index))
+
+  def close(self):
+    self._target.close()
+
+
+def _create_straggling_executor(straggler_policy, delay=None):
+  straggler = _StragglingExecutor(_create_worker_stack(), delay=delay)
+  executor = _create_middle_stack(
+      [_create_worker_stack(), _create_worker_stack(), straggler],
+      straggler_policy=straggler_policy)
+  return executor, straggler
+
+
+def _invoke_with_straggler(ex, straggler, comp, arg=None):
+  loop = asyncio.get_event_loop()
+  v1 = loop.run_until_complete(ex.create_value(comp))
+  if arg is not None:
+    type_spec = v1.type_signature.parameter
+    v2 = loop.run_until_complete(ex.create_value(arg, type_spec))
+  else:
+    v2 = None
+  straggler.straggling = True
+  v3 = loop.run_until_complete(ex.create_call(v1, v2))
+  return loop.run_until_complete(v3.compute())
+
+
 class FederatedComposingStrategyTest(parameterized.TestCase):
 
   def test_recovers_from_raising(self):
@@ -461,6 +546,120 @@ class FederatedComposingStrategyTest(parameterized.TestCase):
     result = _invoke(executor, comp, arg)
     self.assertAlmostEqual(result, 6.83333333333, places=3)
 
+  def test_federated_sum_drops_straggler(self):
+
+    @computations.federated_computation
+    def comp():
+      value = intrinsics.federated_value(10, placements.CLIENTS)
+      return intrinsics.federated_sum(value)
+
+    executor, straggler = _create_straggling_executor(
+        federated_composing_strategy.StragglerPolicy(max_dropped_children=1))
+    result = _invoke_with_straggler(executor, straggler, comp)
+    # 2 clients on each of the 2 workers which contributed.
+    self.assertEqual(result, 40)
+
+  def test_federated_mean_normalizes_by_contributing_clients(self):
+
+    @computations.federated_computation(
+        computation_types.at_clients(tf.float32))
+    def comp(x):
+      return intrinsics.federated_mean(x)
+
+    executor, straggler = _create_straggling_executor(
+        federated_composing_strategy.StragglerPolicy(max_dropped_children=1))
+    result = _invoke_with_straggler(executor, straggler, comp,
+                                    [1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+    self.assertEqual(result, 2.5)
+
+  def test_federated_weighted_mean_drops_straggler(self):
+
+    @computations.federated_computation(
+        computation_types.at_clients(tf.float32),
+        computation_types.at_clients(tf.float32))
+    def comp(x, y):
+      return intrinsics.federated_mean(x, y)
+
+    executor, straggler = _create_straggling_executor(
+        federated_composing_strategy.StragglerPolicy(max_dropped_children=1))
+    arg = structure.Struct([('x', [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]),
+                            ('y', [1.0, 1.0, 1.0, 5.0, 100.0, 100.0])])
+    result = _invoke_with_straggler(executor, straggler, comp, arg)
+    self.assertAlmostEqual(result, 26.0 / 8.0, places=5)
+
+  @parameterized.named_parameters(
+      ('mean', intrinsics.federated_mean, 6.5),
+      ('sum', intrinsics.federated_sum, 78.0),
+  )
+  def test_straggler_policy_without_stragglers(self, intrinsic, expected):
+
+    @computations.federated_computation(
+        computation_types.at_clients(tf.float32))
+    def comp(x):
+      return intrinsic(x)
+
+    executor, num_clients = _create_test_executor(
+        federated_composing_strategy.StragglerPolicy(max_dropped_children=0))
+    arg = [float(x + 1) for x in range(num_clients)]
+    result = _invoke(executor, comp, arg)
+    self.assertEqual(result, expected)
+
+  def test_federated_weighted_mean_with_straggler_policy(self):
+
+    @computations.federated_computation(
+        computation_types.at_clients(tf.float32),
+        computation_types.at_clients(tf.float32))
+    def comp(x, y):
+      return intrinsics.federated_mean(x, y)
+
+    executor, num_clients = _create_test_executor(
+        federated_composing_strategy.StragglerPolicy(max_dropped_children=0))
+    arg = structure.Struct([('x', [float(x + 1) for x in range(num_clients)]),
+                            ('y', [1.0, 2.0, 3.0] * 4)])
+    result = _invoke(executor, comp, arg)
+    self.assertAlmostEqual(result, 6.83333333333, places=3)
+
+  def test_waits_for_slow_child_within_deadline(self):
+
+    @computations.federated_computation
+    def comp():
+      value = intrinsics.federated_value(10, placements.CLIENTS)
+      return intrinsics.federated_sum(value)
+
+    executor, straggler = _create_straggling_executor(
+        federated_composing_strategy.StragglerPolicy(
+            max_dropped_children=1,
+            deadline_percentile=0.5,
+            deadline_factor=1e4),
+        delay=0.1)
+    result = _invoke_with_straggler(executor, straggler, comp)
+    self.assertEqual(result, 60)
+
+  def test_drops_wedged_child_after_deadline(self):
+
+    @computations.federated_computation
+    def comp():
+      value = intrinsics.federated_value(10, placements.CLIENTS)
+      return intrinsics.federated_sum(value)
+
+    executor, straggler = _create_straggling_executor(
+        federated_composing_strategy.StragglerPolicy(
+            max_dropped_children=1, deadline_percentile=0.5))
+    result = _invoke_with_straggler(executor, straggler, comp)
+    self.assertEqual(result, 40)
+
+  @parameterized.named_parameters(
+      ('negative_max_dropped_children', dict(max_dropped_children=-1)),
+      ('zero_deadline_percentile',
+       dict(max_dropped_children=1, deadline_percentile=0.0)),
+      ('small_deadline_factor',
+       dict(max_dropped_children=1, deadline_percentile=0.5,
+            deadline_factor=0.5)),
+  )
+  def test_straggler_policy_raises_value_error(self, kwargs):
+    with self.assertRaises(ValueError):
+      federated_composing_strategy.StragglerPolicy(**kwargs)
+
   def test_executor_call_unsupported_intrinsic(self):
     # `whimsy_intrinsic` definition is needed to allow successful lookup.
     whimsy_intrinsic = intrinsic_defs.IntrinsicDef(
@@ -47,9 +47,10 @@
 """
 
 import asyncio
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import absl.logging as logging
+import numpy as np
 import tensorflow as tf
 
 from tensorflow_federated.proto.v0 import computation_pb2 as pb
@@ -142,6 +143,18 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
 
   Note that this strategy does not have a built-in concept of intermediate
   aggregation, partitioning placements, clustering clients, etc.
+
+  By default, client values are folded into the aggregate at the server one at
+  a time, in the order in which they arrive. If `tree_reduction` is `True`, the
+  aggregations which are associative by contract (`tff.federated_sum`, and the
+  `merge` stage of `tff.federated_aggregate`) are instead combined pairwise in
+  a tree of logarithmic depth, so that the calls at each level of the tree are
+  independent of each other and can proceed concurrently.
+
+  When the local computation factory supports it, `tff.federated_sum` and
+  `tff.federated_mean` over tensors (or structures of tensors) bypass both of
+  the above: all client values are stacked at the server and reduced in a
+  single call, instead of one call per client.
   """
 
   @classmethod
@@ -149,12 +162,14 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
               target_executors: Dict[str, executor_base.Executor],
               local_computation_factory: local_computation_factory_base
               .LocalComputationFactory = tensorflow_computation_factory
-              .TensorFlowComputationFactory()):
+              .TensorFlowComputationFactory(),
+              tree_reduction: bool = False):
     # pylint:disable=g-long-lambda
     return lambda executor: cls(
         executor,
         target_executors,
-        local_computation_factory=local_computation_factory)
+        local_computation_factory=local_computation_factory,
+        tree_reduction=tree_reduction)
     # pylint:enable=g-long-lambda
 
   def __init__(self,
@@ -162,7 +177,8 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
                target_executors: Dict[str, executor_base.Executor],
                local_computation_factory: local_computation_factory_base
                .LocalComputationFactory = tensorflow_computation_factory
-               .TensorFlowComputationFactory()):
+               .TensorFlowComputationFactory(),
+               tree_reduction: bool = False):
     """Creates a `FederatedResolvingStrategy`.
 
     Args:
@@ -177,6 +193,9 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
         to construct local computations used as parameters in certain federated
         operators (such as `tff.federated_sum`, etc.). Defaults to a TensorFlow
         computation factory that generates TensorFlow code.
+      tree_reduction: A `bool` indicating whether associative aggregations
+        should be combined in a tree of logarithmic depth rather than
+        sequentially.
 
     Raises:
       TypeError: If `target_executors` is not a `dict`, where each key is a
@@ -191,8 +210,12 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
     py_typecheck.check_type(
         local_computation_factory,
         local_computation_factory_base.LocalComputationFactory)
+    py_typecheck.check_type(tree_reduction, bool)
     self._target_executors = {}
     self._local_computation_factory = local_computation_factory
+    self._tree_reduction = tree_reduction
+    self._stacked_operators = {}
+    self._batched_select_operators = {}
     for k, v in target_executors.items():
       if k is not None:
         py_typecheck.check_type(k, placements.PlacementLiteral)
@@ -394,21 +417,32 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
     val_type, zero_type, accumulate_type, merge_type, report_type = (
         executor_utils.parse_federated_aggregate_argument_types(
             arg.type_signature))
-    del val_type, merge_type
+    del val_type
     py_typecheck.check_type(arg.internal_representation, structure.Struct)
     py_typecheck.check_len(arg.internal_representation, 5)
     val, zero, accumulate, merge, report = arg.internal_representation
 
-    # Discard `merge`. Since all aggregation happens on a single executor,
-    # there's no need for this additional layer.
-    del merge
-
     # Re-wrap `zero` in a `FederatingResolvingStrategyValue` to ensure that it
     # is an `ExecutorValue` rather than a `Struct` (since the internal
     # representation can include embedded values, lists of embedded values
     # (in the case of federated values), or `Struct`s.
     zero = FederatedResolvingStrategyValue(zero, zero_type)
-    pre_report = await self.reduce(val, zero, accumulate, accumulate_type)
+    if self._tree_reduction:
+      # Every client forms its own group: its value is accumulated into `zero`,
+      # and the per-client accumulators are then merged in a tree, relying on
+      # the associativity and commutativity of `merge`.
+      pre_report = await self.tree_reduce(
+          val,
+          zero,
+          merge,
+          merge_type,
+          accumulate=accumulate,
+          accumulate_type=accumulate_type)
+    else:
+      # Discard `merge`. Since all aggregation happens on a single executor,
+      # there's no need for this additional layer.
+      del merge
+      pre_report = await self.reduce(val, zero, accumulate, accumulate_type)
 
     py_typecheck.check_type(pre_report.type_signature,
                             computation_types.FederatedType)
@@ -467,6 +501,11 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
   async def compute_federated_mean(
       self,
       arg: FederatedResolvingStrategyValue) -> FederatedResolvingStrategyValue:
+    stacked_mean = self._create_stacked_operator(
+        self._local_computation_factory.create_stacked_mean_operator, arg)
+    if stacked_mean is not None:
+      return await self.stacked_reduce(arg.internal_representation,
+                                       *stacked_mean)
     arg_sum = await self.compute_federated_sum(arg)
     member_type = arg_sum.type_signature.member
     count = float(len(arg.internal_representation))
@@ -519,6 +558,156 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
                                                placements.SERVER,
                                                all_equal=True))
 
+  @tracing.trace
+  async def stacked_reduce(
+      self,
+      val: List[executor_value_base.ExecutorValue],
+      op: pb.Computation,
+      op_type: computation_types.FunctionType,
+  ) -> FederatedResolvingStrategyValue:
+    """Reduces `val` at the server with a single call to `op`.
+
+    Args:
+      val: A non-empty list of embedded values to reduce.
+      op: An operator `(<T,...,T> -> T)` taking as many elements as there are
+        members of `val`, such as one created by `create_stacked_sum_operator`.
+      op_type: The type signature of `op`.
+
+    Returns:
+      An instance of `FederatedResolvingStrategyValue` placed at the server.
+    """
+    server = self._target_executors[placements.SERVER][0]
+
+    async def _move(v):
+      return await server.create_value(await v.compute(), v.type_signature)
+
+    op_at_server, *items = await asyncio.gather(
+        server.create_value(op, op_type), *[_move(v) for v in val])
+    result = await server.create_call(
+        op_at_server, await server.create_struct(
+            structure.Struct([(None, item) for item in items])))
+    return FederatedResolvingStrategyValue([result],
+                                           computation_types.FederatedType(
+                                               result.type_signature,
+                                               placements.SERVER,
+                                               all_equal=True))
+
+  def _create_stacked_operator(self, create_operator_fn, arg):
+    """Returns a stacked operator for the members of `arg`, or `None`.
+
+    `None` is returned if the members of `arg` are not tensors or structures of
+    tensors, or if the local computation factory does not support stacked
+    operators, in which case callers fall back to a pairwise reduction.
+
+    The operators are cached by their member type and number of clients, so
+    that they are only constructed once for all rounds of a computation.
+
+    Args:
+      create_operator_fn: A stacked operator constructor of the local
+        computation factory, such as `create_stacked_sum_operator`.
+      arg: A `FederatedResolvingStrategyValue` placed at the clients.
+    """
+    member_type = arg.type_signature.member
+    count = len(arg.internal_representation)
+    if count < 1 or not type_analysis.is_generic_op_compatible_type(
+        member_type):
+      return None
+    key = (create_operator_fn.__name__, member_type, count)
+    if key not in self._stacked_operators:
+      self._stacked_operators[key] = create_operator_fn(member_type, count)
+    return self._stacked_operators[key]
+
+  def _create_batched_select_operator(self, select_fn, select_fn_type):
+    """Returns a batched version of `select_fn`, or `None`.
+
+    `None` is returned if the local computation factory cannot batch
+    `select_fn`, in which case callers select each key separately. The
+    operators are cached by `select_fn`, so that they are only constructed once
+    for all rounds of a computation.
+
+    Args:
+      select_fn: The `pb.Computation` selecting a single key.
+      select_fn_type: The `computation_types.FunctionType` of `select_fn`.
+    """
+    key = select_fn.SerializeToString(deterministic=True)
+    if key not in self._batched_select_operators:
+      self._batched_select_operators[key] = (
+          self._local_computation_factory.create_batched_select_operator(
+              select_fn, select_fn_type))
+    return self._batched_select_operators[key]
+
+  @tracing.trace
+  async def tree_reduce(
+      self,
+      val: List[executor_value_base.ExecutorValue],
+      zero: executor_value_base.ExecutorValue,
+      merge: pb.Computation,
+      merge_type: computation_types.FunctionType,
+      accumulate: Optional[pb.Computation] = None,
+      accumulate_type: Optional[computation_types.FunctionType] = None,
+  ) -> FederatedResolvingStrategyValue:
+    """Reduces `val` at the server by merging pairwise in a tree.
+
+    Each member of `val` is moved to the server and, if `accumulate` is given,
+    accumulated into `zero`. The results are then combined with `merge` in
+    rounds, each of which halves the number of values, so the reduction has
+    logarithmic rather than linear depth and the calls in each round are issued
+    concurrently.
+
+    Args:
+      val: A list of embedded values to reduce.
+      zero: The embedded zero of the reduction, returned if `val` is empty.
+      merge: An associative and commutative binary operator `(<U,U> -> U)`.
+      merge_type: The type signature of `merge`.
+      accumulate: An optional operator `(<U,T> -> U)` applied to `zero` and
+        each member of `val` before merging. If `None`, the members of `val`
+        are merged directly, so they must be of type `U`, and `zero` must be an
+        identity of `merge`.
+      accumulate_type: The type signature of `accumulate`, if given.
+
+    Returns:
+      An instance of `FederatedResolvingStrategyValue` placed at the server.
+    """
+    server = self._target_executors[placements.SERVER][0]
+
+    async def _move(v):
+      return await server.create_value(await v.compute(), v.type_signature)
+
+    async def _call_binary_op(op_at_server, first, second):
+      return await server.create_call(
+          op_at_server, await server.create_struct(
+              structure.Struct([(None, first), (None, second)])))
+
+    zero_at_server, merge_at_server = await asyncio.gather(
+        _move(zero), server.create_value(merge, merge_type))
+    if accumulate is not None:
+      accumulate_at_server = await server.create_value(accumulate,
+                                                       accumulate_type)
+
+    async def _move_and_accumulate(v):
+      item = await _move(v)
+      if accumulate is None:
+        return item
+      return await _call_binary_op(accumulate_at_server, zero_at_server, item)
+
+    partial_results = list(
+        await asyncio.gather(*[_move_and_accumulate(v) for v in val]))
+    if not partial_results:
+      partial_results = [zero_at_server]
+    while len(partial_results) > 1:
+      merged = await asyncio.gather(*[
+          _call_binary_op(merge_at_server, first, second) for first, second in
+          zip(partial_results[0::2], partial_results[1::2])
+      ])
+      # An odd value out is carried over to the next round unchanged.
+      partial_results = list(merged) + partial_results[2 * len(merged):]
+    result = partial_results[0]
+    return FederatedResolvingStrategyValue([result],
+                                           computation_types.FederatedType(
+                                               result.type_signature,
+                                               placements.SERVER,
+                                               all_equal=True))
+
   @tracing.trace
   async def compute_federated_secure_sum_bitwidth(
       self,
@@ -567,6 +756,46 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
       raise TypeError(f'Unexpected `client_keys_type`: {client_keys_type}')
     num_keys_per_client: int = client_keys_type.member.shape.dims[0].value
     unplaced_result_type = computation_types.SequenceType(select_fn_type.result)
+    all_keys = [
+        np.asarray(keys, np.int32) for keys in await asyncio.gather(
+            *[keys_at_client.compute() for keys_at_client in client_keys])
+    ]
+    batched_select_fn = self._create_batched_select_operator(
+        select_fn, select_fn_type)
+    if batched_select_fn is not None:
+      # Keys shared by several clients are only selected once.
+      unique_keys = np.unique(
+          np.concatenate([np.zeros([0], np.int32)] + all_keys))
+      if unique_keys.size:
+        batched_select_fn_at_server, unique_keys_at_server = (
+            await asyncio.gather(
+                server.create_value(*batched_select_fn),
+                server.create_value(
+                    unique_keys,
+                    computation_types.TensorType(tf.int32,
+                                                 [len(unique_keys)]))))
+        batched_select_fn_arg = await server.create_struct(
+            structure.Struct([
+                (None, server_val_at_server),
+                (None, unique_keys_at_server),
+            ]))
+        selected = await server.create_call(batched_select_fn_at_server,
+                                            batched_select_fn_arg)
+        stacked_values = await selected.compute()
+        selected_values = [
+            structure.map_structure(lambda t, i=i: t[i], stacked_values)
+            for i in range(len(unique_keys))
+        ]
+      else:
+        selected_values = []
+      selected_by_key = dict(zip(unique_keys.tolist(), selected_values))
+      return FederatedResolvingStrategyValue(
+          list(await asyncio.gather(*[
+              client.create_value([selected_by_key[k] for k in keys.tolist()],
+                                  unplaced_result_type)
+              for client, keys in zip(clients, all_keys)
+          ])), computation_types.at_clients(unplaced_result_type))
+
     select_fn_at_server = await server.create_value(select_fn, select_fn_type)
     index_fn_at_server = await executor_utils.embed_indexing_operator(
         server, client_keys_type.member, single_key_type)
@@ -587,9 +816,8 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
       selected = await server.create_call(select_fn_at_server, select_fn_arg)
       return await selected.compute()
 
-    async def select_single_client(client, keys_at_client):
-      keys_at_server = await server.create_value(await keys_at_client.compute(),
-                                                 client_keys_type.member)
+    async def select_single_client(client, keys):
+      keys_at_server = await server.create_value(keys, client_keys_type.member)
       unplaced_values = await asyncio.gather(*[
           select_single_key(keys_at_server, i)
           for i in range(num_keys_per_client)
@@ -598,8 +826,8 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
 
     return FederatedResolvingStrategyValue(
         list(await asyncio.gather(*[
-            select_single_client(client, keys_at_client)
-            for client, keys_at_client in zip(clients, client_keys)
+            select_single_client(client, keys)
+            for client, keys in zip(clients, all_keys)
         ])), computation_types.at_clients(unplaced_result_type))
 
   @tracing.trace
@@ -607,6 +835,11 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
       self,
       arg: FederatedResolvingStrategyValue) -> FederatedResolvingStrategyValue:
     py_typecheck.check_type(arg.type_signature, computation_types.FederatedType)
+    stacked_sum = self._create_stacked_operator(
+        self._local_computation_factory.create_stacked_sum_operator, arg)
+    if stacked_sum is not None:
+      return await self.stacked_reduce(arg.internal_representation,
+                                       *stacked_sum)
     zero, plus = await asyncio.gather(
         executor_utils.embed_constant(
             self._executor,
@@ -617,6 +850,10 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
             self._executor,
             arg.type_signature.member,
             local_computation_factory=self._local_computation_factory))
+    if self._tree_reduction:
+      return await self.tree_reduce(arg.internal_representation, zero,
+                                    plus.internal_representation,
+                                    plus.type_signature)
     return await self.reduce(arg.internal_representation, zero,
                              plus.internal_representation, plus.type_signature)
 
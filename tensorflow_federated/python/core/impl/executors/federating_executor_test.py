@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 from typing import Any, Iterable, List, Tuple, Type
 
 from absl.testing import absltest
@@ -21,6 +22,8 @@ import tensorflow as tf
 from tensorflow_federated.proto.v0 import computation_pb2 as pb
 from tensorflow_federated.python.common_libs import structure
 from tensorflow_federated.python.core.impl.compiler import intrinsic_defs
+from tensorflow_federated.python.core.impl.compiler import local_computation_factory_base
+from tensorflow_federated.python.core.impl.compiler import tensorflow_computation_factory
 from tensorflow_federated.python.core.impl.computation import computation_impl
 from tensorflow_federated.python.core.impl.context_stack import context_stack_impl
 from tensorflow_federated.python.core.impl.executors import eager_tf_executor
@@ -39,19 +42,28 @@ def all_isinstance(objs: Iterable[Any], classinfo: Type[Any]) -> bool:
 
 
 def create_test_executor(
-    number_of_clients: int = 3) -> federating_executor.FederatingExecutor:
+    number_of_clients: int = 3,
+    tree_reduction: bool = False,
+    local_computation_factory: local_computation_factory_base
+    .LocalComputationFactory = tensorflow_computation_factory
+    .TensorFlowComputationFactory()
+) -> federating_executor.FederatingExecutor:
 
   def create_bottom_stack():
     executor = eager_tf_executor.EagerTFExecutor()
     return reference_resolving_executor.ReferenceResolvingExecutor(executor)
 
-  factory = federated_resolving_strategy.FederatedResolvingStrategy.factory({
+  target_executors = {
       placements.SERVER:
           create_bottom_stack(),
       placements.CLIENTS: [
           create_bottom_stack() for _ in range(number_of_clients)
       ],
-  })
+  }
+  factory = federated_resolving_strategy.FederatedResolvingStrategy.factory(
+      target_executors,
+      local_computation_factory=local_computation_factory,
+      tree_reduction=tree_reduction)
   return federating_executor.FederatingExecutor(factory, create_bottom_stack())
 
 
@@ -571,6 +583,214 @@ class FederatingExecutorCreateCallTest(executor_test_utils.AsyncTestCase,
       self.run_sync(executor.create_call(comp))
 
 
+class FederatingExecutorTreeReductionTest(executor_test_utils.AsyncTestCase,
+                                          parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('one_client', 1),
+      ('two_clients', 2),
+      ('five_clients', 5),
+      ('eight_clients', 8),
+  )
+  def test_federated_sum(self, number_of_clients):
+    executor = create_test_executor(
+        number_of_clients=number_of_clients, tree_reduction=True)
+    comp, comp_type = executor_test_utils.create_whimsy_intrinsic_def_federated_sum(
+    )
+    values = [float(x) for x in range(number_of_clients)]
+
+    comp = self.run_sync(executor.create_value(comp, comp_type))
+    arg = self.run_sync(
+        executor.create_value(values, computation_types.at_clients(tf.float32)))
+    result = self.run_sync(executor.create_call(comp, arg))
+
+    self.assertEqual(self.run_sync(result.compute()), sum(values))
+
+  @parameterized.named_parameters(
+      ('one_client', 1),
+      ('two_clients', 2),
+      ('five_clients', 5),
+  )
+  def test_federated_aggregate(self, number_of_clients):
+    executor = create_test_executor(
+        number_of_clients=number_of_clients, tree_reduction=True)
+    comp, comp_type = executor_test_utils.create_whimsy_intrinsic_def_federated_aggregate(
+    )
+    values = [float(x) for x in range(number_of_clients)]
+    args = [
+        (values, computation_types.at_clients(tf.float32)),
+        executor_test_utils.create_whimsy_value_unplaced(),
+        executor_test_utils.create_whimsy_computation_tensorflow_add(),
+        executor_test_utils.create_whimsy_computation_tensorflow_add(),
+        executor_test_utils.create_whimsy_computation_tensorflow_identity(),
+    ]
+
+    comp = self.run_sync(executor.create_value(comp, comp_type))
+    elements = [self.run_sync(executor.create_value(*x)) for x in args]
+    arg = self.run_sync(executor.create_struct(elements))
+    result = self.run_sync(executor.create_call(comp, arg))
+
+    # The zero (10.0) is accumulated once per client, since every client forms
+    # its own group.
+    self.assertEqual(
+        self.run_sync(result.compute()), sum(values) + 10.0 * number_of_clients)
+
+
+class _UnvectorizedComputationFactory(
+    tensorflow_computation_factory.TensorFlowComputationFactory):
+  """A factory which supports none of the vectorized operators."""
+
+  def create_stacked_sum_operator(self, operand_type, count):
+    return None
+
+  def create_stacked_mean_operator(self, operand_type, count):
+    return None
+
+  def create_batched_select_operator(self, select_fn, select_fn_type):
+    return None
+
+
+class _CountingComputationFactory(
+    tensorflow_computation_factory.TensorFlowComputationFactory):
+  """A factory counting the vectorized operators it creates."""
+
+  def __init__(self):
+    super().__init__()
+    self.num_stacked_operators = 0
+    self.num_batched_select_operators = 0
+
+  def create_stacked_sum_operator(self, operand_type, count):
+    self.num_stacked_operators += 1
+    return super().create_stacked_sum_operator(operand_type, count)
+
+  def create_batched_select_operator(self, select_fn, select_fn_type):
+    self.num_batched_select_operators += 1
+    return super().create_batched_select_operator(select_fn, select_fn_type)
+
+
+class FederatingExecutorStackedReductionTest(executor_test_utils.AsyncTestCase,
+                                             parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('one_client_stacked', 1, True),
+      ('five_clients_stacked', 5, True),
+      ('one_client_unstacked', 1, False),
+      ('five_clients_unstacked', 5, False),
+  )
+  def test_federated_sum_of_struct(self, number_of_clients, stacked):
+    local_computation_factory = (
+        tensorflow_computation_factory.TensorFlowComputationFactory()
+        if stacked else _UnvectorizedComputationFactory())
+    executor = create_test_executor(
+        number_of_clients=number_of_clients,
+        local_computation_factory=local_computation_factory)
+    member_type = computation_types.StructType([('a', tf.float32),
+                                                ('b', tf.int32)])
+    comp_type = computation_types.FunctionType(
+        computation_types.at_clients(member_type),
+        computation_types.at_server(member_type))
+    values = [
+        collections.OrderedDict(a=float(x), b=x)
+        for x in range(number_of_clients)
+    ]
+
+    comp = self.run_sync(
+        executor.create_value(intrinsic_defs.FEDERATED_SUM, comp_type))
+    arg_type = computation_types.at_clients(member_type)
+    arg = self.run_sync(executor.create_value(values, arg_type))
+    result = self.run_sync(executor.create_call(comp, arg))
+
+    expected_sum = sum(range(number_of_clients))
+    self.assertEqual(
+        self.run_sync(result.compute()),
+        structure.Struct([('a', float(expected_sum)), ('b', expected_sum)]))
+
+  @parameterized.named_parameters(
+      ('one_client_stacked', 1, True),
+      ('five_clients_stacked', 5, True),
+      ('one_client_unstacked', 1, False),
+      ('five_clients_unstacked', 5, False),
+  )
+  def test_federated_mean(self, number_of_clients, stacked):
+    local_computation_factory = (
+        tensorflow_computation_factory.TensorFlowComputationFactory()
+        if stacked else _UnvectorizedComputationFactory())
+    executor = create_test_executor(
+        number_of_clients=number_of_clients,
+        local_computation_factory=local_computation_factory)
+    comp, comp_type = executor_test_utils.create_whimsy_intrinsic_def_federated_mean(
+    )
+    values = [float(x) for x in range(number_of_clients)]
+
+    comp = self.run_sync(executor.create_value(comp, comp_type))
+    arg = self.run_sync(
+        executor.create_value(values, computation_types.at_clients(tf.float32)))
+    result = self.run_sync(executor.create_call(comp, arg))
+
+    self.assertAlmostEqual(
+        self.run_sync(result.compute()), sum(values) / number_of_clients)
+
+  def test_federated_sum_reuses_stacked_operator(self):
+    local_computation_factory = _CountingComputationFactory()
+    executor = create_test_executor(
+        number_of_clients=3,
+        local_computation_factory=local_computation_factory)
+    comp, comp_type = executor_test_utils.create_whimsy_intrinsic_def_federated_sum(
+    )
+    comp = self.run_sync(executor.create_value(comp, comp_type))
+
+    for _ in range(2):
+      arg = self.run_sync(
+          executor.create_value([1.0, 2.0, 3.0],
+                                computation_types.at_clients(tf.float32)))
+      result = self.run_sync(executor.create_call(comp, arg))
+      self.assertEqual(self.run_sync(result.compute()), 6.0)
+
+    self.assertEqual(local_computation_factory.num_stacked_operators, 1)
+
+
+class FederatingExecutorBatchedSelectTest(executor_test_utils.AsyncTestCase,
+                                          parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('batched', True),
+      ('unbatched', False),
+  )
+  def test_federated_select_with_overlapping_keys(self, batched):
+    local_computation_factory = (
+        _CountingComputationFactory()
+        if batched else _UnvectorizedComputationFactory())
+    executor = create_test_executor(
+        number_of_clients=3,
+        local_computation_factory=local_computation_factory)
+    comp, comp_type = executor_test_utils.create_whimsy_intrinsic_def_federated_select(
+    )
+    client_keys = [[0, 1, 2], [2, 1, 0], [1, 1, 1]]
+    client_keys_type, max_key_type, server_state_type, _ = comp_type.parameter
+    args = [
+        (client_keys, client_keys_type),
+        (2, max_key_type),
+        ('abc', server_state_type),
+        executor_test_utils.create_whimsy_federated_select_args()[3],
+    ]
+
+    comp = self.run_sync(executor.create_value(comp, comp_type))
+    elements = [self.run_sync(executor.create_value(*x)) for x in args]
+    arg = self.run_sync(executor.create_struct(elements))
+    result = self.run_sync(executor.create_call(comp, arg))
+
+    actual_result = self.run_sync(result.compute())
+    self.assertLen(actual_result, len(client_keys))
+    for dataset, keys in zip(actual_result, client_keys):
+      actual_elements = [
+          tuple(t.numpy() for t in element) for element in dataset
+      ]
+      self.assertEqual(actual_elements, [(b'abc', k) for k in keys])
+    if batched:
+      self.assertEqual(local_computation_factory.num_batched_select_operators,
+                       1)
+
+
 class FederatingExecutorCreateStructTest(executor_test_utils.AsyncTestCase,
                                          parameterized.TestCase):
 
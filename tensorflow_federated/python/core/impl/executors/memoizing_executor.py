@@ -0,0 +1,447 @@
+# Copyright 2021, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# pytype: skip-file
+# This modules disables the Pytype analyzer, see
+# https://github.com/tensorflow/federated/blob/main/docs/pytype.md for more
+# information.
+"""An executor reusing the results of deterministic computations."""
+
+import collections
+import hashlib
+import itertools
+import os
+import threading
+from typing import Callable, Optional
+
+from absl import logging
+import tensorflow as tf
+
+from tensorflow_federated.proto.v0 import computation_pb2 as pb
+from tensorflow_federated.proto.v0 import executor_pb2
+from tensorflow_federated.python.common_libs import py_typecheck
+from tensorflow_federated.python.common_libs import serialization_utils
+from tensorflow_federated.python.common_libs import structure
+from tensorflow_federated.python.common_libs import tracing
+from tensorflow_federated.python.core.impl.computation import computation_impl
+from tensorflow_federated.python.core.impl.executors import executor_base
+from tensorflow_federated.python.core.impl.executors import executor_serialization
+from tensorflow_federated.python.core.impl.executors import executor_value_base
+
+# TensorFlow ops whose outputs may differ between two runs on the same inputs.
+# Stateless random ops, whose seeds are inputs, are deterministic.
+_NONDETERMINISTIC_OPS = frozenset([
+    'EagerPyFunc',
+    'Multinomial',
+    'ParameterizedTruncatedNormal',
+    'PyFunc',
+    'PyFuncStateless',
+    'RandomDataset',
+    'RandomDatasetV2',
+    'RandomGamma',
+    'RandomPoisson',
+    'RandomPoissonV2',
+    'RandomShuffle',
+    'RandomShuffleQueueV2',
+    'RandomStandardNormal',
+    'RandomUniform',
+    'RandomUniformInt',
+    'RngReadAndSkip',
+    'RngSkip',
+    'ShuffleAndRepeatDataset',
+    'ShuffleAndRepeatDatasetV2',
+    'ShuffleDataset',
+    'ShuffleDatasetV2',
+    'ShuffleDatasetV3',
+    'StatefulRandomBinomial',
+    'StatefulStandardNormal',
+    'StatefulStandardNormalV2',
+    'StatefulTruncatedNormal',
+    'StatefulUniform',
+    'StatefulUniformFullInt',
+    'StatefulUniformInt',
+    'Timestamp',
+    'TruncatedNormal',
+])
+
+
+def is_deterministic_computation(comp: pb.Computation) -> bool:
+  """Whether `comp` is a TensorFlow computation free of nondeterministic ops.
+
+  Args:
+    comp: An instance of `pb.Computation`.
+
+  Returns:
+    `True` if `comp` is a TensorFlow computation, none of whose ops, including
+    those of the functions in its library, is known to be nondeterministic.
+  """
+  py_typecheck.check_type(comp, pb.Computation)
+  if comp.WhichOneof('computation') != 'tensorflow':
+    return False
+  return not _has_nondeterministic_ops(
+      serialization_utils.unpack_graph_def(comp.tensorflow.graph_def))
+
+
+def _has_nondeterministic_ops(graph_def: tf.compat.v1.GraphDef) -> bool:
+  nodes = itertools.chain(graph_def.node,
+                          *[f.node_def for f in graph_def.library.function])
+  return any(node.op in _NONDETERMINISTIC_OPS for node in nodes)
+
+
+def _is_deterministic_value(value_proto: executor_pb2.Value) -> bool:
+  """Whether `value_proto` is free of sequences with nondeterministic ops.
+
+  Two equal serialized datasets may still yield different elements, e.g. if
+  they shuffle their elements or map them through random ops, so calls with
+  such arguments must not be memoized.
+
+  Args:
+    value_proto: An instance of `executor_pb2.Value`.
+
+  Returns:
+    `False` if `value_proto` contains a sequence whose graph contains ops known
+    to be nondeterministic, or which is not serialized as a graph.
+  """
+  which_value = value_proto.WhichOneof('value')
+  if which_value == 'sequence':
+    if value_proto.sequence.WhichOneof('value') != 'serialized_graph_def':
+      return False
+    graph_def = tf.compat.v1.GraphDef.FromString(
+        value_proto.sequence.serialized_graph_def)
+    return not _has_nondeterministic_ops(graph_def)
+  elif which_value == 'struct':
+    return all(
+        _is_deterministic_value(element.value)
+        for element in value_proto.struct.element)
+  elif which_value == 'federated':
+    return all(
+        _is_deterministic_value(member)
+        for member in value_proto.federated.value)
+  return True
+
+
+class MemoizationCache(object):
+  """A thread-safe LRU cache of the serialized results of computations.
+
+  Results are evicted in least-recently-used order once together they exceed
+  `max_bytes`. If a `spill_dir` is given, evicted results are written to files
+  in that directory rather than dropped, and read back on a later hit; the
+  spilled results are in turn deleted in least-recently-used order once they
+  exceed `max_spill_bytes`.
+  """
+
+  def __init__(self,
+               max_bytes: int,
+               spill_dir: Optional[str] = None,
+               max_spill_bytes: Optional[int] = None):
+    """Creates an empty cache.
+
+    Args:
+      max_bytes: The maximum total size of the results held in memory, in
+        serialized bytes; must be positive.
+      spill_dir: An optional existing directory to which evicted results are
+        written.
+      max_spill_bytes: An optional maximum total size of the results spilled to
+        `spill_dir`, in bytes; must be positive. Unbounded by default.
+
+    Raises:
+      ValueError: If `max_bytes` or `max_spill_bytes` is not positive, or if
+        `max_spill_bytes` is given without a `spill_dir`.
+    """
+    py_typecheck.check_type(max_bytes, int)
+    if max_bytes < 1:
+      raise ValueError(f'Expected a positive `max_bytes`, found {max_bytes}.')
+    if spill_dir is not None:
+      py_typecheck.check_type(spill_dir, str)
+    if max_spill_bytes is not None:
+      py_typecheck.check_type(max_spill_bytes, int)
+      if max_spill_bytes < 1:
+        raise ValueError('Expected a positive `max_spill_bytes`, found '
+                         f'{max_spill_bytes}.')
+      if spill_dir is None:
+        raise ValueError('`max_spill_bytes` requires a `spill_dir`.')
+    self._max_bytes = max_bytes
+    self._spill_dir = spill_dir
+    self._max_spill_bytes = max_spill_bytes
+    self._lock = threading.Lock()
+    self._entries = collections.OrderedDict()
+    self._size_bytes = 0
+    self._spilled_entries = collections.OrderedDict()
+    self._spilled_bytes = 0
+    self._hits = 0
+    self._misses = 0
+
+  @property
+  def size_bytes(self) -> int:
+    """The total size of the results held in memory, in bytes."""
+    return self._size_bytes
+
+  @property
+  def spilled_bytes(self) -> int:
+    """The total size of the results spilled to disk, in bytes."""
+    return self._spilled_bytes
+
+  @property
+  def hits(self) -> int:
+    return self._hits
+
+  @property
+  def misses(self) -> int:
+    return self._misses
+
+  def __len__(self) -> int:
+    return len(self._entries) + len(self._spilled_entries)
+
+  def _spill_path(self, key: bytes) -> str:
+    return os.path.join(self._spill_dir, key.hex())
+
+  def get(self, key: bytes) -> Optional[bytes]:
+    """Returns the serialized result cached under `key`, or `None`."""
+    with self._lock:
+      result = self._entries.get(key)
+      if result is not None:
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return result
+      spilled_size_bytes = self._spilled_entries.pop(key, None)
+      if spilled_size_bytes is None:
+        self._misses += 1
+        return None
+      self._spilled_bytes -= spilled_size_bytes
+      path = self._spill_path(key)
+      try:
+        with open(path, 'rb') as f:
+          result = f.read()
+        os.remove(path)
+      except OSError as e:
+        logging.warning('Failed to read a spilled result from %s: %s', path, e)
+        self._misses += 1
+        return None
+      self._hits += 1
+      self._put(key, result)
+      return result
+
+  def put(self, key: bytes, result: bytes):
+    """Caches the serialized `result` under `key`."""
+    with self._lock:
+      self._put(key, result)
+
+  def _put(self, key: bytes, result: bytes):
+    previous_result = self._entries.pop(key, None)
+    if previous_result is not None:
+      self._size_bytes -= len(previous_result)
+    self._entries[key] = result
+    self._size_bytes += len(result)
+    while len(self._entries) > 1 and self._size_bytes > self._max_bytes:
+      evicted_key, evicted_result = self._entries.popitem(last=False)
+      self._size_bytes -= len(evicted_result)
+      if self._spill_dir is not None:
+        self._spill(evicted_key, evicted_result)
+
+  def _spill(self, key: bytes, result: bytes):
+    path = self._spill_path(key)
+    try:
+      with open(path, 'wb') as f:
+        f.write(result)
+    except OSError as e:
+      logging.warning('Failed to spill a result to %s: %s', path, e)
+      return
+    self._spilled_entries[key] = len(result)
+    self._spilled_bytes += len(result)
+    while (self._max_spill_bytes is not None and
+           self._spilled_bytes > self._max_spill_bytes):
+      evicted_key, size_bytes = self._spilled_entries.popitem(last=False)
+      self._spilled_bytes -= size_bytes
+      try:
+        os.remove(self._spill_path(evicted_key))
+      except OSError:
+        pass
+
+  def clear(self):
+    """Removes all entries, including spilled ones, and resets the counters."""
+    with self._lock:
+      for key in self._spilled_entries:
+        try:
+          os.remove(self._spill_path(key))
+        except OSError:
+          pass
+      self._entries.clear()
+      self._spilled_entries.clear()
+      self._size_bytes = 0
+      self._spilled_bytes = 0
+      self._hits = 0
+      self._misses = 0
+
+
+def _digest(message) -> bytes:
+  return hashlib.sha256(message.SerializeToString(deterministic=True)).digest()
+
+
+class MemoizingValue(executor_value_base.ExecutorValue):
+  """A value embedded in a `MemoizingExecutor`."""
+
+  def __init__(self,
+               target_value: executor_value_base.ExecutorValue,
+               computation_digest: Optional[bytes] = None,
+               serialized_value: Optional[bytes] = None):
+    """Creates a value.
+
+    Args:
+      target_value: The value embedded in the target executor.
+      computation_digest: The digest of the computation this value represents,
+        if it is deterministic.
+      serialized_value: The serialized `executor_pb2.Value`, if known.
+    """
+    self._target_value = target_value
+    self._computation_digest = computation_digest
+    self._content_digest = None
+    if serialized_value is not None:
+      self._content_digest = hashlib.sha256(serialized_value).digest()
+
+  @property
+  def target_value(self) -> executor_value_base.ExecutorValue:
+    return self._target_value
+
+  @property
+  def computation_digest(self) -> Optional[bytes]:
+    return self._computation_digest
+
+  @property
+  def type_signature(self):
+    return self._target_value.type_signature
+
+  async def compute(self):
+    return await self._target_value.compute()
+
+  async def content_digest(self) -> Optional[bytes]:
+    """Returns a digest of the content of this value, if serializable.
+
+    Values which contain nondeterministic sequences have no digest, since
+    computations consuming them may not be memoized.
+    """
+    if self._content_digest is None:
+      try:
+        value = await self.compute()
+        value_proto, _ = executor_serialization.serialize_value(
+            value, self.type_signature)
+      except (TypeError, ValueError):
+        self._content_digest = b''
+      else:
+        if _is_deterministic_value(value_proto):
+          self._content_digest = _digest(value_proto)
+        else:
+          self._content_digest = b''
+    return self._content_digest or None
+
+
+class MemoizingExecutor(executor_base.Executor):
+  """An executor reusing the results of deterministic computations.
+
+  Calls to deterministic computations are keyed by a digest of the computation
+  and of the content of the argument. The results of these calls are computed
+  eagerly and stored in a `MemoizationCache`, which may be shared by several
+  executors, so that later calls with the same key, such as repeated evaluation
+  rounds on unchanged inputs, are served from the cache rather than computed
+  again by the target executor.
+
+  Computing the digest of the argument requires computing the argument, so this
+  executor is meant to wrap leaf executors, such as the `EagerTFExecutor`,
+  which compute eagerly anyway.
+  """
+
+  def __init__(
+      self,
+      target_executor: executor_base.Executor,
+      cache: MemoizationCache,
+      is_deterministic: Callable[[pb.Computation],
+                                 bool] = is_deterministic_computation):
+    """Creates a memoizing executor.
+
+    Args:
+      target_executor: The `executor_base.Executor` computing the calls which
+        are not cached.
+      cache: The `MemoizationCache` of the results of calls.
+      is_deterministic: A function deciding whether the results of a
+        `pb.Computation` may be memoized. Defaults to
+        `is_deterministic_computation`.
+    """
+    py_typecheck.check_type(target_executor, executor_base.Executor)
+    py_typecheck.check_type(cache, MemoizationCache)
+    py_typecheck.check_callable(is_deterministic)
+    self._target_executor = target_executor
+    self._cache = cache
+    self._is_deterministic = is_deterministic
+
+  def close(self):
+    self._target_executor.close()
+
+  @tracing.trace(span=True)
+  async def create_value(self, value, type_spec=None):
+    target_value = await self._target_executor.create_value(value, type_spec)
+    if isinstance(value, computation_impl.ConcreteComputation):
+      value = computation_impl.ConcreteComputation.get_proto(value)
+    if isinstance(value, pb.Computation) and self._is_deterministic(value):
+      return MemoizingValue(target_value, computation_digest=_digest(value))
+    return MemoizingValue(target_value)
+
+  @tracing.trace
+  async def create_call(self, comp, arg=None):
+    py_typecheck.check_type(comp, MemoizingValue)
+    if arg is not None:
+      py_typecheck.check_type(arg, MemoizingValue)
+    key = None
+    if comp.computation_digest is not None:
+      if arg is None:
+        key = comp.computation_digest
+      else:
+        arg_digest = await arg.content_digest()
+        if arg_digest is not None:
+          key = comp.computation_digest + arg_digest
+    result_type = comp.type_signature.result
+    if key is not None:
+      serialized_result = self._cache.get(key)
+      if serialized_result is not None:
+        value, _ = executor_serialization.deserialize_value(
+            executor_pb2.Value.FromString(serialized_result))
+        result = await self._target_executor.create_value(value, result_type)
+        return MemoizingValue(result, serialized_value=serialized_result)
+    result = await self._target_executor.create_call(
+        comp.target_value, arg.target_value if arg is not None else None)
+    if key is None:
+      return MemoizingValue(result)
+    try:
+      value_proto, _ = executor_serialization.serialize_value(
+          await result.compute(), result_type)
+    except (TypeError, ValueError):
+      # Results which cannot be serialized, such as functions, are not cached.
+      return MemoizingValue(result)
+    serialized_result = value_proto.SerializeToString(deterministic=True)
+    self._cache.put(key, serialized_result)
+    return MemoizingValue(result, serialized_value=serialized_result)
+
+  @tracing.trace
+  async def create_struct(self, elements):
+    elements = structure.iter_elements(structure.from_container(elements))
+    target_elements = []
+    for name, value in elements:
+      py_typecheck.check_type(value, MemoizingValue)
+      target_elements.append((name, value.target_value))
+    return MemoizingValue(await self._target_executor.create_struct(
+        structure.Struct(target_elements)))
+
+  @tracing.trace
+  async def create_selection(self, source, index):
+    py_typecheck.check_type(source, MemoizingValue)
+    return MemoizingValue(await self._target_executor.create_selection(
+        source.target_value, index))
@@ -0,0 +1,210 @@
+# Copyright 2021, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import os
+
+import tensorflow as tf
+
+from tensorflow_federated.python.core.api import computations
+from tensorflow_federated.python.core.api import test_case
+from tensorflow_federated.python.core.impl.computation import computation_impl
+from tensorflow_federated.python.core.impl.executors import eager_tf_executor
+from tensorflow_federated.python.core.impl.executors import memoizing_executor
+from tensorflow_federated.python.core.impl.types import computation_types
+
+
+class _CountingExecutor(eager_tf_executor.EagerTFExecutor):
+
+  def __init__(self):
+    super().__init__()
+    self.num_calls = 0
+
+  async def create_call(self, comp, arg=None):
+    self.num_calls += 1
+    return await super().create_call(comp, arg)
+
+
+@computations.tf_computation(tf.int32)
+def _add_one(x):
+  return x + 1
+
+
+@computations.tf_computation(tf.int32)
+def _add_noise(x):
+  return x + tf.random.uniform([], maxval=10, dtype=tf.int32)
+
+
+@computations.tf_computation(computation_types.SequenceType(tf.int64))
+def _first_element(ds):
+  return ds.reduce(tf.constant(-1, tf.int64),
+                   lambda x, y: tf.where(x < 0, y, x))
+
+
+def _call(ex, comp, arg, arg_type=tf.int32):
+  loop = asyncio.get_event_loop()
+  comp_val = loop.run_until_complete(ex.create_value(comp))
+  arg_val = loop.run_until_complete(ex.create_value(arg, arg_type))
+  result = loop.run_until_complete(ex.create_call(comp_val, arg_val))
+  return loop.run_until_complete(result.compute())
+
+
+class IsDeterministicComputationTest(test_case.TestCase):
+
+  def test_returns_true_with_deterministic_computation(self):
+    self.assertTrue(
+        memoizing_executor.is_deterministic_computation(
+            computation_impl.ConcreteComputation.get_proto(_add_one)))
+
+  def test_returns_false_with_random_computation(self):
+    self.assertFalse(
+        memoizing_executor.is_deterministic_computation(
+            computation_impl.ConcreteComputation.get_proto(_add_noise)))
+
+
+class MemoizationCacheTest(test_case.TestCase):
+
+  def test_raises_with_nonpositive_max_bytes(self):
+    with self.assertRaises(ValueError):
+      memoizing_executor.MemoizationCache(0)
+
+  def test_raises_with_max_spill_bytes_without_spill_dir(self):
+    with self.assertRaises(ValueError):
+      memoizing_executor.MemoizationCache(10, max_spill_bytes=10)
+
+  def test_evicts_least_recently_used_beyond_max_bytes(self):
+    cache = memoizing_executor.MemoizationCache(10)
+    cache.put(b'a', b'123456')
+    cache.put(b'b', b'1234')
+    cache.get(b'a')
+
+    cache.put(b'c', b'12')
+
+    self.assertIsNone(cache.get(b'b'))
+    self.assertEqual(cache.get(b'a'), b'123456')
+    self.assertEqual(cache.size_bytes, 8)
+
+  def test_spills_evicted_results_to_disk(self):
+    spill_dir = self.create_tempdir().full_path
+    cache = memoizing_executor.MemoizationCache(10, spill_dir=spill_dir)
+    cache.put(b'a', b'123456')
+    cache.put(b'b', b'123456')
+
+    self.assertEqual(cache.spilled_bytes, 6)
+    self.assertLen(os.listdir(spill_dir), 1)
+    self.assertEqual(cache.get(b'a'), b'123456')
+    self.assertEqual(cache.hits, 1)
+    self.assertEqual(cache.get(b'b'), b'123456')
+    self.assertLen(cache, 2)
+
+  def test_drops_spilled_results_beyond_max_spill_bytes(self):
+    spill_dir = self.create_tempdir().full_path
+    cache = memoizing_executor.MemoizationCache(
+        10, spill_dir=spill_dir, max_spill_bytes=10)
+    for key in [b'a', b'b', b'c']:
+      cache.put(key, b'123456')
+
+    self.assertEqual(cache.spilled_bytes, 6)
+    self.assertIsNone(cache.get(b'a'))
+    self.assertEqual(cache.get(b'b'), b'123456')
+
+
+class MemoizingExecutorTest(test_case.TestCase):
+
+  def test_reuses_result_of_deterministic_computation(self):
+    cache = memoizing_executor.MemoizationCache(1000)
+    target = _CountingExecutor()
+    ex = memoizing_executor.MemoizingExecutor(target, cache)
+
+    self.assertEqual(_call(ex, _add_one, 10), 11)
+    self.assertEqual(_call(ex, _add_one, 10), 11)
+    self.assertEqual(_call(ex, _add_one, 20), 21)
+
+    self.assertEqual(target.num_calls, 2)
+    self.assertEqual(cache.hits, 1)
+    self.assertEqual(cache.misses, 2)
+
+  def test_shares_cache_across_executors(self):
+    cache = memoizing_executor.MemoizationCache(1000)
+    targets = [_CountingExecutor() for _ in range(3)]
+
+    for target in targets:
+      ex = memoizing_executor.MemoizingExecutor(target, cache)
+      self.assertEqual(_call(ex, _add_one, 10), 11)
+
+    self.assertEqual([target.num_calls for target in targets], [1, 0, 0])
+
+  def test_does_not_memoize_random_computation(self):
+    cache = memoizing_executor.MemoizationCache(1000)
+    target = _CountingExecutor()
+    ex = memoizing_executor.MemoizingExecutor(target, cache)
+
+    _call(ex, _add_noise, 10)
+    _call(ex, _add_noise, 10)
+
+    self.assertEqual(target.num_calls, 2)
+    self.assertEmpty(cache)
+
+  def test_reuses_result_of_call_on_deterministic_dataset(self):
+    cache = memoizing_executor.MemoizationCache(100000)
+    target = _CountingExecutor()
+    ex = memoizing_executor.MemoizingExecutor(target, cache)
+    ds = tf.data.Dataset.range(10)
+    ds_type = computation_types.SequenceType(tf.int64)
+
+    self.assertEqual(_call(ex, _first_element, ds, ds_type), 0)
+    self.assertEqual(_call(ex, _first_element, ds, ds_type), 0)
+
+    self.assertEqual(target.num_calls, 1)
+
+  def test_does_not_memoize_call_on_shuffled_dataset(self):
+    cache = memoizing_executor.MemoizationCache(100000)
+    target = _CountingExecutor()
+    ex = memoizing_executor.MemoizingExecutor(target, cache)
+    ds = tf.data.Dataset.range(10).shuffle(10)
+    ds_type = computation_types.SequenceType(tf.int64)
+
+    _call(ex, _first_element, ds, ds_type)
+    _call(ex, _first_element, ds, ds_type)
+
+    self.assertEqual(target.num_calls, 2)
+    self.assertEmpty(cache)
+
+  def test_uses_custom_determinism_predicate(self):
+    cache = memoizing_executor.MemoizationCache(1000)
+    target = _CountingExecutor()
+    ex = memoizing_executor.MemoizingExecutor(
+        target, cache, is_deterministic=lambda comp: False)
+
+    _call(ex, _add_one, 10)
+    _call(ex, _add_one, 10)
+
+    self.assertEqual(target.num_calls, 2)
+
+  def test_creates_struct_and_selection(self):
+    ex = memoizing_executor.MemoizingExecutor(
+        eager_tf_executor.EagerTFExecutor(),
+        memoizing_executor.MemoizationCache(1000))
+    loop = asyncio.get_event_loop()
+    elements = [
+        loop.run_until_complete(ex.create_value(x, tf.int32)) for x in [1, 2]
+    ]
+    struct = loop.run_until_complete(ex.create_struct(elements))
+    selection = loop.run_until_complete(ex.create_selection(struct, 1))
+
+    self.assertEqual(loop.run_until_complete(selection.compute()), 2)
+
+
+if __name__ == '__main__':
+  test_case.main()
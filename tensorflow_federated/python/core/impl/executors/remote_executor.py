@@ -18,7 +18,14 @@
 # information.
 """A local proxy for a remote executor service hosted on a separate machine."""
 
-from typing import Mapping
+import asyncio
+import collections
+import contextlib
+import hashlib
+import threading
+import time
+from typing import Any, Mapping, Optional, Tuple
+import uuid
 import weakref
 
 from absl import logging
@@ -38,6 +45,155 @@ from tensorflow_federated.python.core.impl.types import placements
 
 _STREAM_CLOSE_WAIT_SECONDS = 10
 
+# The default maximum number of RPCs a single `RemoteExecutor` keeps in flight
+# on its channel at any point in time.
+_DEFAULT_MAX_CONCURRENT_REQUESTS = 100
+
+# The number of serialized broadcast values kept by a `BroadcastCache`. A value
+# only needs to be kept until it has been sent to all workers.
+_DEFAULT_BROADCAST_CACHE_SIZE = 2
+
+# The number of content digests a `RemoteExecutor` remembers having sent.
+_MAX_SENT_CONTENT_DIGESTS = 64
+
+# The default maximum time, in seconds, for which the disposal of a remote value
+# may be held back to be batched with others.
+_DEFAULT_DISPOSE_INTERVAL_SECONDS = 1.0
+
+
+def _is_broadcast_type(type_spec: Optional[computation_types.Type]) -> bool:
+  return (type_spec is not None and type_spec.is_federated() and
+          type_spec.all_equal and type_spec.placement is placements.CLIENTS)
+
+
+class BroadcastCache(object):
+  """Serializes each value broadcast to several `RemoteExecutor`s only once.
+
+  Broadcasting a value to clients spread across remote workers creates the same
+  all-equal value on the `RemoteExecutor` of every worker. When these executors
+  share a `BroadcastCache`, the value is serialized, and its content digest
+  computed, by the first of them only; the others reuse the result. Values are
+  recognized by identity, so they must not be mutated once broadcast.
+  """
+
+  def __init__(self, max_size: int = _DEFAULT_BROADCAST_CACHE_SIZE):
+    """Creates an empty cache of at most `max_size` serialized values.
+
+    Raises:
+      ValueError: If `max_size` is not positive.
+    """
+    py_typecheck.check_type(max_size, int)
+    if max_size < 1:
+      raise ValueError(f'Expected a positive `max_size`, found {max_size}.')
+    self._max_size = max_size
+    self._lock = threading.Lock()
+    self._entries = collections.OrderedDict()
+
+  def serialize(
+      self,
+      value: Any,
+      type_spec: computation_types.Type,
+      tensor_encoding: Optional[executor_pb2.TensorEncoding] = None
+  ) -> Tuple[executor_pb2.Value, computation_types.Type, bytes]:
+    """Returns the serialized `value`, its type, and its content digest."""
+    key = id(value)
+    # Serialization runs under the lock, so that executors broadcasting the
+    # same value concurrently wait for the first one rather than repeat it.
+    with self._lock:
+      entry = self._entries.get(key)
+      # The cached value is kept alive by the entry, so its id is not reused.
+      if (entry is not None and entry[0] is value and entry[1] == type_spec and
+          entry[2] == tensor_encoding):
+        self._entries.move_to_end(key)
+        return entry[3:]
+      value_proto, value_type = executor_serialization.serialize_value(
+          value, type_spec, tensor_encoding=tensor_encoding)
+      digest = hashlib.sha256(
+          value_proto.SerializeToString(deterministic=True)).digest()
+      self._entries[key] = (value, type_spec, tensor_encoding, value_proto,
+                            value_type, digest)
+      while len(self._entries) > self._max_size:
+        self._entries.popitem(last=False)
+      return value_proto, value_type, digest
+
+
+class _DisposeFlusher(object):
+  """Sends the disposals of remote values from a background thread.
+
+  `RemoteValue`s are disposed of from their finalizers, which may run on any
+  thread, including the event loop, so they must not block on RPCs. Instead,
+  the references of disposed values are queued, and sent in a single request
+  by a background thread once `batch_size` of them have accumulated, or at most
+  `interval_seconds` after the first of them was queued.
+  """
+
+  def __init__(self, send_fn_ref: weakref.ref, batch_size: int,
+               interval_seconds: float):
+    """Creates a flusher, whose thread is started by the first disposal.
+
+    Args:
+      send_fn_ref: A weak reference to the function sending an
+        `executor_pb2.DisposeRequest`, so that the thread does not keep its
+        executor alive.
+      batch_size: The number of queued references which triggers a request.
+      interval_seconds: The maximum time a queued reference waits for others.
+    """
+    self._send_fn_ref = send_fn_ref
+    self._batch_size = batch_size
+    self._interval_seconds = interval_seconds
+    self._condition = threading.Condition()
+    self._value_refs = []
+    self._closed = False
+    self._thread = None
+
+  def add(self, value_ref: executor_pb2.ValueRef):
+    with self._condition:
+      if self._closed:
+        return
+      self._value_refs.append(value_ref)
+      if self._thread is None:
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+      if len(self._value_refs) >= self._batch_size:
+        self._condition.notify()
+
+  def discard(self):
+    """Drops the queued references, of values the service no longer holds."""
+    with self._condition:
+      self._value_refs = []
+
+  def close(self):
+    with self._condition:
+      self._closed = True
+      self._value_refs = []
+      self._condition.notify()
+
+  def _run(self):
+    while True:
+      with self._condition:
+        self._condition.wait_for(lambda: self._value_refs or self._closed)
+        self._condition.wait_for(
+            lambda: len(self._value_refs) >= self._batch_size or self._closed,
+            timeout=self._interval_seconds)
+        if self._closed:
+          return
+        value_refs = self._value_refs
+        self._value_refs = []
+      if value_refs:
+        self._send(value_refs)
+
+  def _send(self, value_refs):
+    # The function is only held for the duration of the request.
+    send_fn = self._send_fn_ref()
+    if send_fn is None:
+      return
+    try:
+      send_fn(executor_pb2.DisposeRequest(value_ref=value_refs))
+    except (grpc.RpcError, executors_errors.RetryableError) as e:
+      # The values are lost along with the worker, if it is unreachable.
+      logging.warning('Failed to dispose of %s remote values: %s',
+                      len(value_refs), e)
+
 
 class RemoteValue(executor_value_base.ExecutorValue):
   """A reference to a value embedded in a remotely deployed executor service."""
@@ -78,18 +234,107 @@ class RemoteValue(executor_value_base.ExecutorValue):
     return self._value_ref
 
 
+@contextlib.contextmanager
+def _reraise_grpc_errors_with_retryable_info():
+  """Reraises retryable gRPC errors as `executors_errors.RetryableError`."""
+  try:
+    yield
+  except grpc.RpcError as e:
+    if _is_retryable_grpc_error(e):
+      logging.info('Received retryable gRPC error: %s', e)
+      raise executors_errors.RetryableError(e)
+    else:
+      raise
+
+
 @tracing.trace(span=True)
 def _request(rpc_func, request):
   """Populates trace context and reraises gRPC errors with retryable info."""
   with tracing.wrap_rpc_in_trace_context():
-    try:
+    with _reraise_grpc_errors_with_retryable_info():
       return rpc_func(request)
-    except grpc.RpcError as e:
-      if _is_retryable_grpc_error(e):
-        logging.info('Received retryable gRPC error: %s', e)
-        raise executors_errors.RetryableError(e)
-      else:
-        raise
+
+
+def _wrap_grpc_future(grpc_future: grpc.Future,
+                      loop: asyncio.AbstractEventLoop) -> asyncio.Future:
+  """Returns an `asyncio.Future` on `loop` completed with `grpc_future`."""
+  asyncio_future = loop.create_future()
+
+  def _transfer_result():
+    if asyncio_future.done():
+      # The waiting coroutine was cancelled before the RPC completed.
+      return
+    if grpc_future.cancelled():
+      asyncio_future.cancel()
+      return
+    error = grpc_future.exception()
+    if error is not None:
+      asyncio_future.set_exception(error)
+    else:
+      asyncio_future.set_result(grpc_future.result())
+
+  # gRPC invokes done callbacks on its own threads, so the result must be
+  # handed back to the event loop in a threadsafe manner.
+  grpc_future.add_done_callback(
+      lambda _: loop.call_soon_threadsafe(_transfer_result))
+  return asyncio_future
+
+
+@tracing.trace(span=True)
+async def _request_async(rpc_func, request):
+  """Asynchronous version of `_request` which does not block the event loop.
+
+  The RPC is issued through the `future` method of the gRPC multi-callable, so
+  any number of requests may be in flight on the same channel while the event
+  loop continues to make progress on other work.
+
+  Args:
+    rpc_func: A unary-unary gRPC multi-callable, e.g. `stub.CreateValue`.
+    request: The request proto to send.
+
+  Returns:
+    The response proto.
+
+  Raises:
+    executors_errors.RetryableError: If the RPC failed with a retryable error.
+    grpc.RpcError: If the RPC failed with a non-retryable error.
+  """
+  loop = asyncio.get_event_loop()
+  with _reraise_grpc_errors_with_retryable_info():
+    with tracing.wrap_rpc_in_trace_context():
+      grpc_future = rpc_func.future(request)
+    try:
+      return await _wrap_grpc_future(grpc_future, loop)
+    except asyncio.CancelledError:
+      grpc_future.cancel()
+      raise
+
+
+def _next_streamed_response(responses):
+  """Blocks until the next response on the stream `responses` arrives."""
+  with _reraise_grpc_errors_with_retryable_info():
+    return next(responses, None)
+
+
+def _remaining_streamed_responses(responses):
+  """Blocks until all remaining responses on the stream `responses` arrive."""
+  with _reraise_grpc_errors_with_retryable_info():
+    return list(responses)
+
+
+def _deserialize_streamed_value(responses):
+  """Blocks while reassembling the value streamed back in `responses`."""
+  with _reraise_grpc_errors_with_retryable_info():
+    return executor_serialization.deserialize_value_chunks(
+        response.chunk for response in responses)
+
+
+def _release_shared_memory_tensors(request: executor_pb2.ExecuteRequest):
+  """Removes the shared memory files of values in a batch that was not sent."""
+  for operation in request.operation:
+    if operation.WhichOneof('operation') == 'create_value':
+      executor_serialization.release_shared_memory_tensors(
+          operation.create_value.value)
 
 
 def _is_retryable_grpc_error(error):
@@ -111,15 +356,55 @@ def _is_retryable_grpc_error(error):
 
 
 class RemoteExecutor(executor_base.Executor):
-  """The remote executor is a local proxy for a remote executor instance."""
-
-  # TODO(b/134543154): Switch to using an asynchronous gRPC client so we don't
-  # have to block on all those calls.
+  """The remote executor is a local proxy for a remote executor instance.
+
+  The `create_*` methods and `compute` issue their RPCs asynchronously, so a
+  single `RemoteExecutor` may have many requests in flight on its channel at
+  once, and a slow remote worker never blocks the event loop driving it. The
+  number of outstanding requests is bounded by `max_concurrent_requests`;
+  further requests wait (without blocking) until an earlier one completes.
+
+  If `batch_requests` is `True`, the `create_*` methods do not contact the
+  remote service at all. Instead, they assign the reference of the new value
+  locally and append the operation to a pending batch, which is sent to the
+  service through a single `Execute` RPC when a value is computed. Batches are
+  registered with the service in the order in which they are sent, so
+  operations may freely refer to values created in earlier batches.
+
+  If `stream_values` is `True`, values are created and computed through the
+  streaming `CreateValueStream` and `ComputeStream` RPCs, which split large
+  tensors into bounded chunks. Values then need not fit in a single gRPC
+  message, and are serialized and reassembled incrementally on both sides.
+
+  If a `broadcast_cache` is given, all-equal values placed at `tff.CLIENTS`,
+  such as broadcast server state, are identified by a digest of their content.
+  They are serialized once for all executors sharing the cache, and their
+  content is only sent if the remote service does not already hold it.
+
+  If a `tensor_encoding` is given, floating-point tensors are sent to the remote
+  service in that encoding, and the service is asked to send computed values
+  back in the same encoding. Lossy encodings trade precision for bandwidth, so
+  the encoding is chosen per channel, e.g. only for workers on slow links.
+
+  Remote values are disposed of on the service once no longer referenced. The
+  disposals are batched, and sent from a background thread once
+  `dispose_batch_size` values are pending, or `dispose_interval_seconds` after
+  the first of them, so that neither finalizers nor the event loop block on the
+  requests, and workers release the values promptly.
+  """
 
   def __init__(self,
                channel,
                thread_pool_executor=None,
-               dispose_batch_size=20):
+               dispose_batch_size=20,
+               max_concurrent_requests=_DEFAULT_MAX_CONCURRENT_REQUESTS,
+               batch_requests=False,
+               use_shared_memory=False,
+               stream_values=False,
+               max_chunk_size_bytes=None,
+               broadcast_cache: Optional[BroadcastCache] = None,
+               tensor_encoding: Optional[executor_pb2.TensorEncoding] = None,
+               dispose_interval_seconds=_DEFAULT_DISPOSE_INTERVAL_SECONDS):
     """Creates a remote executor.
 
     Args:
@@ -132,10 +417,69 @@ class RemoteExecutor(executor_base.Executor):
         worker values. Lower values will result in more requests to the remote
         worker, but will result in values being cleaned up sooner and therefore
         may result in lower memory usage on the remote worker.
+      max_concurrent_requests: The maximum number of asynchronous RPCs this
+        executor keeps in flight on `channel` at any point in time.
+      batch_requests: Whether to submit the operations of this executor to the
+        remote service in batches through the `Execute` RPC, rather than one
+        RPC per operation.
+      use_shared_memory: Whether large tensors may be passed to the remote
+        service through shared memory rather than inline in the requests. Only
+        valid if the service runs on the same host as this executor.
+      stream_values: Whether to create and compute values through the streaming
+        RPCs, in bounded chunks, rather than in a single message each.
+      max_chunk_size_bytes: The optional maximum size of the tensor content in
+        each chunk of a value streamed to the remote service. Defaults to that
+        of `executor_serialization.serialize_value_chunks`.
+      broadcast_cache: An optional `BroadcastCache`, generally shared by the
+        executors of all remote workers, used to deduplicate broadcast values.
+      tensor_encoding: An optional `executor_pb2.TensorEncoding` in which
+        floating-point tensors are exchanged with the remote service.
+      dispose_interval_seconds: The maximum time, in seconds, for which the
+        disposal of a remote value is held back to be batched with others.
+
+    Raises:
+      ValueError: If `dispose_batch_size`, `dispose_interval_seconds`,
+        `max_concurrent_requests` or `max_chunk_size_bytes` is not positive, or
+        if `stream_values` is combined with `batch_requests`,
+        `use_shared_memory` or `tensor_encoding`, or `broadcast_cache` with
+        `batch_requests` or `stream_values`.
     """
 
     py_typecheck.check_type(channel, grpc.Channel)
     py_typecheck.check_type(dispose_batch_size, int)
+    py_typecheck.check_type(max_concurrent_requests, int)
+    py_typecheck.check_type(batch_requests, bool)
+    py_typecheck.check_type(use_shared_memory, bool)
+    py_typecheck.check_type(stream_values, bool)
+    py_typecheck.check_type(dispose_interval_seconds, (int, float))
+    if dispose_batch_size < 1:
+      raise ValueError('`dispose_batch_size` must be positive, found '
+                       f'{dispose_batch_size}.')
+    if dispose_interval_seconds <= 0:
+      raise ValueError('`dispose_interval_seconds` must be positive, found '
+                       f'{dispose_interval_seconds}.')
+    if max_concurrent_requests < 1:
+      raise ValueError('`max_concurrent_requests` must be positive, found '
+                       f'{max_concurrent_requests}.')
+    if tensor_encoding is not None:
+      py_typecheck.check_type(tensor_encoding, executor_pb2.TensorEncoding)
+    if stream_values and (batch_requests or use_shared_memory or
+                          tensor_encoding is not None):
+      raise ValueError('`stream_values` cannot be combined with '
+                       '`batch_requests`, `use_shared_memory` or '
+                       '`tensor_encoding`.')
+    if broadcast_cache is not None:
+      py_typecheck.check_type(broadcast_cache, BroadcastCache)
+      if batch_requests or stream_values:
+        raise ValueError('`broadcast_cache` cannot be combined with '
+                         '`batch_requests` or `stream_values`.')
+    self._chunking_kwargs = {}
+    if max_chunk_size_bytes is not None:
+      py_typecheck.check_type(max_chunk_size_bytes, int)
+      if max_chunk_size_bytes < 1:
+        raise ValueError('`max_chunk_size_bytes` must be positive, found '
+                         f'{max_chunk_size_bytes}.')
+      self._chunking_kwargs['max_chunk_size_bytes'] = max_chunk_size_bytes
 
     logging.debug('Creating new ExecutorStub')
 
@@ -151,25 +495,159 @@ class RemoteExecutor(executor_base.Executor):
     # object from being GC'ed and the callback above from no-op'ing.
     self._channel = channel
     self._stub = executor_pb2_grpc.ExecutorStub(channel)
-    self._dispose_batch_size = dispose_batch_size
-    self._dispose_request = executor_pb2.DisposeRequest()
+    self._dispose_flusher = _DisposeFlusher(
+        weakref.WeakMethod(self._send_dispose_request), dispose_batch_size,
+        dispose_interval_seconds)
+    weakref.finalize(self, self._dispose_flusher.close)
+    self._thread_pool_executor = thread_pool_executor
+    self._max_concurrent_requests = max_concurrent_requests
+    self._batch_requests = batch_requests
+    self._use_shared_memory = use_shared_memory
+    self._stream_values = stream_values
+    self._broadcast_cache = broadcast_cache
+    self._tensor_encoding = tensor_encoding
+    # The time spent with computations outstanding on the service, which
+    # `busy_seconds` reports to placement policies.
+    self._busy_lock = threading.Lock()
+    self._num_computing = 0
+    self._busy_since = None
+    self._busy_seconds = 0.0
+    # The content digests of the values most recently sent to the service.
+    self._sent_content_digests = collections.OrderedDict()
+    # Operations are appended to the pending batch from the event loop, but
+    # also from finalizers of `RemoteValue`s, which may run on any thread.
+    self._pending_lock = threading.Lock()
+    self._pending_request = executor_pb2.ExecuteRequest()
+    # The asyncio primitives are created lazily, since they must belong to the
+    # event loop which drives this executor, and that loop is generally not the
+    # one running when the executor is constructed.
+    self._event_loop = None
+    self._request_semaphore = None
+    self._execute_lock = None
 
   @property
   def is_ready(self) -> bool:
     return self._channel_status == grpc.ChannelConnectivity.READY
 
+  @property
+  def busy_seconds(self) -> float:
+    """The total time during which computations were outstanding.
+
+    Overlapping computations are counted once, so this approximates the time the
+    remote worker spent computing, plus the time spent transferring results.
+    """
+    with self._busy_lock:
+      busy_seconds = self._busy_seconds
+      if self._num_computing:
+        busy_seconds += time.monotonic() - self._busy_since
+      return busy_seconds
+
+  @contextlib.contextmanager
+  def _track_busy_time(self):
+    with self._busy_lock:
+      if not self._num_computing:
+        self._busy_since = time.monotonic()
+      self._num_computing += 1
+    try:
+      yield
+    finally:
+      with self._busy_lock:
+        self._num_computing -= 1
+        if not self._num_computing:
+          self._busy_seconds += time.monotonic() - self._busy_since
+
   def close(self):
     logging.debug('Clearing executor state on server.')
     self._clear_executor()
 
   def _dispose(self, value_ref: executor_pb2.ValueRef):
     """Disposes of the remote value stored on the worker service."""
-    self._dispose_request.value_ref.append(value_ref)
-    if len(self._dispose_request.value_ref) < self._dispose_batch_size:
-      return
-    dispose_request = self._dispose_request
-    self._dispose_request = executor_pb2.DisposeRequest()
-    _request(self._stub.Dispose, dispose_request)
+    self._dispose_flusher.add(value_ref)
+
+  def _send_dispose_request(self, dispose_request: executor_pb2.DisposeRequest):
+    if self._batch_requests:
+      # The disposed values may have been created by operations which have not
+      # been sent yet, so the disposal must be ordered after them.
+      with self._pending_lock:
+        self._pending_request.operation.add(dispose=dispose_request)
+    else:
+      _request(self._stub.Dispose, dispose_request)
+
+  def _clear_pending_operations(self):
+    with self._pending_lock:
+      self._pending_request = executor_pb2.ExecuteRequest()
+
+  def _add_pending_operation(self, **kwargs) -> executor_pb2.ValueRef:
+    """Appends an operation to the pending batch and returns its reference."""
+    value_ref = executor_pb2.ValueRef(id=str(uuid.uuid4()))
+    with self._pending_lock:
+      self._pending_request.operation.add(result_ref=value_ref, **kwargs)
+    return value_ref
+
+  def _maybe_create_loop_primitives(self):
+    loop = asyncio.get_event_loop()
+    if self._event_loop is not loop:
+      self._request_semaphore = asyncio.Semaphore(self._max_concurrent_requests)
+      self._execute_lock = asyncio.Lock()
+      self._event_loop = loop
+
+  async def _issue_request(self, rpc_func, request):
+    """Issues `request` asynchronously, respecting the concurrency limit."""
+    self._maybe_create_loop_primitives()
+    async with self._request_semaphore:
+      return await _request_async(rpc_func, request)
+
+  async def _execute_pending_operations(
+      self,
+      compute_ref: executor_pb2.ValueRef
+  ) -> executor_pb2.ExecuteResponse.ComputeResult:
+    """Sends the pending batch followed by a `compute` of `compute_ref`.
+
+    Args:
+      compute_ref: The reference of the value to compute.
+
+    Returns:
+      The `executor_pb2.ExecuteResponse.ComputeResult` for `compute_ref`.
+
+    Raises:
+      executors_errors.RetryableError: If the RPC failed with a retryable
+        error.
+      grpc.RpcError: If the RPC failed with a non-retryable error.
+      RuntimeError: If the service did not respond as expected.
+    """
+    self._maybe_create_loop_primitives()
+    loop = asyncio.get_event_loop()
+    async with self._request_semaphore:
+      # The next batch may only be sent once the service has registered all
+      # operations of the previous one, as it may refer to their results.
+      async with self._execute_lock:
+        with self._pending_lock:
+          request = self._pending_request
+          self._pending_request = executor_pb2.ExecuteRequest()
+        request.operation.add(
+            compute=self._compute_request(compute_ref))
+        try:
+          with _reraise_grpc_errors_with_retryable_info():
+            with tracing.wrap_rpc_in_trace_context():
+              responses = self._stub.Execute(request)
+          first_response = await loop.run_in_executor(
+              self._thread_pool_executor, _next_streamed_response, responses)
+        except BaseException:
+          _release_shared_memory_tensors(request)
+          raise
+        if (first_response is None or
+            first_response.WhichOneof('response') != 'operations_registered'):
+          _release_shared_memory_tensors(request)
+          raise RuntimeError('Expected the service to confirm registration of '
+                             f'the operations, found {first_response}.')
+      responses = await loop.run_in_executor(self._thread_pool_executor,
+                                             _remaining_streamed_responses,
+                                             responses)
+    for response in responses:
+      if response.compute_result.value_ref.id == compute_ref.id:
+        return response.compute_result
+    raise RuntimeError(
+        f'The service did not return a result for value {compute_ref.id}.')
 
   @tracing.trace(span=True)
   def set_cardinalities(self,
@@ -180,10 +658,17 @@ class RemoteExecutor(executor_base.Executor):
     request = executor_pb2.SetCardinalitiesRequest(
         cardinalities=serialized_cardinalities)
 
+    # The service drops all values when reconfigured.
+    self._clear_pending_operations()
+    self._dispose_flusher.discard()
+    self._sent_content_digests.clear()
     _request(self._stub.SetCardinalities, request)
 
   @tracing.trace(span=True)
   def _clear_executor(self):
+    self._clear_pending_operations()
+    self._dispose_flusher.discard()
+    self._sent_content_digests.clear()
     request = executor_pb2.ClearExecutorRequest()
     try:
       _request(self._stub.ClearExecutor, request)
@@ -193,16 +678,105 @@ class RemoteExecutor(executor_base.Executor):
                     'therefore there is no state to clear.')
     return
 
+  async def _create_streamed_value(self, value, type_spec):
+    """Streams `value` to the remote service in chunks."""
+    chunks, type_spec = executor_serialization.serialize_value_chunks(
+        value, type_spec, **self._chunking_kwargs)
+    # The chunks are serialized lazily on a gRPC thread, which cancels the RPC
+    # if serialization fails; the error is kept to be reraised here instead.
+    serialization_errors = []
+
+    def _requests():
+      try:
+        for chunk in chunks:
+          yield executor_pb2.CreateValueStreamRequest(chunk=chunk)
+      except (ValueError, TypeError) as e:
+        serialization_errors.append(e)
+
+    try:
+      response = await self._issue_request(self._stub.CreateValueStream,
+                                           _requests())
+    except (grpc.RpcError, executors_errors.RetryableError):
+      if serialization_errors:
+        raise serialization_errors[0]
+      raise
+    py_typecheck.check_type(response, executor_pb2.CreateValueResponse)
+    return RemoteValue(response.value_ref, type_spec, self)
+
+  async def _compute_streamed_value(self, value_ref: executor_pb2.ValueRef):
+    """Computes the remote value `value_ref`, streamed back in chunks."""
+    self._maybe_create_loop_primitives()
+    loop = asyncio.get_event_loop()
+    async with self._request_semaphore:
+      with _reraise_grpc_errors_with_retryable_info():
+        with tracing.wrap_rpc_in_trace_context():
+          responses = self._stub.ComputeStream(
+              executor_pb2.ComputeRequest(value_ref=value_ref))
+      try:
+        value, _ = await loop.run_in_executor(self._thread_pool_executor,
+                                              _deserialize_streamed_value,
+                                              responses)
+      except asyncio.CancelledError:
+        responses.cancel()
+        raise
+    return value
+
+  async def _create_broadcast_value(self, value, type_spec):
+    """Creates an all-equal client value, sending its content at most once."""
+    value_proto, type_spec, digest = self._broadcast_cache.serialize(
+        value, type_spec, tensor_encoding=self._tensor_encoding)
+    if digest in self._sent_content_digests:
+      self._sent_content_digests.move_to_end(digest)
+      try:
+        response = await self._issue_request(
+            self._stub.CreateValue,
+            executor_pb2.CreateValueRequest(content_digest=digest))
+        py_typecheck.check_type(response, executor_pb2.CreateValueResponse)
+        return RemoteValue(response.value_ref, type_spec, self)
+      except grpc.RpcError as e:
+        if e.code() != grpc.StatusCode.NOT_FOUND:
+          raise
+        # The service no longer holds the value, so it is sent in full.
+    response = await self._issue_request(
+        self._stub.CreateValue,
+        executor_pb2.CreateValueRequest(
+            value=value_proto, content_digest=digest))
+    py_typecheck.check_type(response, executor_pb2.CreateValueResponse)
+    self._sent_content_digests[digest] = None
+    while len(self._sent_content_digests) > _MAX_SENT_CONTENT_DIGESTS:
+      self._sent_content_digests.popitem(last=False)
+    return RemoteValue(response.value_ref, type_spec, self)
+
   @tracing.trace(span=True)
   async def create_value(self, value, type_spec=None):
+    if self._stream_values:
+      return await self._create_streamed_value(value, type_spec)
+    if self._broadcast_cache is not None:
+      type_spec = computation_types.to_type(type_spec)
+      if _is_broadcast_type(type_spec):
+        return await self._create_broadcast_value(value, type_spec)
 
     @tracing.trace
     def serialize_value():
-      return executor_serialization.serialize_value(value, type_spec)
+      return executor_serialization.serialize_value(
+          value,
+          type_spec,
+          use_shared_memory=self._use_shared_memory,
+          tensor_encoding=self._tensor_encoding)
 
     value_proto, type_spec = serialize_value()
     create_value_request = executor_pb2.CreateValueRequest(value=value_proto)
-    response = _request(self._stub.CreateValue, create_value_request)
+    if self._batch_requests:
+      value_ref = self._add_pending_operation(create_value=create_value_request)
+      return RemoteValue(value_ref, type_spec, self)
+    try:
+      response = await self._issue_request(self._stub.CreateValue,
+                                           create_value_request)
+    except BaseException:
+      # The service never reads the shared memory files of a value it did not
+      # receive, so they are removed here.
+      executor_serialization.release_shared_memory_tensors(value_proto)
+      raise
     py_typecheck.check_type(response, executor_pb2.CreateValueResponse)
     return RemoteValue(response.value_ref, type_spec, self)
 
@@ -215,7 +789,11 @@ class RemoteExecutor(executor_base.Executor):
     create_call_request = executor_pb2.CreateCallRequest(
         function_ref=comp.value_ref,
         argument_ref=(arg.value_ref if arg is not None else None))
-    response = _request(self._stub.CreateCall, create_call_request)
+    if self._batch_requests:
+      value_ref = self._add_pending_operation(create_call=create_call_request)
+      return RemoteValue(value_ref, comp.type_signature.result, self)
+    response = await self._issue_request(self._stub.CreateCall,
+                                         create_call_request)
     py_typecheck.check_type(response, executor_pb2.CreateCallResponse)
     return RemoteValue(response.value_ref, comp.type_signature.result, self)
 
@@ -232,7 +810,10 @@ class RemoteExecutor(executor_base.Executor):
       type_elem.append((k, v.type_signature) if k else v.type_signature)
     result_type = computation_types.StructType(type_elem)
     request = executor_pb2.CreateStructRequest(element=proto_elem)
-    response = _request(self._stub.CreateStruct, request)
+    if self._batch_requests:
+      value_ref = self._add_pending_operation(create_struct=request)
+      return RemoteValue(value_ref, result_type, self)
+    response = await self._issue_request(self._stub.CreateStruct, request)
     py_typecheck.check_type(response, executor_pb2.CreateStructResponse)
     return RemoteValue(response.value_ref, result_type, self)
 
@@ -244,15 +825,35 @@ class RemoteExecutor(executor_base.Executor):
     result_type = source.type_signature[index]
     request = executor_pb2.CreateSelectionRequest(
         source_ref=source.value_ref, index=index)
-    response = _request(self._stub.CreateSelection, request)
+    if self._batch_requests:
+      value_ref = self._add_pending_operation(create_selection=request)
+      return RemoteValue(value_ref, result_type, self)
+    response = await self._issue_request(self._stub.CreateSelection,
+                                         request)
     py_typecheck.check_type(response, executor_pb2.CreateSelectionResponse)
     return RemoteValue(response.value_ref, result_type, self)
 
+  def _compute_request(
+      self, value_ref: executor_pb2.ValueRef) -> executor_pb2.ComputeRequest:
+    return executor_pb2.ComputeRequest(
+        value_ref=value_ref, tensor_encoding=self._tensor_encoding)
+
   @tracing.trace(span=True)
   async def _compute(self, value_ref):
     py_typecheck.check_type(value_ref, executor_pb2.ValueRef)
-    request = executor_pb2.ComputeRequest(value_ref=value_ref)
-    response = _request(self._stub.Compute, request)
+    with self._track_busy_time():
+      return await self._compute_remote_value(value_ref)
+
+  async def _compute_remote_value(self, value_ref: executor_pb2.ValueRef):
+    """Computes the remote value `value_ref` through the configured RPCs."""
+    if self._stream_values:
+      return await self._compute_streamed_value(value_ref)
+    if self._batch_requests:
+      compute_result = await self._execute_pending_operations(value_ref)
+      value, _ = executor_serialization.deserialize_value(compute_result.value)
+      return value
+    request = self._compute_request(value_ref)
+    response = await self._issue_request(self._stub.Compute, request)
     py_typecheck.check_type(response, executor_pb2.ComputeResponse)
     value, _ = executor_serialization.deserialize_value(response.value)
     return value
@@ -15,12 +15,15 @@
 import asyncio
 import collections
 import contextlib
+import os
+import threading
 from unittest import mock
 
 from absl.testing import absltest
 from absl.testing import parameterized
 import grpc
 from grpc.framework.foundation import logging_pool
+import numpy as np
 import portpicker
 import tensorflow as tf
 
@@ -28,6 +31,7 @@ from google.protobuf import any_pb2
 from tensorflow_federated.proto.v0 import executor_pb2
 from tensorflow_federated.proto.v0 import executor_pb2_grpc
 from tensorflow_federated.python.core.api import computations
+from tensorflow_federated.python.core.impl.executors import executor_serialization
 from tensorflow_federated.python.core.impl.executors import executor_service
 from tensorflow_federated.python.core.impl.executors import executor_stacks
 from tensorflow_federated.python.core.impl.executors import executor_test_utils
@@ -46,7 +50,10 @@ def create_remote_executor():
 
 
 @contextlib.contextmanager
-def test_context():
+def test_context(batch_requests=False,
+                 stream_values=False,
+                 deduplicate_broadcasts=False,
+                 tensor_encoding=None):
   port = portpicker.pick_unused_port()
   server_pool = logging_pool.pool(max_workers=1)
   server = grpc.server(server_pool)
@@ -67,7 +74,13 @@ def test_context():
 
   channel = grpc.insecure_channel('localhost:{}'.format(port))
 
-  remote_exec = remote_executor.RemoteExecutor(channel)
+  remote_exec = remote_executor.RemoteExecutor(
+      channel,
+      batch_requests=batch_requests,
+      stream_values=stream_values,
+      broadcast_cache=(remote_executor.BroadcastCache()
+                       if deduplicate_broadcasts else None),
+      tensor_encoding=tensor_encoding)
   remote_exec.set_cardinalities({placements.CLIENTS: 3})
   executor = reference_resolving_executor.ReferenceResolvingExecutor(
       remote_exec)
@@ -97,18 +110,86 @@ def _invoke(ex, comp, arg=None):
   return loop.run_until_complete(v3.compute())
 
 
-def _raise_grpc_error_unavailable(*args):
-  del args  # Unused
+class _TestGrpcFuture(grpc.Future):
+  """A `grpc.Future` completed explicitly by the test."""
+
+  def __init__(self):
+    self._result = None
+    self._error = None
+    self._done = False
+    self._callbacks = []
+
+  def set_result(self, result):
+    self._result = result
+    self._complete()
+
+  def set_exception(self, error):
+    self._error = error
+    self._complete()
+
+  def _complete(self):
+    self._done = True
+    for fn in self._callbacks:
+      fn(self)
+
+  def cancel(self):
+    return False
+
+  def cancelled(self):
+    return False
+
+  def running(self):
+    return not self._done
+
+  def done(self):
+    return self._done
+
+  def result(self, timeout=None):
+    if self._error is not None:
+      raise self._error
+    return self._result
+
+  def exception(self, timeout=None):
+    return self._error
+
+  def traceback(self, timeout=None):
+    return None
+
+  def add_done_callback(self, fn):
+    if self._done:
+      fn(self)
+    else:
+      self._callbacks.append(fn)
+
+
+def _completed_grpc_future(response):
+  future = _TestGrpcFuture()
+  future.set_result(response)
+  return future
+
+
+def _grpc_error(code):
   error = grpc.RpcError()
-  error.code = lambda: grpc.StatusCode.UNAVAILABLE
-  raise error
+  error.code = lambda: code
+  return error
+
 
+def _raise_grpc_error(code):
+  raise _grpc_error(code)
 
-def _raise_non_retryable_grpc_error(*args):
+
+def _grpc_error_unavailable_future(*args):
   del args  # Unused
-  error = grpc.RpcError()
-  error.code = lambda: grpc.StatusCode.ABORTED
-  raise error
+  future = _TestGrpcFuture()
+  future.set_exception(_grpc_error(grpc.StatusCode.UNAVAILABLE))
+  return future
+
+
+def _non_retryable_grpc_error_future(*args):
+  del args  # Unused
+  future = _TestGrpcFuture()
+  future.set_exception(_grpc_error(grpc.StatusCode.ABORTED))
+  return future
 
 
 @mock.patch(
@@ -123,7 +204,8 @@ class RemoteValueTest(absltest.TestCase):
     value = executor_pb2.Value(tensor=any_pb)
     response = executor_pb2.ComputeResponse(value=value)
     instance = mock_stub.return_value
-    instance.Compute = mock.Mock(side_effect=[response])
+    instance.Compute.future = mock.Mock(
+        side_effect=[_completed_grpc_future(response)])
     loop = asyncio.get_event_loop()
     executor = create_remote_executor()
     type_signature = computation_types.FunctionType(None, tf.int32)
@@ -132,13 +214,60 @@ class RemoteValueTest(absltest.TestCase):
 
     result = loop.run_until_complete(comp.compute())
 
-    instance.Compute.assert_called_once()
+    instance.Compute.future.assert_called_once()
     self.assertEqual(result, 1)
 
+  def test_compute_accumulates_busy_seconds(self, mock_stub):
+    tensor_proto = tf.make_tensor_proto(1)
+    any_pb = any_pb2.Any()
+    any_pb.Pack(tensor_proto)
+    response = executor_pb2.ComputeResponse(
+        value=executor_pb2.Value(tensor=any_pb))
+    instance = mock_stub.return_value
+    instance.Compute.future = mock.Mock(
+        side_effect=[_completed_grpc_future(response)])
+    loop = asyncio.get_event_loop()
+    executor = create_remote_executor()
+    value = remote_executor.RemoteValue(executor_pb2.ValueRef(), tf.int32,
+                                        executor)
+    self.assertEqual(executor.busy_seconds, 0.0)
+
+    with mock.patch.object(remote_executor, 'time') as mock_time:
+      mock_time.monotonic.side_effect = [10.0, 12.5]
+      loop.run_until_complete(value.compute())
+
+    self.assertEqual(executor.busy_seconds, 2.5)
+
+  def test_compute_requests_tensor_encoding(self, mock_stub):
+    tensor_proto = tf.make_tensor_proto(1.0)
+    any_pb = any_pb2.Any()
+    any_pb.Pack(tensor_proto)
+    response = executor_pb2.ComputeResponse(
+        value=executor_pb2.Value(tensor=any_pb))
+    instance = mock_stub.return_value
+    instance.Compute.future = mock.Mock(
+        side_effect=[_completed_grpc_future(response)])
+    loop = asyncio.get_event_loop()
+    port = portpicker.pick_unused_port()
+    channel = grpc.insecure_channel('localhost:{}'.format(port))
+    tensor_encoding = executor_pb2.TensorEncoding(
+        precision=executor_pb2.TensorEncoding.BFLOAT16)
+    executor = remote_executor.RemoteExecutor(
+        channel, tensor_encoding=tensor_encoding)
+    value = remote_executor.RemoteValue(executor_pb2.ValueRef(), tf.float32,
+                                        executor)
+
+    result = loop.run_until_complete(value.compute())
+
+    request = instance.Compute.future.call_args[0][0]
+    self.assertEqual(request.tensor_encoding, tensor_encoding)
+    self.assertEqual(result, 1.0)
+
   def test_compute_raises_retryable_error_on_grpc_error_unavailable(
       self, mock_stub):
     instance = mock_stub.return_value
-    instance.Compute = mock.Mock(side_effect=_raise_grpc_error_unavailable)
+    instance.Compute.future = mock.Mock(
+        side_effect=_grpc_error_unavailable_future)
     loop = asyncio.get_event_loop()
     executor = create_remote_executor()
     type_signature = computation_types.FunctionType(None, tf.int32)
@@ -150,7 +279,8 @@ class RemoteValueTest(absltest.TestCase):
 
   def test_compute_reraises_grpc_error(self, mock_stub):
     instance = mock_stub.return_value
-    instance.Compute = mock.Mock(side_effect=_raise_non_retryable_grpc_error)
+    instance.Compute.future = mock.Mock(
+        side_effect=_non_retryable_grpc_error_future)
     loop = asyncio.get_event_loop()
     executor = create_remote_executor()
     type_signature = computation_types.FunctionType(None, tf.int32)
@@ -164,7 +294,7 @@ class RemoteValueTest(absltest.TestCase):
 
   def test_compute_reraises_type_error(self, mock_stub):
     instance = mock_stub.return_value
-    instance.Compute = mock.Mock(side_effect=TypeError)
+    instance.Compute.future = mock.Mock(side_effect=TypeError)
     loop = asyncio.get_event_loop()
     executor = create_remote_executor()
     type_signature = computation_types.FunctionType(None, tf.int32)
@@ -191,19 +321,21 @@ class RemoteExecutorTest(absltest.TestCase):
   def test_create_value_returns_remote_value(self, mock_stub):
     response = executor_pb2.CreateValueResponse()
     instance = mock_stub.return_value
-    instance.CreateValue = mock.Mock(side_effect=[response])
+    instance.CreateValue.future = mock.Mock(
+        side_effect=[_completed_grpc_future(response)])
     loop = asyncio.get_event_loop()
     executor = create_remote_executor()
 
     result = loop.run_until_complete(executor.create_value(1, tf.int32))
 
-    instance.CreateValue.assert_called_once()
+    instance.CreateValue.future.assert_called_once()
     self.assertIsInstance(result, remote_executor.RemoteValue)
 
   def test_create_value_raises_retryable_error_on_grpc_error_unavailable(
       self, mock_stub):
     instance = mock_stub.return_value
-    instance.CreateValue = mock.Mock(side_effect=_raise_grpc_error_unavailable)
+    instance.CreateValue.future = mock.Mock(
+        side_effect=_grpc_error_unavailable_future)
     loop = asyncio.get_event_loop()
     executor = create_remote_executor()
 
@@ -212,8 +344,8 @@ class RemoteExecutorTest(absltest.TestCase):
 
   def test_create_value_reraises_grpc_error(self, mock_stub):
     instance = mock_stub.return_value
-    instance.CreateValue = mock.Mock(
-        side_effect=_raise_non_retryable_grpc_error)
+    instance.CreateValue.future = mock.Mock(
+        side_effect=_non_retryable_grpc_error_future)
     loop = asyncio.get_event_loop()
     executor = create_remote_executor()
 
@@ -224,17 +356,107 @@ class RemoteExecutorTest(absltest.TestCase):
 
   def test_create_value_reraises_type_error(self, mock_stub):
     instance = mock_stub.return_value
-    instance.CreateValue = mock.Mock(side_effect=TypeError)
+    instance.CreateValue.future = mock.Mock(side_effect=TypeError)
     loop = asyncio.get_event_loop()
     executor = create_remote_executor()
 
     with self.assertRaises(TypeError):
       loop.run_until_complete(executor.create_value(1, tf.int32))
 
+  def test_create_value_removes_shared_memory_file_on_grpc_error(
+      self, mock_stub):
+    instance = mock_stub.return_value
+    instance.CreateValue.future = mock.Mock(
+        side_effect=_non_retryable_grpc_error_future)
+    loop = asyncio.get_event_loop()
+    port = portpicker.pick_unused_port()
+    channel = grpc.insecure_channel('localhost:{}'.format(port))
+    executor = remote_executor.RemoteExecutor(channel, use_shared_memory=True)
+    x = np.ones([1024, 1024], dtype=np.float32)
+
+    with mock.patch.object(
+        executor_serialization,
+        'release_shared_memory_tensors',
+        wraps=executor_serialization.release_shared_memory_tensors
+    ) as mock_release:
+      with self.assertRaises(grpc.RpcError):
+        loop.run_until_complete(
+            executor.create_value(
+                x, computation_types.TensorType(tf.float32, [1024, 1024])))
+
+    mock_release.assert_called_once()
+    value_proto = mock_release.call_args[0][0]
+    self.assertEqual(value_proto.WhichOneof('value'), 'shared_memory_tensor')
+    self.assertFalse(os.path.exists(value_proto.shared_memory_tensor.path))
+
+  def test_broadcast_value_is_serialized_once_and_sent_once(self, mock_stub):
+    instance = mock_stub.return_value
+    instance.CreateValue.future = mock.Mock(
+        side_effect=lambda _: _completed_grpc_future(
+            executor_pb2.CreateValueResponse()))
+    loop = asyncio.get_event_loop()
+    broadcast_cache = remote_executor.BroadcastCache()
+    port = portpicker.pick_unused_port()
+    channel = grpc.insecure_channel('localhost:{}'.format(port))
+    first_ex = remote_executor.RemoteExecutor(
+        channel, broadcast_cache=broadcast_cache)
+    second_ex = remote_executor.RemoteExecutor(
+        channel, broadcast_cache=broadcast_cache)
+    value = tf.ones([10]).numpy()
+    type_spec = computation_types.at_clients(
+        computation_types.TensorType(tf.float32, [10]), all_equal=True)
+
+    with mock.patch.object(
+        executor_serialization,
+        'serialize_value',
+        wraps=executor_serialization.serialize_value) as mock_serialize:
+      for ex in [first_ex, first_ex, second_ex]:
+        loop.run_until_complete(ex.create_value(value, type_spec))
+
+    mock_serialize.assert_called_once()
+    requests = [
+        call[0][0] for call in instance.CreateValue.future.call_args_list
+    ]
+    self.assertLen(requests, 3)
+    digest = requests[0].content_digest
+    self.assertNotEmpty(digest)
+    self.assertTrue(requests[0].HasField('value'))
+    # The first executor already sent the content to its service.
+    self.assertFalse(requests[1].HasField('value'))
+    self.assertEqual(requests[1].content_digest, digest)
+    self.assertTrue(requests[2].HasField('value'))
+    self.assertEqual(requests[2].content_digest, digest)
+
+  def test_broadcast_value_is_resent_if_not_found(self, mock_stub):
+    not_found_future = _TestGrpcFuture()
+    not_found_future.set_exception(_grpc_error(grpc.StatusCode.NOT_FOUND))
+    instance = mock_stub.return_value
+    instance.CreateValue.future = mock.Mock(side_effect=[
+        _completed_grpc_future(executor_pb2.CreateValueResponse()),
+        not_found_future,
+        _completed_grpc_future(executor_pb2.CreateValueResponse()),
+    ])
+    loop = asyncio.get_event_loop()
+    port = portpicker.pick_unused_port()
+    channel = grpc.insecure_channel('localhost:{}'.format(port))
+    executor = remote_executor.RemoteExecutor(
+        channel, broadcast_cache=remote_executor.BroadcastCache())
+    value = tf.ones([10]).numpy()
+    type_spec = computation_types.at_clients(
+        computation_types.TensorType(tf.float32, [10]), all_equal=True)
+
+    loop.run_until_complete(executor.create_value(value, type_spec))
+    result = loop.run_until_complete(executor.create_value(value, type_spec))
+
+    self.assertIsInstance(result, remote_executor.RemoteValue)
+    last_request = instance.CreateValue.future.call_args_list[-1][0][0]
+    self.assertTrue(last_request.HasField('value'))
+
   def test_create_call_returns_remote_value(self, mock_stub):
     response = executor_pb2.CreateCallResponse()
     instance = mock_stub.return_value
-    instance.CreateCall = mock.Mock(side_effect=[response])
+    instance.CreateCall.future = mock.Mock(
+        side_effect=[_completed_grpc_future(response)])
     loop = asyncio.get_event_loop()
     executor = create_remote_executor()
     type_signature = computation_types.FunctionType(None, tf.int32)
@@ -243,13 +465,14 @@ class RemoteExecutorTest(absltest.TestCase):
 
     result = loop.run_until_complete(executor.create_call(fn, None))
 
-    instance.CreateCall.assert_called_once()
+    instance.CreateCall.future.assert_called_once()
     self.assertIsInstance(result, remote_executor.RemoteValue)
 
   def test_create_call_raises_retryable_error_on_grpc_error_unavailable(
       self, mock_stub):
     instance = mock_stub.return_value
-    instance.CreateCall = mock.Mock(side_effect=_raise_grpc_error_unavailable)
+    instance.CreateCall.future = mock.Mock(
+        side_effect=_grpc_error_unavailable_future)
     loop = asyncio.get_event_loop()
     executor = create_remote_executor()
     type_signature = computation_types.FunctionType(None, tf.int32)
@@ -261,7 +484,8 @@ class RemoteExecutorTest(absltest.TestCase):
 
   def test_create_call_reraises_grpc_error(self, mock_stub):
     instance = mock_stub.return_value
-    instance.CreateCall = mock.Mock(side_effect=_raise_non_retryable_grpc_error)
+    instance.CreateCall.future = mock.Mock(
+        side_effect=_non_retryable_grpc_error_future)
     loop = asyncio.get_event_loop()
     executor = create_remote_executor()
     type_signature = computation_types.FunctionType(None, tf.int32)
@@ -275,7 +499,7 @@ class RemoteExecutorTest(absltest.TestCase):
 
   def test_create_call_reraises_type_error(self, mock_stub):
     instance = mock_stub.return_value
-    instance.CreateCall = mock.Mock(side_effect=TypeError)
+    instance.CreateCall.future = mock.Mock(side_effect=TypeError)
     loop = asyncio.get_event_loop()
     executor = create_remote_executor()
     type_signature = computation_types.FunctionType(None, tf.int32)
@@ -288,7 +512,8 @@ class RemoteExecutorTest(absltest.TestCase):
   def test_create_struct_returns_remote_value(self, mock_stub):
     response = executor_pb2.CreateStructResponse()
     instance = mock_stub.return_value
-    instance.CreateStruct = mock.Mock(side_effect=[response])
+    instance.CreateStruct.future = mock.Mock(
+        side_effect=[_completed_grpc_future(response)])
     loop = asyncio.get_event_loop()
     executor = create_remote_executor()
     type_signature = computation_types.TensorType(tf.int32)
@@ -299,13 +524,14 @@ class RemoteExecutorTest(absltest.TestCase):
 
     result = loop.run_until_complete(executor.create_struct([value_1, value_2]))
 
-    instance.CreateStruct.assert_called_once()
+    instance.CreateStruct.future.assert_called_once()
     self.assertIsInstance(result, remote_executor.RemoteValue)
 
   def test_create_struct_raises_retryable_error_on_grpc_error_unavailable(
       self, mock_stub):
     instance = mock_stub.return_value
-    instance.CreateStruct = mock.Mock(side_effect=_raise_grpc_error_unavailable)
+    instance.CreateStruct.future = mock.Mock(
+        side_effect=_grpc_error_unavailable_future)
     loop = asyncio.get_event_loop()
     executor = create_remote_executor()
     type_signature = computation_types.TensorType(tf.int32)
@@ -319,8 +545,8 @@ class RemoteExecutorTest(absltest.TestCase):
 
   def test_create_struct_reraises_grpc_error(self, mock_stub):
     instance = mock_stub.return_value
-    instance.CreateStruct = mock.Mock(
-        side_effect=_raise_non_retryable_grpc_error)
+    instance.CreateStruct.future = mock.Mock(
+        side_effect=_non_retryable_grpc_error_future)
     loop = asyncio.get_event_loop()
     executor = create_remote_executor()
     type_signature = computation_types.TensorType(tf.int32)
@@ -336,7 +562,7 @@ class RemoteExecutorTest(absltest.TestCase):
 
   def test_create_struct_reraises_type_error(self, mock_stub):
     instance = mock_stub.return_value
-    instance.CreateStruct = mock.Mock(side_effect=TypeError)
+    instance.CreateStruct.future = mock.Mock(side_effect=TypeError)
     loop = asyncio.get_event_loop()
     executor = create_remote_executor()
     type_signature = computation_types.TensorType(tf.int32)
@@ -351,7 +577,8 @@ class RemoteExecutorTest(absltest.TestCase):
   def test_create_selection_returns_remote_value(self, mock_stub):
     response = executor_pb2.CreateSelectionResponse()
     instance = mock_stub.return_value
-    instance.CreateSelection = mock.Mock(side_effect=[response])
+    instance.CreateSelection.future = mock.Mock(
+        side_effect=[_completed_grpc_future(response)])
     loop = asyncio.get_event_loop()
     executor = create_remote_executor()
     type_signature = computation_types.StructType([tf.int32, tf.int32])
@@ -360,14 +587,14 @@ class RemoteExecutorTest(absltest.TestCase):
 
     result = loop.run_until_complete(executor.create_selection(source, 0))
 
-    instance.CreateSelection.assert_called_once()
+    instance.CreateSelection.future.assert_called_once()
     self.assertIsInstance(result, remote_executor.RemoteValue)
 
   def test_create_selection_raises_retryable_error_on_grpc_error_unavailable(
       self, mock_stub):
     instance = mock_stub.return_value
-    instance.CreateSelection = mock.Mock(
-        side_effect=_raise_grpc_error_unavailable)
+    instance.CreateSelection.future = mock.Mock(
+        side_effect=_grpc_error_unavailable_future)
     loop = asyncio.get_event_loop()
     executor = create_remote_executor()
     type_signature = computation_types.StructType([tf.int32, tf.int32])
@@ -379,8 +606,8 @@ class RemoteExecutorTest(absltest.TestCase):
 
   def test_create_selection_reraises_non_retryable_grpc_error(self, mock_stub):
     instance = mock_stub.return_value
-    instance.CreateSelection = mock.Mock(
-        side_effect=_raise_non_retryable_grpc_error)
+    instance.CreateSelection.future = mock.Mock(
+        side_effect=_non_retryable_grpc_error_future)
     loop = asyncio.get_event_loop()
     executor = create_remote_executor()
     type_signature = computation_types.StructType([tf.int32, tf.int32])
@@ -394,7 +621,7 @@ class RemoteExecutorTest(absltest.TestCase):
 
   def test_create_selection_reraises_type_error(self, mock_stub):
     instance = mock_stub.return_value
-    instance.CreateSelection = mock.Mock(side_effect=TypeError)
+    instance.CreateSelection.future = mock.Mock(side_effect=TypeError)
     loop = asyncio.get_event_loop()
     executor = create_remote_executor()
     type_signature = computation_types.StructType([tf.int32, tf.int32])
@@ -404,11 +631,189 @@ class RemoteExecutorTest(absltest.TestCase):
     with self.assertRaises(TypeError):
       loop.run_until_complete(executor.create_selection(source, 0))
 
+  def test_create_value_issues_requests_concurrently_up_to_limit(
+      self, mock_stub):
+    pending_futures = []
+
+    def _pending_future(*args):
+      del args  # Unused
+      future = _TestGrpcFuture()
+      pending_futures.append(future)
+      return future
+
+    instance = mock_stub.return_value
+    instance.CreateValue.future = mock.Mock(side_effect=_pending_future)
+    loop = asyncio.get_event_loop()
+    port = portpicker.pick_unused_port()
+    channel = grpc.insecure_channel('localhost:{}'.format(port))
+    executor = remote_executor.RemoteExecutor(
+        channel, max_concurrent_requests=2)
+
+    async def _create_values():
+      tasks = [
+          asyncio.ensure_future(executor.create_value(x, tf.int32))
+          for x in range(3)
+      ]
+      await asyncio.sleep(0.1)
+      # Only two requests may be in flight at once; none has completed yet.
+      self.assertLen(pending_futures, 2)
+      pending_futures[0].set_result(executor_pb2.CreateValueResponse())
+      await asyncio.sleep(0.1)
+      self.assertLen(pending_futures, 3)
+      for future in pending_futures[1:]:
+        future.set_result(executor_pb2.CreateValueResponse())
+      return await asyncio.gather(*tasks)
+
+    results = loop.run_until_complete(_create_values())
+
+    self.assertLen(results, 3)
+    for result in results:
+      self.assertIsInstance(result, remote_executor.RemoteValue)
+
+  def test_batched_create_value_and_compute_issue_single_execute(
+      self, mock_stub):
+    value_proto, _ = executor_serialization.serialize_value(1, tf.int32)
+    instance = mock_stub.return_value
+
+    def _execute(request):
+      self.assertLen(request.operation, 2)
+      self.assertEqual(request.operation[0].WhichOneof('operation'),
+                       'create_value')
+      compute_ref = request.operation[1].compute.value_ref
+      self.assertEqual(compute_ref, request.operation[0].result_ref)
+      return iter([
+          executor_pb2.ExecuteResponse(
+              operations_registered=executor_pb2.ExecuteResponse
+              .OperationsRegistered()),
+          executor_pb2.ExecuteResponse(
+              compute_result=executor_pb2.ExecuteResponse.ComputeResult(
+                  value_ref=compute_ref, value=value_proto)),
+      ])
+
+    instance.Execute = mock.Mock(side_effect=_execute)
+    loop = asyncio.get_event_loop()
+    port = portpicker.pick_unused_port()
+    channel = grpc.insecure_channel('localhost:{}'.format(port))
+    executor = remote_executor.RemoteExecutor(channel, batch_requests=True)
+
+    value = loop.run_until_complete(executor.create_value(1, tf.int32))
+    instance.CreateValue.future.assert_not_called()
+    result = loop.run_until_complete(value.compute())
+
+    instance.Execute.assert_called_once()
+    self.assertEqual(result, 1)
+
+  def test_batched_compute_raises_retryable_error_on_grpc_error_unavailable(
+      self, mock_stub):
+    instance = mock_stub.return_value
+    instance.Execute = mock.Mock(
+        side_effect=lambda _: _raise_grpc_error(grpc.StatusCode.UNAVAILABLE))
+    loop = asyncio.get_event_loop()
+    port = portpicker.pick_unused_port()
+    channel = grpc.insecure_channel('localhost:{}'.format(port))
+    executor = remote_executor.RemoteExecutor(channel, batch_requests=True)
+    value = loop.run_until_complete(executor.create_value(1, tf.int32))
+
+    with self.assertRaises(executors_errors.RetryableError):
+      loop.run_until_complete(value.compute())
+
+  def test_dispose_is_sent_in_background_once_batch_is_full(self, mock_stub):
+    instance = mock_stub.return_value
+    disposed = threading.Event()
+    instance.Dispose = mock.Mock(side_effect=lambda _: disposed.set())
+    port = portpicker.pick_unused_port()
+    channel = grpc.insecure_channel('localhost:{}'.format(port))
+    executor = remote_executor.RemoteExecutor(
+        channel, dispose_batch_size=2, dispose_interval_seconds=60.0)
+    values = [
+        remote_executor.RemoteValue(
+            executor_pb2.ValueRef(id=str(i)), tf.int32, executor)
+        for i in range(2)
+    ]
+
+    del values
+    self.assertTrue(disposed.wait(10.0))
+
+    request = instance.Dispose.call_args[0][0]
+    self.assertCountEqual([ref.id for ref in request.value_ref], ['0', '1'])
+
+  def test_dispose_is_sent_in_background_after_interval(self, mock_stub):
+    instance = mock_stub.return_value
+    disposed = threading.Event()
+    instance.Dispose = mock.Mock(side_effect=lambda _: disposed.set())
+    port = portpicker.pick_unused_port()
+    channel = grpc.insecure_channel('localhost:{}'.format(port))
+    executor = remote_executor.RemoteExecutor(
+        channel, dispose_batch_size=20, dispose_interval_seconds=0.01)
+    value = remote_executor.RemoteValue(
+        executor_pb2.ValueRef(id='value'), tf.int32, executor)
+
+    del value
+    self.assertTrue(disposed.wait(10.0))
+
+    request = instance.Dispose.call_args[0][0]
+    self.assertEqual([ref.id for ref in request.value_ref], ['value'])
+
+  def test_raises_value_error_with_nonpositive_dispose_batch_size(
+      self, mock_stub):
+    del mock_stub  # Unused
+    port = portpicker.pick_unused_port()
+    channel = grpc.insecure_channel('localhost:{}'.format(port))
+    with self.assertRaises(ValueError):
+      remote_executor.RemoteExecutor(channel, dispose_batch_size=0)
+
+  def test_raises_value_error_with_nonpositive_dispose_interval_seconds(
+      self, mock_stub):
+    del mock_stub  # Unused
+    port = portpicker.pick_unused_port()
+    channel = grpc.insecure_channel('localhost:{}'.format(port))
+    with self.assertRaises(ValueError):
+      remote_executor.RemoteExecutor(channel, dispose_interval_seconds=0.0)
+
+  def test_raises_value_error_with_nonpositive_max_concurrent_requests(
+      self, mock_stub):
+    del mock_stub  # Unused
+    port = portpicker.pick_unused_port()
+    channel = grpc.insecure_channel('localhost:{}'.format(port))
+    with self.assertRaises(ValueError):
+      remote_executor.RemoteExecutor(channel, max_concurrent_requests=0)
+
+  def test_raises_value_error_with_stream_values_and_batch_requests(
+      self, mock_stub):
+    del mock_stub  # Unused
+    port = portpicker.pick_unused_port()
+    channel = grpc.insecure_channel('localhost:{}'.format(port))
+    with self.assertRaises(ValueError):
+      remote_executor.RemoteExecutor(
+          channel, batch_requests=True, stream_values=True)
+
+  def test_raises_value_error_with_stream_values_and_tensor_encoding(
+      self, mock_stub):
+    del mock_stub  # Unused
+    port = portpicker.pick_unused_port()
+    channel = grpc.insecure_channel('localhost:{}'.format(port))
+    with self.assertRaises(ValueError):
+      remote_executor.RemoteExecutor(
+          channel,
+          stream_values=True,
+          tensor_encoding=executor_pb2.TensorEncoding(
+              compression=executor_pb2.TensorEncoding.ZLIB))
+
+  def test_raises_value_error_with_nonpositive_max_chunk_size_bytes(
+      self, mock_stub):
+    del mock_stub  # Unused
+    port = portpicker.pick_unused_port()
+    channel = grpc.insecure_channel('localhost:{}'.format(port))
+    with self.assertRaises(ValueError):
+      remote_executor.RemoteExecutor(
+          channel, stream_values=True, max_chunk_size_bytes=0)
+
 
 class RemoteExecutorIntegrationTest(parameterized.TestCase):
 
-  def test_no_arg_tf_computation(self):
-    with test_context() as context:
+  @parameterized.named_parameters(('unbatched', False), ('batched', True))
+  def test_no_arg_tf_computation(self, batch_requests):
+    with test_context(batch_requests=batch_requests) as context:
 
       @computations.tf_computation
       def comp():
@@ -417,8 +822,9 @@ class RemoteExecutorIntegrationTest(parameterized.TestCase):
       result = _invoke(context.executor, comp)
       self.assertEqual(result, 10)
 
-  def test_one_arg_tf_computation(self):
-    with test_context() as context:
+  @parameterized.named_parameters(('unbatched', False), ('batched', True))
+  def test_one_arg_tf_computation(self, batch_requests):
+    with test_context(batch_requests=batch_requests) as context:
 
       @computations.tf_computation(tf.int32)
       def comp(x):
@@ -427,6 +833,41 @@ class RemoteExecutorIntegrationTest(parameterized.TestCase):
       result = _invoke(context.executor, comp, 10)
       self.assertEqual(result, 11)
 
+  def test_streamed_tf_computation_with_large_tensors(self):
+    with test_context(stream_values=True) as context:
+
+      @computations.tf_computation(
+          computation_types.TensorType(tf.float32, [1024, 1024]))
+      def comp(x):
+        return collections.OrderedDict(doubled=x * 2.0, total=tf.reduce_sum(x))
+
+      result = _invoke(context.executor, comp,
+                       tf.ones([1024, 1024], dtype=tf.float32).numpy())
+      self.assertEqual(result.doubled.shape, (1024, 1024))
+      self.assertTrue((result.doubled == 2.0).all())
+      self.assertEqual(result.total, 1024 * 1024)
+
+  @parameterized.named_parameters(('unbatched', False), ('batched', True))
+  def test_tf_computation_with_tensor_encoding(self, batch_requests):
+    tensor_encoding = executor_pb2.TensorEncoding(
+        precision=executor_pb2.TensorEncoding.FLOAT16,
+        compression=executor_pb2.TensorEncoding.ZLIB,
+        max_sparse_density=0.5)
+    with test_context(
+        batch_requests=batch_requests,
+        tensor_encoding=tensor_encoding) as context:
+
+      @computations.tf_computation(
+          computation_types.TensorType(tf.float32, [100]))
+      def comp(x):
+        return x * 2.0
+
+      x = np.zeros([100], dtype=np.float32)
+      x[:10] = np.arange(10, dtype=np.float32)
+      result = _invoke(context.executor, comp, x)
+      self.assertEqual(result.dtype, np.float32)
+      np.testing.assert_array_equal(result, x * 2.0)
+
   def test_two_arg_tf_computation(self):
     with test_context() as context:
 
@@ -475,8 +916,16 @@ class RemoteExecutorIntegrationTest(parameterized.TestCase):
 
     self.assertEqual(result, 10)
 
-  def test_with_federated_computations(self):
-    with test_context() as context:
+  @parameterized.named_parameters(('unbatched', False, False, False),
+                                  ('batched', True, False, False),
+                                  ('streamed', False, True, False),
+                                  ('deduplicated', False, False, True))
+  def test_with_federated_computations(self, batch_requests, stream_values,
+                                       deduplicate_broadcasts):
+    with test_context(
+        batch_requests=batch_requests,
+        stream_values=stream_values,
+        deduplicate_broadcasts=deduplicate_broadcasts) as context:
 
       @computations.federated_computation(
           computation_types.FederatedType(tf.int32, placements.CLIENTS))
@@ -59,43 +59,107 @@ class ThreadDelegatingExecutorValue(evb.ExecutorValue):
                                           self._event_loop)
 
 
+def _start_event_loop_thread():
+  """Returns a new event loop, and the daemon thread running it forever."""
+  event_loop = asyncio.new_event_loop()
+  event_loop.set_task_factory(tracing.propagate_trace_context_task_factory)
+
+  def run_loop(loop):
+    loop.run_forever()
+    loop.close()
+
+  thread = threading.Thread(
+      target=functools.partial(run_loop, event_loop), daemon=True)
+  thread.start()
+  return event_loop, thread
+
+
+def _stop_event_loop_threads(event_loops, threads):
+  logging.debug('Finalizing, joining threads.')
+  for loop in event_loops:
+    loop.call_soon_threadsafe(loop.stop)
+  for thread in threads:
+    thread.join()
+  logging.debug('Threads joined.')
+
+
+class EventLoopThreadPool(object):
+  """A size-bounded pool of threads, each running its own event loop.
+
+  Every call to `acquire_event_loop` hands out the event loop of one of the
+  threads in the pool, in round-robin order, so that any number of
+  `ThreadDelegatingExecutor`s sharing the pool run on at most `num_threads`
+  threads. Threads are started lazily, the first time their event loop is
+  handed out, and are stopped once the pool is garbage collected.
+  """
+
+  def __init__(self, num_threads: int):
+    """Creates a pool of at most `num_threads` threads.
+
+    Args:
+      num_threads: The maximum number of threads in the pool; must be positive.
+
+    Raises:
+      ValueError: If `num_threads` is not positive.
+    """
+    py_typecheck.check_type(num_threads, int)
+    if num_threads < 1:
+      raise ValueError(
+          f'Expected a positive `num_threads`, found {num_threads}.')
+    self._num_threads = num_threads
+    self._lock = threading.Lock()
+    self._event_loops = []
+    self._threads = []
+    self._next_index = 0
+    weakref.finalize(self, _stop_event_loop_threads, self._event_loops,
+                     self._threads)
+
+  @property
+  def num_threads(self) -> int:
+    return self._num_threads
+
+  def acquire_event_loop(self) -> asyncio.AbstractEventLoop:
+    """Returns the event loop of the next thread in the pool."""
+    with self._lock:
+      index = self._next_index
+      self._next_index = (index + 1) % self._num_threads
+      if index == len(self._event_loops):
+        event_loop, thread = _start_event_loop_thread()
+        self._event_loops.append(event_loop)
+        self._threads.append(thread)
+      return self._event_loops[index]
+
+
 class ThreadDelegatingExecutor(eb.Executor):
   """The concurrent executor delegates work to a separate thread.
 
   This executor only handles threading. It delegates all execution to an
   underlying pool of target executors.
-  """
 
-  # TODO(b/134543154): Upgrade this to a threadpool with multiple workers,
-  # possibly one that could be shared among multiple of these executors.
+  All of the work of a given executor runs on a single event loop, so the
+  relative ordering of its work is preserved, but several executors may share
+  the threads of an `EventLoopThreadPool` to bound the total number of threads.
+  """
 
-  def __init__(self, target_executor: eb.Executor):
+  def __init__(self,
+               target_executor: eb.Executor,
+               event_loop_pool: Optional[EventLoopThreadPool] = None):
     """Creates a concurrent executor backed by a target executor.
 
     Args:
       target_executor: The executor that does all the work.
+      event_loop_pool: An optional `EventLoopThreadPool` whose threads may be
+        shared with other executors. If `None`, this executor runs its work on
+        a dedicated thread of its own.
     """
     py_typecheck.check_type(target_executor, eb.Executor)
+    if event_loop_pool is None:
+      event_loop_pool = EventLoopThreadPool(1)
+    py_typecheck.check_type(event_loop_pool, EventLoopThreadPool)
     self._target_executor = target_executor
-    self._event_loop = asyncio.new_event_loop()
-    self._event_loop.set_task_factory(
-        tracing.propagate_trace_context_task_factory)
-
-    def run_loop(loop):
-      loop.run_forever()
-      loop.close()
-
-    self._thread = threading.Thread(
-        target=functools.partial(run_loop, self._event_loop), daemon=True)
-    self._thread.start()
-
-    def finalizer(loop, thread):
-      logging.debug('Finalizing, joining thread.')
-      loop.call_soon_threadsafe(loop.stop)
-      thread.join()
-      logging.debug('Thread joined.')
-
-    weakref.finalize(self, finalizer, self._event_loop, self._thread)
+    # Holding on to the pool keeps its threads alive as long as this executor.
+    self._event_loop_pool = event_loop_pool
+    self._event_loop = event_loop_pool.acquire_event_loop()
 
   def close(self):
     # Close does not clean up the event loop or thread.
@@ -192,5 +192,38 @@ class ThreadDelegatingExecutorTest(absltest.TestCase):
     self.assertEqual(result, 9)
 
 
+class EventLoopThreadPoolTest(absltest.TestCase):
+
+  def test_raises_with_nonpositive_num_threads(self):
+    with self.assertRaises(ValueError):
+      thread_delegating_executor.EventLoopThreadPool(0)
+
+  def test_acquire_event_loop_bounds_number_of_loops(self):
+    pool = thread_delegating_executor.EventLoopThreadPool(2)
+
+    event_loops = [pool.acquire_event_loop() for _ in range(5)]
+
+    self.assertLen(set(event_loops), 2)
+    self.assertIs(event_loops[0], event_loops[2])
+    self.assertIs(event_loops[1], event_loops[3])
+
+  def test_executors_sharing_pool_compute_independently(self):
+
+    @computations.tf_computation(tf.int32)
+    def add_one(x):
+      return tf.add(x, 1)
+
+    pool = thread_delegating_executor.EventLoopThreadPool(2)
+    executors = [
+        thread_delegating_executor.ThreadDelegatingExecutor(
+            eager_tf_executor.EagerTFExecutor(), event_loop_pool=pool)
+        for _ in range(5)
+    ]
+
+    results = [_invoke(ex, add_one, i) for i, ex in enumerate(executors)]
+
+    self.assertEqual(results, [1, 2, 3, 4, 5])
+
+
 if __name__ == '__main__':
   absltest.main()
@@ -26,6 +26,7 @@ from tensorflow_federated.python.simulation.sampling_utils import build_uniform_
 from tensorflow_federated.python.simulation.server_utils import run_server
 from tensorflow_federated.python.simulation.server_utils import server_context
 from tensorflow_federated.python.simulation.tensorboard_manager import TensorBoardManager
+from tensorflow_federated.python.simulation.training_loop import CLIENT_SELECTION_TIME_KEY
 from tensorflow_federated.python.simulation.training_loop import EVALUATION_METRICS_PREFIX
 from tensorflow_federated.python.simulation.training_loop import EVALUATION_TIME_KEY
 from tensorflow_federated.python.simulation.training_loop import ROUND_NUMBER_KEY
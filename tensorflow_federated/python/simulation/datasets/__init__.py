@@ -20,7 +20,10 @@ from tensorflow_federated.python.simulation.datasets import gldv2
 from tensorflow_federated.python.simulation.datasets import inaturalist
 from tensorflow_federated.python.simulation.datasets import shakespeare
 from tensorflow_federated.python.simulation.datasets import stackoverflow
+from tensorflow_federated.python.simulation.datasets.caching_client_data import CachingClientData
 from tensorflow_federated.python.simulation.datasets.client_data import ClientData
+from tensorflow_federated.python.simulation.datasets.columnar_client_data import ColumnarClientData
+from tensorflow_federated.python.simulation.datasets.columnar_client_data import write_columnar_client_data
 from tensorflow_federated.python.simulation.datasets.dataset_utils import build_dataset_mixture
 from tensorflow_federated.python.simulation.datasets.dataset_utils import build_single_label_dataset
 from tensorflow_federated.python.simulation.datasets.dataset_utils import build_synthethic_iid_datasets
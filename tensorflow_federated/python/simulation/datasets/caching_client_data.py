@@ -0,0 +1,279 @@
+# Copyright 2021, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A `ClientData` caching the materialized datasets of its clients."""
+
+import collections
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from typing import List, Optional, Sequence, Tuple
+import weakref
+
+import tensorflow as tf
+
+from tensorflow_federated.python.common_libs import py_typecheck
+from tensorflow_federated.python.simulation.datasets import client_data
+
+
+def _num_bytes(tensor: tf.Tensor) -> int:
+  if tensor.dtype == tf.string:
+    return sum(len(value) for value in tensor.numpy().flatten())
+  return tensor.shape.num_elements() * tensor.dtype.size
+
+
+def _directory_num_bytes(path: str) -> int:
+  return sum(
+      os.path.getsize(os.path.join(directory, filename))
+      for directory, _, filenames in os.walk(path)
+      for filename in filenames)
+
+
+def _relax_shapes(dataset: tf.data.Dataset, element_spec) -> tf.data.Dataset:
+  """Returns `dataset` with the less specific shapes of `element_spec`."""
+  if dataset.element_spec == element_spec:
+    return dataset
+
+  def relax(*element):
+    if not isinstance(element_spec, tuple):
+      element = element[0]
+    return tf.nest.map_structure(
+        lambda t, s: tf.compat.v1.placeholder_with_default(t, s.shape),
+        element, element_spec)
+
+  return dataset.map(relax)
+
+
+def _materialize(dataset: tf.data.Dataset,
+                 element_spec) -> Tuple[tf.data.Dataset, int]:
+  """Returns a dataset of the elements of `dataset` held as constant tensors.
+
+  Consecutive elements of identical shapes are stacked into a single tensor
+  and sliced again, so that e.g. batches only cost one tensor per feature,
+  plus one for the last, partial batch.
+
+  Args:
+    dataset: The `tf.data.Dataset` to materialize.
+    element_spec: The element spec of the returned dataset.
+
+  Returns:
+    A tuple of the materialized `tf.data.Dataset` and the number of bytes of
+    its elements.
+  """
+  runs = []
+  run_shapes = None
+  num_bytes = 0
+  for element in dataset:
+    tensors = tf.nest.flatten(element)
+    num_bytes += sum(_num_bytes(t) for t in tensors)
+    shapes = [t.shape for t in tensors]
+    if shapes != run_shapes:
+      runs.append([])
+      run_shapes = shapes
+    runs[-1].append(element)
+  if not runs:
+    empty_element = tf.nest.map_structure(
+        lambda s: tf.zeros([0] + [d or 0 for d in s.shape.as_list()], s.dtype),
+        element_spec)
+    return tf.data.Dataset.from_tensor_slices(empty_element), 0
+  materialized = None
+  for run in runs:
+    stacked = tf.nest.map_structure(lambda *tensors: tf.stack(tensors), *run)
+    run_dataset = tf.data.Dataset.from_tensor_slices(stacked)
+    if materialized is None:
+      materialized = run_dataset
+    else:
+      materialized = materialized.concatenate(run_dataset)
+  return _relax_shapes(materialized, element_spec), num_bytes
+
+
+class CachingClientData(client_data.ClientData):
+  """Caches the datasets of the clients of an underlying `ClientData`.
+
+  The first time the dataset of a client is created, it is iterated once and
+  its elements are stored, either as constant tensors in memory or, if a
+  `cache_dir` is given, on local disk with `tf.data.experimental.save`. Later
+  requests for the same client, e.g. when it is sampled again in a later round,
+  return a dataset of the stored elements, without running the underlying
+  input pipeline, such as a database query, proto parsing and preprocessing.
+
+  The stored datasets are evicted in least-recently-used order once together
+  they exceed `max_bytes`. Datasets larger than `max_bytes` are not cached.
+  The files of a dataset stored on disk are only deleted once it is evicted
+  and every dataset returned for it, which may not have been iterated yet, has
+  been garbage collected.
+
+  Since the whole dataset of a client is materialized, the underlying datasets
+  must be finite, and should be deterministic: e.g. shuffling is frozen to the
+  order of the first iteration, so it should be applied after caching, through
+  `preprocess`.
+
+  `serializable_dataset_fn` is not cached, since it is traced into a graph and
+  its argument is only known when the graph runs.
+  """
+
+  def __init__(self,
+               underlying_client_data: client_data.ClientData,
+               max_bytes: int,
+               cache_dir: Optional[str] = None):
+    """Constructs a `CachingClientData`.
+
+    Args:
+      underlying_client_data: The `tff.simulation.datasets.ClientData` whose
+        datasets are cached.
+      max_bytes: The maximum total size of the cached elements, in bytes; must
+        be positive.
+      cache_dir: An optional local directory in which to store the datasets. If
+        `None`, the datasets are stored in memory.
+
+    Raises:
+      ValueError: If `max_bytes` is not positive.
+    """
+    py_typecheck.check_type(underlying_client_data, client_data.ClientData)
+    py_typecheck.check_type(max_bytes, int)
+    if max_bytes < 1:
+      raise ValueError(f"Expected a positive `max_bytes`, found {max_bytes}.")
+    if cache_dir is not None:
+      py_typecheck.check_type(cache_dir, str)
+      os.makedirs(cache_dir, exist_ok=True)
+    self._underlying_client_data = underlying_client_data
+    self._max_bytes = max_bytes
+    self._cache_dir = cache_dir
+    self._lock = threading.Lock()
+    # Maps client ids to a tuple of the cached dataset and its size in bytes.
+    self._entries = collections.OrderedDict()
+    self._size_bytes = 0
+    self._hits = 0
+    self._misses = 0
+    self._evictions = 0
+
+  @property
+  def size_bytes(self) -> int:
+    """The total size of the cached elements, in bytes."""
+    return self._size_bytes
+
+  @property
+  def hits(self) -> int:
+    return self._hits
+
+  @property
+  def misses(self) -> int:
+    return self._misses
+
+  @property
+  def evictions(self) -> int:
+    return self._evictions
+
+  @property
+  def hit_rate(self) -> float:
+    """The fraction of the datasets created which were served from the cache."""
+    num_requests = self._hits + self._misses
+    return self._hits / num_requests if num_requests else 0.0
+
+  def _get(self, client_id: str) -> Optional[tf.data.Dataset]:
+    with self._lock:
+      entry = self._entries.get(client_id)
+      if entry is None:
+        self._misses += 1
+        return None
+      self._entries.move_to_end(client_id)
+      self._hits += 1
+      return entry[0]
+
+  def _store(self, client_id: str,
+             dataset: tf.data.Dataset) -> tf.data.Dataset:
+    """Caches the elements of `dataset`, and returns a dataset of them."""
+    element_spec = self._underlying_client_data.element_type_structure
+    if self._cache_dir is None:
+      cached_dataset, num_bytes = _materialize(dataset, element_spec)
+      if num_bytes > self._max_bytes:
+        return cached_dataset
+    else:
+      # Each stored dataset gets a directory of its own, since an evicted
+      # dataset of the same client may still be in use.
+      path = tempfile.mkdtemp(
+          prefix=hashlib.sha256(client_id.encode("utf-8")).hexdigest() + "_",
+          dir=self._cache_dir)
+      tf.data.experimental.save(dataset, path)
+      num_bytes = _directory_num_bytes(path)
+      if num_bytes > self._max_bytes:
+        shutil.rmtree(path, ignore_errors=True)
+        return dataset
+      cached_dataset = tf.data.experimental.load(path, element_spec)
+      # The datasets derived from the returned one keep it alive, so its files
+      # are deleted once it is both evicted and no longer in use.
+      weakref.finalize(cached_dataset, shutil.rmtree, path, ignore_errors=True)
+    with self._lock:
+      previous_entry = self._entries.pop(client_id, None)
+      if previous_entry is not None:
+        self._size_bytes -= previous_entry[1]
+      self._entries[client_id] = (cached_dataset, num_bytes)
+      self._size_bytes += num_bytes
+      while self._size_bytes > self._max_bytes:
+        _, (_, evicted_num_bytes) = self._entries.popitem(last=False)
+        self._size_bytes -= evicted_num_bytes
+        self._evictions += 1
+    return cached_dataset
+
+  def clear(self):
+    """Removes all cached datasets, and resets the counters."""
+    with self._lock:
+      self._entries.clear()
+      self._size_bytes = 0
+      self._hits = 0
+      self._misses = 0
+      self._evictions = 0
+
+  @property
+  def serializable_dataset_fn(self):
+    return self._underlying_client_data.serializable_dataset_fn
+
+  @property
+  def client_ids(self) -> List[str]:
+    return self._underlying_client_data.client_ids
+
+  def create_tf_dataset_for_client(self, client_id: str) -> tf.data.Dataset:
+    dataset = self._get(client_id)
+    if dataset is not None:
+      return dataset
+    return self._store(
+        client_id,
+        self._underlying_client_data.create_tf_dataset_for_client(client_id))
+
+  def create_tf_datasets_for_clients(
+      self, client_ids: Sequence[str]) -> List[tf.data.Dataset]:
+    datasets = [self._get(client_id) for client_id in client_ids]
+    missing_client_ids = list(
+        dict.fromkeys(
+            client_id for client_id, dataset in zip(client_ids, datasets)
+            if dataset is None))
+    if missing_client_ids:
+      # The datasets of the missing clients are fetched at once.
+      missing_datasets = dict(
+          zip(
+              missing_client_ids,
+              self._underlying_client_data.create_tf_datasets_for_clients(
+                  missing_client_ids)))
+      for client_id, dataset in missing_datasets.items():
+        missing_datasets[client_id] = self._store(client_id, dataset)
+      datasets = [
+          dataset if dataset is not None else missing_datasets[client_id]
+          for client_id, dataset in zip(client_ids, datasets)
+      ]
+    return datasets
+
+  @property
+  def element_type_structure(self):
+    return self._underlying_client_data.element_type_structure
@@ -0,0 +1,154 @@
+# Copyright 2021, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+from unittest import mock
+
+import tensorflow as tf
+
+from tensorflow_federated.python.simulation.datasets import caching_client_data
+from tensorflow_federated.python.simulation.datasets import from_tensor_slices_client_data
+
+TEST_DATA = {
+    'CLIENT A':
+        collections.OrderedDict(
+            x=[[1, 2], [3, 4], [5, 6]],
+            y=[4.0, 5.0, 6.0],
+            z=['a', 'b', 'c'],
+        ),
+    'CLIENT B':
+        collections.OrderedDict(
+            x=[[10, 11]],
+            y=[7.0],
+            z=['d'],
+        ),
+}
+
+
+def _create_underlying_client_data():
+  # Batches of two examples make the last batch of client A partial.
+  return from_tensor_slices_client_data.TestClientData(TEST_DATA).preprocess(
+      lambda dataset: dataset.batch(2))
+
+
+class CachingClientDataTest(tf.test.TestCase):
+
+  def assertDatasetsEqual(self, actual, expected):
+    actual = list(actual.as_numpy_iterator())
+    expected = list(expected.as_numpy_iterator())
+    self.assertLen(actual, len(expected))
+    for actual_element, expected_element in zip(actual, expected):
+      self.assertAllEqual(actual_element, expected_element)
+
+  def test_caches_datasets_in_memory(self):
+    underlying = _create_underlying_client_data()
+    data = caching_client_data.CachingClientData(underlying, max_bytes=1000)
+
+    for _ in range(2):
+      for client_id in data.client_ids:
+        dataset = data.create_tf_dataset_for_client(client_id)
+        self.assertEqual(dataset.element_spec, data.element_type_structure)
+        self.assertDatasetsEqual(
+            dataset, underlying.create_tf_dataset_for_client(client_id))
+
+    self.assertEqual(data.misses, 2)
+    self.assertEqual(data.hits, 2)
+    self.assertEqual(data.hit_rate, 0.5)
+    self.assertGreater(data.size_bytes, 0)
+
+  def test_caches_datasets_on_disk(self):
+    underlying = _create_underlying_client_data()
+    data = caching_client_data.CachingClientData(
+        underlying, max_bytes=10**6, cache_dir=self.create_tempdir().full_path)
+
+    for _ in range(2):
+      dataset = data.create_tf_dataset_for_client('CLIENT A')
+      self.assertDatasetsEqual(
+          dataset, underlying.create_tf_dataset_for_client('CLIENT A'))
+
+    self.assertEqual(data.hits, 1)
+    self.assertGreater(data.size_bytes, 0)
+
+  def test_does_not_recreate_cached_datasets(self):
+    underlying = _create_underlying_client_data()
+    data = caching_client_data.CachingClientData(underlying, max_bytes=1000)
+    data.create_tf_dataset_for_client('CLIENT A')
+
+    with mock.patch.object(
+        underlying, 'create_tf_dataset_for_client',
+        side_effect=AssertionError('Dataset created again.')):
+      data.create_tf_dataset_for_client('CLIENT A')
+
+  def test_evicts_least_recently_used_beyond_max_bytes(self):
+    underlying = _create_underlying_client_data()
+    data = caching_client_data.CachingClientData(underlying, max_bytes=1000)
+    data.create_tf_dataset_for_client('CLIENT A')
+    size_a = data.size_bytes
+    data.create_tf_dataset_for_client('CLIENT B')
+    size_b = data.size_bytes - size_a
+    data.clear()
+
+    data = caching_client_data.CachingClientData(
+        underlying, max_bytes=max(size_a, size_b) + 1)
+    data.create_tf_dataset_for_client('CLIENT A')
+    data.create_tf_dataset_for_client('CLIENT B')
+    data.create_tf_dataset_for_client('CLIENT A')
+
+    self.assertEqual(data.evictions, 2)
+    self.assertEqual(data.hits, 0)
+
+  def test_keeps_files_of_evicted_datasets_in_use(self):
+    underlying = _create_underlying_client_data()
+    data = caching_client_data.CachingClientData(
+        underlying, max_bytes=10**6, cache_dir=self.create_tempdir().full_path)
+    data.create_tf_dataset_for_client('CLIENT A')
+    size_a = data.size_bytes
+    data.create_tf_dataset_for_client('CLIENT B')
+    size_b = data.size_bytes - size_a
+    data.clear()
+
+    data = caching_client_data.CachingClientData(
+        underlying,
+        max_bytes=max(size_a, size_b) + 1,
+        cache_dir=self.create_tempdir().full_path)
+    # Storing the dataset of client B evicts the one of client A, which was
+    # returned by the same call but not iterated yet.
+    datasets = data.create_tf_datasets_for_clients(['CLIENT A', 'CLIENT B'])
+
+    self.assertEqual(data.evictions, 1)
+    for client_id, dataset in zip(['CLIENT A', 'CLIENT B'], datasets):
+      self.assertDatasetsEqual(
+          dataset, underlying.create_tf_dataset_for_client(client_id))
+
+  def test_create_datasets_for_clients(self):
+    underlying = _create_underlying_client_data()
+    data = caching_client_data.CachingClientData(underlying, max_bytes=1000)
+    data.create_tf_dataset_for_client('CLIENT B')
+
+    datasets = data.create_tf_datasets_for_clients(['CLIENT A', 'CLIENT B'])
+
+    for client_id, dataset in zip(['CLIENT A', 'CLIENT B'], datasets):
+      self.assertDatasetsEqual(
+          dataset, underlying.create_tf_dataset_for_client(client_id))
+    self.assertEqual(data.hits, 1)
+    self.assertEqual(data.misses, 2)
+
+  def test_raises_with_nonpositive_max_bytes(self):
+    with self.assertRaises(ValueError):
+      caching_client_data.CachingClientData(
+          _create_underlying_client_data(), max_bytes=0)
+
+
+if __name__ == '__main__':
+  tf.test.main()
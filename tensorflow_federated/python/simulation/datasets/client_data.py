@@ -144,6 +144,23 @@ class ClientData(object, metaclass=abc.ABCMeta):
               i=client_id))
     return self.serializable_dataset_fn(client_id)
 
+  def create_tf_datasets_for_clients(
+      self, client_ids: Sequence[str]) -> List[tf.data.Dataset]:
+    """Creates a new `tf.data.Dataset` for each of `client_ids`.
+
+    Subclasses may override this method to fetch the data of many clients at
+    once, e.g. to build the datasets of the clients selected for a round.
+
+    Args:
+      client_ids: The string client_ids of the desired clients.
+
+    Returns:
+      A list of `tf.data.Dataset` objects, in the order of `client_ids`.
+    """
+    return [
+        self.create_tf_dataset_for_client(client_id) for client_id in client_ids
+    ]
+
   @property
   def dataset_computation(self):
     """A `tff.Computation` accepting a client ID, returning a dataset.
@@ -391,6 +408,13 @@ class PreprocessClientData(ClientData):
     return self._preprocess_fn(
         self._underlying_client_data.create_tf_dataset_for_client(client_id))
 
+  def create_tf_datasets_for_clients(
+      self, client_ids: Sequence[str]) -> List[tf.data.Dataset]:
+    return [
+        self._preprocess_fn(dataset) for dataset in
+        self._underlying_client_data.create_tf_datasets_for_clients(client_ids)
+    ]
+
   @property
   def element_type_structure(self):
     return self._element_type_structure
@@ -0,0 +1,125 @@
+# Copyright 2021, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+
+import numpy as np
+import tensorflow as tf
+
+from tensorflow_federated.python.simulation.datasets import client_data
+from tensorflow_federated.python.simulation.datasets import columnar_client_data
+from tensorflow_federated.python.simulation.datasets import from_tensor_slices_client_data
+
+_TEST_DATA = {
+    'client_b':
+        collections.OrderedDict(
+            pixels=np.arange(12, dtype=np.float32).reshape([3, 2, 2]),
+            label=np.array([1, 2, 3], dtype=np.int64),
+            tokens=np.array([b'a', b'', b'bcd'])),
+    'client_a':
+        collections.OrderedDict(
+            pixels=np.ones([1, 2, 2], dtype=np.float32),
+            label=np.array([7], dtype=np.int64),
+            tokens=np.array([b'xyz'])),
+}
+
+
+def _range_dataset_fn(client_id):
+  return tf.data.Dataset.range(tf.strings.length(client_id) - 1)
+
+
+def _as_list(dataset):
+  return list(dataset.as_numpy_iterator())
+
+
+class ColumnarClientDataTest(tf.test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._path = self.create_tempdir().full_path
+    self._source = from_tensor_slices_client_data.TestClientData(_TEST_DATA)
+    columnar_client_data.write_columnar_client_data(self._source, self._path)
+
+  def assertDatasetsEqual(self, actual, expected):
+    actual, expected = _as_list(actual), _as_list(expected)
+    self.assertLen(actual, len(expected))
+    for actual_example, expected_example in zip(actual, expected):
+      self.assertAllEqual(actual_example, expected_example)
+
+  def test_reads_written_clients(self):
+    data = columnar_client_data.ColumnarClientData(self._path)
+
+    self.assertEqual(data.client_ids, ['client_a', 'client_b'])
+    self.assertEqual(data.element_type_structure,
+                     self._source.element_type_structure)
+    for client_id in data.client_ids:
+      self.assertDatasetsEqual(
+          data.create_tf_dataset_for_client(client_id),
+          self._source.create_tf_dataset_for_client(client_id))
+
+  def test_serializable_dataset_fn_reads_written_clients(self):
+    data = columnar_client_data.ColumnarClientData(self._path)
+    dataset_fn = tf.function(data.serializable_dataset_fn)
+
+    for client_id in data.client_ids:
+      dataset = dataset_fn(tf.constant(client_id))
+      self.assertEqual(dataset.element_spec, data.element_type_structure)
+      self.assertDatasetsEqual(
+          dataset, self._source.create_tf_dataset_for_client(client_id))
+
+  def test_reads_clients_without_examples(self):
+    # Client `a` has no examples, and client `bbb` has two.
+    source = client_data.ClientData.from_clients_and_tf_fn(['a', 'bbb'],
+                                                           _range_dataset_fn)
+    columnar_client_data.write_columnar_client_data(source, self._path)
+    data = columnar_client_data.ColumnarClientData(self._path)
+
+    self.assertEqual(_as_list(data.create_tf_dataset_for_client('a')), [])
+    self.assertEqual(_as_list(data.create_tf_dataset_for_client('bbb')), [0, 1])
+    self.assertEqual(
+        _as_list(data.serializable_dataset_fn(tf.constant('a'))), [])
+    self.assertEqual(
+        _as_list(data.serializable_dataset_fn(tf.constant('bbb'))), [0, 1])
+
+  def test_create_dataset_from_all_clients(self):
+    data = columnar_client_data.ColumnarClientData(self._path)
+
+    dataset = data.create_tf_dataset_from_all_clients()
+
+    self.assertLen(_as_list(dataset), 4)
+
+  def test_client_missing(self):
+    data = columnar_client_data.ColumnarClientData(self._path)
+    with self.assertRaisesRegex(ValueError, 'not a client in this ClientData'):
+      data.create_tf_dataset_for_client('missing_client_id')
+
+  def test_raises_without_columnar_data(self):
+    with self.assertRaises(columnar_client_data.ColumnarFormatError):
+      columnar_client_data.ColumnarClientData(self.create_tempdir().full_path)
+
+  def test_write_raises_with_undefined_shapes(self):
+    source = client_data.ClientData.from_clients_and_tf_fn(
+        ['a'], lambda _: tf.data.Dataset.range(3).batch(2))
+    with self.assertRaises(ValueError):
+      columnar_client_data.write_columnar_client_data(source, self._path)
+
+  def test_write_raises_with_non_scalar_strings(self):
+    source = from_tensor_slices_client_data.TestClientData(
+        {'a': collections.OrderedDict(tokens=np.array([[b'a', b'b']]))})
+    with self.assertRaisesRegex(ValueError, 'string features to be scalars'):
+      columnar_client_data.write_columnar_client_data(source, self._path)
+
+
+if __name__ == '__main__':
+  tf.test.main()
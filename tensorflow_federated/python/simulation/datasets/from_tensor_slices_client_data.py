@@ -14,7 +14,9 @@
 """A simple ClientData based on in-memory tensor slices."""
 
 import copy
+from typing import Dict, Sequence, Union
 
+import numpy as np
 import tensorflow as tf
 
 from tensorflow_federated.python.common_libs import py_typecheck
@@ -33,7 +35,9 @@ class TestClientData(client_data.ClientData):
   class is intended only for constructing toy federated datasets, especially
   to support simulation tests. Using this for large datasets is *not*
   recommended, as it requires putting all client data into the underlying
-  TensorFlow graph (which is memory intensive).
+  TensorFlow graph (which is memory intensive). Large synthetic populations of
+  clients can instead be built from concatenated arrays with
+  `TestClientData.from_concatenated_arrays`.
   """
 
   def __init__(self, tensor_slices_dict):
@@ -116,6 +120,43 @@ class TestClientData(client_data.ClientData):
     example_dataset = self.create_tf_dataset_for_client(self.client_ids[0])
     self._element_type_structure = example_dataset.element_spec
 
+  @staticmethod
+  def from_concatenated_arrays(
+      client_ids: Sequence[str],
+      tensor_slices: Union[np.ndarray, Dict[str, np.ndarray]],
+      offsets: np.ndarray) -> 'TestClientData':
+    """Constructs a `TestClientData` from the concatenated data of all clients.
+
+    The data is given in a compressed sparse row layout: the examples of all
+    clients are concatenated along the first dimension of `tensor_slices`, and
+    the examples of the client `client_ids[i]` are those in the range
+    `[offsets[i], offsets[i + 1])`.
+
+    Unlike the constructor, this neither copies the data nor converts the data
+    of each client to tensors; the arrays are checked once, and the dataset of
+    a client is only created from a slice of them when requested. This makes it
+    suitable for large, synthetic populations of clients.
+
+    Args:
+      client_ids: A sequence of unique string client ids.
+      tensor_slices: A numpy array, or a dictionary of string keys to numpy
+        arrays, holding the concatenated examples of all clients. All arrays
+        must have the same first dimension.
+      offsets: A one-dimensional integer array of `len(client_ids) + 1` offsets
+        of the examples of each client in `tensor_slices`, starting at `0` and
+        ending at the number of examples.
+
+    Returns:
+      A `TestClientData`.
+
+    Raises:
+      ValueError: If the client ids are not unique, if the arrays have
+        different numbers of examples, if `offsets` does not match the client
+        ids and examples, or if a client with no data is found.
+      TypeError: If a client id is not a string, or `offsets` are not integers.
+    """
+    return _ConcatenatedTestClientData(client_ids, tensor_slices, offsets)
+
   @property
   def client_ids(self):
     return list(self._tensor_slices_dict.keys())
@@ -223,3 +264,109 @@ class TestClientData(client_data.ClientData):
   @property
   def element_type_structure(self):
     return self._element_type_structure
+
+
+class _ConcatenatedTestClientData(TestClientData):
+  """A `TestClientData` over the concatenated data of all clients."""
+
+  def __init__(  # pylint: disable=super-init-not-called
+      self, client_ids: Sequence[str],
+      tensor_slices: Union[np.ndarray, Dict[str, np.ndarray]],
+      offsets: np.ndarray):
+    client_ids = list(client_ids)
+    for client_id in client_ids:
+      py_typecheck.check_type(client_id, str)
+    self._client_indices = {
+        client_id: index for index, client_id in enumerate(client_ids)
+    }
+    if len(self._client_indices) != len(client_ids):
+      raise ValueError('The client ids must be unique.')
+    if not client_ids:
+      raise ValueError('Expected at least one client.')
+
+    if isinstance(tensor_slices, dict):
+      tensor_slices = type(tensor_slices)(
+          (key, np.asarray(array)) for key, array in tensor_slices.items())
+    else:
+      tensor_slices = np.asarray(tensor_slices)
+    num_examples = {len(array) for array in tf.nest.flatten(tensor_slices)}
+    if len(num_examples) != 1:
+      raise ValueError(
+          'All the arrays in `tensor_slices` must have the same first '
+          'dimension, found {}.'.format(sorted(num_examples)))
+    num_examples = num_examples.pop()
+
+    offsets = np.asarray(offsets)
+    if not np.issubdtype(offsets.dtype, np.integer):
+      raise TypeError('Expected integer `offsets`, found {}.'.format(
+          offsets.dtype))
+    if offsets.shape != (len(client_ids) + 1,):
+      raise ValueError(
+          'Expected `offsets` of shape {}, found {}.'.format(
+              (len(client_ids) + 1,), offsets.shape))
+    if offsets[0] != 0 or offsets[-1] != num_examples:
+      raise ValueError(
+          'Expected `offsets` from 0 to the number of examples {}, found {} '
+          'to {}.'.format(num_examples, offsets[0], offsets[-1]))
+    empty_clients = np.flatnonzero(np.diff(offsets) <= 0)
+    if empty_clients.size:
+      raise ValueError('No data found for client {}'.format(
+          client_ids[empty_clients[0]]))
+
+    self._client_ids = client_ids
+    self._tensor_slices = tensor_slices
+    self._offsets = offsets.astype(np.int64)
+    example_dataset = self.create_tf_dataset_for_client(client_ids[0])
+    self._element_type_structure = example_dataset.element_spec
+
+  @property
+  def client_ids(self):
+    return list(self._client_ids)
+
+  @tf.function
+  def _create_dataset(self, client_id):
+    """A tf.function taking id of a client and returning that client's data.
+
+    Like `TestClientData`, this bakes all the data into the graph, which is
+    only done when the function is first traced.
+
+    Args:
+      client_id: The string identifier for particular client in the dataset.
+
+    Returns:
+      A tf.data.Dataset of `client_id`'s data.
+
+    Raises:
+      tf.errors.InvalidArgumentError: If no data can be found for the
+        `client_id` provided (i.e., it's not in the set of clients).
+    """
+    client_index_table = tf.lookup.StaticHashTable(
+        initializer=tf.lookup.KeyValueTensorInitializer(
+            keys=tf.constant(self._client_ids),
+            values=tf.range(len(self._client_ids), dtype=tf.int64)),
+        default_value=-1)
+    client_index = client_index_table.lookup(client_id)
+    tf.Assert(client_index >= 0, ['No data found for client ', client_id])
+    offsets = tf.constant(self._offsets)
+    start, stop = offsets[client_index], offsets[client_index + 1]
+    tensor_slices = tf.nest.map_structure(
+        lambda array: tf.constant(array)[start:stop], self._tensor_slices)
+    return tf.data.Dataset.from_tensor_slices(tensor_slices)
+
+  @property
+  def serializable_dataset_fn(self):
+    return self._create_dataset
+
+  def create_tf_dataset_for_client(self, client_id):
+    client_index = self._client_indices.get(client_id)
+    if client_index is None:
+      raise ValueError('No data found for client {}'.format(client_id))
+    start = self._offsets[client_index]
+    stop = self._offsets[client_index + 1]
+    return tf.data.Dataset.from_tensor_slices(
+        tf.nest.map_structure(lambda array: array[start:stop],
+                              self._tensor_slices))
+
+  @property
+  def element_type_structure(self):
+    return self._element_type_structure
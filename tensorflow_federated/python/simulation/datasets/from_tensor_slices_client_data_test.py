@@ -16,6 +16,7 @@ import collections
 import copy
 
 from absl.testing import parameterized
+import numpy as np
 import tensorflow as tf
 
 from tensorflow_federated.python.core.api import computation_base
@@ -336,6 +337,99 @@ class TestClientDataTest(tf.test.TestCase, parameterized.TestCase):
       dataset_computation(CLIENT_ID_NOT_IN_TEST_DATA)
 
 
+
+class FromConcatenatedArraysTest(tf.test.TestCase, parameterized.TestCase):
+
+  def assertSameDatasets(self, a_dataset, b_dataset):
+    a_elements = list(a_dataset.as_numpy_iterator())
+    b_elements = list(b_dataset.as_numpy_iterator())
+    self.assertEqual(len(a_elements), len(b_elements))
+    for a, b in zip(a_elements, b_elements):
+      self.assertAllEqual(a, b)
+
+  @parameterized.named_parameters(
+      ('list_data', TEST_DATA),
+      ('ordered_dict_data', TEST_DATA_WITH_ORDEREDDICTS),
+  )
+  def test_matches_client_data_from_tensor_slices(self, tensor_slices_dict):
+    client_ids = list(tensor_slices_dict)
+    structures = list(tensor_slices_dict.values())
+
+    def concatenate(slices):
+      return np.concatenate([tf.constant(x).numpy() for x in slices])
+
+    if isinstance(structures[0], dict):
+      tensor_slices = collections.OrderedDict(
+          (key, concatenate([s[key] for s in structures]))
+          for key in structures[0])
+      num_examples = [len(s['x']) for s in structures]
+    else:
+      tensor_slices = concatenate(structures)
+      num_examples = [len(s) for s in structures]
+    offsets = np.cumsum([0] + num_examples)
+    expected_client_data = from_tensor_slices_client_data.TestClientData(
+        tensor_slices_dict)
+
+    client_data = (
+        from_tensor_slices_client_data.TestClientData.from_concatenated_arrays(
+            client_ids, tensor_slices, offsets))
+
+    self.assertIsInstance(client_data,
+                          from_tensor_slices_client_data.TestClientData)
+    self.assertEqual(client_data.client_ids, client_ids)
+    self.assertEqual(client_data.element_type_structure,
+                     expected_client_data.element_type_structure)
+    for client_id in client_ids:
+      expected_dataset = expected_client_data.create_tf_dataset_for_client(
+          client_id)
+      self.assertSameDatasets(
+          client_data.create_tf_dataset_for_client(client_id),
+          expected_dataset)
+      self.assertSameDatasets(
+          client_data.serializable_dataset_fn(client_id), expected_dataset)
+
+  def test_slices_arrays_without_copying(self):
+    tensor_slices = np.arange(6, dtype=np.int32)
+    client_data = (
+        from_tensor_slices_client_data.TestClientData.from_concatenated_arrays(
+            ['a', 'b'], tensor_slices, np.array([0, 4, 6])))
+    tensor_slices[5] = 10
+    self.assertEqual(
+        list(client_data.create_tf_dataset_for_client('b').as_numpy_iterator()),
+        [4, 10])
+
+  def test_raises_error_if_unknown_client_id(self):
+    client_data = (
+        from_tensor_slices_client_data.TestClientData.from_concatenated_arrays(
+            ['a'], np.arange(2), np.array([0, 2])))
+    with self.assertRaises(ValueError):
+      client_data.create_tf_dataset_for_client(CLIENT_ID_NOT_IN_TEST_DATA)
+    with self.assertRaises(tf.errors.InvalidArgumentError):
+      client_data.serializable_dataset_fn(CLIENT_ID_NOT_IN_TEST_DATA)
+
+  @parameterized.named_parameters(
+      ('too_few_offsets', ['a', 'b'], np.array([0, 2])),
+      ('offsets_not_ending_at_num_examples', ['a'], np.array([0, 1])),
+      ('empty_client', ['a', 'b', 'c'], np.array([0, 1, 1, 2])),
+      ('duplicate_client_ids', ['a', 'a'], np.array([0, 1, 2])),
+  )
+  def test_raises_value_error_with_invalid_layout(self, client_ids, offsets):
+    with self.assertRaises(ValueError):
+      from_tensor_slices_client_data.TestClientData.from_concatenated_arrays(
+          client_ids, np.arange(2), offsets)
+
+  def test_raises_value_error_with_arrays_of_different_lengths(self):
+    tensor_slices = collections.OrderedDict(x=np.arange(2), y=np.arange(3))
+    with self.assertRaises(ValueError):
+      from_tensor_slices_client_data.TestClientData.from_concatenated_arrays(
+          ['a'], tensor_slices, np.array([0, 2]))
+
+  def test_raises_type_error_with_non_integer_offsets(self):
+    with self.assertRaises(TypeError):
+      from_tensor_slices_client_data.TestClientData.from_concatenated_arrays(
+          ['a'], np.arange(2), np.array([0.0, 2.0]))
+
+
 if __name__ == '__main__':
   execution_contexts.set_local_python_execution_context()
   tf.test.main()
@@ -13,7 +13,10 @@
 # limitations under the License.
 """Implementation of `ClientData` backed by an SQL database."""
 
-from typing import Iterator, Optional
+import collections
+import pathlib
+import threading
+from typing import Iterator, List, Optional, Sequence
 
 from absl import logging
 import sqlite3
@@ -30,19 +33,47 @@ class DatabaseFormatError(Exception):
 REQUIRED_TABLES = frozenset(["examples", "client_metadata"])
 REQUIRED_EXAMPLES_COLUMNS = frozenset(
     ["split_name", "client_id", "serialized_example_proto"])
+# The index created on `examples` when no index serves lookups by client.
+EXAMPLES_INDEX_NAME = "idx_examples_client_id_split_name"
+# The maximum number of clients looked up by a single query, below the default
+# limit of SQLite on the number of parameters of a statement.
+_MAX_CLIENTS_PER_QUERY = 500
 
 
-def _check_database_format(database_filepath: str):
+def _connect_read_only(database_filepath: str) -> sqlite3.Connection:
+  """Opens a read-only connection to a SQLite database.
+
+  Args:
+    database_filepath: A string filepath to a SQLite database.
+
+  Returns:
+    A `sqlite3.Connection` which may be used from any thread.
+
+  Raises:
+    DatabaseFormatError: If the database at `database_filepath` cannot be
+      opened, e.g. because it does not exist.
+  """
+  # The path is escaped as a URI, so that e.g. `?` and `#` are not parsed.
+  uri = pathlib.Path(database_filepath).resolve().as_uri() + "?mode=ro"
+  try:
+    return sqlite3.connect(uri, uri=True, check_same_thread=False)
+  except sqlite3.OperationalError as e:
+    raise DatabaseFormatError(
+        f"Unable to open the database at [{database_filepath}].") from e
+
+
+def _check_database_format(connection: sqlite3.Connection,
+                           database_filepath: str):
   """Validates the format of a SQLite database.
 
   Args:
+    connection: A `sqlite3.Connection` to the database.
     database_filepath: A string filepath to a SQLite database.
 
   Raises:
     DatabaseFormatError: If the required tables or columns are missing from the
       database at `database_filepath`.
   """
-  connection = sqlite3.connect(database_filepath)
   # Make sure `examples` and `client_metadata` tables exists.
   result = connection.execute("SELECT name FROM sqlite_master;")
   table_names = {r[0] for r in result}
@@ -62,24 +93,66 @@ def _check_database_format(database_filepath: str):
         f"but is missing columns {missing_required_columns}.")
 
 
-def _fetch_client_ids(database_filepath: str,
+def _has_client_index(connection: sqlite3.Connection) -> bool:
+  """Whether an index of `examples` serves lookups by client and split."""
+  for index in connection.execute("PRAGMA index_list(examples);"):
+    index_name = index[1]
+    columns = [
+        r[2] for r in connection.execute(f"PRAGMA index_info('{index_name}');")
+    ]
+    if columns[:1] == ["client_id"] or set(columns[:2]) == {
+        "client_id", "split_name"
+    }:
+      return True
+  return False
+
+
+def _ensure_client_index(connection: sqlite3.Connection,
+                         database_filepath: str):
+  """Creates an index on `examples(client_id, split_name)` if none exists.
+
+  Without such an index, every query for the examples of a client scans the
+  whole `examples` table.
+
+  Args:
+    connection: A read-only `sqlite3.Connection` to the database.
+    database_filepath: A string filepath to a SQLite database.
+  """
+  if _has_client_index(connection):
+    return
+  logging.info("Creating index %s on the examples of %s.", EXAMPLES_INDEX_NAME,
+               database_filepath)
+  try:
+    with sqlite3.connect(database_filepath) as writable_connection:
+      writable_connection.execute(
+          f"CREATE INDEX IF NOT EXISTS {EXAMPLES_INDEX_NAME} "
+          "ON examples (client_id, split_name);")
+  except sqlite3.OperationalError as e:
+    logging.warning(
+        "Failed to create an index on the examples of %s, queries for the "
+        "examples of a client will scan the whole table: %s", database_filepath,
+        e)
+
+
+def _fetch_client_ids(connection: sqlite3.Connection,
                       split_name: Optional[str] = None) -> Iterator[str]:
   """Fetches the list of client_ids.
 
   Args:
-    database_filepath: A path to a SQL database.
+    connection: A `sqlite3.Connection` to the database.
     split_name: An optional split name to filter on. If `None`, all client ids
       are returned.
 
   Returns:
     An iterator of string client ids.
   """
-  connection = sqlite3.connect(database_filepath)
   query = "SELECT DISTINCT client_id FROM client_metadata"
+  parameters = ()
   if split_name is not None:
-    query += f" WHERE split_name = '{split_name}'"
+    query += " WHERE split_name = ?"
+    parameters = (split_name,)
   query += ";"
-  result = connection.execute(query)
+  result = connection.execute(query, parameters)
   return map(lambda x: x[0], result)
 
 
@@ -107,6 +180,11 @@ class SqlClientData(client_data.ClientData):
          training examples.
      -   `num_examples`: `INTEGER` column containing the number of examples
          held by this client.
+
+  Lookups of the examples of a client require an index of the `examples` table
+  on its `client_id` and `split_name` columns, which is created when the
+  database is opened if it is missing. The database is otherwise opened
+  read-only, through one connection per thread.
   """
 
   def __init__(self, database_filepath: str, split_name: Optional[str] = None):
@@ -117,27 +195,46 @@ class SqlClientData(client_data.ClientData):
       split_name: An optional `str` identifier for the split of the database to
         use. This filters clients and examples based on the `split_name` column.
         A value of `None` means no filtering, selecting all examples.
+
+    Raises:
+      DatabaseFormatError: If the database cannot be opened, or if the required
+        tables or columns are missing from it.
     """
     py_typecheck.check_type(database_filepath, str)
-    _check_database_format(database_filepath)
     self._filepath = database_filepath
     self._split_name = split_name
-    self._client_ids = sorted(
-        list(_fetch_client_ids(database_filepath, split_name)))
+    self._local = threading.local()
+    connection = self._connection()
+    _check_database_format(connection, database_filepath)
+    _ensure_client_index(connection, database_filepath)
+    self._client_ids = sorted(list(_fetch_client_ids(connection, split_name)))
+    self._client_id_set = frozenset(self._client_ids)
     logging.info("Loaded %d client ids from SQL database.",
                  len(self._client_ids))
     # SQLite returns a single column of bytes which are serialized protocol
     # buffer messages.
     self._element_type_structure = tf.TensorSpec(dtype=tf.string, shape=())
 
+  def _connection(self) -> sqlite3.Connection:
+    """Returns the read-only connection to the database of this thread."""
+    connection = getattr(self._local, "connection", None)
+    if connection is None:
+      connection = _connect_read_only(self._filepath)
+      self._local.connection = connection
+    return connection
+
   def _create_dataset(self, client_id):
     """Creates a `tf.data.Dataset` for a client in a TF-serializable manner."""
+    # Quotes are escaped, since the query cannot be parameterized.
     query_parts = [
         "SELECT serialized_example_proto FROM examples WHERE client_id = '",
-        client_id, "'"
+        tf.strings.regex_replace(client_id, "'", "''"), "'"
     ]
     if self._split_name is not None:
-      query_parts.extend([" and split_name ='", self._split_name, "'"])
+      query_parts.extend([
+          " and split_name ='",
+          self._split_name.replace("'", "''"), "'"
+      ])
     return tf.data.experimental.SqlDataset(
         driver_name="sqlite",
         data_source_name=self._filepath,
@@ -165,13 +262,56 @@ class SqlClientData(client_data.ClientData):
     Returns:
       A `tf.data.Dataset` object.
     """
-    if client_id not in self.client_ids:
+    if client_id not in self._client_id_set:
       raise ValueError(
           "ID [{i}] is not a client in this ClientData. See "
           "property `client_ids` for the list of valid ids.".format(
               i=client_id))
     return self._create_dataset(client_id)
 
+  def create_tf_datasets_for_clients(
+      self, client_ids: Sequence[str]) -> List[tf.data.Dataset]:
+    """Creates the datasets of many clients, fetching their examples at once.
+
+    The examples of all `client_ids` are fetched by a few queries, rather than
+    one query per client, and held in memory.
+
+    Args:
+      client_ids: The string identifiers of the desired clients.
+
+    Returns:
+      A list with a `tf.data.Dataset` object for each of `client_ids`, in the
+      same order.
+
+    Raises:
+      ValueError: If any of `client_ids` is not a client of this `ClientData`.
+    """
+    missing_client_ids = [c for c in client_ids if c not in self._client_id_set]
+    if missing_client_ids:
+      raise ValueError(
+          "IDs {i} are not clients in this ClientData. See "
+          "property `client_ids` for the list of valid ids.".format(
+              i=missing_client_ids))
+    examples = collections.defaultdict(list)
+    unique_client_ids = list(dict.fromkeys(client_ids))
+    connection = self._connection()
+    for start in range(0, len(unique_client_ids), _MAX_CLIENTS_PER_QUERY):
+      batch = unique_client_ids[start:start + _MAX_CLIENTS_PER_QUERY]
+      query = ("SELECT client_id, serialized_example_proto FROM examples "
+               f"WHERE client_id IN ({', '.join('?' * len(batch))})")
+      parameters = list(batch)
+      if self._split_name is not None:
+        query += " AND split_name = ?"
+        parameters.append(self._split_name)
+      for client_id, serialized_example_proto in connection.execute(
+          query + ";", parameters):
+        examples[client_id].append(serialized_example_proto)
+    return [
+        tf.data.Dataset.from_tensor_slices(
+            tf.constant(examples[client_id], dtype=tf.string))
+        for client_id in client_ids
+    ]
+
   @property
   def element_type_structure(self):
     return self._element_type_structure
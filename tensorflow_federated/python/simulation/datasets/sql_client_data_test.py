@@ -14,6 +14,7 @@
 """Tests for tensorflow_federated.python.simulation.sql_client_data."""
 
 import os
+import shutil
 
 from absl import flags
 import sqlite3
@@ -86,6 +87,17 @@ class SqlClientDataTest(tf.test.TestCase):
     with self.assertRaisesRegex(ValueError, 'not a client in this ClientData'):
       client_data.create_tf_dataset_for_client('missing_client_id')
 
+  def test_raises_with_missing_database(self):
+    with self.assertRaises(sql_client_data.DatabaseFormatError):
+      sql_client_data.SqlClientData(
+          os.path.join(FLAGS.test_tmpdir, 'missing.sqlite'))
+
+  def test_opens_database_with_uri_characters_in_path(self):
+    database_filepath = os.path.join(FLAGS.test_tmpdir, 'a?b#c%20d.sqlite')
+    shutil.copyfile(test_dataset_filepath(), database_filepath)
+    client_data = sql_client_data.SqlClientData(database_filepath)
+    self.assertEqual(client_data.client_ids, ['test_a', 'test_b', 'test_c'])
+
   def test_create_dataset_for_client(self):
 
     def test_split(split_name, example_counts):
@@ -128,6 +140,51 @@ class SqlClientDataTest(tf.test.TestCase):
       # The `test` split has no examples for client `test_a`.
       test_split('test', {'test_b': 1, 'test_c': 1})
 
+  def test_create_datasets_for_clients(self):
+    client_data = sql_client_data.SqlClientData(
+        test_dataset_filepath(), split_name='test')
+
+    datasets = client_data.create_tf_datasets_for_clients(
+        ['test_c', 'test_b', 'test_c'])
+
+    self.assertEqual([list(d.as_numpy_iterator()) for d in datasets], [
+        [make_test_example('test_c', 1)],
+        [make_test_example('test_b', 1)],
+        [make_test_example('test_c', 1)],
+    ])
+
+  def test_create_datasets_for_clients_raises_with_missing_client(self):
+    client_data = sql_client_data.SqlClientData(test_dataset_filepath())
+    with self.assertRaisesRegex(ValueError, 'not clients in this ClientData'):
+      client_data.create_tf_datasets_for_clients(['test_a', 'missing'])
+
+  def test_creates_missing_client_index(self):
+    database_filepath = os.path.join(FLAGS.test_tmpdir, 'unindexed.sqlite')
+    with sqlite3.connect(database_filepath) as connection:
+      connection.execute("""CREATE TABLE examples (
+                            split_name TEXT NOT NULL,
+                            client_id TEXT NOT NULL,
+                            serialized_example_proto BLOB NOT NULL);""")
+      connection.execute("""CREATE TABLE client_metadata (
+                            client_id TEXT NOT NULL,
+                            split_name TEXT NOT NULL,
+                            num_examples INTEGER NOT NULL);""")
+      connection.execute(
+          'INSERT INTO examples VALUES (?, ?, ?);',
+          ('train', "quote's", make_test_example("quote's", 0)))
+      connection.execute('INSERT INTO client_metadata VALUES (?, ?, ?);',
+                         ("quote's", 'train', 1))
+
+    client_data = sql_client_data.SqlClientData(database_filepath, 'train')
+
+    with sqlite3.connect(database_filepath) as connection:
+      index_names = [r[1] for r in connection.execute(
+          'PRAGMA index_list(examples);')]
+    self.assertEqual(index_names, [sql_client_data.EXAMPLES_INDEX_NAME])
+    dataset = client_data.create_tf_dataset_for_client("quote's")
+    self.assertEqual(
+        list(dataset.as_numpy_iterator()), [make_test_example("quote's", 0)])
+
   def test_dataset_computation(self):
 
     def test_split(split_name, expected_examples):
@@ -230,6 +287,15 @@ class PreprocessSqlClientDataTest(tf.test.TestCase):
     with self.subTest('test'):
       test_split('test', 1)
 
+  def test_create_datasets_for_clients_with_take_preprocess(self):
+    client_data = sql_client_data.SqlClientData(test_dataset_filepath())
+    client_data = client_data.preprocess(lambda x: x.take(1))
+
+    datasets = client_data.create_tf_datasets_for_clients(['test_b', 'test_c'])
+
+    self.assertEqual([d.reduce(0, lambda s, x: s + 1) for d in datasets],
+                     [1, 1])
+
   def test_create_dataset_for_client_with_take_preprocess(self):
 
     def test_split(split_name, example_counts):
@@ -15,6 +15,8 @@
 
 import concurrent
 import contextlib
+import http.server
+import threading
 import time
 from typing import Any, List, Optional, Tuple
 
@@ -25,16 +27,53 @@ from tensorflow_federated.proto.v0 import executor_pb2_grpc
 from tensorflow_federated.python.common_libs import py_typecheck
 from tensorflow_federated.python.core.impl.executors import executor_factory
 from tensorflow_federated.python.core.impl.executors import executor_service
+from tensorflow_federated.python.core.impl.executors import executor_service_stats
 
 _ONE_DAY_IN_SECONDS = 60 * 60 * 24
 
 
+def _start_metrics_server(
+    service: executor_service.ExecutorService,
+    port: int) -> http.server.ThreadingHTTPServer:
+  """Serves the metrics of `service` on `port`, in the Prometheus text format.
+
+  Args:
+    service: The `executor_service.ExecutorService` whose metrics to serve.
+    port: The port of the HTTP endpoint, whose metrics are at `/metrics`.
+
+  Returns:
+    The HTTP server, serving from a background thread until shut down.
+  """
+
+  class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(self):  # pylint: disable=invalid-name
+      if self.path != '/metrics':
+        self.send_error(404)
+        return
+      body = executor_service_stats.format_prometheus_text(
+          service.get_stats()).encode('utf-8')
+      self.send_response(200)
+      self.send_header('Content-Type', 'text/plain; version=0.0.4')
+      self.send_header('Content-Length', str(len(body)))
+      self.end_headers()
+      self.wfile.write(body)
+
+    def log_message(self, *args):
+      del args  # Scrapes are not logged.
+
+  metrics_server = http.server.ThreadingHTTPServer(('', port), _MetricsHandler)
+  threading.Thread(target=metrics_server.serve_forever, daemon=True).start()
+  return metrics_server
+
+
 @contextlib.contextmanager
 def server_context(ex_factory: executor_factory.ExecutorFactory,
                    num_threads: int,
                    port: int,
                    credentials: Optional[grpc.ServerCredentials] = None,
-                   options: Optional[List[Tuple[Any, Any]]] = None):
+                   options: Optional[List[Tuple[Any, Any]]] = None,
+                   metrics_port: Optional[int] = None):
   """Context manager yielding gRPC server hosting simulation component.
 
   Args:
@@ -47,12 +86,15 @@ def server_context(ex_factory: executor_factory.ExecutorFactory,
       gRPC server's `add_secure_port()`.
     options: The optional `list` of server options, each in the `(key, value)`
       format accepted by the `grpc.server()` constructor.
+    metrics_port: The optional port of an HTTP endpoint serving the metrics of
+      the executor service at `/metrics`, in the Prometheus text format. The
+      metrics are always available through the `GetStats` RPC.
 
   Yields:
     The constructed gRPC server.
 
   Raises:
-    ValueError: If `num_threads` or `port` are invalid.
+    ValueError: If `num_threads`, `port` or `metrics_port` are invalid.
   """
   py_typecheck.check_type(ex_factory, executor_factory.ExecutorFactory)
   py_typecheck.check_type(num_threads, int)
@@ -63,6 +105,10 @@ def server_context(ex_factory: executor_factory.ExecutorFactory,
     raise ValueError('The number of threads must be a positive integer.')
   if port < 1:
     raise ValueError('The server port must be a positive integer.')
+  if metrics_port is not None:
+    py_typecheck.check_type(metrics_port, int)
+    if metrics_port < 1:
+      raise ValueError('The metrics port must be a positive integer.')
   service = executor_service.ExecutorService(ex_factory)
   server_kwargs = {}
   if options is not None:
@@ -70,6 +116,7 @@ def server_context(ex_factory: executor_factory.ExecutorFactory,
   thread_pool_executor = concurrent.futures.ThreadPoolExecutor(
       max_workers=num_threads)
   server = grpc.server(thread_pool_executor, **server_kwargs)
+  metrics_server = None
   try:
     full_port_string = '[::]:{}'.format(port)
     if credentials is not None:
@@ -78,11 +125,16 @@ def server_context(ex_factory: executor_factory.ExecutorFactory,
       server.add_insecure_port(full_port_string)
     executor_pb2_grpc.add_ExecutorServicer_to_server(service, server)
     server.start()
+    if metrics_port is not None:
+      metrics_server = _start_metrics_server(service, metrics_port)
     yield server
   except KeyboardInterrupt:
     logging.info('Server stopped by KeyboardInterrupt.')
   finally:
     logging.info('Shutting down server.')
+    if metrics_server is not None:
+      metrics_server.shutdown()
+      metrics_server.server_close()
     thread_pool_executor.shutdown(wait=False)
     server.stop(None)
     ex_factory.clean_up_executors()
@@ -92,7 +144,8 @@ def run_server(ex_factory: executor_factory.ExecutorFactory,
                num_threads: int,
                port: int,
                credentials: Optional[grpc.ServerCredentials] = None,
-               options: Optional[List[Tuple[Any, Any]]] = None):
+               options: Optional[List[Tuple[Any, Any]]] = None,
+               metrics_port: Optional[int] = None):
   """Runs a gRPC server hosting a simulation component in this process.
 
   The server runs indefinitely, but can be stopped by a keyboard interrupt.
@@ -107,10 +160,13 @@ def run_server(ex_factory: executor_factory.ExecutorFactory,
       gRPC server's `add_secure_port()`.
     options: The optional `list` of server options, each in the `(key, value)`
       format accepted by the `grpc.server()` constructor.
+    metrics_port: The optional port of an HTTP endpoint serving the metrics of
+      the executor service at `/metrics`, in the Prometheus text format.
 
   Raises:
-    ValueError: If `num_threads` or `port` are invalid.
+    ValueError: If `num_threads`, `port` or `metrics_port` are invalid.
   """
-  with server_context(ex_factory, num_threads, port, credentials, options):
+  with server_context(ex_factory, num_threads, port, credentials, options,
+                      metrics_port):
     while True:
       time.sleep(_ONE_DAY_IN_SECONDS)
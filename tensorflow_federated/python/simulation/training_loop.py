@@ -14,10 +14,13 @@
 """Training loops for iterative process simulations."""
 
 import collections
+import concurrent.futures
+import contextlib
+import itertools
 import os
 import pprint
 import time
-from typing import Any, Callable, Iterable, List, Mapping, MutableMapping, Optional, Tuple
+from typing import Any, Callable, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Tuple
 
 from absl import logging
 
@@ -38,6 +41,7 @@ MetricsManager = metrics_manager_lib.MetricsManager
 ValidationFnType = Callable[[Any, int], MetricsType]
 
 ROUND_TIME_KEY = 'round_time_in_seconds'
+CLIENT_SELECTION_TIME_KEY = 'client_selection_time_in_seconds'
 VALIDATION_METRICS_PREFIX = 'validation/'
 VALIDATION_TIME_KEY = 'validation_time_in_seconds'
 
@@ -284,13 +288,73 @@ def _create_on_round_end_fn(
   return on_round_end
 
 
+def _timed_client_selection(client_selection_fn: Callable[[int], Any],
+                            round_num: int) -> Tuple[Any, float]:
+  """Returns the client data of a round, and the seconds taken to select it."""
+  selection_start_time = time.time()
+  client_data = client_selection_fn(round_num)
+  return client_data, time.time() - selection_start_time
+
+
+def _select_clients(client_selection_fn: Callable[[int], Any],
+                    round_nums: Iterable[int],
+                    prefetch_rounds: int = 0) -> Iterator[Tuple[Any, float]]:
+  """Yields the client data of each round in `round_nums`, in order.
+
+  If `prefetch_rounds` is positive, `client_selection_fn` is called on a
+  background thread for up to `prefetch_rounds` rounds ahead of the round last
+  yielded, so that selecting the clients of the next rounds overlaps with the
+  training of the current one. A single thread calls `client_selection_fn`, in
+  the order of `round_nums`, so that the calls are the same as without
+  prefetching.
+
+  Args:
+    client_selection_fn: Callable accepting an integer round number, and
+      returning a list of client data to use as federated data for that round.
+    round_nums: An iterable of the integer round numbers to select clients for.
+    prefetch_rounds: A nonnegative integer number of rounds to select clients
+      for ahead of the current round.
+
+  Yields:
+    A tuple of the output of `client_selection_fn` and the number of seconds it
+    took to compute it, for each round in `round_nums`.
+  """
+  round_nums = iter(round_nums)
+  if prefetch_rounds == 0:
+    for round_num in round_nums:
+      yield _timed_client_selection(client_selection_fn, round_num)
+    return
+
+  executor = concurrent.futures.ThreadPoolExecutor(
+      max_workers=1, thread_name_prefix='client_selection')
+  futures = collections.deque()
+
+  def submit_rounds(num_rounds):
+    for round_num in itertools.islice(round_nums, num_rounds):
+      futures.append(
+          executor.submit(_timed_client_selection, client_selection_fn,
+                          round_num))
+
+  try:
+    submit_rounds(prefetch_rounds + 1)
+    while futures:
+      selection = futures.popleft().result()
+      submit_rounds(1)
+      yield selection
+  finally:
+    for future in futures:
+      future.cancel()
+    executor.shutdown(wait=True)
+
+
 def run_simulation(
     process: iterative_process.IterativeProcess,
     client_selection_fn: Callable[[int], Any],
     total_rounds: int,
     file_checkpoint_manager: Optional[FileCheckpointManager] = None,
     metrics_managers: Optional[List[MetricsManager]] = None,
-    validation_fn: Optional[ValidationFnType] = None):
+    validation_fn: Optional[ValidationFnType] = None,
+    prefetch_rounds: int = 0):
   """Runs a federated training simulation for a given iterative process.
 
   We assume that the iterative process has the following functional type
@@ -309,7 +373,13 @@ def run_simulation(
   This method also records how long it takes (in seconds) to call
   `client_selection_fn` and `process.next` at each round and add this to the
   round metrics with key `tff.simulation.ROUND_TIME_KEY`. Note this does not
-  include validation time.
+  include validation time. The time spent in `client_selection_fn` alone is
+  added with key `tff.simulation.CLIENT_SELECTION_TIME_KEY`.
+
+  If `prefetch_rounds` is positive, `client_selection_fn` is called on a
+  background thread for up to `prefetch_rounds` rounds ahead, so that the
+  clients (e.g. their datasets) of the next rounds are selected while the
+  current round trains. See `_run_simulation_with_callbacks` for details.
 
   In full generality, after each round, we compute validation metrics via
   `validation_fn` (if not `None`), add these to the metrics created by
@@ -330,6 +400,9 @@ def run_simulation(
       iterative process (ie. the first output argument of
       `iterative_process.next`) and the current round number, and returning a
       mapping of validation metrics.
+    prefetch_rounds: A nonnegative integer number of rounds for which to call
+      `client_selection_fn` ahead of the current round. Defaults to `0`, in
+      which case the clients of each round are selected when it starts.
 
   Returns:
     The `state` of the iterative process after training.
@@ -340,7 +413,7 @@ def run_simulation(
                                          metrics_managers, validation_fn)
   return _run_simulation_with_callbacks(process, client_selection_fn,
                                         total_rounds, on_loop_start,
-                                        on_round_end)
+                                        on_round_end, prefetch_rounds)
 
 
 def _run_simulation_with_callbacks(
@@ -349,7 +422,8 @@ def _run_simulation_with_callbacks(
     total_rounds: int,
     on_loop_start: Optional[Callable[[Any], Tuple[Any, int]]] = None,
     on_round_end: Optional[Callable[[Any, int, MetricsType],
-                                    Tuple[Any, MetricsType]]] = None):
+                                    Tuple[Any, MetricsType]]] = None,
+    prefetch_rounds: int = 0):
   """Runs federated training for a given `tff.templates.IterativeProcess`.
 
   We assume that the iterative process has the following functional type
@@ -367,7 +441,18 @@ def _run_simulation_with_callbacks(
 
   This method also records how long it takes (in seconds) to call
   `client_selection_fn` and `process.next` at each round and add this to the
-  round metrics with key `tff.simulation.ROUND_TIME_KEY`.
+  round metrics with key `tff.simulation.ROUND_TIME_KEY`. The time spent in
+  `client_selection_fn` alone is added with key
+  `tff.simulation.CLIENT_SELECTION_TIME_KEY`.
+
+  If `prefetch_rounds` is positive, `client_selection_fn` is called on a
+  background thread for up to `prefetch_rounds` rounds ahead, while the current
+  round trains. The calls are made in round order, one at a time, so the
+  selected clients are the same as without prefetching, provided that
+  `client_selection_fn` depends only on its round number (and not e.g. on a
+  global random state that training also uses). In that case
+  `tff.simulation.ROUND_TIME_KEY` only includes the time spent waiting for the
+  clients of the round to be selected.
 
   This method uses up to two callbacks. The first, `on_loop_start`, accepts the
   initial state of `process`, and returns a starting `state` and `round_num` for
@@ -399,10 +484,19 @@ def _run_simulation_with_callbacks(
       process, an integer round number, and a mapping of metrics. The callable
       returns a (potentially updated) `state` of the same type, and a
       (potentially updated) mapping of metrics.
+    prefetch_rounds: A nonnegative integer number of rounds for which to call
+      `client_selection_fn` ahead of the current round.
 
   Returns:
     The `state` of the iterative process after training.
+
+  Raises:
+    ValueError: If `prefetch_rounds` is negative.
   """
+  if prefetch_rounds < 0:
+    raise ValueError('Expected a nonnegative `prefetch_rounds`, found '
+                     f'{prefetch_rounds}.')
+
   logging.info('Initializing simulation process')
   initial_state = process.initialize()
 
@@ -413,24 +507,29 @@ def _run_simulation_with_callbacks(
     state = initial_state
     start_round = 1
 
-  for round_num in range(start_round, total_rounds + 1):
-    logging.info('Executing round %d', round_num)
-    round_metrics = collections.OrderedDict(round_num=round_num)
-
-    train_start_time = time.time()
-    federated_train_data = client_selection_fn(round_num)
-
-    state, metrics = process.next(state, federated_train_data)
-    train_time = time.time() - train_start_time
-    round_metrics[ROUND_TIME_KEY] = train_time
-    round_metrics.update(metrics)
-
-    if on_round_end is not None:
-      logging.info('running round end callback')
-      state, round_metrics = on_round_end(state, round_num, round_metrics)
-
-    logging.info('Output metrics at round {:d}:\n{!s}'.format(
-        round_num, pprint.pformat(round_metrics)))
+  round_nums = range(start_round, total_rounds + 1)
+  with contextlib.closing(
+      _select_clients(client_selection_fn, round_nums,
+                      prefetch_rounds)) as client_selections:
+    for round_num in round_nums:
+      logging.info('Executing round %d', round_num)
+      round_metrics = collections.OrderedDict(round_num=round_num)
+
+      train_start_time = time.time()
+      federated_train_data, selection_time = next(client_selections)
+
+      state, metrics = process.next(state, federated_train_data)
+      train_time = time.time() - train_start_time
+      round_metrics[ROUND_TIME_KEY] = train_time
+      round_metrics[CLIENT_SELECTION_TIME_KEY] = selection_time
+      round_metrics.update(metrics)
+
+      if on_round_end is not None:
+        logging.info('running round end callback')
+        state, round_metrics = on_round_end(state, round_num, round_metrics)
+
+      logging.info('Output metrics at round {:d}:\n{!s}'.format(
+          round_num, pprint.pformat(round_metrics)))
 
   return state
 
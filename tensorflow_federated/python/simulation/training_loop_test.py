@@ -14,6 +14,7 @@
 
 import collections
 import os
+import threading
 from unittest import mock
 
 from absl.testing import absltest
@@ -445,7 +446,8 @@ class RunSimulationTest(parameterized.TestCase):
     mock_create_on_loop_start.assert_called_once_with(None, None, None)
     mock_create_on_round_end.assert_called_once_with(None, None, None)
     mock_run_simulation_with_callbacks.assert_called_once_with(
-        process, client_selection_fn, total_rounds, on_loop_start, on_round_end)
+        process, client_selection_fn, total_rounds, on_loop_start, on_round_end,
+        0)
 
   @parameterized.named_parameters(
       ('optional_inputs_0', None, None, None),
@@ -485,7 +487,8 @@ class RunSimulationTest(parameterized.TestCase):
                                                      metrics_managers,
                                                      validation_fn)
     mock_run_simulation_with_callbacks.assert_called_once_with(
-        process, client_selection_fn, total_rounds, on_loop_start, on_round_end)
+        process, client_selection_fn, total_rounds, on_loop_start, on_round_end,
+        0)
 
   @parameterized.named_parameters(
       ('optional_inputs_0', None, None, None),
@@ -529,7 +532,8 @@ class RunSimulationTest(parameterized.TestCase):
                                                      metrics_managers,
                                                      validation_fn)
     mock_run_simulation_with_callbacks.assert_called_once_with(
-        process, client_selection_fn, total_rounds, on_loop_start, on_round_end)
+        process, client_selection_fn, total_rounds, on_loop_start, on_round_end,
+        0)
 
 
 class RunSimulationWithCallbacksTest(parameterized.TestCase):
@@ -627,11 +631,69 @@ class RunSimulationWithCallbacksTest(parameterized.TestCase):
         'round_num': 1,
         'mock_train_metric': 1,
         training_loop.ROUND_TIME_KEY: 0,
+        training_loop.CLIENT_SELECTION_TIME_KEY: 0,
     }
     actual_metrics_passed_to_round_end = on_round_end.call_args_list[0][0][-1]
     self.assertDictEqual(actual_metrics_passed_to_round_end,
                          expected_metrics_passed_to_round_end)
 
+  @parameterized.named_parameters(
+      ('prefetch_1', 1),
+      ('prefetch_2', 2),
+      ('prefetch_10', 10),
+  )
+  def test_prefetching_selects_clients_in_round_order(self, prefetch_rounds):
+    process = mock.create_autospec(iterative_process.IterativeProcess)
+    process.next.return_value = ('0', {})
+    client_selection_fn = mock.MagicMock(side_effect=lambda x: [x])
+    training_loop._run_simulation_with_callbacks(
+        process, client_selection_fn, 5, prefetch_rounds=prefetch_rounds)
+    expected_calls = [mock.call(i) for i in range(1, 6)]
+    self.assertEqual(expected_calls, client_selection_fn.mock_calls)
+    client_data = [call[0][1] for call in process.next.call_args_list]
+    self.assertEqual(client_data, [[i] for i in range(1, 6)])
+
+  def test_prefetching_selects_next_round_during_training(self):
+    process = mock.create_autospec(iterative_process.IterativeProcess)
+    next_round_selected = threading.Event()
+    selected_during_training = []
+
+    def next_fn(state, client_data):
+      del client_data  # Unused.
+      selected_during_training.append(next_round_selected.wait(timeout=10))
+      return state, {}
+
+    def client_selection_fn(round_num):
+      if round_num == 2:
+        next_round_selected.set()
+      return ()
+
+    process.next.side_effect = next_fn
+    training_loop._run_simulation_with_callbacks(
+        process, client_selection_fn, 2, prefetch_rounds=1)
+    # The clients of round 2 are selected while round 1 trains.
+    self.assertEqual(selected_during_training, [True, True])
+
+  def test_prefetching_raises_client_selection_error(self):
+    process = mock.create_autospec(iterative_process.IterativeProcess)
+    process.next.return_value = ('0', {})
+
+    def client_selection_fn(round_num):
+      if round_num == 3:
+        raise ValueError('Selection failed')
+      return ()
+
+    with self.assertRaisesRegex(ValueError, 'Selection failed'):
+      training_loop._run_simulation_with_callbacks(
+          process, client_selection_fn, 5, prefetch_rounds=2)
+    self.assertEqual(process.next.call_count, 2)
+
+  def test_raises_with_negative_prefetch_rounds(self):
+    process = mock.create_autospec(iterative_process.IterativeProcess)
+    with self.assertRaises(ValueError):
+      training_loop._run_simulation_with_callbacks(
+          process, mock.MagicMock(), 5, prefetch_rounds=-1)
+
 
 class RunStatelessSimulationTest(absltest.TestCase):
 
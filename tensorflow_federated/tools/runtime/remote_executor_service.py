@@ -27,6 +27,10 @@ flags.DEFINE_string('certificate_chain', '', 'the cert for SSL/TLS setup')
 flags.DEFINE_integer('clients', '1', 'number of clients to host on this worker')
 flags.DEFINE_integer('fanout', '100',
                      'max fanout in the hierarchy of local executors')
+flags.DEFINE_integer(
+    'metrics_port', None,
+    'optional port serving worker metrics at /metrics, in the Prometheus '
+    'text format')
 
 
 GRPC_OPTIONS = [('grpc.max_message_length', 20 * 1024 * 1024),
@@ -53,7 +57,7 @@ def main(argv):
   else:
     credentials = None
   tff.simulation.run_server(executor_factory, FLAGS.threads, FLAGS.port,
-                            credentials, GRPC_OPTIONS)
+                            credentials, GRPC_OPTIONS, FLAGS.metrics_port)
 
 
 if __name__ == '__main__':